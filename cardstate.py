@@ -0,0 +1,190 @@
+"""Starea cardurilor din pagina de listă: decide dacă un anunț cunoscut mai trebuie vizitat.
+
+Cardul arată deja titlul, prețul, localitatea și data; le comparăm cu ce am reținut la ultima vizită
+reușită a anunțului. Anunțurile noi și cele schimbate (preț, titlu, reactualizare) se vizitează,
+cele neschimbate se sar, deci numărul de vizite urmează schimbările, nu mărimea inventarului.
+Starea stă într-un SQLite local (`<prefix>.cards.sqlite`), independent de CSV-urile rulărilor.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from parsing import parse_price, sanitize_text, strip_diacritics
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+# data de pe card după o reactualizare plătită („Reactualizat azi la 10:15”)
+REFRESH_MARKERS = ("reactualizat", "refreshed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    url TEXT PRIMARY KEY,
+    fingerprint TEXT,
+    title TEXT,
+    price TEXT,
+    location_date TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_visited REAL,
+    user_id TEXT,
+    has_phone INTEGER NOT NULL DEFAULT 0
+);
+"""
+# coloane adăugate după prima versiune a tabelei: (nume, definiție) pentru ALTER TABLE pe fișiere vechi
+MIGRATIONS = (("user_id", "TEXT"), ("has_phone", "INTEGER NOT NULL DEFAULT 0"))
+
+
+@dataclass
+class CardMeta:
+    url: str
+    title: str = ""
+    price: str = ""
+    location_date: str = ""
+    promoted: bool = False
+
+    @property
+    def location(self) -> str:
+        return self.location_date.split(" - ", 1)[0].strip()
+
+    @property
+    def date(self) -> str:
+        parts = self.location_date.split(" - ", 1)
+        return parts[1].strip() if len(parts) > 1 else ""
+
+    @property
+    def refreshed(self) -> bool:
+        d = strip_diacritics(self.date.lower())
+        return any(m in d for m in REFRESH_MARKERS)
+
+    def fingerprint(self) -> str:
+        """Titlu + preț normalizat + localitate; data și badge-ul „promovat” nu intră (se schimbă singure)."""
+        val, cur = parse_price(self.price)
+        norm = "|".join(
+            [
+                strip_diacritics(sanitize_text(self.title).lower()),
+                f"{val}{cur}" if val else sanitize_text(self.price).lower(),
+                strip_diacritics(self.location.lower()),
+            ]
+        )
+        return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> Optional["CardMeta"]:
+        if not d or not d.get("url"):
+            return None
+        return cls(**{k: d[k] for k in ("url", "title", "price", "location_date", "promoted") if k in d})
+
+
+class CardStateStore:
+    def __init__(self, path: str):
+        self.path = path
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        # folosit și din workerii de listă (thread-uri); apelanții serializează accesul
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=60000")
+        self._db.executescript(SCHEMA)
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(cards)")}
+        for name, decl in MIGRATIONS:
+            if name not in cols:
+                self._db.execute(f"ALTER TABLE cards ADD COLUMN {name} {decl}")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_cards_user ON cards(user_id)")
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    def classify_many(self, cards: Iterable[CardMeta], known: Iterable[str] = ()) -> Dict[str, str]:
+        """url -> new/changed/unchanged pentru cardurile unei pagini, într-o singură tranzacție.
+
+        `known` = URL-uri deja exportate în rulări vechi (CSV), fără stare de card: prima dată le reținem
+        amprenta și le tratăm ca neschimbate, ca să nu revizităm tot istoricul la trecerea pe acest mecanism.
+        """
+        cards = list(cards)
+        if not cards:
+            return {}
+        known = set(known)
+        now = time.time()
+        out: Dict[str, str] = {}
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            urls = [c.url for c in cards]
+            rows = {
+                r[0]: r[1:]
+                for r in self._db.execute(
+                    f"SELECT url, fingerprint, location_date FROM cards WHERE url IN ({','.join('?' * len(urls))})",
+                    urls,
+                )
+            }
+            for c in cards:
+                prev = rows.get(c.url)
+                fp = c.fingerprint()
+                if prev is None or prev[0] is None:
+                    if c.url in known:
+                        out[c.url] = UNCHANGED
+                        self._upsert(c, now, visited=False, fingerprint=fp)
+                    else:
+                        out[c.url] = NEW
+                        self._upsert(c, now, visited=False, fingerprint=None)
+                elif prev[0] != fp or (c.refreshed and (prev[1] or "") != c.location_date):
+                    out[c.url] = CHANGED
+                    self._db.execute("UPDATE cards SET last_seen=? WHERE url=?", (now, c.url))
+                else:
+                    out[c.url] = UNCHANGED
+                    self._db.execute("UPDATE cards SET last_seen=? WHERE url=?", (now, c.url))
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return out
+
+    def mark_visited(self, card: CardMeta, user_id: str = "", has_phone: bool = False) -> None:
+        """Reține amprenta după o vizită reușită; o vizită eșuată lasă anunțul de revizitat data viitoare."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._upsert(card, time.time(), visited=True, fingerprint=card.fingerprint())
+            self._db.execute(
+                "UPDATE cards SET user_id=COALESCE(NULLIF(?, ''), user_id), has_phone=? WHERE url=?",
+                (user_id or "", 1 if has_phone else 0, card.url),
+            )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _upsert(self, c: CardMeta, now: float, visited: bool, fingerprint: Optional[str]) -> None:
+        self._db.execute(
+            "INSERT INTO cards(url, fingerprint, title, price, location_date, first_seen, last_seen, last_visited) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET fingerprint=COALESCE(excluded.fingerprint, cards.fingerprint), "
+            "title=excluded.title, price=excluded.price, location_date=excluded.location_date, "
+            "last_seen=excluded.last_seen, last_visited=COALESCE(excluded.last_visited, cards.last_visited)",
+            (c.url, fingerprint, c.title, c.price, c.location_date, now, now, now if visited else None),
+        )
+
+    def sellers_for(self, urls: Iterable[str]) -> Dict[str, Tuple[bool, bool]]:
+        """url -> (vânzător cunoscut, telefonul vânzătorului deja capturat), pentru anunțurile vizitate anterior."""
+        urls = list(urls)
+        if not urls:
+            return {}
+        rows = self._db.execute(
+            "SELECT c.url, MAX(o.has_phone) FROM cards c JOIN cards o ON o.user_id = c.user_id "
+            f"WHERE c.user_id IS NOT NULL AND c.user_id != '' AND c.url IN ({','.join('?' * len(urls))}) "
+            "GROUP BY c.url",
+            urls,
+        )
+        return {url: (True, bool(phone)) for url, phone in rows}
+
+    def count(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM cards").fetchone()[0])
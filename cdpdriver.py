@@ -0,0 +1,842 @@
+"""Backend asyncio nativ: Chrome controlat direct prin DevTools Protocol (CDP), fără chromedriver.
+
+Straturi (doar stdlib + excepțiile Selenium):
+- `WebSocket`: client RFC 6455 minimal peste `asyncio.open_connection`;
+- `CdpConnection`: un websocket per browser; comenzi cu id + Future, sesiuni „flatten” per tab, evenimente;
+- `CdpBrowser` / `CdpPage`: API async (navigate, find, evaluate, click, cookies). Un singur event loop
+  conduce oricâte tab-uri în paralel; `fetch_all` le folosește pentru K pagini în zbor;
+- `CdpDriver`: fațadă sincronă cu subsetul Selenium folosit de scraper (ca `fakedriver.FakeDriver`), pe un loop
+  comun tuturor driverelor din proces (`LoopThread`). `make_driver` o întoarce cu `DRIVER_BACKEND=cdp`.
+
+Fiecare operație e un singur mesaj pe websocket-ul deja deschis, nu o cerere HTTP către chromedriver care
+apoi vorbește CDP cu Chrome. Erorile sunt cele din `selenium.common.exceptions`, deci căile de recuperare ale
+scraper-ului (sesiune moartă, timeout, element lipsă) rămân aceleași.
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSessionIdException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+T = TypeVar("T")
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+MAX_MESSAGE = 256 * 1024 * 1024  # page_source / corpuri de răspuns mari
+NETWORK_LOG_MAX = 5000  # evenimente Network păstrate pentru get_log("performance")
+OBJECT_GROUP = "olx"  # elementele întoarse de find_elements; eliberate la fiecare navigare
+
+CHROME_CANDIDATES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+# By -> selector CSS, ca în Selenium (XPath și textul linkurilor rămân la `_FIND_JS`)
+_BY_CSS: Dict[str, Callable[[str], str]] = {
+    By.CSS_SELECTOR: lambda v: v,
+    By.TAG_NAME: lambda v: v,
+    By.ID: lambda v: f'[id="{v}"]',
+    By.NAME: lambda v: f'[name="{v}"]',
+    By.CLASS_NAME: lambda v: f".{v}",
+}
+
+_FIND_JS = """(function(root, by, value) {
+  root = root || document;
+  if (by === "xpath") {
+    const r = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const out = [];
+    for (let i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+    return out;
+  }
+  if (by === "link text" || by === "partial link text") {
+    return Array.from(root.querySelectorAll("a")).filter((a) => {
+      const t = (a.innerText || "").trim();
+      return by === "link text" ? t === value : t.includes(value);
+    });
+  }
+  return Array.from(root.querySelectorAll(value));
+})"""
+
+_ATTRIBUTE_JS = """function(name) {
+  const p = this[name];
+  if (typeof p === "boolean") return p ? "true" : null;
+  if (p !== undefined && p !== null && typeof p !== "object" && typeof p !== "function") return String(p);
+  return this.getAttribute(name);
+}"""
+
+_DISPLAYED_JS = """function() {
+  const r = this.getBoundingClientRect(), s = getComputedStyle(this);
+  return r.width > 0 && r.height > 0 && s.visibility !== "hidden" && s.display !== "none";
+}"""
+
+# centrul elementului după scroll + dacă alt element îl acoperă (Selenium: ElementClickInterceptedException)
+_CLICK_POINT_JS = """function() {
+  this.scrollIntoView({block: "center", inline: "center"});
+  const r = this.getBoundingClientRect();
+  const x = r.left + r.width / 2, y = r.top + r.height / 2;
+  const hit = document.elementFromPoint(x, y);
+  if (r.width === 0 || r.height === 0) return {x: x, y: y, hidden: true};
+  return {x: x, y: y, covered: !(hit === this || this.contains(hit))};
+}"""
+
+
+# ------------------------ WebSocket (RFC 6455, client) ------------------------
+def encode_frame(opcode: int, payload: bytes, mask: bool = True) -> bytes:
+    """Un frame FIN; clientul trebuie să-și mascheze frame-urile."""
+    head = bytearray([0x80 | opcode])
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head.append(bit | n)
+    elif n < 1 << 16:
+        head.append(bit | 126)
+        head += struct.pack("!H", n)
+    else:
+        head.append(bit | 127)
+        head += struct.pack("!Q", n)
+    if not mask:
+        return bytes(head) + payload
+    key = os.urandom(4)
+    return bytes(head) + key + _mask(payload, key)
+
+
+def _mask(data: bytes, key: bytes) -> bytes:
+    if not data:
+        return data
+    n = len(data)
+    k = int.from_bytes((key * (n // 4 + 1))[:n], "big")
+    return (int.from_bytes(data, "big") ^ k).to_bytes(n, "big")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[bool, int, bytes]:
+    """(fin, opcode, payload) pentru următorul frame de pe fir."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+    if n > MAX_MESSAGE:
+        raise ConnectionError(f"frame websocket prea mare: {n} bytes")
+    key = await reader.readexactly(4) if b1 & 0x80 else b""
+    payload = await reader.readexactly(n)
+    return bool(b0 & 0x80), b0 & 0x0F, _mask(payload, key) if key else payload
+
+
+class WebSocket:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._send_lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, url: str, timeout: float = 10.0) -> "WebSocket":
+        parts = urlsplit(url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write(
+            (
+                f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+            ).encode()
+        )
+        head = (await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)).decode("latin-1")
+        status, *lines = head.split("\r\n")
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines if line)}
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        if " 101 " not in f"{status} " or headers.get("sec-websocket-accept") != accept:
+            writer.close()
+            raise ConnectionError(f"handshake websocket eșuat: {status}")
+        return cls(reader, writer)
+
+    async def _send_frame(self, opcode: int, payload: bytes) -> None:
+        async with self._send_lock:
+            self.writer.write(encode_frame(opcode, payload))
+            await self.writer.drain()
+
+    async def send(self, text: str) -> None:
+        await self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    async def recv(self) -> str:
+        """Următorul mesaj text (frame-urile de continuare lipite); ping => pong; close => ConnectionError."""
+        parts: List[bytes] = []
+        while True:
+            fin, op, payload = await read_frame(self.reader)
+            if op == OP_PING:
+                await self._send_frame(OP_PONG, payload)
+            elif op == OP_CLOSE:
+                raise ConnectionError("websocket închis de browser")
+            elif op in (OP_TEXT, OP_BINARY, OP_CONT):
+                parts.append(payload)
+                if fin:
+                    return b"".join(parts).decode("utf-8")
+
+    async def close(self) -> None:
+        try:
+            await self._send_frame(OP_CLOSE, struct.pack("!H", 1000))
+        except Exception:
+            pass
+        self.writer.close()
+
+
+# ------------------------ Conexiunea CDP ------------------------
+def cdp_error(method: str, error: Dict[str, Any]) -> WebDriverException:
+    """Eroarea CDP => excepția Selenium pe care o tratează deja scraper-ul."""
+    msg = str(error.get("message") or error)
+    low = msg.lower()
+    text = f"{method}: {msg}"
+    if "could not find object" in low or "cannot find context" in low or "no node" in low:
+        return StaleElementReferenceException(f"stale element reference: {text}")
+    if "no target with given id" in low or "session with given id not found" in low:
+        return NoSuchWindowException(f"no such window: {text}")
+    return WebDriverException(f"unknown error: {text}")
+
+
+class CdpConnection:
+    """Comenzi CDP multiplexate pe un websocket: `send()` așteaptă răspunsul cu același id."""
+
+    def __init__(self, ws: Any):
+        self.ws = ws
+        self.closed = False
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Tuple["asyncio.Future[Dict[str, Any]]", str]] = {}
+        self._listeners: Dict[Optional[str], List[Callable[[str, Dict[str, Any]], None]]] = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    def on(self, session_id: Optional[str], callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        self._listeners.setdefault(session_id, []).append(callback)
+
+    def off(self, session_id: Optional[str]) -> None:
+        self._listeners.pop(session_id, None)
+
+    async def send(
+        self, method: str, params: Optional[Dict[str, Any]] = None, session_id: Optional[str] = None, timeout=60.0
+    ) -> Dict[str, Any]:
+        if self.closed:
+            raise InvalidSessionIdException("invalid session id: conexiunea CDP e închisă")
+        mid = next(self._ids)
+        msg: Dict[str, Any] = {"id": mid, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        fut: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._pending[mid] = (fut, method)
+        try:
+            await self.ws.send(json.dumps(msg))
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"timeout: {method} fără răspuns în {timeout:g}s") from None
+        except (ConnectionError, OSError) as e:
+            raise InvalidSessionIdException(f"invalid session id: {e}") from None
+        finally:
+            self._pending.pop(mid, None)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                msg = json.loads(await self.ws.recv())
+                if "id" in msg:
+                    fut, method = self._pending.get(msg["id"], (None, ""))
+                    if fut is None or fut.done():
+                        continue
+                    if "error" in msg:
+                        fut.set_exception(cdp_error(method, msg["error"]))
+                    else:
+                        fut.set_result(msg.get("result") or {})
+                    continue
+                for cb in list(self._listeners.get(msg.get("sessionId"), ())):
+                    cb(msg.get("method", ""), msg.get("params") or {})
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.closed = True
+            for fut, _method in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(InvalidSessionIdException("invalid session id: browserul s-a deconectat"))
+
+    async def close(self) -> None:
+        self.closed = True
+        await self.ws.close()
+        self._reader.cancel()
+
+
+# ------------------------ Browser / tab (async) ------------------------
+class CdpPage:
+    """Un tab atașat (sesiune flatten): navigare, DOM prin Runtime, input prin Input.*."""
+
+    def __init__(self, conn: CdpConnection, target_id: str, session_id: str, network_log: bool = False):
+        self.conn = conn
+        self.target_id = target_id
+        self.session_id = session_id
+        self.network_log = network_log
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=NETWORK_LOG_MAX)
+        self.closed = False
+        self._loaded = asyncio.Event()
+        conn.on(session_id, self._on_event)
+
+    async def init(self) -> "CdpPage":
+        await self.send("Page.enable")
+        if self.network_log:
+            await self.send("Network.enable")
+        return self
+
+    def _on_event(self, method: str, params: Dict[str, Any]) -> None:
+        if method == "Page.loadEventFired":
+            self._loaded.set()
+        elif method == "Inspector.detached":
+            self.closed = True
+        if self.network_log and method.startswith("Network."):
+            self.events.append({"method": method, "params": params, "ts": time.time()})
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None, timeout=60.0) -> Dict[str, Any]:
+        if self.closed:
+            raise NoSuchWindowException("no such window: target window already closed")
+        return await self.conn.send(method, params, self.session_id, timeout)
+
+    async def navigate(self, url: str, timeout: float = 60.0) -> None:
+        """Page.navigate + așteptarea evenimentului `load` (ca `driver.get` cu pageLoadStrategy normal)."""
+        await self.send("Runtime.releaseObjectGroup", {"objectGroup": OBJECT_GROUP})
+        self._loaded.clear()
+        res = await self.send("Page.navigate", {"url": url}, timeout)
+        if res.get("errorText") and res["errorText"] != "net::ERR_ABORTED":
+            raise WebDriverException(f"unknown error: {res['errorText']} ({url})")
+        if not res.get("loaderId"):
+            return  # navigare în același document (#ancoră)
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"timeout: pagina nu s-a încărcat în {timeout:g}s ({url})") from None
+
+    def _result(self, res: Dict[str, Any]) -> Dict[str, Any]:
+        if "exceptionDetails" in res:
+            det = res["exceptionDetails"]
+            desc = (det.get("exception") or {}).get("description") or det.get("text") or "eroare JS"
+            raise JavascriptException(f"javascript error: {desc}")
+        return res.get("result") or {}
+
+    async def evaluate(self, expression: str, by_value: bool = True, await_promise: bool = False) -> Any:
+        res = await self.send(
+            "Runtime.evaluate",
+            {
+                "expression": expression,
+                "returnByValue": by_value,
+                "awaitPromise": await_promise,
+                "objectGroup": OBJECT_GROUP,
+            },
+        )
+        r = self._result(res)
+        return r.get("value") if by_value else r
+
+    async def call(self, object_id: str, function: str, args: Sequence[Dict[str, Any]] = (), by_value=True) -> Any:
+        """`function` apelată cu `this` = obiectul `object_id`; argumentele în formatul CallArgument."""
+        res = await self.send(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": function,
+                "arguments": list(args),
+                "returnByValue": by_value,
+                "objectGroup": OBJECT_GROUP,
+            },
+        )
+        r = self._result(res)
+        return r.get("value") if by_value else r
+
+    async def _array_items(self, array: Dict[str, Any]) -> List[str]:
+        oid = array.get("objectId")
+        if not oid:
+            return []
+        props = await self.send("Runtime.getProperties", {"objectId": oid, "ownProperties": True})
+        items = [
+            (int(p["name"]), p["value"]["objectId"])
+            for p in props.get("result", [])
+            if p.get("name", "").isdigit() and (p.get("value") or {}).get("objectId")
+        ]
+        await self.send("Runtime.releaseObject", {"objectId": oid})
+        return [o for _, o in sorted(items)]
+
+    async def find(self, by: str, value: str, root: Optional[str] = None) -> List[str]:
+        """objectId-urile elementelor găsite (în documentul curent sau sub elementul `root`)."""
+        if by in _BY_CSS:
+            by, value = By.CSS_SELECTOR, _BY_CSS[by](value)
+        if root is None:
+            arr = await self.evaluate(f"{_FIND_JS}(null, {json.dumps(by)}, {json.dumps(value)})", by_value=False)
+        else:
+            fn = f"function(by, value) {{ return {_FIND_JS}(this, by, value); }}"
+            arr = await self.call(root, fn, [{"value": by}, {"value": value}], by_value=False)
+        return await self._array_items(arr)
+
+    async def click(self, object_id: str) -> None:
+        """Click „adevărat” (Input.dispatchMouseEvent) în centrul elementului, ca un click WebDriver."""
+        pt = await self.call(object_id, _CLICK_POINT_JS)
+        if pt.get("hidden"):
+            raise ElementClickInterceptedException("element not interactable: element fără dimensiuni")
+        if pt.get("covered"):
+            raise ElementClickInterceptedException("element click intercepted: alt element primește click-ul")
+        base = {"x": pt["x"], "y": pt["y"], "button": "left", "clickCount": 1}
+        await self.send("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": pt["x"], "y": pt["y"]})
+        await self.send("Input.dispatchMouseEvent", {"type": "mousePressed", **base})
+        await self.send("Input.dispatchMouseEvent", {"type": "mouseReleased", **base})
+
+    async def type_text(self, object_id: str, text: str) -> None:
+        await self.call(object_id, "function() { this.focus(); }")
+        await self.send("Input.insertText", {"text": text})
+
+    async def content(self) -> str:
+        return await self.evaluate("document.documentElement ? document.documentElement.outerHTML : ''")
+
+    async def close(self) -> None:
+        self.closed = True
+        self.conn.off(self.session_id)
+        await self.conn.send("Target.closeTarget", {"targetId": self.target_id})
+
+
+class CdpBrowser:
+    """Un proces Chrome (sau un Chrome deja pornit, prin URL-ul websocket) și tab-urile lui."""
+
+    def __init__(self, conn: CdpConnection, proc: Optional[subprocess.Popen] = None, tmp_dir: Optional[str] = None):
+        self.conn = conn
+        self.proc = proc
+        self.tmp_dir = tmp_dir
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> "CdpBrowser":
+        return cls(CdpConnection(await WebSocket.connect(ws_url)))
+
+    @classmethod
+    async def launch(cls, args: Sequence[str] = (), binary: Optional[str] = None, timeout: float = 30.0):
+        """Pornește Chrome cu `--remote-debugging-port=0` și citește portul din `DevToolsActivePort`."""
+        args = list(args)
+        data_dir = next((a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir=")), None)
+        tmp_dir = None
+        if data_dir is None:
+            data_dir = tmp_dir = tempfile.mkdtemp(prefix="olx-cdp-")
+            args.append(f"--user-data-dir={data_dir}")
+        port_file = os.path.join(data_dir, "DevToolsActivePort")
+        try:
+            os.remove(port_file)
+        except OSError:
+            pass
+        cmd = [binary or find_chrome(), "--remote-debugging-port=0", "--no-first-run", "--no-default-browser-check"]
+        proc = subprocess.Popen(cmd + args + ["about:blank"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with open(port_file, "r", encoding="utf-8") as f:
+                    port, path = f.read().split()[:2]
+                break
+            except (OSError, ValueError):
+                pass
+            if proc.poll() is not None or time.monotonic() > deadline:
+                _kill(proc, tmp_dir)
+                raise WebDriverException(f"session not created: Chrome nu a pornit ({cmd[0]})")
+            await asyncio.sleep(0.05)
+        try:
+            conn = CdpConnection(await WebSocket.connect(f"ws://127.0.0.1:{port}{path}"))
+        except Exception as e:
+            _kill(proc, tmp_dir)
+            raise WebDriverException(f"session not created: {e}") from e
+        return cls(conn, proc, tmp_dir)
+
+    async def pages(self) -> List[str]:
+        res = await self.conn.send("Target.getTargets")
+        return [t["targetId"] for t in res.get("targetInfos", []) if t.get("type") == "page"]
+
+    async def attach(self, target_id: str, network_log: bool = False) -> CdpPage:
+        res = await self.conn.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        return await CdpPage(self.conn, target_id, res["sessionId"], network_log).init()
+
+    async def new_page(self, url: str = "about:blank", network_log: bool = False) -> CdpPage:
+        res = await self.conn.send("Target.createTarget", {"url": url})
+        return await self.attach(res["targetId"], network_log)
+
+    async def close(self) -> None:
+        try:
+            if not self.conn.closed:
+                await self.conn.send("Browser.close", timeout=5.0)
+        except Exception:
+            pass
+        try:
+            await self.conn.close()
+        except Exception:
+            pass
+        _kill(self.proc, self.tmp_dir)
+
+
+def _kill(proc: Optional[subprocess.Popen], tmp_dir: Optional[str]) -> None:
+    if proc is not None and proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    if tmp_dir:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def find_chrome() -> str:
+    """`CHROME_BINARY` sau primul Chrome/Chromium găsit în PATH / locațiile standard."""
+    env = os.getenv("CHROME_BINARY")
+    if env:
+        return env
+    for cand in CHROME_CANDIDATES:
+        path = shutil.which(cand) or (cand if os.path.isabs(cand) and os.path.exists(cand) else None)
+        if path:
+            return path
+    raise WebDriverException("session not created: Chrome nu a fost găsit (setează CHROME_BINARY)")
+
+
+async def fetch_all(
+    browser: CdpBrowser,
+    urls: Iterable[str],
+    concurrency: int = 8,
+    script: str = "document.documentElement.outerHTML",
+    timeout: float = 60.0,
+) -> List[Tuple[str, Any, float]]:
+    """Fiecare URL în unul din `concurrency` tab-uri reutilizate => (url, rezultatul `script` sau excepția, secunde).
+
+    Toate tab-urile sunt conduse de același event loop: cât un tab așteaptă rețeaua, celelalte lucrează.
+    """
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    for u in urls:
+        queue.put_nowait(u)
+    n = max(1, min(concurrency, queue.qsize()))
+    for _ in range(n):
+        queue.put_nowait(None)
+    out: List[Tuple[str, Any, float]] = []
+
+    async def worker(page: CdpPage) -> None:
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                await page.navigate(url, timeout)
+                res: Any = await page.evaluate(script)
+            except WebDriverException as e:
+                res = e
+            out.append((url, res, time.perf_counter() - t0))
+
+    pages = [await browser.new_page() for _ in range(n)]
+    try:
+        await asyncio.gather(*(worker(p) for p in pages))
+    finally:
+        for p in pages:
+            try:
+                await p.close()
+            except Exception:
+                pass
+    return out
+
+
+# ------------------------ Fațada sincronă (API Selenium) ------------------------
+class LoopThread:
+    """Un event loop într-un thread daemon, comun tuturor `CdpDriver`-elor din proces."""
+
+    _shared: Optional["LoopThread"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="cdp-loop", daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def shared(cls) -> "LoopThread":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)  # type: ignore[arg-type]
+        try:
+            return fut.result(timeout)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            raise TimeoutException(f"timeout: comanda CDP n-a terminat în {timeout:g}s") from None
+
+
+def _arg(v: Any) -> Dict[str, Any]:
+    return {"objectId": v.object_id} if isinstance(v, CdpElement) else {"value": v}
+
+
+def performance_entry(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Evenimentul CDP în formatul unei intrări `get_log("performance")` din chromedriver."""
+    msg = {"message": {"method": event["method"], "params": event["params"]}, "webview": ""}
+    return {"level": "INFO", "message": json.dumps(msg), "timestamp": int(event.get("ts", time.time()) * 1000)}
+
+
+def selenium_cookie(c: Dict[str, Any]) -> Dict[str, Any]:
+    """Cookie CDP (Network.Cookie) => dict-ul întors de Selenium `get_cookies()`."""
+    out = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+    if not c.get("session") and (c.get("expires") or 0) > 0:
+        out["expiry"] = int(c["expires"])
+    return out
+
+
+def cdp_cookie(c: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """Cookie în formatul Selenium (`add_cookie`) => parametrii Network.setCookie."""
+    out = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+    if "expiry" in c:
+        out["expires"] = c["expiry"]
+    if "domain" not in out:
+        out["url"] = url
+    return out
+
+
+class CdpElement:
+    def __init__(self, driver: "CdpDriver", object_id: str):
+        self._driver = driver
+        self.object_id = object_id
+
+    def _call(self, function: str, *args: Any) -> Any:
+        d = self._driver
+        return d._run(d._page.call(self.object_id, function, [_arg(a) for a in args]))
+
+    @property
+    def text(self) -> str:
+        return self._call("function() { return this.innerText || this.textContent || ''; }") or ""
+
+    @property
+    def tag_name(self) -> str:
+        return self._call("function() { return this.tagName.toLowerCase(); }")
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._call(_ATTRIBUTE_JS, name)
+
+    def is_displayed(self) -> bool:
+        return bool(self._call(_DISPLAYED_JS))
+
+    def is_enabled(self) -> bool:
+        return bool(self._call("function() { return !this.disabled; }"))
+
+    def click(self) -> None:
+        self._driver._run(self._driver._page.click(self.object_id))
+
+    def send_keys(self, *value: Any) -> None:
+        self._driver._run(self._driver._page.type_text(self.object_id, "".join(map(str, value))))
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> "CdpElement":
+        return self._driver._find_one(by, value, self.object_id)
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List["CdpElement"]:
+        return self._driver._find_all(by, value, self.object_id)
+
+
+class _SwitchTo:
+    def __init__(self, driver: "CdpDriver"):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver._switch(handle)
+
+
+class CdpDriver:
+    """Subsetul Selenium folosit de scraper, peste CDP; comenzile rulează pe loop-ul comun (`LoopThread`)."""
+
+    def __init__(self, browser: CdpBrowser, page: CdpPage, loop: LoopThread, network_log: bool = False):
+        self.browser = browser
+        self.network_log = network_log
+        self.profile: Any = None  # ProfileLease, eliberat la quit() (ca ProfiledChrome)
+        self.emulation: List[Tuple[str, Dict[str, Any]]] = []  # comenzi Emulation.* pentru fiecare tab atașat
+        self.switch_to = _SwitchTo(self)
+        self._loop = loop
+        self._pages: Dict[str, CdpPage] = {page.target_id: page}
+        self._order: List[str] = [page.target_id]
+        self._current = page.target_id
+        self._page_load_timeout = 60.0
+        self._script_timeout = 60.0
+        self._implicit_wait = 0.0
+
+    @classmethod
+    def launch(
+        cls,
+        args: Sequence[str] = (),
+        network_log: bool = False,
+        binary: Optional[str] = None,
+        loop: Optional[LoopThread] = None,
+    ) -> "CdpDriver":
+        loop = loop or LoopThread.shared()
+
+        async def start() -> Tuple[CdpBrowser, CdpPage]:
+            browser = await CdpBrowser.launch(args, binary)
+            try:
+                targets = await browser.pages()
+                if targets:
+                    page = await browser.attach(targets[0], network_log)
+                else:
+                    page = await browser.new_page("about:blank", network_log)
+            except BaseException:
+                await browser.close()
+                raise
+            return browser, page
+
+        return cls(*loop.run(start(), timeout=60.0), loop=loop, network_log=network_log)
+
+    # ---- infrastructură ----
+    def _run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        return self._loop.run(coro, timeout if timeout is not None else self._script_timeout + 5.0)
+
+    @property
+    def _page(self) -> CdpPage:
+        page = self._pages.get(self._current)
+        if page is None or page.closed:
+            raise NoSuchWindowException("no such window: target window already closed")
+        return page
+
+    def _find_all(self, by: str, value: str, root: Optional[str] = None) -> List[CdpElement]:
+        deadline = time.monotonic() + self._implicit_wait
+        while True:
+            ids = self._run(self._page.find(by, value, root))
+            if ids or time.monotonic() >= deadline:
+                return [CdpElement(self, i) for i in ids]
+            time.sleep(0.1)
+
+    def _find_one(self, by: str, value: str, root: Optional[str] = None) -> CdpElement:
+        els = self._find_all(by, value, root)
+        if not els:
+            raise NoSuchElementException(f"no such element: {by}={value}")
+        return els[0]
+
+    def _switch(self, handle: str) -> None:
+        if handle not in self._pages:
+            if handle not in self.window_handles:
+                raise NoSuchWindowException(f"no such window: {handle}")
+            page = self._run(self.browser.attach(handle, self.network_log))
+            for cmd, params in self.emulation:
+                self._run(page.send(cmd, params))
+            self._pages[handle] = page
+        self._current = handle
+
+    def emulate(self, commands: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Ca `mobileEmulation` din chromedriver: tab-ul curent și fiecare tab atașat de acum încolo."""
+        self.emulation = list(commands)
+        for cmd, params in self.emulation:
+            self.execute_cdp_cmd(cmd, params)
+
+    # ---- navigare / pagini ----
+    def get(self, url: str) -> None:
+        self._run(self._page.navigate(url, self._page_load_timeout), timeout=self._page_load_timeout + 5.0)
+
+    @property
+    def current_url(self) -> str:
+        return self._run(self._page.evaluate("location.href"))
+
+    @property
+    def page_source(self) -> str:
+        return self._run(self._page.content())
+
+    @property
+    def title(self) -> str:
+        return self._run(self._page.evaluate("document.title"))
+
+    @property
+    def window_handles(self) -> List[str]:
+        live = self._run(self.browser.pages())
+        self._order = [h for h in self._order if h in live] + [h for h in live if h not in self._order]
+        return list(self._order)
+
+    @property
+    def current_window_handle(self) -> str:
+        return self._page.target_id
+
+    def close(self) -> None:
+        page = self._page
+        self._pages.pop(page.target_id, None)
+        self._run(page.close())
+
+    def quit(self) -> None:
+        try:
+            self._run(self.browser.close(), timeout=15.0)
+        except Exception:
+            _kill(self.browser.proc, self.browser.tmp_dir)
+        finally:
+            self._pages.clear()
+            if self.profile is not None:
+                self.profile.release()
+                self.profile = None
+
+    # ---- DOM / scripturi ----
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> CdpElement:
+        return self._find_one(by, value)
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List[CdpElement]:
+        return self._find_all(by, value)
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Ca în Selenium: corpul unei funcții cu `arguments`; elementele trec ca referințe, rezultatul prin valoare."""
+        page = self._page
+        objs = [a for a in args if isinstance(a, CdpElement)]
+        if not objs:
+            expr = f"(function() {{\n{script}\n}}).apply(window, {json.dumps(list(args))})"
+            return self._run(page.evaluate(expr))
+        fn = f"function() {{\n{script}\n}}"
+        return self._run(page.call(objs[0].object_id, fn, [_arg(a) for a in args]))
+
+    def execute_cdp_cmd(self, cmd: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(self._page.send(cmd, params))
+
+    def get_log(self, log_type: str) -> List[Dict[str, Any]]:
+        if log_type != "performance" or not self.network_log:
+            raise WebDriverException(f"invalid argument: log type '{log_type}' not found")
+        page = self._page
+        entries = [performance_entry(e) for e in list(page.events)]
+        page.events.clear()
+        return entries
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self._run(self._page.send("Page.captureScreenshot", {"format": "png"}))["data"])
+
+    # ---- cookie-uri / setări ----
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        res = self._run(self._page.send("Network.getCookies", {"urls": [self.current_url]}))
+        return [selenium_cookie(c) for c in res.get("cookies", [])]
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        self._run(self._page.send("Network.setCookie", cdp_cookie(cookie, self.current_url)))
+
+    def delete_all_cookies(self) -> None:
+        self._run(self._page.send("Network.clearBrowserCookies"))
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        self._page_load_timeout = float(seconds)
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self._script_timeout = float(seconds)
+
+    def implicitly_wait(self, seconds: float) -> None:
+        self._implicit_wait = float(seconds)
@@ -0,0 +1,76 @@
+"""Jurnal de checkpoint pentru reluare exactă după crash (seed, pagină, linkuri rămase, anunț în lucru)."""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Scrie JSON atomic: fișier temporar + fsync + os.replace (nu rămâne niciodată un fișier pe jumătate)."""
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class CheckpointJournal:
+    """Starea crawl-ului, rescrisă atomic la fiecare pas.
+
+    Câmpuri: `seeds` (pentru validare la reluare), `seed_idx`, `page_idx`, `pending` (linkurile
+    [text, url] rămase pe pagina curentă; None = pagina încă nelistată), `inflight` (anunțul în lucru),
+    `listing` (paginile încă nelistate per seed, cu workeri de listă în paralel; None = deduse din
+    `seed_idx`/`page_idx`) și `outputs` (fișierele CSV/JSONL în care se continuă scrierea).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Any] = {}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("completed"):
+            return None
+        self.state = data
+        return data
+
+    def start(self, run_id: Optional[str], seeds: List[str], outputs: Dict[str, Optional[str]]) -> None:
+        self.state = {
+            "run_id": run_id,
+            "seeds": list(seeds),
+            "seed_idx": 0,
+            "page_idx": 1,
+            "pending": None,
+            "inflight": None,
+            "listing": None,
+            "outputs": outputs,
+        }
+        self._flush()
+
+    def matches(self, seeds: List[str]) -> bool:
+        return list(self.state.get("seeds") or []) == list(seeds)
+
+    def update(self, **fields: Any) -> None:
+        self.state.update(fields)
+        self._flush()
+
+    def complete(self) -> None:
+        """Rulare terminată: jurnalul nu mai e folosit la `--resume`."""
+        self.state["completed"] = True
+        self.state["pending"] = None
+        self.state["inflight"] = None
+        self._flush()
+
+    def _flush(self) -> None:
+        self.state["updated_ts"] = time.time()
+        atomic_write_json(self.path, self.state)
@@ -0,0 +1,227 @@
+"""Profiluri Chrome persistente per rol (list/ad): cache HTTP cald între rulări și la refacerea driverului.
+
+Fără profil, fiecare driver nou descarcă din nou bundle-urile JS/CSS și fonturile OLX prin proxy-ul taxat.
+Cu `CHROME_PROFILE_DIR` setat, fiecare driver primește un `--user-data-dir` propriu rolului, cu un cache pe
+disc limitat (`--disk-cache-size`). Un profil e folosit de un singur Chrome odată: slotul e blocat cu un fișier
+`.olx.lock` (pid-ul deținătorului); un lock al unui proces mort se preia. Profilele mai vechi de `max_age_h`
+sau mai mari decât `max_mb` se șterg la următoarea preluare (rotație), deci nu cresc la nesfârșit.
+"""
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+LOCK_NAME = ".olx.lock"
+CREATED_NAME = ".olx.created"
+
+# resursele documentului curent: [transferSize, encodedBodySize] (Resource Timing + Navigation Timing);
+# resursele cross-origin fără Timing-Allow-Origin raportează 0/0 și nu se pot clasifica => excluse
+CACHE_ENTRIES_JS = """
+var out = [];
+var all = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+for (var i = 0; i < all.length; i++) {
+  var e = all[i];
+  if (e.encodedBodySize > 0) { out.push([e.transferSize || 0, e.encodedBodySize]); }
+}
+return out;
+"""
+
+# deținute de procesul curent; un lock cu pid-ul nostru dar fără intrare aici e rămas de la un driver mort
+_HELD: Set[str] = set()
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        # Windows: os.kill(pid, 0) nu e o sondă; considerăm lock-ul valid (se preia după max_age_h)
+        return True
+    return True
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+@dataclass
+class ProfileLease:
+    """Un slot de profil preluat; `release()` eliberează lock-ul (idempotent)."""
+
+    path: str
+    role: str
+    rotated: bool = False
+
+    def release(self) -> None:
+        if self.path not in _HELD:
+            return
+        _HELD.discard(self.path)
+        try:
+            os.remove(os.path.join(self.path, LOCK_NAME))
+        except OSError:
+            pass
+
+
+class ProfilePool:
+    def __init__(
+        self,
+        root: str,
+        role: str,
+        slots: int = 4,
+        max_age_h: float = 72.0,
+        max_mb: float = 512.0,
+    ):
+        self.root = root
+        self.role = role
+        self.slots = max(1, slots)
+        self.max_age_s = max_age_h * 3600.0
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def slot_path(self, i: int) -> str:
+        return os.path.join(self.root, f"{self.role}-{i}")
+
+    def _try_lock(self, path: str) -> bool:
+        lock = os.path.join(path, LOCK_NAME)
+        for _ in range(2):
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if path in _HELD or not self._stale(lock):
+                    return False
+                try:
+                    os.remove(lock)
+                except OSError:
+                    return False
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"pid": os.getpid(), "ts": time.time()}, f)
+            _HELD.add(path)
+            return True
+        return False
+
+    def _stale(self, lock: str) -> bool:
+        try:
+            with open(lock, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            pid, ts = int(info.get("pid", 0)), float(info.get("ts", 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return True
+        if pid == os.getpid():
+            return True  # nu e în _HELD => driverul care l-a luat a murit fără quit()
+        return not _pid_alive(pid) or time.time() - ts > self.max_age_s
+
+    def _needs_rotation(self, path: str, now: float) -> bool:
+        try:
+            created = os.path.getmtime(os.path.join(path, CREATED_NAME))
+        except OSError:
+            # profil fără marcaj (creat de altă versiune / manual): îl refacem, ca să-i știm vârsta
+            return any(name != LOCK_NAME for name in os.listdir(path))
+        return now - created > self.max_age_s or dir_size(path) > self.max_bytes
+
+    def acquire(self, now: Optional[float] = None) -> Optional[ProfileLease]:
+        """Primul slot liber al rolului (rotit dacă e vechi/prea mare); None = toate sloturile ocupate."""
+        now = time.time() if now is None else now
+        os.makedirs(self.root, exist_ok=True)
+        for i in range(self.slots):
+            path = self.slot_path(i)
+            os.makedirs(path, exist_ok=True)
+            if not self._try_lock(path):
+                continue
+            rotated = self._needs_rotation(path, now)
+            if rotated:
+                for name in os.listdir(path):
+                    if name == LOCK_NAME:
+                        continue
+                    full = os.path.join(path, name)
+                    if os.path.isdir(full):
+                        shutil.rmtree(full, ignore_errors=True)
+                    else:
+                        try:
+                            os.remove(full)
+                        except OSError:
+                            pass
+            marker = os.path.join(path, CREATED_NAME)
+            if not os.path.exists(marker):
+                with open(marker, "w", encoding="utf-8") as f:
+                    f.write(str(now))
+                os.utime(marker, (now, now))
+            return ProfileLease(path, self.role, rotated)
+        return None
+
+    def cleanup(self) -> List[str]:
+        """Șterge sloturile nefolosite peste `slots` (ex. după micșorarea lui CHROME_PROFILE_SLOTS)."""
+        removed: List[str] = []
+        if not os.path.isdir(self.root):
+            return removed
+        keep = {os.path.basename(self.slot_path(i)) for i in range(self.slots)}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not name.startswith(f"{self.role}-") or name in keep or not os.path.isdir(path):
+                continue
+            if self._try_lock(path):
+                shutil.rmtree(path, ignore_errors=True)
+                _HELD.discard(path)
+                removed.append(path)
+        return removed
+
+
+def chrome_profile_args(lease: ProfileLease, cache_mb: float) -> List[str]:
+    return [f"--user-data-dir={os.path.abspath(lease.path)}", f"--disk-cache-size={int(cache_mb * 1024 * 1024)}"]
+
+
+class CacheStats:
+    """Hit ratio și bytes economisiți din intrările Resource Timing ([transferSize, encodedBodySize]).
+
+    transferSize 0 = servit din cache; transferSize < encodedBodySize = revalidat (304, doar headerele);
+    altfel descărcat integral.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.hits = 0
+        self.bytes_saved = 0
+        self.bytes_transferred = 0
+
+    def add(self, entries: Iterable[Sequence[float]]) -> None:
+        for entry in entries:
+            try:
+                transfer, encoded = int(entry[0]), int(entry[1])
+            except (TypeError, ValueError, IndexError):
+                continue
+            if encoded <= 0:
+                continue
+            self.requests += 1
+            self.bytes_transferred += transfer
+            if transfer < encoded:
+                self.hits += 1
+                self.bytes_saved += encoded - transfer
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "cache_requests": self.requests,
+            "cache_hits": self.hits,
+            "cache_hit_ratio": round(self.hit_ratio, 4),
+            "cache_bytes_saved": self.bytes_saved,
+            "cache_bytes_transferred": self.bytes_transferred,
+        }
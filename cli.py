@@ -0,0 +1,517 @@
+"""CLI cu subcomenzi: crawl, export, postprocess, reparse, stats, report, query, serve, login.
+
+Fiecare subcomandă importă doar ce îi trebuie: `stats`/`report` nu ating pandas/Selenium/BeautifulSoup,
+`export`/`postprocess`/`query`/`serve` aduc doar pandas, `reparse` doar BeautifulSoup;
+`crawl` și `login` încarcă `scraper_olx`.
+Flag-urile de config sunt puse în env înainte de import, deci `scraper_olx` le citește ca pe orice
+variabilă de mediu (aceleași nume: HEADLESS, MAX_PAGES_PER_SEED, URLS_FILE, ...).
+
+Exemple:
+  python cli.py crawl --max-pages 1 --no-headless
+  python cli.py crawl --mode daemon
+  python cli.py export --prefix anunturi_autorulote
+  python cli.py reparse _debug --out reparse.jsonl
+  python cli.py postprocess anunturi_autorulote_20250823-214113.csv --rates rates.json
+  python cli.py stats --last 10
+  python cli.py report --out runs.html --fail-on-regression
+  python cli.py query --phone 0722111222
+  python cli.py serve --port 8765
+  python cli.py login --no-headless
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PREFIX = "anunturi_autorulote"
+
+# dest argparse -> variabila de mediu citită de scraper_olx
+ENV_FLAGS = {
+    "headless": "HEADLESS",
+    "max_pages": "MAX_PAGES_PER_SEED",
+    "max_minutes": "MAX_RUN_MINUTES",
+    "urls": "URLS_FILE",
+    "proxies": "PROXIES_FILE",
+    "secrets": "SECRETS_FILE",
+    "cookies": "COOKIES_FILE",
+    "profile_dir": "CHROME_PROFILE_DIR",
+    "profile_slots": "CHROME_PROFILE_SLOTS",
+    "prefix": "OUTPUT_PREFIX",
+    "output_mode": "OUTPUT_MODE",
+    "base_url": "OLX_BASE_URL",
+    "log_dir": "LOG_DIR",
+    "log_format": "LOG_FORMAT",
+    "parse_workers": "PARSE_WORKERS",
+    "ad_tabs": "AD_TABS",
+    "ad_profile": "AD_PROFILE",
+    "repost_skip": "REPOST_SKIP",
+    "list_workers": "LIST_WORKERS",
+    "metrics_port": "METRICS_PORT",
+    "debug_snapshots": "DEBUG_SNAPSHOTS",
+    "sample_profiler": "SAMPLE_PROFILER",
+    "driver_backend": "DRIVER_BACKEND",
+}
+
+
+def apply_env(args: argparse.Namespace) -> None:
+    """Flag-urile date explicit suprascriu env-ul; cele omise lasă env-ul/default-urile neatinse."""
+    for dest, env in ENV_FLAGS.items():
+        v = getattr(args, dest, None)
+        if v is None:
+            continue
+        os.environ[env] = ("1" if v else "0") if isinstance(v, bool) else str(v)
+
+
+def _add_common(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--prefix", default=None, help=f"prefixul fișierelor de output (env OUTPUT_PREFIX, {DEFAULT_PREFIX})"
+    )
+    p.add_argument("--log-dir", default=None, help="director loguri (env LOG_DIR, logs)")
+    p.add_argument("--log-format", choices=["text", "json"], default=None, help="env LOG_FORMAT (text)")
+
+
+def _add_browser(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None, help="env HEADLESS")
+    p.add_argument("--proxies", default=None, help="env PROXIES_FILE (proxies.json)")
+    p.add_argument("--secrets", default=None, help="env SECRETS_FILE (secrets.env)")
+    p.add_argument("--cookies", default=None, help="env COOKIES_FILE (olx_cookies.json)")
+    p.add_argument("--base-url", default=None, help="env OLX_BASE_URL (https://www.olx.ro)")
+    p.add_argument("--profile-dir", default=None, help="env CHROME_PROFILE_DIR: profiluri Chrome persistente")
+    p.add_argument(
+        "--profile-slots",
+        type=int,
+        default=None,
+        help="env CHROME_PROFILE_SLOTS (4): profiluri per rol; surplusul se șterge",
+    )
+    p.add_argument(
+        "--driver-backend",
+        choices=["selenium", "cdp"],
+        default=None,
+        help="env DRIVER_BACKEND: chromedriver (selenium) sau DevTools direct din asyncio (cdp)",
+    )
+
+
+def _add_query_source(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--store", default=None, help="env AD_STORE_FILE (<prefix>.ads.sqlite), citit doar în citire")
+    p.add_argument("--index", default=None, help="env QUERY_INDEX_FILE (<prefix>.query.sqlite)")
+    p.add_argument("--files", nargs="*", default=None, help="output-uri preluate (implicit <prefix>_*.csv/jsonl)")
+
+
+def _prefix(args: argparse.Namespace) -> str:
+    return args.prefix or os.getenv("OUTPUT_PREFIX") or DEFAULT_PREFIX
+
+
+def _log_dir(args: argparse.Namespace) -> str:
+    return args.log_dir or os.getenv("LOG_DIR") or "logs"
+
+
+# ------------------------ crawl / login (Selenium) ------------------------
+def cmd_crawl(args: argparse.Namespace) -> int:
+    apply_env(args)
+    import scraper_olx as so
+
+    if args.mode == "coordinator":
+        so.run_coordinator(args.queue or so.QUEUE_PATH, wait=not args.no_wait)
+    elif args.mode == "worker":
+        so.run_worker(args.queue or so.QUEUE_PATH, worker_id=args.worker_id)
+    elif args.mode == "daemon":
+        so.run_daemon()
+    else:
+        so.main(resume=args.resume)
+    return 0
+
+
+def cmd_login(args: argparse.Namespace) -> int:
+    """Login asistat o singură dată; cookie-urile salvate sunt refolosite de crawl-urile următoare."""
+    apply_env(args)
+    import scraper_olx as so
+
+    proxies = so.load_proxies(so.PROXIES_FILE)
+    email, password = so.load_secrets(so.SECRETS_FILE)
+    ep = proxies.ad_endpoints[0] if proxies.ad_endpoints else None
+    driver = so.make_driver(ep, proxies.verify_ssl, ua=so.FIXED_AD_UA, role="ad")
+    try:
+        driver = so.ensure_single_login(driver, email, password)
+        ok = so.is_logged_in(driver)
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    print(f"login: {'OK' if ok else 'EȘUAT'} | cookies={so.COOKIES_FILE}")
+    return 0 if ok else 1
+
+
+# ------------------------ export (pandas) ------------------------
+def read_output_rows(paths: List[str]) -> List[Dict[str, str]]:
+    """Rândurile din CSV-urile de output, fără duplicate (telefon, url), în ordinea fișierelor."""
+    rows: List[Dict[str, str]] = []
+    seen = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for r in csv.DictReader(f):
+                key = (r.get("telefon", ""), r.get("url", ""))
+                if key in seen:
+                    continue
+                seen.add(key)
+                rows.append(r)
+    return rows
+
+
+def cmd_export_store(args: argparse.Namespace) -> int:
+    """Exportul din store-ul normalizat: foile anunturi + telefoane, sau view-ul plat (un rând per telefon)."""
+    from outputstore import AdStore
+
+    path = args.store or os.getenv("AD_STORE_FILE") or f"{_prefix(args)}.ads.sqlite"
+    if not os.path.exists(path):
+        print(f"export: store-ul {path} nu există (rulează crawl cu --output-mode normalized/both)", file=sys.stderr)
+        return 1
+    ts = time.strftime("%Y%m%d-%H%M%S")
+    store = AdStore(path)
+    try:
+        if args.view == "normalized":
+            out = args.out or f"{_prefix(args)}_export_{ts}.xlsx"
+            store.export_excel(out, transform=_typed(args))
+            c = store.counts()
+            print(f"export: {c['ads']} anunțuri, {c['phones']} telefoane din {path} => {out}")
+        elif (args.out or "").lower().endswith(".csv"):
+            n = store.export_flat_csv(args.out)
+            print(f"export: {n} rânduri (view plat) din {path} => {args.out}")
+        else:
+            import pandas as pd
+
+            out = args.out or f"{_prefix(args)}_export_{ts}.xlsx"
+            rows = store.flat_rows()
+            pd.DataFrame(rows).to_excel(out, index=False)
+            print(f"export: {len(rows)} rânduri (view plat) din {path} => {out}")
+    finally:
+        store.close()
+    return 0
+
+
+def _typed(args: argparse.Namespace):
+    """Transformarea `postprocess` pentru export, dacă e activă (--postprocess / env POSTPROCESS, implicit da)."""
+    raw = (os.getenv("POSTPROCESS") or "1").strip().lower()
+    on = args.postprocess if args.postprocess is not None else raw in ("1", "true", "yes", "da", "on")
+    if not on:
+        return None
+    from postprocess import load_rates, postprocess
+
+    rates = load_rates(args.rates or os.getenv("RATES_FILE"))
+    return lambda df: postprocess(df, rates)
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    if args.view:
+        return cmd_export_store(args)
+    paths = args.csv or sorted(glob.glob(f"{_prefix(args)}_*.csv"))
+    if not paths:
+        print("export: niciun CSV de exportat", file=sys.stderr)
+        return 1
+    rows = read_output_rows(paths)
+    out = args.out or f"{_prefix(args)}_export_{time.strftime('%Y%m%d-%H%M%S')}.xlsx"
+    import pandas as pd
+
+    df, transform = pd.DataFrame(rows), _typed(args)
+    (transform(df) if transform else df).to_excel(out, index=False)
+    print(f"export: {len(rows)} rânduri din {len(paths)} CSV => {out}")
+    return 0
+
+
+def cmd_postprocess(args: argparse.Namespace) -> int:
+    """Coloanele tipizate (postprocess.py) adăugate în exporturi existente (CSV/JSONL/XLSX), pe loc sau în --out."""
+    from postprocess import load_rates, postprocess_file
+
+    if args.out and len(args.paths) > 1:
+        print("postprocess: --out merge doar cu un singur fișier", file=sys.stderr)
+        return 2
+    rates = load_rates(args.rates or os.getenv("RATES_FILE"))
+    for path in args.paths:
+        t0 = time.perf_counter()
+        n = postprocess_file(path, args.out, rates)
+        print(f"postprocess: {n} rânduri în {time.perf_counter() - t0:.2f}s => {args.out or path}")
+    return 0
+
+
+# ------------------------ reparse (BeautifulSoup) ------------------------
+def _snapshot_dirs(paths: List[str]) -> List[str]:
+    from snapshots import snapshot_html_path
+
+    out: List[str] = []
+    for p in paths:
+        if snapshot_html_path(p):
+            out.append(p)
+        elif os.path.isdir(p):
+            out.extend(sorted(d for d in glob.glob(os.path.join(p, "*")) if snapshot_html_path(d)))
+    return out
+
+
+def cmd_reparse(args: argparse.Namespace) -> int:
+    """Reaplică parserul curent pe snapshot-urile HTML salvate (`_debug/*/page.html[.gz]`), fără browser."""
+    from parsing import parse_snapshot, snapshot_from_html
+    from snapshots import read_snapshot_html, snapshot_url
+
+    dirs = _snapshot_dirs(args.paths or ["_debug"])
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    n_ok = 0
+    try:
+        for d in dirs:
+            fields = parse_snapshot(snapshot_from_html(read_snapshot_html(d), snapshot_url(d)))
+            n_ok += 1 if any(fields.values()) else 0
+            out.write(json.dumps({"snapshot": d, **fields}, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"reparse: {len(dirs)} snapshot-uri, {n_ok} cu câmpuri extrase", file=sys.stderr)
+    return 0
+
+
+# ------------------------ stats (doar stdlib) ------------------------
+def load_run_index(log_dir: str) -> List[Dict[str, Any]]:
+    path = os.path.join(log_dir, "runs", "index.jsonl")
+    runs: List[Dict[str, Any]] = []
+    if not os.path.exists(path):
+        return runs
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs
+
+
+def _sqlite_count(path: str, sql: str) -> Optional[List[Any]]:
+    if not os.path.exists(path):
+        return None
+    import sqlite3
+
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return db.execute(sql).fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        db.close()
+
+
+def _query_index(args: argparse.Namespace):
+    """Indexul de căutare <prefix>.query.sqlite, adus la zi din store-ul <prefix>.ads.sqlite (doar citire) și din
+    output-urile <prefix>_*.csv/jsonl."""
+    from queryindex import QueryIndex
+
+    prefix = _prefix(args)
+    store = args.store or os.getenv("AD_STORE_FILE") or f"{prefix}.ads.sqlite"
+    path = args.index or os.getenv("QUERY_INDEX_FILE") or f"{prefix}.query.sqlite"
+    index = QueryIndex(path, sources=args.files or [f"{prefix}_*.csv", f"{prefix}_*.jsonl"], store=store)
+    index.refresh()
+    return index
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    from queryindex import FILTERS
+
+    index = _query_index(args)
+    try:
+        filters = {k: getattr(args, k) for k in FILTERS if getattr(args, k) is not None}
+        page = index.search(limit=args.limit, after=args.after, **filters)
+    finally:
+        index.close()
+    print(json.dumps(page, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from queryindex import start_query_server
+
+    index = _query_index(args)
+    server = start_query_server(index, args.port, host=args.host, refresh_s=args.refresh)
+    st = index.stats()
+    url = f"http://{args.host}:{server.server_port}/ads"
+    print(f"serve: {st['ads']} anunțuri, {st['phones']} telefoane => {url}?phone=...&localitate=...")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        index.close()
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    runs = load_run_index(_log_dir(args))[-args.last :]
+    prefix = _prefix(args)
+    cards = _sqlite_count(os.getenv("CARD_STATE_FILE", f"{prefix}.cards.sqlite"), "SELECT COUNT(*) FROM cards")
+    queue = _sqlite_count(
+        os.getenv("QUEUE_PATH", "olx_queue.sqlite"), "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+    )
+    report = {
+        "runs": runs,
+        "cards_known": cards[0][0] if cards else None,
+        "queue": dict(queue) if queue else None,
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    for r in runs:
+        print(
+            f"{r.get('ts_utc', '?'):<22} {r.get('mode', 'single'):<12} {float(r.get('duration_s') or 0):>9.0f}s "
+            f"ads={r.get('ads_saved', 0):<6} phones={r.get('phones_found', 0):<6} "
+            f"new={r.get('ads_new', '-')} changed={r.get('ads_changed', '-')} skipped={r.get('ads_skipped', '-')}"
+            + (
+                f" cache={float(r['cache_hit_ratio']):.0%} saved={int(r.get('cache_bytes_saved') or 0) / 1e6:.1f}MB"
+                if r.get("cache_hit_ratio") is not None
+                else ""
+            )
+        )
+    if not runs:
+        print("nicio rulare în index.jsonl")
+    if report["cards_known"] is not None:
+        print(f"carduri cunoscute: {report['cards_known']}")
+    if report["queue"]:
+        print("coadă: " + ", ".join(f"{k}={v}" for k, v in sorted(report["queue"].items())))
+    return 0
+
+
+def cmd_report(args: argparse.Namespace) -> int:
+    """Trenduri și regresii din index.jsonl => Markdown (stdout sau .md) ori HTML static (.html)."""
+    from runreport import build_report, render_html, render_markdown
+
+    runs = load_run_index(_log_dir(args))
+    rep = build_report(runs, baseline_runs=args.baseline, threshold=args.threshold, min_duration_s=args.min_duration)
+    if args.out:
+        text = render_html(rep) if args.out.lower().endswith((".html", ".htm")) else render_markdown(rep)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"report: {rep.used_runs}/{rep.total_runs} rulări, {len(rep.regressions)} regresii => {args.out}")
+    else:
+        print(render_markdown(rep), end="")
+    return 1 if args.fail_on_regression and rep.regressions else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="cli.py", description="OLX scraper")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("crawl", help="rulează crawl-ul (single/daemon/coordinator/worker)")
+    _add_common(p)
+    _add_browser(p)
+    p.add_argument("--mode", choices=["single", "daemon", "coordinator", "worker"], default="single")
+    p.add_argument("--resume", action="store_true", help="continuă rularea întreruptă din checkpoint")
+    p.add_argument("--urls", default=None, help="env URLS_FILE (urls.txt)")
+    p.add_argument("--max-pages", type=int, default=None, help="env MAX_PAGES_PER_SEED")
+    p.add_argument("--max-minutes", type=float, default=None, help="env MAX_RUN_MINUTES")
+    p.add_argument("--parse-workers", default=None, help="env PARSE_WORKERS (auto / 0 / N)")
+    p.add_argument("--list-workers", type=int, default=None, help="env LIST_WORKERS: seed-uri listate în paralel")
+    p.add_argument("--ad-tabs", type=int, default=None, help="env AD_TABS: anunțuri încărcate simultan (1)")
+    p.add_argument(
+        "--ad-profile", choices=["desktop", "mobile"], default=None, help="env AD_PROFILE: m.olx.ro întâi (desktop)"
+    )
+    p.add_argument(
+        "--output-mode",
+        choices=["flat", "normalized", "both"],
+        default=None,
+        help="env OUTPUT_MODE: CSV plat / store ads+phones (<prefix>.ads.sqlite) / amândouă (flat)",
+    )
+    p.add_argument(
+        "--repost-skip",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="env REPOST_SKIP: fără reveal pentru reposturile aceluiași vânzător (telefoanele originalului)",
+    )
+    p.add_argument("--metrics-port", type=int, default=None, help="env METRICS_PORT")
+    p.add_argument("--debug-snapshots", action=argparse.BooleanOptionalAction, default=None)
+    p.add_argument(
+        "--sample-profiler",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="env SAMPLE_PROFILER: stive eșantionate => logs/runs/run-<id>.collapsed (flamegraph)",
+    )
+    p.add_argument("--queue", default=None, help="coada SQLite partajată (coordinator/worker)")
+    p.add_argument("--worker-id", default=None)
+    p.add_argument("--no-wait", action="store_true", help="coordinator: un singur pas enqueue + export")
+    p.set_defaults(func=cmd_crawl)
+
+    p = sub.add_parser("login", help="login asistat + salvare cookies")
+    _add_common(p)
+    _add_browser(p)
+    p.set_defaults(func=cmd_login)
+
+    p = sub.add_parser("export", help="CSV-urile rulărilor => un XLSX deduplicat")
+    _add_common(p)
+    p.add_argument("csv", nargs="*", help="fișiere CSV (implicit <prefix>_*.csv)")
+    p.add_argument("--out", default=None)
+    p.add_argument(
+        "--view",
+        choices=["normalized", "flat"],
+        default=None,
+        help="din store-ul <prefix>.ads.sqlite: foile anunturi+telefoane sau view-ul plat (.csv/.xlsx)",
+    )
+    p.add_argument("--store", default=None, help="env AD_STORE_FILE (<prefix>.ads.sqlite)")
+    p.add_argument("--postprocess", action=argparse.BooleanOptionalAction, default=None, help="env POSTPROCESS")
+    p.add_argument("--rates", default=None, help="env RATES_FILE (rates.json): curs EUR/RON")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("postprocess", help="coloane tipizate (preț, vizualizări, monedă...) în exporturi existente")
+    _add_common(p)
+    p.add_argument("paths", nargs="+", help="fișiere de output .csv / .jsonl / .xlsx")
+    p.add_argument("--out", default=None, help="fișierul rezultat (implicit se rescrie intrarea)")
+    p.add_argument("--rates", default=None, help="env RATES_FILE (rates.json): curs EUR/RON")
+    p.set_defaults(func=cmd_postprocess)
+
+    p = sub.add_parser("reparse", help="reaplică parserul pe snapshot-urile HTML salvate")
+    _add_common(p)
+    p.add_argument("paths", nargs="*", help="directoare snapshot sau părinții lor (implicit _debug)")
+    p.add_argument("--out", default=None, help="JSONL (implicit stdout)")
+    p.set_defaults(func=cmd_reparse)
+
+    p = sub.add_parser("query", help="caută în rezultatele acumulate (telefon, user_id, ID, localitate, preț) => JSON")
+    _add_common(p)
+    _add_query_source(p)
+    for flag in ("phone", "user-id", "id-anunt", "localitate", "currency", "repost-cluster"):
+        p.add_argument(f"--{flag}", default=None)
+    p.add_argument("--min-price", type=float, default=None)
+    p.add_argument("--max-price", type=float, default=None)
+    p.add_argument("--limit", type=int, default=50)
+    p.add_argument("--after", default=None, help="cheia `next` din pagina precedentă")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("serve", help="server HTTP/JSON local, read-only, peste rezultatele acumulate (GET /ads)")
+    _add_common(p)
+    _add_query_source(p)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--refresh", type=float, default=60.0, help="secunde între refresh-uri (0 = fără)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("stats", help="sumarul ultimelor rulări + starea cardurilor/cozii")
+    _add_common(p)
+    p.add_argument("--last", type=int, default=20)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("report", help="trenduri pe versiune/host din index.jsonl + regresii => Markdown/HTML")
+    _add_common(p)
+    p.add_argument("--out", default=None, help=".html sau .md (implicit Markdown la stdout)")
+    p.add_argument("--baseline", type=int, default=10, help="rulări anterioare în baseline-ul unei versiuni noi")
+    p.add_argument("--threshold", type=float, default=0.15, help="regresie sub (1 - prag) x baseline anunțuri/min")
+    p.add_argument("--min-duration", type=float, default=30.0, help="rulări mai scurte (secunde) sunt ignorate")
+    p.add_argument("--fail-on-regression", action="store_true", help="cod de ieșire 1 dacă există regresii")
+    p.set_defaults(func=cmd_report)
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return int(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
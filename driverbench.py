@@ -0,0 +1,158 @@
+"""Benchmark al backend-urilor de browser pe `mock_olx`: Selenium (chromedriver) vs. CDP direct (`cdpdriver`).
+
+Aceleași pagini de anunț, aceeași operație per pagină: navigare + `page_source` + `find_elements` pe titlu.
+- `selenium`: `make_driver` cu `DRIVER_BACKEND=selenium`, pagină după pagină;
+- `cdp`: `make_driver` cu `DRIVER_BACKEND=cdp` (fațada sincronă), pagină după pagină;
+- `cdp-async`: `cdpdriver.fetch_all`, K tab-uri în zbor pe un singur event loop.
+Raport: pornirea browserului, pagini/secundă, latența per pagină (p50/p95) și erorile.
+
+Rulează (Chrome local; chromedriver doar pentru `selenium`):
+  python driverbench.py --ads 200 --concurrency 8
+  python driverbench.py --ads 100 --backends cdp cdp-async --latency 50 150 --json bench.json
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Sequence
+
+from mock_olx import MockConfig, MockOlx
+
+BACKENDS = ("selenium", "cdp", "cdp-async")
+TITLE_CSS = "h1, h4, [data-cy='ad_title']"
+
+
+def _latency(samples: Sequence[float]) -> Dict[str, float]:
+    xs = sorted(samples)
+    if not xs:
+        return {"p50_ms": 0.0, "p95_ms": 0.0}
+    return {
+        "p50_ms": round(xs[len(xs) // 2] * 1000, 1),
+        "p95_ms": round(xs[min(len(xs) - 1, int(len(xs) * 0.95))] * 1000, 1),
+    }
+
+
+def bench_sync(backend: str, urls: Sequence[str]) -> Dict[str, Any]:
+    """Un driver din `make_driver` (backend-ul ales), paginile pe rând."""
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+
+    import scraper_olx as so
+
+    saved = so.DRIVER_BACKEND
+    so.DRIVER_BACKEND = backend
+    try:
+        t0 = time.perf_counter()
+        driver = so.make_driver(None, True, ua=so.FIXED_AD_UA)
+        startup = time.perf_counter() - t0
+    finally:
+        so.DRIVER_BACKEND = saved
+    driver.implicitly_wait(0)
+    times: List[float] = []
+    errors = 0
+    t0 = time.perf_counter()
+    try:
+        for url in urls:
+            t1 = time.perf_counter()
+            try:
+                driver.get(url)
+                driver.page_source
+                driver.find_elements(By.CSS_SELECTOR, TITLE_CSS)
+            except WebDriverException:
+                errors += 1
+            times.append(time.perf_counter() - t1)
+    finally:
+        elapsed = time.perf_counter() - t0
+        driver.quit()
+    return {"startup_s": round(startup, 2), "elapsed_s": elapsed, "times": times, "errors": errors}
+
+
+def bench_async(urls: Sequence[str], concurrency: int, args: Sequence[str]) -> Dict[str, Any]:
+    """`fetch_all` pe un singur Chrome: `concurrency` tab-uri conduse de același event loop."""
+    from cdpdriver import CdpBrowser, fetch_all
+
+    script = f"[document.documentElement.outerHTML.length, document.querySelectorAll({json.dumps(TITLE_CSS)}).length]"
+
+    async def run() -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        browser = await CdpBrowser.launch(args)
+        startup = time.perf_counter() - t0
+        try:
+            t0 = time.perf_counter()
+            res = await fetch_all(browser, urls, concurrency=concurrency, script=script)
+            elapsed = time.perf_counter() - t0
+        finally:
+            await browser.close()
+        errors = sum(1 for _, r, _ in res if isinstance(r, Exception))
+        return {"startup_s": round(startup, 2), "elapsed_s": elapsed, "times": [t for _, _, t in res], "errors": errors}
+
+    return asyncio.run(run())
+
+
+def run_bench(
+    cfg: MockConfig, backends: Sequence[str] = BACKENDS, concurrency: int = 8, headless: bool = True
+) -> List[Dict[str, Any]]:
+    mock = MockOlx(cfg)
+    base = mock.start()
+    urls = [base + ad.path for ad in mock.ads]
+    args = ["--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--log-level=3"] if headless else []
+    os.environ.setdefault("LOG_DIR", os.path.join("_loadtest", "logs"))
+    reports = []
+    try:
+        for backend in backends:
+            r = bench_async(urls, concurrency, args) if backend == "cdp-async" else bench_sync(backend, urls)
+            times, elapsed = r.pop("times"), r.pop("elapsed_s")
+            reports.append(
+                {
+                    "backend": backend,
+                    "pages": len(times),
+                    "concurrency": concurrency if backend == "cdp-async" else 1,
+                    "elapsed_s": round(elapsed, 2),
+                    "pages_per_s": round(len(times) / elapsed, 2) if elapsed else 0.0,
+                    **_latency(times),
+                    **r,
+                }
+            )
+    finally:
+        mock.stop()
+    return reports
+
+
+def format_bench(reports: Sequence[Dict[str, Any]]) -> str:
+    lines = [f"{'backend':<10} {'tab-uri':>7} {'pornire':>8} {'pagini/s':>9} {'p50':>8} {'p95':>8} {'erori':>6}"]
+    base = reports[0] if reports else None
+    for r in reports:
+        line = (
+            f"{r['backend']:<10} {r['concurrency']:>7} {r['startup_s']:>7.2f}s {r['pages_per_s']:>9.2f} "
+            f"{r['p50_ms']:>6.0f}ms {r['p95_ms']:>6.0f}ms {r['errors']:>6}"
+        )
+        if base is not None and r is not base and base["pages_per_s"]:
+            line += f"  ({r['pages_per_s'] / base['pages_per_s']:.1f}x față de {base['backend']})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Selenium vs. CDP direct pe paginile mock-ului OLX")
+    ap.add_argument("--ads", type=int, default=100)
+    ap.add_argument("--latency", type=int, nargs=2, default=(30, 120), metavar=("MIN_MS", "MAX_MS"))
+    ap.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    ap.add_argument("--concurrency", type=int, default=8, help="tab-uri în zbor pentru cdp-async")
+    ap.add_argument("--no-headless", action="store_true")
+    ap.add_argument("--json", default=None, help="scrie raportul și ca JSON")
+    a = ap.parse_args()
+
+    os.environ.setdefault("HEADLESS", "0" if a.no_headless else "1")
+    result = run_bench(
+        MockConfig(n_ads=a.ads, latency_ms=tuple(a.latency), snapshot_dir=""),
+        backends=a.backends,
+        concurrency=a.concurrency,
+        headless=not a.no_headless,
+    )
+    print(format_bench(result))
+    if a.json:
+        with open(a.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
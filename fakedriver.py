@@ -0,0 +1,498 @@
+"""Backend WebDriver în proces, fără Chrome: `FakeDriver` servește paginile mock-ului (`mock_olx.MockOlx`).
+
+Implementează subsetul din API-ul Selenium folosit de scraper: `get`, `find_element(s)` (CSS prin soupsieve și
+XPath-urile de forma `//tag[contains(., '...') or ...]`), elemente cu `text`/`get_attribute`/`click`,
+`execute_script` pentru scripturile cunoscute ale scraper-ului (click, cardurile listei, `window.open`), ferestre,
+cookie-uri și CDP (ignorat). Click-ul pe „Arată telefonul” pune linkurile `tel:` direct în DOM, ca JS-ul paginii.
+
+`FaultConfig` injectează defectele pe care le tratează căile de recuperare ale scraper-ului:
+- sesiune moartă: după o încărcare, driverul moare la una din următoarele comenzi (`InvalidSessionIdException`
+  de atunci încolo, ca un Chrome căzut), până e recreat;
+- timeout de încărcare (`TimeoutException` la `get`);
+- pagină blocată (403 „Access Denied”);
+- selectori lipsă: un element cheie al paginii de anunț dispare (layout schimbat).
+`FakeSite` ține evidența: defecte injectate și latența de recuperare (de la moartea sesiunii până la prima pagină
+încărcată de un driver nou al aceluiași rol). Conectarea la scraper: `scraper_olx.DRIVER_FACTORY = site.new_driver`.
+"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+from mock_olx import BLOCKED_HTML, EMPTY_LIST_HTML, HOME_HTML, MockOlx
+
+FAKE_BASE_URL = "https://fake.olx.test"
+
+# elementele paginii de anunț care pot „dispărea” (selectori lipsă)
+MISSING_SELECTORS = (
+    "[data-testid='ad-price-container']",
+    "[data-testid='ad_description']",
+    "[data-testid='user-profile-user-name']",
+    "[data-testid='phones-container']",
+)
+_BLOCK_TAGS = {"div", "p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "section", "article", "nav", "br", "tr"}
+_XPATH_RE = re.compile(r"^//(\*|[a-z][a-z0-9]*)((?:\[.+?\])*)$", re.S)
+_PRED_RE = re.compile(r"\[(.+?)\](?=\[|$)", re.S)
+_TERM_RE = re.compile(r"^(?:contains\(\s*(\.|text\(\)|@[\w-]+)\s*,\s*'([^']*)'\s*\)|self::([a-z][a-z0-9]*))$")
+
+
+@dataclass
+class FaultConfig:
+    session_death_rate: float = 0.0  # per încărcare de pagină
+    timeout_rate: float = 0.0
+    block_rate: float = 0.0  # doar paginile de listă și de anunț, ca în mock_olx
+    missing_selector_rate: float = 0.0  # doar paginile de anunț
+    max_commands_to_death: int = 8  # moartea vine la 0..N comenzi după încărcare (în captură, la reveal...)
+    seed: int = 11
+
+
+@dataclass
+class FaultStats:
+    session_deaths: int = 0
+    timeouts: int = 0
+    blocked: int = 0
+    missing_selectors: int = 0
+    drivers: int = 0
+    page_loads: int = 0
+    recovery_s: List[float] = field(default_factory=list)
+    unrecovered: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        rec = sorted(self.recovery_s)
+        return {
+            "session_deaths": self.session_deaths,
+            "timeouts": self.timeouts,
+            "blocked": self.blocked,
+            "missing_selectors": self.missing_selectors,
+            "drivers": self.drivers,
+            "page_loads": self.page_loads,
+            "recoveries": len(rec),
+            "unrecovered": self.unrecovered,
+            "recovery_p50_ms": round(rec[len(rec) // 2] * 1000, 2) if rec else None,
+            "recovery_max_ms": round(rec[-1] * 1000, 2) if rec else None,
+        }
+
+
+@dataclass
+class _Page:
+    url: str
+    soup: Any
+    status: int = 200
+    ad_num: Optional[int] = None
+
+
+class FakeSite:
+    """Catalogul mock-ului servit în proces + injectorul de defecte; fabrica de drivere pentru scraper."""
+
+    def __init__(self, mock: MockOlx, faults: Optional[FaultConfig] = None, base_url: str = FAKE_BASE_URL):
+        self.mock = mock
+        self.faults = faults or FaultConfig()
+        self.base_url = base_url.rstrip("/")
+        self.stats = FaultStats()
+        self._rnd = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._deaths: Dict[str, List[float]] = {}  # rol -> momentele morților încă nerecuperate
+
+    def new_driver(self, ep: Any = None, ua: Optional[dict] = None, role: str = "", **_: Any) -> "FakeDriver":
+        """Semnătura lui `make_driver` (proxy-ul e ignorat)."""
+        with self._lock:
+            self.stats.drivers += 1
+        return FakeDriver(self, role=role, ua=(ua or {}).get("ua", ""))
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rnd.random() < rate
+
+    def randint(self, lo: int, hi: int) -> int:
+        with self._lock:
+            return self._rnd.randint(lo, hi)
+
+    def died(self, role: str) -> None:
+        with self._lock:
+            self.stats.session_deaths += 1
+            self._deaths.setdefault(role, []).append(time.perf_counter())
+
+    def loaded(self, driver: "FakeDriver") -> None:
+        """Pagină încărcată: morțile anterioare pornirii acestui driver (același rol) s-au recuperat."""
+        with self._lock:
+            self.stats.page_loads += 1
+            pending = self._deaths.get(driver.role)
+            if not pending:
+                return
+            now = time.perf_counter()
+            done = [t for t in pending if t < driver.created]
+            self.stats.recovery_s.extend(now - t for t in done)
+            self._deaths[driver.role] = [t for t in pending if t >= driver.created]
+
+    def finish(self) -> Dict[str, Any]:
+        with self._lock:
+            self.stats.unrecovered = sum(len(v) for v in self._deaths.values())
+            return self.stats.as_dict()
+
+    def load(self, url: str, ua: str) -> Tuple[int, str, Optional[int], List[str]]:
+        """(status, html, ID-ul numeric al anunțului sau None, selectori de scos) pentru `url`."""
+        parts = urlsplit(url)
+        path, f = parts.path or "/", self.faults
+        self.mock.stats.add(requests=1)
+        if path in ("/", "/cont/"):
+            return 200, HOME_HTML, None, []
+        if self.roll(f.block_rate):
+            with self._lock:
+                self.stats.blocked += 1
+            self.mock.stats.add(blocked=1)
+            return 403, BLOCKED_HTML, None, []
+        m = re.search(r"-(ID[0-9A-Za-z]+)\.html$", path)
+        if path.startswith("/d/oferta/") and m:
+            ad = self.mock.by_code.get(m.group(1))
+            if ad is None:
+                return 404, "<html><body>Anunțul nu mai este disponibil</body></html>", None, []
+            missing: List[str] = []
+            if self.roll(f.missing_selector_rate):
+                with self._lock:
+                    self.stats.missing_selectors += 1
+                    missing.append(self._rnd.choice(MISSING_SELECTORS))
+            mobile = "Mobile" in ua
+            self.mock.stats.add(ad_pages=1, ad_pages_mobile=int(mobile))
+            return 200, self.mock.render_ad(ad, mobile=mobile), ad.num_id, missing
+        page = int((parse_qs(parts.query).get("page") or ["1"])[0] or 1)
+        body = self.mock.render_list(page)
+        self.mock.stats.add(list_pages=1)
+        return 200, body if body is not None else EMPTY_LIST_HTML, None, []
+
+
+def _visible_text(node: Any) -> str:
+    """Aproximarea lui `innerText`: fără script/style, blocurile pe linii separate."""
+    parts: List[str] = []
+
+    def walk(n: Any) -> None:
+        for child in getattr(n, "children", ()):
+            name = getattr(child, "name", None)
+            if name is None:
+                parts.append(str(child))
+            elif name not in ("script", "style", "head", "template"):
+                if name in _BLOCK_TAGS:
+                    parts.append("\n")
+                walk(child)
+                if name in _BLOCK_TAGS:
+                    parts.append("\n")
+
+    walk(node)
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _xpath_filter(xpath: str):
+    """XPath-urile scraper-ului (`//tag[pred][pred]`, pred = termeni `contains(...)` / `self::x` legați cu `or`)."""
+    m = _XPATH_RE.match(xpath.strip())
+    if not m:
+        raise InvalidSelectorException(f"XPath nesuportat de FakeDriver: {xpath}")
+    tag = None if m.group(1) == "*" else m.group(1)
+    preds: List[List[Tuple[str, str, str]]] = []
+    for pred in _PRED_RE.findall(m.group(2)):
+        terms = []
+        for term in re.split(r"\s+or\s+", pred.strip()):
+            t = _TERM_RE.match(term.strip())
+            if not t:
+                raise InvalidSelectorException(f"XPath nesuportat de FakeDriver: {xpath}")
+            terms.append((t.group(1) or "", t.group(2) or "", t.group(3) or ""))
+        preds.append(terms)
+
+    def term_ok(el: Any, arg: str, needle: str, self_tag: str) -> bool:
+        if self_tag:
+            return el.name == self_tag
+        if arg == ".":
+            return needle in el.get_text()
+        if arg == "text()":
+            return any(needle in s for s in el.find_all(string=True, recursive=False))
+        val = el.get(arg[1:])
+        return needle in (" ".join(val) if isinstance(val, list) else (val or ""))
+
+    def match(el: Any) -> bool:
+        return all(any(term_ok(el, *term) for term in terms) for terms in preds)
+
+    return tag, match
+
+
+def _find(root: Any, by: str, value: str) -> List[Any]:
+    if by == By.XPATH:
+        tag, match = _xpath_filter(value)
+        return [el for el in root.find_all(tag or True) if match(el)]
+    if by == By.TAG_NAME:
+        return root.find_all(value)
+    if by == By.ID:
+        return root.select(f"#{value}")
+    if by == By.CLASS_NAME:
+        return root.select(f".{value}")
+    if by == By.NAME:
+        return root.select(f"[name='{value}']")
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        exact = by == By.LINK_TEXT
+        return [a for a in root.find_all("a") if (a.get_text().strip() == value if exact else value in a.get_text())]
+    return root.select(value)
+
+
+class FakeElement:
+    def __init__(self, driver: "FakeDriver", node: Any):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        self._driver._cmd()
+        return _visible_text(self._node)
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.name
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._driver._cmd()
+        val = self._node.get(name)
+        if isinstance(val, list):
+            val = " ".join(val)
+        if name == "href" and val is not None:
+            return urljoin(self._driver.current_url, val)  # ca în browser: proprietatea `href`, absolută
+        return val
+
+    def is_displayed(self) -> bool:
+        self._driver._cmd()
+        return True
+
+    def is_enabled(self) -> bool:
+        self._driver._cmd()
+        return True
+
+    def click(self) -> None:
+        self._driver._cmd()
+        self._driver._clicked(self._node)
+
+    def send_keys(self, *value: Any) -> None:
+        self._driver._cmd()
+
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> "FakeElement":
+        els = self.find_elements(by, value)
+        if not els:
+            raise NoSuchElementException(f"no such element: {value}")
+        return els[0]
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List["FakeElement"]:
+        self._driver._cmd()
+        return [FakeElement(self._driver, n) for n in _find(self._node, by, value)]
+
+
+class _SwitchTo:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver._cmd()
+        if handle not in self._driver._windows:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self._driver._current = handle
+
+
+class FakeDriver:
+    def __init__(self, site: FakeSite, role: str = "", ua: str = ""):
+        self.site = site
+        self.role = role
+        self.ua = ua
+        self.created = time.perf_counter()
+        self._dead = False
+        self._dies_in: Optional[int] = None
+        self._cookies: List[Dict[str, Any]] = []
+        self._n = 0
+        self._windows: Dict[str, _Page] = {}
+        self._current = self._new_window()
+        self.switch_to = _SwitchTo(self)
+        self.profile = None
+
+    # ---- defecte ----
+    def _cmd(self) -> None:
+        if self._dies_in is not None:
+            self._dies_in -= 1
+            if self._dies_in < 0:
+                self._dies_in, self._dead = None, True
+                self.site.died(self.role)
+        if self._dead:
+            raise InvalidSessionIdException("invalid session id")
+
+    # ---- pagini / ferestre ----
+    def _new_window(self, page: Optional[_Page] = None) -> str:
+        self._n += 1
+        handle = f"W{self._n}"
+        self._windows[handle] = page or _Page("about:blank", BeautifulSoup("<html><body></body></html>", "html.parser"))
+        return handle
+
+    @property
+    def _page(self) -> _Page:
+        try:
+            return self._windows[self._current]
+        except KeyError:
+            raise NoSuchWindowException("no such window: target window already closed") from None
+
+    def _load(self, url: str) -> _Page:
+        f = self.site.faults
+        if self._dies_in is None and self.site.roll(f.session_death_rate):
+            self._dies_in = self.site.randint(0, f.max_commands_to_death)
+            self._cmd()
+        if self.site.roll(f.timeout_rate):
+            with self.site._lock:
+                self.site.stats.timeouts += 1
+            raise TimeoutException("timeout: Timed out receiving message from renderer: 60.000")
+        status, html, ad_num, missing = self.site.load(url, self.ua)
+        soup = BeautifulSoup(html, "html.parser")
+        for sel in missing:
+            for el in soup.select(sel):
+                el.decompose()
+        self.site.loaded(self)
+        return _Page(url, soup, status, ad_num)
+
+    def get(self, url: str) -> None:
+        self._cmd()
+        url = urljoin(self.site.base_url + "/", url)
+        self._windows[self._current] = _Page(url, self._page.soup)  # URL-ul se schimbă chiar dacă încărcarea cade
+        self._windows[self._current] = self._load(url)
+
+    @property
+    def current_url(self) -> str:
+        self._cmd()
+        return self._page.url
+
+    @property
+    def page_source(self) -> str:
+        self._cmd()
+        return str(self._page.soup)
+
+    @property
+    def title(self) -> str:
+        self._cmd()
+        t = self._page.soup.title
+        return t.get_text() if t is not None else ""
+
+    @property
+    def window_handles(self) -> List[str]:
+        self._cmd()
+        return list(self._windows)
+
+    @property
+    def current_window_handle(self) -> str:
+        self._cmd()
+        self._page
+        return self._current
+
+    def close(self) -> None:
+        self._cmd()
+        self._windows.pop(self._current, None)
+
+    def quit(self) -> None:
+        self._dead, self._dies_in = True, None
+        self._windows.clear()
+
+    # ---- DOM ----
+    def find_element(self, by: str = By.CSS_SELECTOR, value: str = "") -> FakeElement:
+        els = self.find_elements(by, value)
+        if not els:
+            raise NoSuchElementException(f"no such element: {value}")
+        return els[0]
+
+    def find_elements(self, by: str = By.CSS_SELECTOR, value: str = "") -> List[FakeElement]:
+        self._cmd()
+        return [FakeElement(self, n) for n in _find(self._page.soup, by, value)]
+
+    def _clicked(self, node: Any) -> None:
+        """Efectul JS al click-ului: butonul de telefon => linkuri `tel:` din „API”, ca PHONE_JS din mock."""
+        if node.get("data-testid") != "show-phone-number":
+            return
+        page = self._page
+        ad = self.site.mock.by_num.get(page.ad_num or -1)
+        self.site.mock.stats.add(phone_api=1)
+        box = node.parent
+        for tel in ad.phones if ad else []:
+            a = page.soup.new_tag("a", href=f"tel:{tel}")
+            a.string = tel
+            box.append(a)
+        node.decompose()
+
+    def _cards(self) -> List[Dict[str, Any]]:
+        out = []
+        for c in self._page.soup.select("[data-cy='l-card']"):
+            a = c.select_one("a[href*='/d/oferta/']")
+            t = c.select_one("[data-cy='ad-card-title']")
+            t = (t.select_one("h4, h6") or t) if t is not None else None
+            price = c.select_one("[data-testid='ad-price']")
+            loc = c.select_one("[data-testid='location-date']")
+            out.append(
+                {
+                    "href": urljoin(self._page.url, a.get("href")) if a is not None else "",
+                    "title": _visible_text(t) if t is not None else "",
+                    "price": _visible_text(price) if price is not None else "",
+                    "location_date": _visible_text(loc) if loc is not None else "",
+                    "promoted": c.select_one("[data-testid='adCard-featured']") is not None,
+                }
+            )
+        return out
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """Scripturile scraper-ului după ce fac (click, carduri, ferestre); restul (scroll, stealth...) => None."""
+        self._cmd()
+        if "arguments[0].click()" in script and args:
+            args[0].click()
+        elif "l-card" in script and ".map(" in script:
+            return self._cards()
+        elif script.lstrip().startswith("window.open(arguments[0]") and args:
+            self._new_window(self._load(urljoin(self._page.url, str(args[0]))))
+        elif "document.readyState" in script:
+            return "complete"
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._cmd()
+        return {}
+
+    def get_log(self, log_type: str) -> List[Dict[str, Any]]:
+        self._cmd()
+        # ca un Chrome pornit fără goog:loggingPrefs: NetworkPhoneSniffer cade pe DOM
+        raise WebDriverException(f"invalid argument: log type '{log_type}' not found")
+
+    # ---- cookie-uri / setări ----
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        self._cmd()
+        return list(self._cookies)
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        self._cmd()
+        self._cookies.append(dict(cookie))
+
+    def delete_all_cookies(self) -> None:
+        self._cmd()
+        self._cookies.clear()
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        self._cmd()
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self._cmd()
+
+    def implicitly_wait(self, seconds: float) -> None:
+        self._cmd()
+
+    def get_screenshot_as_png(self) -> bytes:
+        self._cmd()
+        return b""
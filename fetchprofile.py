@@ -0,0 +1,97 @@
+"""Profilul de fetch al paginilor de anunț: desktop (ca înainte) sau mobil întâi (`AD_PROFILE=mobile`).
+
+Varianta m.olx.ro a anunțului are același conținut (titlu, preț, descriere, vânzător, ID, buton de telefon)
+cu mai puțin markup și mai puține resurse, deci mai puțini bytes prin proxy și o încărcare mai scurtă.
+Driverul ad pornește cu emulare mobilă (UA + viewport + touch din `MOBILE_UA_POOL`). Dacă pe pagina mobilă
+lipsesc câmpuri cheie, anunțul se reîncarcă în varianta desktop în același tab: emularea se comută prin CDP
+(`emulation_commands`) și se pune la loc după.
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+DESKTOP = "desktop"
+MOBILE = "mobile"
+PROFILES = (DESKTOP, MOBILE)
+
+# câmpurile brute din `capture_ad_snapshot` fără de care pagina mobilă nu e folosibilă => fallback desktop
+KEY_FIELDS = ("titlu", "pret", "descriere")
+
+MOBILE_UA_POOL = [
+    {
+        "ua": "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Mobile Safari/537.36",
+        "lang": "ro-RO,ro;q=0.9,en-US;q=0.8,en;q=0.7",
+        "platform": "Linux armv81",
+        "device": {"width": 412, "height": 915, "pixelRatio": 2.625},
+    },
+    {
+        "ua": "Mozilla/5.0 (Linux; Android 13; SM-S911B) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/123.0.0.0 Mobile Safari/537.36",
+        "lang": "ro-RO,ro;q=0.9,en-US;q=0.8,en;q=0.7",
+        "platform": "Linux armv8l",
+        "device": {"width": 360, "height": 780, "pixelRatio": 3.0},
+    },
+]
+
+# viewport-ul desktop pus la loc prin CDP pentru fallback (driverul a pornit în emulare mobilă)
+DESKTOP_DEVICE = {"width": 1366, "height": 900, "pixelRatio": 1.0}
+
+_DESKTOP_HOST_RE = re.compile(r"^https?://(?:www\.)?olx\.ro(?=/|$)", re.I)
+_MOBILE_HOST_RE = re.compile(r"^https?://m\.olx\.ro(?=/|$)", re.I)
+
+
+def normalize_profile(name: Optional[str]) -> str:
+    """`AD_PROFILE` => "desktop" / "mobile"; orice altceva (gol, greșit) => desktop."""
+    name = (name or "").strip().lower()
+    return name if name in PROFILES else DESKTOP
+
+
+def mobile_url(href: str) -> str:
+    """www.olx.ro / olx.ro => m.olx.ro; alte host-uri (ex. mock-ul local) rămân neschimbate."""
+    return _DESKTOP_HOST_RE.sub("https://m.olx.ro", href)
+
+
+def desktop_url(href: str) -> str:
+    return _MOBILE_HOST_RE.sub("https://www.olx.ro", href)
+
+
+def ad_url(href: str, profile: str) -> str:
+    """URL-ul încărcat primul pentru anunț în profilul dat."""
+    return mobile_url(href) if profile == MOBILE else href
+
+
+def missing_fields(snap: Mapping[str, Any], fields: Tuple[str, ...] = KEY_FIELDS) -> List[str]:
+    """Câmpurile cheie goale din snapshot-ul brut (înainte de parsare)."""
+    return [f for f in fields if not str(snap.get(f) or "").strip()]
+
+
+def mobile_emulation(ua: Mapping[str, Any]) -> Dict[str, Any]:
+    """Opțiunea ChromeDriver `mobileEmulation` pentru o intrare din `MOBILE_UA_POOL`."""
+    dev = ua["device"]
+    return {
+        "deviceMetrics": {"width": dev["width"], "height": dev["height"], "pixelRatio": dev["pixelRatio"]},
+        "userAgent": ua["ua"],
+    }
+
+
+def emulation_commands(ua: Mapping[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Comenzile CDP care comută tab-ul curent pe `ua` (cu `device` = mobil, fără = desktop)."""
+    mobile = "device" in ua
+    dev = ua.get("device") or DESKTOP_DEVICE
+    return [
+        (
+            "Emulation.setUserAgentOverride",
+            {"userAgent": ua["ua"], "acceptLanguage": ua.get("lang", ""), "platform": ua.get("platform", "")},
+        ),
+        (
+            "Emulation.setDeviceMetricsOverride",
+            {
+                "width": dev["width"],
+                "height": dev["height"],
+                "deviceScaleFactor": dev["pixelRatio"],
+                "mobile": mobile,
+            },
+        ),
+        ("Emulation.setTouchEmulationEnabled", {"enabled": mobile}),
+    ]
@@ -0,0 +1,129 @@
+"""Frontiera de anunțuri: coadă cu priorități în loc de ordinea din pagina de listă.
+
+Scorul combină prospețimea (data postării/reactualizării de pe card), dacă vânzătorul e deja cunoscut,
+dacă avem deja telefonul lui și prioritatea seed-ului (ordinea din urls.txt). O rulare oprită devreme
+(buget de timp, ban, `MAX_PAGES_PER_SEED`) a vizitat astfel cele mai valoroase anunțuri întâi.
+"""
+
+import heapq
+import itertools
+import re
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from cardstate import CardMeta
+from parsing import strip_diacritics
+
+WEIGHTS: Dict[str, float] = {
+    "fresh": 4.0,  # 4 pentru azi, 2 pentru ieri, ~0.5 la o săptămână
+    "unknown_age": 0.5,  # card fără dată lizibilă
+    "refreshed": 0.5,
+    "promoted": 0.5,
+    "new_seller": 1.5,
+    "no_phone_cached": 1.0,
+    "seed": 1.0,  # 1 pentru primul seed, 1/2 pentru al doilea, ...
+}
+
+MONTHS = {
+    "ianuarie": 1,
+    "februarie": 2,
+    "martie": 3,
+    "aprilie": 4,
+    "mai": 5,
+    "iunie": 6,
+    "iulie": 7,
+    "august": 8,
+    "septembrie": 9,
+    "octombrie": 10,
+    "noiembrie": 11,
+    "decembrie": 12,
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+RE_CARD_DATE = re.compile(r"(\d{1,2})\s+([a-z]+)\s+(\d{4})")
+
+
+def card_age_days(date_text: str, today: Optional[date] = None) -> Optional[int]:
+    """Vechimea în zile a datei de pe card („Azi la 10:15”, „Ieri la ...”, „12 octombrie 2026”); None = ilizibilă."""
+    t = strip_diacritics((date_text or "").lower())
+    if not t:
+        return None
+    if "azi" in t or "today" in t:
+        return 0
+    if "ieri" in t or "yesterday" in t:
+        return 1
+    m = RE_CARD_DATE.search(t)
+    if not m or m.group(2) not in MONTHS:
+        return None
+    try:
+        d = date(int(m.group(3)), MONTHS[m.group(2)], int(m.group(1)))
+    except ValueError:
+        return None
+    return max(0, ((today or date.today()) - d).days)
+
+
+def score_ad(
+    card: Optional[CardMeta],
+    seed_idx: int,
+    seller_known: bool = False,
+    phone_cached: bool = False,
+    today: Optional[date] = None,
+) -> float:
+    w = WEIGHTS
+    s = w["seed"] / (1 + seed_idx)
+    s += 0.0 if seller_known else w["new_seller"]
+    s += 0.0 if phone_cached else w["no_phone_cached"]
+    if card is None:
+        return s + w["unknown_age"]
+    age = card_age_days(card.date, today)
+    s += w["unknown_age"] if age is None else w["fresh"] / (1 + age)
+    if card.refreshed:
+        s += w["refreshed"]
+    if card.promoted:
+        s += w["promoted"]
+    return s
+
+
+class AdFrontier:
+    """Max-heap de (scor, txt, url), fără duplicate; la scor egal se păstrează ordinea inserării.
+
+    Thread-safe: workerii de listă (câte unul per seed/pagină) împart aceeași frontieră.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._urls: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, txt: str, url: str, score: float) -> bool:
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            heapq.heappush(self._heap, (-score, next(self._seq), txt, url))
+            return True
+
+    def pop(self) -> Tuple[str, str, float]:
+        with self._lock:
+            neg, _, txt, url = heapq.heappop(self._heap)
+            self._urls.discard(url)
+            return txt, url, -neg
+
+    def snapshot(self) -> List[List[object]]:
+        """Conținutul în ordinea priorității, serializabil în checkpoint ca `[txt, url, scor]`."""
+        with self._lock:
+            return [[txt, url, round(-neg, 4)] for neg, _, txt, url in sorted(self._heap)]
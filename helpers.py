@@ -1,4 +1,5 @@
 ﻿import re
+import unicodedata
 from typing import Tuple
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
@@ -60,3 +61,10 @@ def normalize_url(href: str) -> str:
         return urlunsplit((s.scheme, s.netloc, s.path, urlencode(qs, doseq=True), ""))
     except Exception:
         return href
+
+
+def normalize_text(text: str) -> str:
+    """Litere mici, fără diacritice, doar cifre/litere separate de un spațiu (chei de comparație/căutare)."""
+    text = unicodedata.normalize("NFD", (text or "").lower())
+    text = "".join(c for c in text if unicodedata.category(c) != "Mn")
+    return re.sub(r"[^0-9a-z]+", " ", text).strip()
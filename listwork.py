@@ -0,0 +1,152 @@
+"""Paginile de listat, partajate de workerii de listă care rulează în paralel (câte un Chrome fiecare).
+
+Unitatea de lucru e (seed, pagină). Workerii iau pe rând pagina cu cel mai mic număr, la egalitate seed-ul
+cu cel mai mic index: toate seed-urile își listează pagina 1, apoi pagina 2, ... deci un seed lent sau foarte
+mare nu le blochează pe celelalte. Paginile unui seed se adaugă pe măsură ce se descoperă (pagina următoare
+după o pagină cu anunțuri) sau toate odată, când pagina 1 arată câte rezultate are seed-ul.
+`snapshot()` = paginile încă nelistate (inclusiv cele în lucru), per seed, pentru checkpoint.
+"""
+
+import heapq
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def page_count(total: Optional[int], page_size: int, max_pages: Optional[int] = None) -> Optional[int]:
+    """Numărul de pagini de listă din „Am găsit N rezultate” și mărimea observată a paginii 1.
+
+    None = nu se poate calcula (total sau pagină necunoscute) => paginare secvențială.
+    """
+    if not total or page_size <= 0:
+        return None
+    n = max(1, math.ceil(total / page_size))
+    return min(n, max_pages) if max_pages else n
+
+
+def next_list_pages(
+    page_idx: int,
+    total: Optional[int],
+    size: int,
+    fan: Optional[Tuple[int, int]] = None,
+    max_pages: Optional[int] = None,
+    cap: int = 25,
+    fanout: bool = True,
+) -> Tuple[List[int], Optional[Tuple[int, int]]]:
+    """Paginile de programat după ce `page_idx` a avut anunțuri: (pagini, fan-out al seed-ului).
+
+    Pagina 1 cu total cunoscut => toate paginile deodată, iar `fan` = (pagini, mărimea paginii 1) se ține
+    minte pentru restul seed-ului. După fan-out se continuă secvențial doar dacă ultima pagină calculată e
+    plină (totalul a fost subestimat); fără total, paginare secvențială ca înainte.
+    """
+    if page_idx == 1 and fanout:
+        n = page_count(total, size, min(max_pages or cap, cap))
+        if n is not None:
+            return list(range(2, n + 1)), (n, size)
+    if fan is not None and (page_idx < fan[0] or size < fan[1] or page_idx >= cap):
+        return [], fan
+    if max_pages is not None and page_idx >= max_pages:
+        return [], fan
+    return [page_idx + 1], fan
+
+
+class RateLimiter:
+    """Cel mult `per_min` porniri pe minut, împărțite de toți workerii (intervale egale, fără rafale)."""
+
+    def __init__(self, per_min: float, clock: Callable[[], float] = time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_min if per_min and per_min > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """Blochează până la următorul slot; întoarce cât s-a așteptat."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        delay = start - now
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class ListingPlan:
+    def __init__(self, pending: Optional[Dict[int, Iterable[int]]] = None):
+        self._cv = threading.Condition()
+        self._heap: List[Tuple[int, int]] = []
+        self._todo: Dict[int, Set[int]] = {}
+        self._inflight: Dict[int, Set[int]] = {}
+        self._closed = False
+        for seed_idx, pages in (pending or {}).items():
+            self.add(seed_idx, pages)
+
+    def add(self, seed_idx: int, pages: Iterable[int]) -> int:
+        """Programează pagini ale unui seed (ignoră duplicatele); întoarce câte pagini noi s-au adăugat."""
+        n = 0
+        with self._cv:
+            todo = self._todo.setdefault(seed_idx, set())
+            busy = self._inflight.get(seed_idx, set())
+            for page in pages:
+                if page in todo or page in busy:
+                    continue
+                todo.add(page)
+                heapq.heappush(self._heap, (page, seed_idx))
+                n += 1
+            if n:
+                self._cv.notify_all()
+        return n
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """(seed_idx, pagină) de listat; așteaptă cât alte pagini în lucru pot aduce pagini noi.
+
+        None = nu mai e nimic de listat (sau `close()`); cu `timeout`, și la expirare.
+        """
+        with self._cv:
+            while True:
+                if self._closed:
+                    return None
+                if self._heap:
+                    page, seed_idx = heapq.heappop(self._heap)
+                    self._todo[seed_idx].discard(page)
+                    self._inflight.setdefault(seed_idx, set()).add(page)
+                    return seed_idx, page
+                if not any(self._inflight.values()):
+                    return None
+                if not self._cv.wait(timeout) and timeout is not None:
+                    return None
+
+    def done(self, seed_idx: int, page: int, next_pages: Iterable[int] = ()) -> bool:
+        """Pagina e listată; `next_pages` = pagini descoperite din ea. True dacă seed-ul s-a terminat."""
+        self.add(seed_idx, next_pages)
+        with self._cv:
+            self._inflight.get(seed_idx, set()).discard(page)
+            finished = not self._todo.get(seed_idx) and not self._inflight.get(seed_idx)
+            if finished:
+                self._todo.pop(seed_idx, None)
+                self._inflight.pop(seed_idx, None)
+            self._cv.notify_all()
+            return finished
+
+    def close(self) -> None:
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+
+    def snapshot(self) -> Dict[str, List[int]]:
+        """{seed_idx: pagini nelistate}, cu cheile ca text (JSON); seed-urile terminate lipsesc."""
+        with self._cv:
+            out: Dict[str, List[int]] = {}
+            for seed_idx in sorted(set(self._todo) | set(self._inflight)):
+                pages = self._todo.get(seed_idx, set()) | self._inflight.get(seed_idx, set())
+                if pages:
+                    out[str(seed_idx)] = sorted(pages)
+            return out
+
+    @staticmethod
+    def from_snapshot(data: Optional[Dict[str, Iterable[int]]]) -> Dict[int, List[int]]:
+        return {int(k): [int(p) for p in v] for k, v in (data or {}).items()}
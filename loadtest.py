@@ -0,0 +1,270 @@
+"""Load test end-to-end fără rețea: `scraper_olx.main()` rulat contra serverului local `mock_olx`.
+
+Raportează anunțuri/minut, latența pe etape (din histograma `olx_stage_duration_seconds`) și cum au fost
+tratate erorile injectate (500/403): rânduri goale, duplicate, telefoane găsite vs. așteptate.
+Cu `--compare-profiles`, același crawl rulează o dată pe profil de anunț (`AD_PROFILE` desktop / mobile) și
+raportul compară secunde și bytes pe anunț.
+
+Rulează (Chrome + chromedriver local, fără acces la olx.ro):
+  python loadtest.py --ads 300 --latency 50 250 --fail-rate 0.03 --block-rate 0.02 --json loadtest_report.json
+  python loadtest.py --ads 100 --compare-profiles --mobile-missing-rate 0.1
+"""
+
+import csv
+import glob
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from mock_olx import MockConfig, MockOlx
+
+
+def _stage_latency(histogram, before: Optional[Dict[Any, Any]] = None) -> Dict[str, Dict[str, float]]:
+    """Count/medie pe etapă; cu `before` (totals() de la începutul rulării), doar ce s-a adăugat de atunci."""
+    out: Dict[str, Dict[str, float]] = {}
+    for key, (count, total) in histogram.totals().items():
+        count0, total0 = (before or {}).get(key, (0, 0.0))
+        count, total = count - count0, total - total0
+        if count <= 0:
+            continue
+        stage = dict(key).get("stage", "?")
+        out[stage] = {"count": count, "avg_s": round(total / count, 4) if count else 0.0, "total_s": round(total, 3)}
+    return out
+
+
+def _audit_outputs(mock: MockOlx, prefix: str) -> Dict[str, Any]:
+    """Compară CSV-urile produse cu catalogul mock-ului: duplicate, rânduri goale, telefoane lipsă."""
+    rows = []
+    for path in glob.glob(f"{prefix}_*.csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows.extend(csv.DictReader(f))
+    if not rows and os.path.exists(f"{prefix}.ads.sqlite"):
+        # OUTPUT_MODE=normalized: fără CSV, auditul se face pe view-ul plat al store-ului
+        from outputstore import AdStore
+
+        store = AdStore(f"{prefix}.ads.sqlite")
+        rows = store.flat_rows()
+        store.close()
+    urls = [r.get("url", "") for r in rows]
+    pairs = [(r.get("telefon", ""), r.get("url", "")) for r in rows]
+    visited = set(urls)
+    phones_by_url: Dict[str, set] = {}
+    for tel, url in pairs:
+        phones_by_url.setdefault(url, set()).add(tel)
+    expected_phones = found_phones = 0
+    for url in visited:
+        m = re.search(r"-(ID[0-9A-Za-z]+)\.html", url)
+        ad = mock.by_code.get(m.group(1)) if m else None
+        if ad is None:
+            continue
+        expected_phones += len(ad.phones)
+        found_phones += len(phones_by_url[url] & set(ad.phones))
+    return {
+        "rows": len(rows),
+        "ads": len(visited),
+        "duplicate_rows": len(pairs) - len(set(pairs)),
+        "empty_rows": sum(1 for r in rows if not (r.get("titlu") or r.get("id_anunt"))),
+        "phones_expected": expected_phones,
+        "phones_found": found_phones,
+        "catalog_ads": len(mock.ads),
+    }
+
+
+def run_loadtest(
+    cfg: MockConfig,
+    workdir: str = "_loadtest",
+    max_pages: Optional[int] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Pornește mock-ul, rulează main() într-un director de lucru izolat și întoarce raportul."""
+    mock = MockOlx(cfg)
+    base = mock.start()
+    cwd = os.getcwd()
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    os.environ.setdefault("LOG_DIR", "logs")
+
+    import scraper_olx as so
+
+    conf = {
+        "OLX_BASE_URL": base,
+        "URLS_FILE": "urls.txt",
+        "PROXIES_FILE": "proxies.loadtest.json",
+        "SECRETS_FILE": "secrets.loadtest.env",
+        "OUTPUT_PREFIX": "loadtest",
+        "CHECKPOINT_FILE": "loadtest.checkpoint.json",
+        "CARD_STATE_FILE": "loadtest.cards.sqlite",
+        "AD_STORE_FILE": "loadtest.ads.sqlite",
+        "REPOST_FILE": "loadtest.reposts.sqlite",
+        "MAX_PAGES_PER_SEED": max_pages,
+        "JITTER": (0.0, 0.0),
+        "BACKOFF_BASE": 0.05,
+    }
+    conf.update(overrides or {})
+    saved = {k: getattr(so, k) for k in conf if hasattr(so, k)}
+    try:
+        for k, v in conf.items():
+            setattr(so, k, v)
+        with open("urls.txt", "w", encoding="utf-8") as f:
+            f.write(f"{base}/oferte/\n")
+        # fiecare load test pornește „la rece”: fără istoric de CSV și fără stare de carduri
+        for old in glob.glob("loadtest_*.csv") + glob.glob("loadtest.*.sqlite"):
+            os.remove(old)
+
+        # metricile din proces sunt cumulative: raportul ia doar diferența față de începutul rulării
+        stages0 = so.M_STAGE_SECONDS.totals()
+        cache0 = so.CACHE_STATS["ad"].bytes_transferred
+        profiles0 = dict(so.AD_PROFILE_COUNTS)
+        t0 = time.time()
+        stats = so.main() or {}
+        elapsed = time.time() - t0
+        audit = _audit_outputs(mock, "loadtest")
+        stages = _stage_latency(so.M_STAGE_SECONDS, stages0)
+        server = mock.stats.as_dict()
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "ads_per_minute": round(audit["ads"] * 60.0 / elapsed, 2) if elapsed else 0.0,
+            "stats": stats,
+            "stages": stages,
+            "server": server,
+            "outputs": audit,
+            "fetch": fetch_summary(
+                so.AD_PROFILE,
+                stages,
+                server,
+                so.CACHE_STATS["ad"].bytes_transferred - cache0,
+                {k: v - profiles0.get(k, 0) for k, v in so.AD_PROFILE_COUNTS.items() if v - profiles0.get(k, 0)},
+            ),
+            "mock": {
+                "ads": cfg.n_ads,
+                "page_size": cfg.page_size,
+                "latency_ms": list(cfg.latency_ms),
+                "fail_rate": cfg.fail_rate,
+                "block_rate": cfg.block_rate,
+            },
+        }
+    finally:
+        for k, v in saved.items():
+            setattr(so, k, v)
+        os.chdir(cwd)
+        mock.stop()
+
+
+def fetch_summary(
+    profile: str,
+    stages: Dict[str, Dict[str, float]],
+    server: Dict[str, int],
+    browser_bytes: int = 0,
+    pages: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Cost pe anunț al profilului: secunde (etapa `ad_page`) și bytes.
+
+    `browser_bytes` = transferSize-ul văzut de Chrome (documentul + resursele + XHR-ul de telefon, inclusiv
+    pagina desktop a fallback-urilor); fără Resource Timing, doar HTML-ul servit de mock.
+    """
+    ad = stages.get("ad_page") or {}
+    served = server.get("ad_pages", 0)
+    html_bytes = server.get("ad_bytes", 0)
+    return {
+        "profile": profile,
+        "ads": int(ad.get("count", 0)),
+        "s_per_ad": ad.get("avg_s", 0.0),
+        "ad_requests": served,
+        "mobile_requests": server.get("ad_pages_mobile", 0),
+        "html_bytes_per_ad": round(html_bytes / served) if served else 0,
+        "bytes_per_ad": round((browser_bytes or html_bytes) / ad["count"]) if ad.get("count") else 0,
+        "pages": dict(pages or {}),
+    }
+
+
+def compare_profiles(
+    cfg: MockConfig,
+    workdir: str = "_loadtest",
+    max_pages: Optional[int] = None,
+    profiles: Sequence[str] = ("desktop", "mobile"),
+    overrides: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Același mock (același catalog) și același crawl, o rulare pe profil de anunț."""
+    reports = []
+    for profile in profiles:
+        conf = dict(overrides or {}, AD_PROFILE=profile)
+        reports.append(run_loadtest(cfg, workdir=os.path.join(workdir, profile), max_pages=max_pages, overrides=conf))
+    return reports
+
+
+def format_profile_comparison(reports: Sequence[Dict[str, Any]]) -> str:
+    lines = [f"{'profil':<8} {'anunțuri':>8} {'s/anunț':>8} {'bytes/anunț':>12} {'html/cerere':>12}  pagini"]
+    base = reports[0]["fetch"] if reports else None
+    for rep in reports:
+        f = rep["fetch"]
+        pages = ", ".join(f"{k}={v}" for k, v in sorted(f["pages"].items())) or "-"
+        line = (
+            f"{f['profile']:<8} {f['ads']:>8} {f['s_per_ad']:>8.3f} {f['bytes_per_ad']:>12} "
+            f"{f['html_bytes_per_ad']:>12}  {pages}"
+        )
+        if base is not None and f is not base and base["bytes_per_ad"] and base["s_per_ad"]:
+            line += (
+                f"  (bytes {100.0 * (f['bytes_per_ad'] / base['bytes_per_ad'] - 1):+.0f}%, "
+                f"timp {100.0 * (f['s_per_ad'] / base['s_per_ad'] - 1):+.0f}% față de {base['profile']})"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_report(rep: Dict[str, Any]) -> str:
+    lines = [
+        f"durata: {rep['elapsed_s']}s | anunțuri/minut: {rep['ads_per_minute']}",
+        "etape (count / medie):",
+    ]
+    for stage, st in sorted(rep["stages"].items()):
+        lines.append(f"  {stage:<15} {st['count']:>6} / {st['avg_s']:.3f}s")
+    srv, out = rep["server"], rep["outputs"]
+    lines += [
+        f"server: cereri={srv['requests']} list={srv['list_pages']} ad={srv['ad_pages']} "
+        f"phone_api={srv['phone_api']} 500={srv['failed']} 403={srv['blocked']} bytes={srv['bytes_sent']}",
+        f"output: anunțuri={out['ads']}/{out['catalog_ads']} rânduri={out['rows']} goale={out['empty_rows']} "
+        f"duplicate={out['duplicate_rows']} telefoane={out['phones_found']}/{out['phones_expected']}",
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Load test end-to-end contra unui OLX local")
+    ap.add_argument("--ads", type=int, default=200)
+    ap.add_argument("--page-size", type=int, default=40)
+    ap.add_argument("--latency", type=int, nargs=2, default=(30, 120), metavar=("MIN_MS", "MAX_MS"))
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    ap.add_argument("--block-rate", type=float, default=0.0)
+    ap.add_argument("--phone-rate", type=float, default=0.8)
+    ap.add_argument("--mobile-missing-rate", type=float, default=0.0, help="anunțuri fără descriere pe mobil")
+    ap.add_argument("--compare-profiles", action="store_true", help="rulează desktop vs. mobile (AD_PROFILE)")
+    ap.add_argument("--max-pages", type=int, default=None)
+    ap.add_argument("--workdir", default="_loadtest")
+    ap.add_argument("--json", default=None, help="scrie raportul complet și ca JSON")
+    args = ap.parse_args()
+
+    mock_cfg = MockConfig(
+        n_ads=args.ads,
+        page_size=args.page_size,
+        latency_ms=tuple(args.latency),
+        fail_rate=args.fail_rate,
+        block_rate=args.block_rate,
+        phone_rate=args.phone_rate,
+        mobile_missing_rate=args.mobile_missing_rate,
+    )
+    if args.compare_profiles:
+        result: Any = compare_profiles(mock_cfg, workdir=args.workdir, max_pages=args.max_pages)
+        for report in result:
+            print(f"--- AD_PROFILE={report['fetch']['profile']}")
+            print(format_report(report))
+        print(format_profile_comparison(result))
+    else:
+        result = run_loadtest(mock_cfg, workdir=args.workdir, max_pages=args.max_pages)
+        print(format_report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,279 @@
+"""Metrici live pentru crawl-uri lungi: registry minimal + endpoint HTTP local (Prometheus/OpenMetrics text)."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+PROM_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float]]:  # pragma: no cover - suprascris
+        return []
+
+
+class Counter(_Metric):
+    """Contor monoton; expus ca `<name>_total`."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, v in items:
+            yield f"{self.name}_total", key, v
+
+
+class Gauge(_Metric):
+    """Valoare instantanee; poate fi setată direct sau calculată la scrape printr-o funcție."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+        self._funcs: Dict[LabelKey, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def set_function(self, fn: Callable[[], float], **labels: str) -> None:
+        with self._lock:
+            self._funcs[_label_key(labels)] = fn
+
+    def value(self, **labels: str) -> float:
+        key = _label_key(labels)
+        if key in self._funcs:
+            return float(self._funcs[key]())
+        return self._values.get(key, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+            funcs = list(self._funcs.items())
+        for key, v in items:
+            yield self.name, key, v
+        for key, fn in funcs:
+            try:
+                yield self.name, key, float(fn())
+            except Exception:
+                continue
+
+
+class Histogram(_Metric):
+    """Histogramă cumulativă (buckets + _sum + _count) per set de label-uri."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._data: Dict[LabelKey, List[float]] = {}  # [count per bucket..., sum, count]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            row = self._data.get(key)
+            if row is None:
+                row = [0.0] * (len(self.buckets) + 2)
+                self._data[key] = row
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def totals(self) -> Dict[LabelKey, Tuple[int, float]]:
+        """(count, sum) per set de label-uri – pentru rapoarte fără parsarea textului expus."""
+        with self._lock:
+            return {k: (int(v[-1]), v[-2]) for k, v in self._data.items()}
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._data.items()]
+        for key, row in items:
+            for i, b in enumerate(self.buckets):
+                yield f"{self.name}_bucket", key + (("le", _fmt_value(b)),), row[i]
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), row[-1]
+            yield f"{self.name}_sum", key, row[-2]
+            yield f"{self.name}_count", key, row[-1]
+
+
+class RateWindow:
+    """Evenimente pe minut pe o fereastră glisantă (ex. anunțuri/minut în ultimele 5 minute)."""
+
+    def __init__(self, window_s: float = 300.0):
+        self.window_s = window_s
+        self._events: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._t0 = time.time()
+
+    def mark(self, n: int = 1) -> None:
+        now = time.time()
+        with self._lock:
+            for _ in range(n):
+                self._events.append(now)
+            self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._events and now - self._events[0] > self.window_s:
+            self._events.popleft()
+
+    def per_minute(self) -> float:
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            n = len(self._events)
+        span = min(self.window_s, max(now - self._t0, 1.0))
+        return n * 60.0 / span
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._stats_sources: List[Tuple[str, Callable[[], Dict[str, float]]]] = []
+        self._lock = threading.Lock()
+
+    def _full(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kw):
+        full = self._full(name)
+        with self._lock:
+            m = self._metrics.get(full)
+            if m is None:
+                m = cls(full, help_text, **kw)
+                self._metrics[full] = m
+            return m
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def expose_stats(self, source: Callable[[], Dict[str, float]], help_prefix: str = "run stat") -> None:
+        """Expune un dict de contoare (ex. `stats` din main) ca metrici `<ns>_<cheie>_total`, citit la scrape."""
+        with self._lock:
+            self._stats_sources = [s for s in self._stats_sources if s[0] != help_prefix]
+            self._stats_sources.append((help_prefix, source))
+
+    def render(self, openmetrics: bool = False) -> str:
+        out: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            sources = list(self._stats_sources)
+        for m in metrics:
+            type_name = m.name if (openmetrics or m.kind != "counter") else f"{m.name}_total"
+            out.append(f"# HELP {type_name} {m.help}")
+            out.append(f"# TYPE {type_name} {m.kind}")
+            for sname, key, v in m.samples():
+                out.append(f"{sname}{_fmt_labels(key)} {_fmt_value(v)}")
+        for help_prefix, source in sources:
+            try:
+                data = dict(source())
+            except Exception:
+                continue
+            for k, v in data.items():
+                if not isinstance(v, (int, float)):
+                    continue
+                base = self._full(k[: -len("_total")] if k.endswith("_total") else k)
+                type_name = base if openmetrics else f"{base}_total"
+                out.append(f"# HELP {type_name} {help_prefix} '{k}'")
+                out.append(f"# TYPE {type_name} counter")
+                out.append(f"{base}_total {_fmt_value(v)}")
+        if openmetrics:
+            out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self):  # noqa: N802 - API http.server
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        om = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+        body = self.registry.render(openmetrics=om).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if om else PROM_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # liniștit: nu poluăm logul de rulare
+        return
+
+
+def start_metrics_server(registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Pornește serverul /metrics într-un thread daemon; oprire cu `server.shutdown()`."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    t = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    t.start()
+    return server
@@ -0,0 +1,495 @@
+"""Server local care imită OLX (pagini de listă + anunțuri) pentru teste de performanță fără rețea.
+
+Șabloanele sunt construite din snapshot-urile reale din `_debug/*/page.html`: pagina de anunț păstrează
+markup-ul și CSS-ul inline (fără scripturi/resurse externe), cu titlul, prețul, descrierea, JSON-LD-ul și
+butonul `show-phone-number` înlocuite per anunț; cardurile de listă pornesc de la un `[data-cy='l-card']`
+din același snapshot. Butonul de telefon face `fetch` la `/api/v1/offers/<id>/limited-phones/` și inserează
+linkuri `tel:`, ca pe site.
+
+Cererile cu UA mobil („Mobile” în User-Agent) primesc varianta m.olx.ro a anunțului: același conținut pe
+șablonul minimal (fără CSS-ul paginii desktop); `mobile_missing_rate` din anunțuri n-au descrierea pe mobil,
+ca să se vadă fallback-ul pe desktop al profilului `AD_PROFILE=mobile`.
+
+Rulează:
+  python mock_olx.py --port 8765 --ads 500 --latency 50 200 --fail-rate 0.02 --block-rate 0.01
+"""
+
+import glob
+import html as html_lib
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+CITIES = ["Cluj-Napoca", "Bucuresti", "Timisoara", "Iasi", "Brasov", "Constanta", "Oradea", "Sibiu"]
+MODELS = ["Adria Coral", "Hymer B-Class", "Knaus Sun Ti", "Dethleffs Trend", "Burstner Lyseo", "Fiat Ducato"]
+MONTHS = ["ianuarie", "februarie", "martie", "aprilie", "mai", "iunie", "iulie", "august"]
+
+MINIMAL_AD_TEMPLATE = """<!DOCTYPE html><html lang="ro"><head><meta charset="utf-8"><title>{{TITLU}}</title>
+{{JSONLD}}</head><body>
+<div data-cy="offer_title" data-testid="offer_title"><h4>{{TITLU}}</h4></div>
+<div data-testid="ad-price-container"><h3>{{PRET}}</h3></div>
+<p data-testid="user-type">{{PERSOANA}}</p>
+<a data-testid="user-profile-link" href="/oferte/user/{{USER_ID}}/">
+<h4 data-testid="user-profile-user-name">{{VANZATOR}}</h4></a>
+<div data-testid="location-text">{{LOCALITATE}}</div>
+{{PHONE_BOX}}
+<div data-cy="ad_description" data-testid="ad_description"><h3>Descriere</h3><div>{{DESCRIERE}}</div></div>
+<div data-testid="ad-footer-bar-section"><span>ID: {{ID}}</span> <span>Vizualizari: {{VIZ}}</span></div>
+{{PHONE_JS}}</body></html>"""
+
+MINIMAL_CARD_TEMPLATE = """<div data-cy="l-card" data-testid="l-card" id="{{ID}}">{{PROMOTED}}<a href="{{HREF}}">
+<h6 data-cy="ad-card-title">{{TITLU}}</h6></a><p data-testid="ad-price">{{PRET}}</p>
+<p data-testid="location-date">{{LOCALITATE}} - {{DATA}}</p></div>"""
+
+LIST_TEMPLATE = """<!DOCTYPE html><html lang="ro"><head><meta charset="utf-8"><title>Autorulote - OLX mock</title>
+{{STYLE}}</head><body><a data-testid="user-profile-link" href="/cont/">Contul meu</a>
+<div data-testid="total-count">Am găsit {{TOTAL}} rezultate</div>
+<div data-testid="listing-grid">{{CARDS}}</div>
+{{PAGINATION}}</body></html>"""
+
+EMPTY_LIST_HTML = """<!DOCTYPE html><html lang="ro"><head><meta charset="utf-8"></head><body>
+<a data-testid="user-profile-link" href="/cont/">Contul meu</a><p>Nu am găsit anunțuri</p></body></html>"""
+
+HOME_HTML = """<!DOCTYPE html><html lang="ro"><head><meta charset="utf-8"><title>OLX mock</title></head><body>
+<a data-testid="user-profile-link" href="/cont/">Contul meu</a>
+<h4 data-testid="user-profile-user-name">mock-user</h4></body></html>"""
+
+BLOCKED_HTML = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>Access Denied</title></head>
+<body><h1>Access Denied</h1><p>You don't have permission to access this server.</p></body></html>"""
+
+PHONE_BOX = (
+    '<div data-testid="phones-container"><button data-testid="show-phone-number" type="button">'
+    "Arată telefonul</button></div>"
+)
+
+PHONE_JS = """<script>
+document.addEventListener('click', function (ev) {
+  var btn = ev.target.closest("[data-testid='show-phone-number']");
+  if (!btn) return;
+  setTimeout(function () {
+    fetch('/api/v1/offers/{{NUM_ID}}/limited-phones/').then(function (r) { return r.json(); }).then(function (j) {
+      var box = btn.parentNode;
+      (j.data.phones || []).forEach(function (p) {
+        var a = document.createElement('a'); a.href = 'tel:' + p; a.textContent = p; box.appendChild(a);
+      });
+      btn.remove();
+    });
+  }, {{PHONE_DELAY}});
+});
+</script>"""
+
+
+@dataclass
+class MockConfig:
+    n_ads: int = 200
+    page_size: int = 40
+    latency_ms: Tuple[int, int] = (30, 120)
+    fail_rate: float = 0.0  # răspunsuri 500
+    block_rate: float = 0.0  # pagini "Access Denied" (403)
+    phone_rate: float = 0.8  # anunțuri care au telefon în spatele butonului
+    phone_delay_ms: int = 300
+    mobile_missing_rate: float = 0.0  # anunțuri fără descriere în varianta mobilă
+    seed: int = 7
+    snapshot_dir: str = "_debug"
+
+
+@dataclass
+class MockAd:
+    idx: int
+    num_id: int
+    code: str
+    title: str
+    price: str
+    city: str
+    date: str
+    user_id: str
+    seller: str
+    persoana: str
+    description: str
+    views: int
+    phones: List[str]
+    promoted: bool
+
+    @property
+    def path(self) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", self.title.lower()).strip("-")
+        return f"/d/oferta/{slug}-{self.code}.html"
+
+
+def _b36(n: int) -> str:
+    chars = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = ""
+    while True:
+        n, r = divmod(n, len(chars))
+        out = chars[r] + out
+        if n == 0:
+            return out
+
+
+def build_catalog(cfg: MockConfig) -> List[MockAd]:
+    ads: List[MockAd] = []
+    n_sellers = max(1, cfg.n_ads // 3)
+    for i in range(cfg.n_ads):
+        rnd = random.Random(cfg.seed * 100003 + i)
+        seller = rnd.randrange(n_sellers)
+        model = rnd.choice(MODELS)
+        year = rnd.randint(2008, 2024)
+        eur = rnd.random() < 0.7
+        amount = rnd.randrange(40, 400) * (1 if eur else 5)
+        phones = [f"07{rnd.randrange(10**8):08d}"] if rnd.random() < cfg.phone_rate else []
+        day = rnd.randint(1, 28)
+        date = (
+            "Azi la %02d:%02d" % (rnd.randint(6, 22), rnd.randint(0, 59))
+            if i % 5 == 0
+            else (f"{day} {rnd.choice(MONTHS)} 2025")
+        )
+        ads.append(
+            MockAd(
+                idx=i,
+                num_id=300000000 + i,
+                code=f"ID{_b36(7_000_000 + i)}",
+                title=f"Inchiriez autorulota {model} {year} #{i}",
+                price=f"{amount:,} €".replace(",", " ") if eur else f"{amount:,} lei".replace(",", " "),
+                city=CITIES[seller % len(CITIES)],
+                date=date,
+                user_id=f"u{10000 + seller}",
+                seller=f"Vanzator {seller}",
+                persoana="Firmă" if seller % 4 == 0 else "Persoană fizică",
+                description=(
+                    f"Autorulota {model} din {year}, {rnd.randint(2, 7)} locuri, bucatarie complet echipata. "
+                    f"Garantie (RON): {rnd.randrange(1, 10) * 500}. " * rnd.randint(3, 12)
+                ),
+                views=rnd.randint(10, 20000),
+                phones=phones,
+                promoted=rnd.random() < 0.1,
+            )
+        )
+    return ads
+
+
+def _strip_external(soup) -> None:
+    """Scoate tot ce ar încerca rețeaua sau ar rula JS-ul OLX: scripturi, link-uri, iframe-uri, imagini externe."""
+    for tag in soup.find_all("script"):
+        if tag.get("type") != "application/ld+json":
+            tag.decompose()
+    for tag in soup.find_all(["link", "iframe", "noscript", "source"]):
+        tag.decompose()
+    for tag in soup.find_all("img"):
+        for attr in ("src", "srcset"):
+            if tag.get(attr):
+                del tag[attr]
+
+
+def _set_text(soup, selector: str, placeholder: str) -> bool:
+    el = soup.select_one(selector)
+    if el is None:
+        return False
+    el.clear()
+    el.append(placeholder)
+    return True
+
+
+def build_templates(snapshot_dir: str) -> Tuple[str, str, str]:
+    """(ad, card, style) construite din snapshot-urile `_debug/*/page.html`; fallback la șabloane minimale."""
+    ad_tpl, card_tpl, style = MINIMAL_AD_TEMPLATE, MINIMAL_CARD_TEMPLATE, ""
+    have_ad = have_card = False
+    for path in sorted(glob.glob(os.path.join(snapshot_dir, "*", "page.html"))):
+        if have_ad and have_card:
+            break
+        try:
+            from bs4 import BeautifulSoup
+
+            with open(path, "r", encoding="utf-8") as f:
+                soup = BeautifulSoup(f.read(), "html.parser")
+            card = soup.select_one("[data-cy='l-card']")
+            if not have_card and card is not None:
+                card_tpl, have_card = _card_template(card), True
+            if not have_ad and soup.body is not None and soup.select_one("[data-testid='offer_title'] h4"):
+                ad_tpl, style, have_ad = _ad_template(soup), "".join(str(s) for s in soup.find_all("style")), True
+        except Exception:
+            continue
+    return ad_tpl, card_tpl, style
+
+
+def _ad_template(soup) -> str:
+    from bs4 import BeautifulSoup
+
+    _strip_external(soup)
+    for s in soup.find_all("script", {"type": "application/ld+json"}):
+        s.decompose()
+    _set_text(soup, "[data-testid='offer_title'] h4", "{{TITLU}}")
+    _set_text(soup, "[data-testid='ad-price-container'] h3", "{{PRET}}")
+    _set_text(soup, "[data-testid='ad_description'] > div", "{{DESCRIERE}}")
+    _set_text(soup, "[data-testid='user-profile-user-name']", "{{VANZATOR}}")
+    footer = soup.select_one("[data-testid='ad-footer-bar-section'] span")
+    if footer is not None:
+        footer.clear()
+        footer.append("ID: {{ID}} Vizualizari: {{VIZ}}")
+    phones = soup.select_one("[data-testid='phones-container']")
+    if phones is not None:
+        phones.replace_with("{{PHONE_BOX}}")
+    else:
+        soup.body.append("{{PHONE_BOX}}")
+    name = soup.select_one("[data-testid='user-profile-user-name']")
+    extra = "<p data-testid='user-type'>{{PERSOANA}}</p><div data-testid='location-text'>{{LOCALITATE}}</div>"
+    (name.parent if name is not None else soup.body).append(BeautifulSoup(extra, "html.parser"))
+    (soup.head or soup.body).append("{{JSONLD}}")
+    soup.body.append("{{PHONE_JS}}")
+    return str(soup)
+
+
+def _card_template(card) -> str:
+    from bs4 import BeautifulSoup
+
+    card = BeautifulSoup(str(card), "html.parser").select_one("[data-cy='l-card']")
+    _strip_external(card)
+    card["id"] = "{{ID}}"
+    for a in card.select("a[href]"):
+        a["href"] = "{{HREF}}"
+    for img in card.select("img[alt]"):
+        img["alt"] = "{{TITLU}}"
+    title = card.select("a[href]")[-1]
+    title.clear()
+    title.append("{{TITLU}}")
+    if title.parent is not None:
+        title.parent["data-cy"] = "ad-card-title"
+    _set_text(card, "[data-testid='ad-price']", "{{PRET}}")
+    ps = [p for p in card.select("p") if p.get("data-cy") != "ad-card-title"]
+    if ps:
+        ps[0]["data-testid"] = "location-date"
+        ps[0].clear()
+        ps[0].append("{{LOCALITATE}} - {{DATA}}")
+        for p in ps[1:]:
+            p.decompose()
+    for badge in card.select("[data-testid='card-delivery-badge']"):
+        badge.replace_with("{{PROMOTED}}")
+    out = str(card)
+    if "{{PROMOTED}}" not in out:
+        out = out.replace(">", ">{{PROMOTED}}", 1)
+    return out
+
+
+def _fill(tpl: str, values: Dict[str, str]) -> str:
+    for k, v in values.items():
+        tpl = tpl.replace("{{" + k + "}}", v)
+    return tpl
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    list_pages: int = 0
+    ad_pages: int = 0
+    ad_pages_mobile: int = 0
+    ad_bytes: int = 0
+    phone_api: int = 0
+    failed: int = 0
+    blocked: int = 0
+    bytes_sent: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **kw: int) -> None:
+        with self._lock:
+            for k, v in kw.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+
+
+class MockOlx:
+    def __init__(self, cfg: Optional[MockConfig] = None):
+        self.cfg = cfg or MockConfig()
+        self.ads = build_catalog(self.cfg)
+        self.by_code = {ad.code: ad for ad in self.ads}
+        self.by_num = {ad.num_id: ad for ad in self.ads}
+        self.ad_tpl, self.card_tpl, self.style = build_templates(self.cfg.snapshot_dir)
+        self.stats = MockStats()
+        self._rnd = random.Random(self.cfg.seed)
+        self._rnd_lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    # --- pagini ---
+    def render_list(self, page: int) -> Optional[str]:
+        size = self.cfg.page_size
+        chunk = self.ads[(page - 1) * size : page * size]
+        if not chunk:
+            return None
+        cards = "".join(
+            _fill(
+                self.card_tpl,
+                {
+                    "ID": str(ad.num_id),
+                    "HREF": self.base_url + ad.path + "?reason=extended_search",
+                    "TITLU": html_lib.escape(ad.title),
+                    "PRET": ad.price,
+                    "LOCALITATE": ad.city,
+                    "DATA": ad.date,
+                    "PROMOTED": '<div data-testid="adCard-featured">Promovat</div>' if ad.promoted else "",
+                },
+            )
+            for ad in chunk
+        )
+        pages = (len(self.ads) + size - 1) // size
+        nav = "".join(
+            f'<a data-testid="pagination-link-{n}" href="/oferte/?page={n}">{n}</a>' for n in range(1, pages + 1)
+        )
+        return _fill(
+            LIST_TEMPLATE,
+            {"STYLE": self.style, "TOTAL": str(len(self.ads)), "CARDS": cards, "PAGINATION": f"<nav>{nav}</nav>"},
+        )
+
+    def render_ad(self, ad: MockAd, mobile: bool = False) -> str:
+        jsonld = {
+            "@context": "https://schema.org",
+            "@type": "Product",
+            "name": ad.title,
+            "sku": str(ad.num_id),
+            "url": self.base_url + ad.path,
+            "offers": {"@type": "Offer", "price": ad.price, "seller": {"@id": f"/oferte/user/{ad.user_id}/"}},
+            "seller": {"@type": "Person", "@id": ad.user_id, "name": ad.seller},
+            "address": {"@type": "PostalAddress", "addressLocality": ad.city},
+        }
+        # aceeași alegere pentru un anunț la fiecare cerere (nu depinde de ordinea vizitelor)
+        tpl = MINIMAL_AD_TEMPLATE if mobile else self.ad_tpl
+        if mobile and random.Random(ad.num_id).random() < self.cfg.mobile_missing_rate:
+            tpl = re.sub(r'<div data-cy="ad_description".*?</div></div>\n', "", tpl, flags=re.S)
+        return _fill(
+            tpl,
+            {
+                "TITLU": html_lib.escape(ad.title),
+                "PRET": ad.price,
+                "DESCRIERE": html_lib.escape(ad.description),
+                "VANZATOR": ad.seller,
+                "PERSOANA": ad.persoana,
+                "LOCALITATE": ad.city,
+                "USER_ID": ad.user_id,
+                "ID": str(ad.num_id),
+                "VIZ": f"{ad.views:,}".replace(",", "."),
+                "JSONLD": f'<script type="application/ld+json">{json.dumps(jsonld, ensure_ascii=False)}</script>',
+                "PHONE_BOX": PHONE_BOX if ad.phones else "",
+                "PHONE_JS": _fill(PHONE_JS, {"NUM_ID": str(ad.num_id), "PHONE_DELAY": str(self.cfg.phone_delay_ms)}),
+            },
+        )
+
+    # --- server ---
+    @property
+    def base_url(self) -> str:
+        if self.server is None:
+            return ""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def roll(self) -> float:
+        with self._rnd_lock:
+            return self._rnd.random()
+
+    def start(self, port: int = 0, host: str = "127.0.0.1") -> str:
+        handler = type("MockOlxHandler", (_Handler,), {"mock": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="mock-olx", daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    mock: MockOlx
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: str, ctype: str = "text/html; charset=utf-8") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "max-age=60")
+        self.end_headers()
+        self.wfile.write(data)
+        self.mock.stats.add(bytes_sent=len(data))
+
+    def do_GET(self):  # noqa: N802 - API http.server
+        m, cfg = self.mock, self.mock.cfg
+        m.stats.add(requests=1)
+        lo, hi = cfg.latency_ms
+        time.sleep(random.uniform(lo, hi) / 1000.0)
+        parts = urlsplit(self.path)
+        path = parts.path
+
+        api = re.match(r"^/api/v1/offers/(\d+)/limited-phones/?$", path)
+        if api:
+            ad = m.by_num.get(int(api.group(1)))
+            m.stats.add(phone_api=1)
+            self._send(200, json.dumps({"data": {"phones": ad.phones if ad else []}}), "application/json")
+            return
+        if path in ("/", "/cont/", "/favicon.ico"):
+            self._send(200, HOME_HTML)
+            return
+        if m.roll() < cfg.fail_rate:
+            m.stats.add(failed=1)
+            self._send(500, "<html><body><h1>500 Internal Server Error</h1></body></html>")
+            return
+        if m.roll() < cfg.block_rate:
+            m.stats.add(blocked=1)
+            self._send(403, BLOCKED_HTML)
+            return
+        ad_m = re.search(r"-(ID[0-9A-Za-z]+)\.html$", path)
+        if path.startswith("/d/oferta/") and ad_m:
+            ad = m.by_code.get(ad_m.group(1))
+            if ad is None:
+                self._send(404, "<html><body>Anunțul nu mai este disponibil</body></html>")
+                return
+            mobile = "Mobile" in (self.headers.get("User-Agent") or "")
+            body = m.render_ad(ad, mobile=mobile)
+            m.stats.add(ad_pages=1, ad_pages_mobile=int(mobile), ad_bytes=len(body.encode("utf-8")))
+            self._send(200, body)
+            return
+        page = int((parse_qs(parts.query).get("page") or ["1"])[0] or 1)
+        m.stats.add(list_pages=1)
+        body = m.render_list(page)
+        self._send(200, body if body is not None else EMPTY_LIST_HTML)
+
+    def log_message(self, format, *args):
+        return
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Server OLX local pentru teste de performanță")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--ads", type=int, default=200)
+    ap.add_argument("--page-size", type=int, default=40)
+    ap.add_argument("--latency", type=int, nargs=2, default=(30, 120), metavar=("MIN_MS", "MAX_MS"))
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    ap.add_argument("--block-rate", type=float, default=0.0)
+    ap.add_argument("--phone-rate", type=float, default=0.8)
+    ap.add_argument("--mobile-missing-rate", type=float, default=0.0)
+    args = ap.parse_args()
+    mock = MockOlx(
+        MockConfig(
+            n_ads=args.ads,
+            page_size=args.page_size,
+            latency_ms=tuple(args.latency),
+            fail_rate=args.fail_rate,
+            block_rate=args.block_rate,
+            phone_rate=args.phone_rate,
+            mobile_missing_rate=args.mobile_missing_rate,
+        )
+    )
+    print(f"OLX mock pe {mock.start(args.port)}/oferte/  (Ctrl+C pentru oprire)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
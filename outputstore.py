@@ -0,0 +1,236 @@
+"""Output normalizat: un rând per anunț (`ads`) și un rând per telefon al anunțului (`phones`), în SQLite.
+
+Output-ul plat (CSV/JSONL) repetă tot rândul, inclusiv descrierea, pentru fiecare telefon, iar deduplicarea
+(telefon, url) se face abia la export. Aici anunțul e cheiat pe `id_anunt` (sau pe URL, cât timp ID-ul nu e
+cunoscut) și se actualizează între rulări (upsert): câmpurile goale ale unei vizite nu le șterg pe cele
+cunoscute, iar fiecare telefon își păstrează `first_seen`/`last_seen`. View-ul `ads_flat` reface rândurile
+plate (un rând per telefon, ca în CSV) pentru cine încă le vrea.
+Fișierul e `<prefix>.ads.sqlite`, comun tuturor rulărilor cu același prefix.
+"""
+
+import csv
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# câmpurile anunțului, în ordinea coloanelor din CSV-ul plat (fără `telefon` și `url`)
+AD_FIELDS = (
+    "titlu",
+    "pret",
+    "pret_valoare",
+    "pret_moneda",
+    "persoana",
+    "garantie",
+    "descriere",
+    "id_anunt",
+    "user_id",
+    "localitate",
+    "vizualizari",
+    "vanzator",
+)
+# etichete calculate după extracție (reposts.py), după `url` în CSV-ul plat
+TAG_FIELDS = ("repost_cluster",)
+FLAT_COLUMNS = ("telefon", *AD_FIELDS, "url", *TAG_FIELDS)
+STORE_FIELDS = (*AD_FIELDS, *TAG_FIELDS)
+
+# OUTPUT_MODE: flat = doar CSV/JSONL plat (ca înainte), normalized = doar acest store, both = amândouă
+OUTPUT_MODES = ("flat", "normalized", "both")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS ads (
+    ad_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    {", ".join(f"{f} TEXT NOT NULL DEFAULT ''" for f in STORE_FIELDS)},
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_run TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_ads_url ON ads(url);
+CREATE INDEX IF NOT EXISTS ix_ads_id ON ads(id_anunt);
+CREATE INDEX IF NOT EXISTS ix_ads_run ON ads(last_run);
+CREATE INDEX IF NOT EXISTS ix_ads_user ON ads(user_id);
+CREATE INDEX IF NOT EXISTS ix_ads_seen ON ads(last_seen);
+CREATE TABLE IF NOT EXISTS phones (
+    ad_key TEXT NOT NULL REFERENCES ads(ad_key) ON DELETE CASCADE,
+    telefon TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_run TEXT,
+    PRIMARY KEY (ad_key, telefon)
+);
+CREATE INDEX IF NOT EXISTS ix_phones_tel ON phones(telefon);
+"""
+# refăcut la fiecare deschidere, ca să urmeze coloanele adăugate prin MIGRATIONS
+VIEW = f"""
+DROP VIEW IF EXISTS ads_flat;
+CREATE VIEW ads_flat AS
+    SELECT COALESCE(p.telefon, '') AS telefon, {", ".join(f"a.{f}" for f in AD_FIELDS)}, a.url,
+        {", ".join(f"a.{f}" for f in TAG_FIELDS)}, a.last_run
+    FROM ads a LEFT JOIN phones p ON p.ad_key = a.ad_key;
+"""
+# coloane adăugate după prima versiune a tabelei `ads`
+MIGRATIONS = (("repost_cluster", "TEXT NOT NULL DEFAULT ''"),)
+
+
+def group_flat_rows(rows: Iterable[Dict[str, Any]]) -> List[Tuple[str, Dict[str, str], List[str]]]:
+    """Rânduri plate (unul per telefon) => (url, câmpurile anunțului, telefoane), în ordinea primei apariții."""
+    out: Dict[str, Tuple[Dict[str, str], List[str]]] = {}
+    for r in rows:
+        url = str(r.get("url") or "").strip()
+        if not url:
+            continue
+        fields, phones = out.setdefault(url, ({f: str(r.get(f) or "") for f in STORE_FIELDS}, []))
+        tel = str(r.get("telefon") or "").strip()
+        if tel and tel not in phones:
+            phones.append(tel)
+    return [(url, fields, phones) for url, (fields, phones) in out.items()]
+
+
+class AdStore:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # scris din thread-ul de crawl și citit de export; apelanții serializează accesul
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=60000")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(ads)")}
+        for name, decl in MIGRATIONS:
+            if name not in cols:
+                self._db.execute(f"ALTER TABLE ads ADD COLUMN {name} {decl}")
+        self._db.executescript(VIEW)
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    def _key(self, fields: Dict[str, str], url: str) -> str:
+        """Cheia anunțului: rândul existent după ID, apoi după URL; altfel ID-ul, sau URL-ul dacă lipsește."""
+        ad_id = (fields.get("id_anunt") or "").strip()
+        if ad_id:
+            row = self._db.execute("SELECT ad_key FROM ads WHERE id_anunt=? LIMIT 1", (ad_id,)).fetchone()
+            if row:
+                return row[0]
+        row = self._db.execute("SELECT ad_key FROM ads WHERE url=? LIMIT 1", (url,)).fetchone()
+        if row:
+            return row[0]
+        return ad_id or url
+
+    def _upsert(
+        self, url: str, fields: Dict[str, str], phones: List[str], run_id: Optional[str], now: float
+    ) -> Tuple[bool, int]:
+        vals = [str(fields.get(f) or "") for f in STORE_FIELDS]
+        key = self._key(fields, url)
+        new_ad = self._db.execute("SELECT 1 FROM ads WHERE ad_key=?", (key,)).fetchone() is None
+        self._db.execute(
+            f"INSERT INTO ads(ad_key, url, {', '.join(STORE_FIELDS)}, first_seen, last_seen, last_run) "
+            f"VALUES (?, ?, {', '.join('?' * len(STORE_FIELDS))}, ?, ?, ?) "
+            "ON CONFLICT(ad_key) DO UPDATE SET url=excluded.url, "
+            + ", ".join(f"{f}=COALESCE(NULLIF(excluded.{f}, ''), ads.{f})" for f in STORE_FIELDS)
+            + ", last_seen=excluded.last_seen, last_run=COALESCE(excluded.last_run, ads.last_run)",
+            (key, url, *vals, now, now, run_id),
+        )
+        known = {r[0] for r in self._db.execute("SELECT telefon FROM phones WHERE ad_key=?", (key,))}
+        self._db.executemany(
+            "INSERT INTO phones(ad_key, telefon, first_seen, last_seen, last_run) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(ad_key, telefon) DO UPDATE SET last_seen=excluded.last_seen, "
+            "last_run=COALESCE(excluded.last_run, phones.last_run)",
+            [(key, p, now, now, run_id) for p in phones],
+        )
+        return new_ad, sum(1 for p in phones if p not in known)
+
+    def upsert(
+        self,
+        url: str,
+        fields: Dict[str, str],
+        phones: Iterable[str],
+        run_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Tuple[bool, int]:
+        """Un anunț vizitat, într-o tranzacție; întoarce (anunț nou, câte telefoane noi)."""
+        return self.upsert_many([(url, fields, phones)], run_id, now)[0]
+
+    def upsert_many(
+        self,
+        ads: Iterable[Tuple[str, Dict[str, str], Iterable[str]]],
+        run_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> List[Tuple[bool, int]]:
+        """Mai multe anunțuri (url, câmpuri, telefoane) într-o singură tranzacție (un singur fsync)."""
+        now = time.time() if now is None else now
+        out = []
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            for url, fields, phones in ads:
+                phones = [p for p in dict.fromkeys(str(p).strip() for p in phones) if p]
+                out.append(self._upsert(url, fields, phones, run_id, now))
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return out
+
+    def upsert_rows(self, rows: Iterable[Dict[str, Any]], run_id: Optional[str] = None) -> Tuple[int, int]:
+        """Rânduri plate (ad_rows / coada distribuită / CSV-uri vechi) => (anunțuri noi, telefoane noi)."""
+        res = self.upsert_many(group_flat_rows(rows), run_id)
+        return sum(int(new_ad) for new_ad, _ in res), sum(n for _, n in res)
+
+    # ---- citire ----
+    def seen_urls(self) -> set:
+        return {r[0] for r in self._db.execute("SELECT url FROM ads")}
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "ads": int(self._db.execute("SELECT COUNT(*) FROM ads").fetchone()[0]),
+            "phones": int(self._db.execute("SELECT COUNT(*) FROM phones").fetchone()[0]),
+        }
+
+    def _select(self, sql: str, args: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        cur = self._db.execute(sql, args)
+        cols = [c[0] for c in cur.description]
+        return [dict(zip(cols, r)) for r in cur]
+
+    def ads(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        where, args = ("WHERE last_run=?", (run_id,)) if run_id else ("", ())
+        return self._select(
+            f"SELECT ad_key, url, {', '.join(STORE_FIELDS)}, first_seen, last_seen, last_run FROM ads {where} "
+            "ORDER BY first_seen, ad_key",
+            args,
+        )
+
+    def phones(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        where, args = ("WHERE p.last_run=?", (run_id,)) if run_id else ("", ())
+        return self._select(
+            "SELECT p.ad_key, a.id_anunt, p.telefon, p.first_seen, p.last_seen, p.last_run, a.url "
+            f"FROM phones p JOIN ads a ON a.ad_key = p.ad_key {where} ORDER BY p.ad_key, p.first_seen, p.telefon",
+            args,
+        )
+
+    def flat_rows(self, run_id: Optional[str] = None) -> List[Dict[str, str]]:
+        """View-ul denormalizat: un rând per (anunț, telefon), coloanele CSV-ului plat."""
+        where, args = ("WHERE last_run=?", (run_id,)) if run_id else ("", ())
+        return self._select(f"SELECT {', '.join(FLAT_COLUMNS)} FROM ads_flat {where} ORDER BY url, telefon", args)
+
+    def export_flat_csv(self, path: str, run_id: Optional[str] = None) -> int:
+        rows = self.flat_rows(run_id)
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            w = csv.DictWriter(f, fieldnames=list(FLAT_COLUMNS))
+            w.writeheader()
+            w.writerows(rows)
+        return len(rows)
+
+    def export_excel(self, path: str, run_id: Optional[str] = None, transform: Optional[Callable] = None) -> None:
+        """XLSX cu foile `anunturi` și `telefoane` (pandas importat doar aici, ca la exportul plat).
+
+        `transform(DataFrame) -> DataFrame` se aplică foii `anunturi` (ex. `postprocess.postprocess`).
+        """
+        import pandas as pd
+
+        with pd.ExcelWriter(path) as xw:
+            ads = pd.DataFrame(self.ads(run_id))
+            (transform(ads) if transform else ads).to_excel(xw, sheet_name="anunturi", index=False)
+            pd.DataFrame(self.phones(run_id)).to_excel(xw, sheet_name="telefoane", index=False)
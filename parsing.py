@@ -0,0 +1,277 @@
+"""Partea CPU a extracției unui anunț: regex-uri, JSON-LD/meta cu BeautifulSoup, fără Selenium.
+
+Driverul doar capturează un „snapshot” (texte din DOM + HTML + URL); `parse_snapshot` îl transformă în
+câmpurile finale și poate rula într-un `ProcessPoolExecutor` (`ParsePool`), ca browserul să treacă la
+anunțul următor cât timp Python parsează.
+"""
+
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+RE_ID = re.compile(r"\bID[:\s]+(\d+)", re.IGNORECASE)
+RE_VIEWS = re.compile(r"Vizualizări?:\s*([\d\.\s]+)", re.IGNORECASE)  # acceptă și 'Vizualizari'
+RE_GARANTIE = re.compile(
+    r"\bGarantie\b.*?[:\-]?\s*([\d\s\.]+(?:\s*(?:RON|Lei|EUR|€))?)",
+    re.IGNORECASE,
+)
+RE_PRICE = re.compile(
+    r"(\d+(?:[\.\s]\d{3})*(?:,\d+)?)[\s\u00A0]*(EUR|€|RON|Lei)",
+    re.IGNORECASE,
+)
+# „Am găsit 1.234 rezultate”, „Am găsit peste 1 000 de anunțuri”
+RE_TOTAL = re.compile(r"am g[aă]sit\s+(?:peste\s+)?(\d[\d.\s]*)", re.IGNORECASE)
+RE_PHONE = re.compile(
+    r"(?:\+?4?0|0)\d(?:[\s\.\-]?\d){8,}",
+    re.IGNORECASE,
+)
+
+
+def sanitize_text(s: str) -> str:
+    if not s:
+        return ""
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def strip_diacritics(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn")
+
+
+def parse_price(raw: str) -> Tuple[str, str]:
+    if not raw:
+        return "", ""
+    m = re.search(r"([\d\.\s]+)\s*(RON|Lei|LEI|EUR|€)?", raw, re.IGNORECASE)
+    if not m:
+        return "", ""
+    val = re.sub(r"[^\d]", "", m.group(1) or "").strip()
+    cur = (m.group(2) or "").upper().replace("LEI", "RON").replace("EURO", "EUR")
+    return val, cur or ""
+
+
+def parse_total_count(text: str) -> Optional[int]:
+    """Numărul de rezultate din textul paginii de listă; None dacă lipsește."""
+    m = RE_TOTAL.search(text or "")
+    if not m:
+        return None
+    digits = re.sub(r"\D", "", m.group(1))
+    return int(digits) if digits else None
+
+
+def extract_identifiers_from_html(html: str, page_url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    from bs4 import BeautifulSoup  # import lent; doar cine parsează HTML îl plătește
+
+    soup = BeautifulSoup(html, "html.parser")
+    ad_id = user_id = locality = None
+
+    # 1) JSON-LD
+    for tag in soup.find_all("script", {"type": "application/ld+json"}):
+        try:
+            data = json.loads(tag.string or tag.text or "")
+        except Exception:
+            continue
+        items = data if isinstance(data, list) else [data]
+        for obj in items:
+            if not isinstance(obj, dict):
+                continue
+            ad_id = ad_id or obj.get("sku")
+            ident = obj.get("identifier")
+            if not ad_id and isinstance(ident, dict):
+                ad_id = ident.get("value") or ident.get("@id") or ident.get("id")
+            if not ad_id and isinstance(ident, list):
+                for it in ident:
+                    if isinstance(it, dict):
+                        cand = it.get("value") or it.get("@id") or it.get("id")
+                        if isinstance(cand, str) and cand.strip():
+                            ad_id = cand
+                            break
+            if not ad_id:
+                for key in ("@id", "id", "url"):
+                    v = obj.get(key)
+                    if isinstance(v, str):
+                        m = re.search(r"(\d{5,})", v)
+                        if m:
+                            ad_id = m.group(1)
+                            break
+            for who in ("seller", "author", "publisher"):
+                w = obj.get(who)
+                if isinstance(w, dict):
+                    cand = w.get("@id") or w.get("id") or w.get("identifier")
+                    if isinstance(cand, dict):
+                        cand = cand.get("value") or cand.get("@id") or cand.get("id")
+                    if isinstance(cand, str):
+                        m = re.search(r"(\d{4,})", cand)
+                        user_id = m.group(1) if m else cand
+                elif isinstance(w, list):
+                    for ww in w:
+                        if isinstance(ww, dict):
+                            cand = ww.get("@id") or ww.get("id") or ww.get("identifier")
+                            if isinstance(cand, dict):
+                                cand = cand.get("value") or cand.get("@id") or cand.get("id")
+                            if isinstance(cand, str) and cand.strip():
+                                m = re.search(r"(\d{4,})", cand)
+                                user_id = m.group(1) if m else cand
+                                break
+                if user_id:
+                    break
+            addr = obj.get("address")
+            if isinstance(addr, dict):
+                locality = locality or addr.get("addressLocality") or addr.get("addressRegion")
+            elif isinstance(addr, str):
+                locality = locality or addr
+    # 2) meta/URL
+    if not ad_id:
+        for name in ("product:retailer_item_id", "al:android:url", "al:ios:url", "og:url", "twitter:url"):
+            tag = soup.find("meta", {"property": name}) or soup.find("meta", {"name": name})
+            if tag and tag.get("content"):
+                m = re.search(r"(\d{5,})", tag["content"]) or re.search(r"ID[\w-]+", tag["content"], re.I)
+                if m:
+                    ad_id = m.group(0)
+    if not ad_id:
+        m = re.search(r"(\d{5,})", page_url) or re.search(r"ID[\w-]+", page_url, re.I)
+        if m:
+            ad_id = m.group(0)
+    # user_id din profil
+    if not user_id:
+        a = soup.select_one("a[data-testid='user-profile-link'][href]")
+        if a:
+            href = a.get("href", "")
+            m = re.search(r"user(?:id)?=([\w-]+)", href, re.I)
+            if m:
+                user_id = m.group(1)
+            else:
+                segs = [s for s in href.split("/") if s]
+                if segs:
+                    user_id = segs[-1]
+    # locality DOM
+    if not locality:
+        cand = soup.select_one("[data-testid='location']") or soup.select_one("[data-testid='location-text']")
+        if cand:
+            locality = cand.get_text(strip=True)
+    if locality and "," in locality:
+        locality = locality.split(",")[0].strip()
+    return (ad_id or None), (user_id or None), (locality or None)
+
+
+FIELD_KEYS = (
+    "titlu",
+    "pret",
+    "pret_valoare",
+    "pret_moneda",
+    "persoana",
+    "garantie",
+    "descriere",
+    "id_anunt",
+    "user_id",
+    "localitate",
+    "vizualizari",
+    "vanzator",
+)
+EMPTY_FIELDS: Dict[str, str] = {k: "" for k in FIELD_KEYS}
+
+
+def _first_group(rx: "re.Pattern[str]", text: str) -> str:
+    m = rx.search(text)
+    return sanitize_text(m.group(1)) if m else ""
+
+
+def parse_snapshot(snap: Dict[str, str]) -> Dict[str, str]:
+    """Snapshot capturat de driver (titlu/pret/... brute, `body`, `html`, `url`) => câmpurile anunțului."""
+    if not snap:
+        return dict(EMPTY_FIELDS)
+    pret = snap.get("pret", "")
+    pv, pc = parse_price(pret)
+    norm = strip_diacritics(snap.get("body", ""))
+    ad_id, user_id, locality = extract_identifiers_from_html(snap.get("html", ""), snap.get("url", ""))
+    return {
+        "titlu": snap.get("titlu", ""),
+        "pret": pret,
+        "pret_valoare": pv,
+        "pret_moneda": pc,
+        "persoana": snap.get("persoana", ""),
+        "garantie": _first_group(RE_GARANTIE, norm),
+        "descriere": sanitize_text(snap.get("descriere", "")),
+        "id_anunt": ad_id or _first_group(RE_ID, norm) or "",
+        "user_id": user_id or "",
+        "localitate": locality or "",
+        "vizualizari": _first_group(RE_VIEWS, norm),
+        "vanzator": snap.get("vanzator", ""),
+    }
+
+
+def snapshot_from_html(html: str, url: str = "") -> Dict[str, str]:
+    """Snapshot echivalent cu cel al driverului, reconstruit dintr-un HTML salvat (ex. `_debug/*/page.html`)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html or "", "html.parser")
+
+    def first(*sels: str) -> str:
+        for sel in sels:
+            el = soup.select_one(sel)
+            if el is not None:
+                txt = sanitize_text(el.get_text(" "))
+                if txt:
+                    return txt
+        return ""
+
+    return {
+        "titlu": first("[data-cy='offer_title'] h1", "[data-cy='offer_title'] h4", "h1[data-cy='ad_title']"),
+        "pret": first("[data-testid='ad-price-container']"),
+        "persoana": first("[data-testid='user-type']"),
+        "vanzator": first("[data-testid='user-profile-user-name']", "[data-testid='user-profile-link']"),
+        "descriere": first("[data-testid='ad_description']", "[data-cy='ad_description']"),
+        "body": soup.body.get_text("\n") if soup.body is not None else "",
+        "html": html or "",
+        "url": url,
+    }
+
+
+def timed_parse(snap: Dict[str, str]) -> Tuple[Dict[str, str], float]:
+    t0 = time.perf_counter()
+    fields = parse_snapshot(snap)
+    return fields, time.perf_counter() - t0
+
+
+def default_parse_workers() -> int:
+    """`PARSE_WORKERS`: `auto` (= nr. de core-uri), `0` = parsare pe thread-ul driverului, sau un număr."""
+    raw = os.getenv("PARSE_WORKERS", "auto").strip().lower()
+    if raw in ("", "auto"):
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 0
+
+
+class ParsePool:
+    """Parsare în procese separate; cu `workers=0` rulează inline dar păstrează aceeași interfață (Future)."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = default_parse_workers() if workers is None else max(0, workers)
+        self._ex: Optional[ProcessPoolExecutor] = None
+        if self.workers > 0:
+            try:
+                self._ex = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, NotImplementedError):
+                self.workers, self._ex = 0, None
+
+    def submit(self, snap: Dict[str, str]) -> "Future[Tuple[Dict[str, str], float]]":
+        if self._ex is not None:
+            try:
+                return self._ex.submit(timed_parse, snap)
+            except RuntimeError:  # pool închis / stricat: continuăm inline
+                self._ex = None
+        fut: "Future[Tuple[Dict[str, str], float]]" = Future()
+        try:
+            fut.set_result(timed_parse(snap))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    def shutdown(self) -> None:
+        if self._ex is not None:
+            self._ex.shutdown(wait=True, cancel_futures=False)
+            self._ex = None
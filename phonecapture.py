@@ -0,0 +1,122 @@
+"""Telefonul din răspunsul XHR al API-ului OLX, citit prin CDP, nu din DOM după pauze fixe.
+
+Butonul „Arată telefonul” face `GET /api/v1/offers/<id>/limited-phones/`. Driverul ad pornește cu
+performance logging (`goog:loggingPrefs`), deci evenimentele CDP `Network.responseReceived` /
+`Network.loadingFinished` ajung în `driver.get_log("performance")`; corpul răspunsului se citește cu
+`Network.getResponseBody`. Reveal-ul se termină în momentul în care răspunsul e pe fir.
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from helpers import clean_phone
+
+PHONE_API_RE = re.compile(r"/api/v1/offers/(\d+)/limited-phones/?(?:\?|$)")
+
+# strategia care a produs numărul (metrică `phone_strategy` + câmp în log)
+NETWORK = "network"
+DOM = "dom"
+DOM_CLICK = "dom_click"
+MOBILE = "mobile"
+REPOST = "repost"  # repost confirmat al aceluiași vânzător: telefoanele anunțului original, fără reveal
+NONE = "none"
+
+# capabilitatea de pus pe Options ca `get_log("performance")` să conțină evenimentele Network
+PERF_LOGGING_PREFS = {"performance": "ALL"}
+
+
+def cdp_events(entries: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """`message.message` din intrările performance log-ului (JSON ca text); intrările stricate se sar."""
+    for entry in entries:
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if isinstance(msg, dict):
+            yield msg
+
+
+def phones_from_api_body(body: str) -> List[str]:
+    """`{"data": {"phones": [...]}}` => numere RO normalizate (07xxxxxxxx), fără duplicate."""
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return []
+    phones = ((data or {}).get("data") or {}).get("phones") if isinstance(data, dict) else None
+    out: List[str] = []
+    for p in phones or []:
+        ph = clean_phone(str(p))
+        if ph.startswith("07") and len(ph) == 10 and ph not in out:
+            out.append(ph)
+    return out
+
+
+class NetworkPhoneSniffer:
+    """Urmărește răspunsurile API-ului de telefon în performance log-ul driverului ad.
+
+    `reset()` înainte de click (aruncă evenimentele vechi), `wait()` după: lista de telefoane din răspuns
+    ([] = API-ul a răspuns fără numere / cu eroare), sau None dacă răspunsul n-a venit în `timeout`.
+    `available` devine False dacă driverul nu are performance logging (pornit fără capabilitate).
+    """
+
+    def __init__(self, driver: Any, poll_s: float = 0.05):
+        self.driver = driver
+        self.poll_s = poll_s
+        self.available = True
+        self._pending: Dict[str, str] = {}
+
+    def _events(self) -> List[Dict[str, Any]]:
+        if not self.available:
+            return []
+        try:
+            return list(cdp_events(self.driver.get_log("performance")))
+        except Exception:
+            self.available = False
+            return []
+
+    def reset(self) -> None:
+        self._events()
+        self._pending.clear()
+
+    def _body(self, request_id: str) -> Optional[str]:
+        try:
+            res = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            return None
+        return res.get("body") if isinstance(res, dict) else None
+
+    def poll(self) -> Optional[List[str]]:
+        """Un pas: None = încă nimic; altfel telefoanele din primul răspuns API terminat."""
+        for ev in self._events():
+            method, params = ev.get("method"), ev.get("params") or {}
+            rid = str(params.get("requestId", ""))
+            if method == "Network.responseReceived":
+                resp = params.get("response") or {}
+                if PHONE_API_RE.search(resp.get("url", "")):
+                    if int(resp.get("status") or 0) >= 400:
+                        return []
+                    self._pending[rid] = resp.get("url", "")
+            elif method in ("Network.loadingFinished", "Network.loadingFailed") and rid in self._pending:
+                self._pending.pop(rid)
+                body = self._body(rid) if method == "Network.loadingFinished" else None
+                return phones_from_api_body(body) if body else []
+        return None
+
+    def wait(self, timeout: float) -> Optional[List[str]]:
+        deadline = time.monotonic() + timeout
+        while self.available:
+            got = self.poll()
+            if got is not None:
+                return got
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_s)
+        # loadingFinished ratat (buffer golit între timp): încercăm direct corpul răspunsurilor văzute
+        for rid in list(self._pending):
+            body = self._body(rid)
+            if body:
+                self._pending.pop(rid, None)
+                return phones_from_api_body(body)
+        return None
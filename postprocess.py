@@ -0,0 +1,165 @@
+"""Post-procesarea output-ului unei rulări, pe coloane întregi (pandas/NumPy), nu rând cu rând.
+
+Câmpurile ies din `parse_snapshot` ca text: `pret_valoare` / `vizualizari` cu puncte și spații, `garantie`
+cu moneda în text, `persoana` ca text liber. `postprocess()` adaugă coloanele tipizate:
+`pret_num`, `garantie_num`, `garantie_moneda`, `vizualizari_num`, moneda normalizată (EUR/RON) și, cu un tabel
+local de curs (`rates.json`), `pret_eur`/`pret_ron`; `tip_vanzator` și `localitate` devin categorii.
+Celelalte coloane text rămân cum erau (consumatorii existenți ai CSV-ului nu se strică); doar `pret_moneda`
+se normalizează pe loc.
+Importă pandas: se încarcă doar la export (ca exportul XLSX), nu la pornirea crawl-ului.
+"""
+
+import functools
+import json
+import os
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# tabelul de curs: câte unități din fiecare monedă face 1 EUR, ex. {"EUR": 1, "RON": 4.97}
+RATES_FILE = "rates.json"
+
+CURRENCY_ALIASES = {"€": "EUR", "EUR": "EUR", "EURO": "EUR", "EURI": "EUR", "RON": "RON", "LEI": "RON", "LEU": "RON"}
+_CURRENCY_RE = r"(€|EURO?I?|RON|LEI|LEU)"
+
+SELLER_PRIVATE = "persoana_fizica"
+SELLER_BUSINESS = "firma"
+SELLER_UNKNOWN = "necunoscut"
+SELLER_TYPES = [SELLER_PRIVATE, SELLER_BUSINESS, SELLER_UNKNOWN]
+
+
+def load_rates(path: Optional[str] = None) -> Optional[Dict[str, float]]:
+    """{moneda: unități per 1 EUR} din JSON; None dacă fișierul lipsește (fără conversie)."""
+    path = path or RATES_FILE
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    rates = {str(k).upper(): float(v) for k, v in (data.get("rates", data) if isinstance(data, dict) else {}).items()}
+    rates.setdefault("EUR", 1.0)
+    return rates
+
+
+def _text(s: pd.Series) -> pd.Series:
+    return s.astype("string").fillna("").str.strip()
+
+
+def _per_unique(fn: Callable[[pd.Series], pd.Series]) -> Callable[[pd.Series], pd.Series]:
+    """Rulează `fn` doar pe valorile distincte și întinde rezultatul pe coloană (`factorize` + `take`).
+
+    Prețurile, monedele, tipul vânzătorului și localitățile se repetă mult, deci operațiile pe text (scumpe
+    pentru dtype-ul `string` fără pyarrow) se fac pe câteva mii de valori, nu pe sute de mii de rânduri.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(s: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(_text(s))
+        out = fn(pd.Series(uniques, dtype="string")).take(codes)
+        out.index = s.index
+        return out
+
+    return wrapper
+
+
+def _fold(s: pd.Series) -> pd.Series:
+    """Litere mici, fără diacritice (ă/â/î/ș/ț, și variantele cu sedilă)."""
+    return _text(s).str.lower().str.normalize("NFD").str.replace("[\u0300-\u036f]", "", regex=True)
+
+
+@_per_unique
+def to_number(s: pd.Series) -> pd.Series:
+    """„15.000”, „15 000”, „1.234,50”, „15 000 €” => float (NaN unde nu e număr).
+
+    Punctul și spațiile sunt separatori de mii (ca pe OLX), virgula e separatorul zecimal.
+    """
+    digits = _text(s).str.extract(r"(\d[\d.\s]*(?:,\d+)?)", expand=False)
+    digits = digits.str.replace(r"[.\s]", "", regex=True).str.replace(",", ".", regex=False)
+    return pd.to_numeric(digits, errors="coerce").astype("float64")
+
+
+@_per_unique
+def normalize_currency(s: pd.Series) -> pd.Series:
+    """Moneda găsită în text (€, EUR, Lei, RON...) => "EUR"/"RON"; "" dacă lipsește."""
+    found = _text(s).str.upper().str.extract(_CURRENCY_RE, expand=False)
+    return found.map(CURRENCY_ALIASES).fillna("").astype("string")
+
+
+@_per_unique
+def seller_type(s: pd.Series) -> pd.Series:
+    folded = _fold(s)
+    out = np.select(
+        [folded.str.contains("persoana", regex=False), folded.str.contains(r"firm|companie|dealer", regex=True)],
+        [SELLER_PRIVATE, SELLER_BUSINESS],
+        default=SELLER_UNKNOWN,
+    )
+    return pd.Series(pd.Categorical(out, categories=SELLER_TYPES))
+
+
+@_per_unique
+def locality(s: pd.Series) -> pd.Series:
+    """Localitatea fără spații în plus și cu aceeași scriere pentru variante de majuscule, ca categorie."""
+    txt = _text(s).str.replace(r"\s+", " ", regex=True)
+    return txt.str.title().replace("", pd.NA).astype("category")
+
+
+def convert(value: pd.Series, currency: pd.Series, rates: Dict[str, float], target: str) -> pd.Series:
+    """Sumele din `currency` în `target`, prin EUR; NaN pentru monede fără curs."""
+    per_eur = currency.map(rates).astype("float64")
+    return (value / per_eur * rates.get(target, np.nan)).round(2)
+
+
+def postprocess(df: pd.DataFrame, rates: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Copie a lui `df` (coloanele output-ului plat sau ale foii `anunturi`) cu coloanele tipizate adăugate."""
+    out = df.copy()
+    n = len(out)
+    empty = pd.Series([""] * n, index=out.index, dtype="string")
+
+    def col(name: str) -> pd.Series:
+        return out[name] if name in out.columns else empty
+
+    price_cur = normalize_currency(col("pret_moneda"))
+    price_cur = price_cur.mask(price_cur == "", normalize_currency(col("pret")))
+    out["pret_moneda"] = price_cur
+    out["pret_num"] = to_number(col("pret_valoare")).fillna(to_number(col("pret")))
+
+    g = col("garantie")
+    out["garantie_num"] = to_number(g)
+    g_cur = normalize_currency(g)
+    # garanție fără monedă în text: moneda prețului
+    out["garantie_moneda"] = g_cur.mask((g_cur == "") & out["garantie_num"].notna(), price_cur)
+
+    out["vizualizari_num"] = to_number(col("vizualizari")).round().astype("Int64")
+    out["tip_vanzator"] = seller_type(col("persoana"))
+    if "localitate" in out.columns:
+        out["localitate"] = locality(out["localitate"])
+
+    if rates:
+        out["pret_eur"] = convert(out["pret_num"], price_cur, rates, "EUR")
+        out["pret_ron"] = convert(out["pret_num"], price_cur, rates, "RON")
+    return out
+
+
+def read_output(path: str) -> pd.DataFrame:
+    """CSV / JSONL / XLSX de output, cu toate coloanele ca text (tipizarea o face `postprocess`)."""
+    if path.endswith(".jsonl"):
+        return pd.read_json(path, lines=True, dtype=False).astype("string")
+    if path.endswith(".xlsx"):
+        return pd.read_excel(path, dtype="string")
+    return pd.read_csv(path, dtype="string", keep_default_na=False, encoding="utf-8-sig")
+
+
+def write_output(df: pd.DataFrame, path: str) -> None:
+    if path.endswith(".jsonl"):
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    elif path.endswith(".xlsx"):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def postprocess_file(path: str, out: Optional[str] = None, rates: Optional[Dict[str, float]] = None) -> int:
+    """Post-procesează un export existent; implicit îl rescrie pe loc. Întoarce numărul de rânduri."""
+    df = postprocess(read_output(path), rates)
+    write_output(df, out or path)
+    return len(df)
@@ -0,0 +1,443 @@
+"""Căutări locale peste rezultatele acumulate: API Python (`QueryIndex`) și un server HTTP/JSON read-only.
+
+Indexul are fișierul lui (`<prefix>.query.sqlite`): aceeași schemă ca store-ul normalizat (outputstore.py) plus
+tabelele de căutare. Store-ul scraperului (`<prefix>.ads.sqlite`) se deschide doar în citire, deci serviciul nu
+atinge `last_run` / `last_seen` pe care se bazează exportul rulării. `refresh()` aduce indexul la zi incremental:
+- anunțurile store-ului scrise după sincronizarea anterioară (`ads.last_seen` > marcajul din `meta`) se copiază
+  cu telefoanele lor;
+- CSV-urile/JSONL-urile rulărilor (`<prefix>_*.csv`) intră prin upsert doar dacă s-au schimbat de la refresh-ul
+  anterior, iar dintr-un fișier care crește (rularea e încă în curs) doar rândurile noi;
+- tabela `ad_query` primește prețul numeric, moneda și localitatea normalizată doar pentru anunțurile atinse
+  după refresh-ul anterior.
+Indexuri: telefon, `user_id`, `id_anunt` (schema store-ului), localitate și preț (în `ad_query`), deci o căutare e
+o interogare pe index, nu o încărcare pandas a întregului istoric. Paginarea e după cheia anunțului (`after` =
+ultima cheie a paginii precedente): pagina N costă cât pagina 1.
+`first_seen`/`last_seen` ale anunțurilor venite din fișiere plate = momentul în care le-a preluat indexul.
+"""
+
+import csv
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import pathname2url
+
+from helpers import clean_phone, normalize_text
+from outputstore import STORE_FIELDS, AdStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ad_query (
+    ad_key TEXT PRIMARY KEY,
+    pret_num REAL,
+    moneda TEXT NOT NULL DEFAULT '',
+    loc_key TEXT NOT NULL DEFAULT '',
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_query_price ON ad_query(pret_num);
+CREATE INDEX IF NOT EXISTS ix_query_loc ON ad_query(loc_key);
+CREATE INDEX IF NOT EXISTS ix_query_seen ON ad_query(last_seen);
+CREATE TABLE IF NOT EXISTS ingested (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# filtrele acceptate de `search` și de GET /ads
+FILTERS = ("phone", "user_id", "id_anunt", "localitate", "min_price", "max_price", "currency", "repost_cluster")
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def read_rows(path: str, skip: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Rândurile plate ale unui output de rulare (CSV, JSONL plat sau normalizat cu `telefoane`) de după primele
+    `skip` înregistrări; întoarce (rânduri, înregistrări complete din fișier).
+
+    Ultima înregistrare se ignoră dacă fișierul nu se termină cu newline (rularea o scrie chiar acum).
+    """
+    with open(path, "rb") as fb:
+        partial = fb.seek(0, os.SEEK_END) > 0 and fb.seek(-1, os.SEEK_END) >= 0 and fb.read(1) != b"\n"
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            records = [line for line in f if line.strip()]
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            records = list(csv.DictReader(f))
+    if partial and records:
+        records.pop()
+    rows: List[Dict[str, Any]] = []
+    for rec in records[skip:]:
+        if isinstance(rec, dict):
+            rows.append(rec)
+            continue
+        try:
+            obj = json.loads(rec)
+        except ValueError:
+            continue
+        if "telefoane" in obj:
+            rows.extend({**obj, "telefon": tel} for tel in obj.pop("telefoane") or [""])
+        else:
+            rows.append(obj)
+    return rows, len(records)
+
+
+def _loc_bounds(name: str) -> Tuple[str, str]:
+    """Intervalul de chei pentru potrivire pe prefix („cluj” găsește „Cluj-Napoca”), folosind indexul."""
+    key = normalize_text(name)
+    return key, key + "\uffff"
+
+
+class QueryIndex:
+    def __init__(self, path: str, sources: Sequence[str] = (), store: Optional[str] = None):
+        """`path` = fișierul indexului; `sources` = glob-uri de fișiere de output preluate la `refresh()`.
+
+        `store` = store-ul normalizat al scraperului, deschis doar în citire la fiecare `refresh()`.
+        """
+        self.path = path
+        self.sources = tuple(sources)
+        self.store_path = store
+        self.store = AdStore(path)  # schema store-ului în fișierul indexului; prin el intră fișierele plate
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=60000")
+        self._db.executescript(SCHEMA)
+        # o singură conexiune pentru thread-ul de refresh și thread-urile serverului
+        self._lock = threading.Lock()
+        self.last_refresh: Optional[float] = None
+
+    def close(self) -> None:
+        self.store.close()
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    # ---- refresh incremental ----
+    def _source_files(self) -> List[str]:
+        paths = sorted({p for pattern in self.sources for p in glob.glob(pattern)})
+        csvs = {os.path.splitext(p)[0] for p in paths if p.endswith(".csv")}
+        # rularea plată scrie aceleași rânduri și în CSV și în JSONL: JSONL-ul doar când nu are CSV
+        return [p for p in paths if p.endswith(".csv") or (p.endswith(".jsonl") and os.path.splitext(p)[0] not in csvs)]
+
+    def ingest_file(self, path: str) -> int:
+        """Preia un fișier de output dacă s-a schimbat; întoarce câte rânduri noi au intrat în store."""
+        st = os.stat(path)
+        with self._lock:
+            prev = self._db.execute("SELECT size, mtime, rows FROM ingested WHERE path=?", (path,)).fetchone()
+        if prev and (prev[0], prev[1]) == (st.st_size, st.st_mtime):
+            return 0
+        # fișier care a crescut = rulare în curs (se scrie doar prin append); altfel îl reluăm de la capăt
+        skip = prev[2] if prev and st.st_size > prev[0] else 0
+        rows, total = read_rows(path, skip)
+        self.store.upsert_rows(rows, run_id=os.path.splitext(os.path.basename(path))[0])
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO ingested(path, size, mtime, rows, at) VALUES (?, ?, ?, ?, ?) ON CONFLICT(path) "
+                "DO UPDATE SET size=excluded.size, mtime=excluded.mtime, rows=excluded.rows, at=excluded.at",
+                (path, st.st_size, st.st_mtime, total, time.time()),
+            )
+        return len(rows)
+
+    def sync_store(self) -> List[str]:
+        """Copiază din store-ul scraperului anunțurile scrise de la sincronizarea anterioară; întoarce cheile lor.
+
+        Store-ul se deschide cu `mode=ro`: timpii și `last_run` ai anunțurilor se copiază așa cum sunt, nu se scriu.
+        """
+        if not self.store_path or not os.path.exists(self.store_path):
+            return []
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE name='store_mark'").fetchone()
+        mark = float(row[0]) if row else -1.0
+        uri = f"file:{pathname2url(os.path.abspath(self.store_path))}?mode=ro"
+        src = sqlite3.connect(uri, uri=True, timeout=60, isolation_level=None)
+        try:
+            src.execute("PRAGMA busy_timeout=60000")
+            cols = {r[1] for r in src.execute("PRAGMA table_info(ads)")}
+            if not cols:
+                return []
+            # store vechi, dinainte de MIGRATIONS: coloanele lipsă vin goale
+            fields = ", ".join(f if f in cols else f"'' AS {f}" for f in STORE_FIELDS)
+            src.execute("BEGIN")  # anunțuri și telefoane din același instantaneu
+            ads = src.execute(
+                f"SELECT ad_key, url, {fields}, first_seen, last_seen, last_run FROM ads WHERE last_seen > ?", (mark,)
+            ).fetchall()
+            phones = src.execute(
+                "SELECT p.ad_key, p.telefon, p.first_seen, p.last_seen, p.last_run FROM phones p "
+                "JOIN ads a ON a.ad_key = p.ad_key WHERE a.last_seen > ?",
+                (mark,),
+            ).fetchall()
+            src.execute("COMMIT")
+        finally:
+            src.close()
+        if not ads:
+            return []
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    f"INSERT INTO ads(ad_key, url, {', '.join(STORE_FIELDS)}, first_seen, last_seen, last_run) "
+                    f"VALUES (?, ?, {', '.join('?' * len(STORE_FIELDS))}, ?, ?, ?) "
+                    "ON CONFLICT(ad_key) DO UPDATE SET url=excluded.url, "
+                    + ", ".join(f"{f}=COALESCE(NULLIF(excluded.{f}, ''), ads.{f})" for f in STORE_FIELDS)
+                    + ", first_seen=MIN(ads.first_seen, excluded.first_seen), "
+                    "last_seen=MAX(ads.last_seen, excluded.last_seen), "
+                    "last_run=COALESCE(excluded.last_run, ads.last_run)",
+                    ads,
+                )
+                self._db.executemany(
+                    "INSERT INTO phones(ad_key, telefon, first_seen, last_seen, last_run) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(ad_key, telefon) DO UPDATE SET "
+                    "first_seen=MIN(phones.first_seen, excluded.first_seen), "
+                    "last_seen=MAX(phones.last_seen, excluded.last_seen), "
+                    "last_run=COALESCE(excluded.last_run, phones.last_run)",
+                    phones,
+                )
+                self._db.execute(
+                    "INSERT INTO meta(name, value) VALUES ('store_mark', ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value=excluded.value",
+                    (repr(max(a[-2] for a in ads)),),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return [a[0] for a in ads]
+
+    def _reindex(self, keys: Sequence[str] = ()) -> int:
+        """Actualizează `ad_query` pentru anunțurile atinse de la ultimul refresh; întoarce câte.
+
+        `keys` = anunțurile copiate din store: își păstrează `last_seen`-ul, care poate fi sub marcajul `ad_query`.
+        """
+        cols = "SELECT ad_key, pret, pret_valoare, pret_moneda, localitate, last_seen FROM ads"
+        with self._lock:
+            mark = self._db.execute("SELECT COALESCE(MAX(last_seen), -1) FROM ad_query").fetchone()[0]
+            rows = {r[0]: r for r in self._db.execute(f"{cols} WHERE last_seen > ?", (mark,))}
+            for i in range(0, len(keys), 500):
+                chunk = list(keys[i : i + 500])
+                rows.update(
+                    (r[0], r) for r in self._db.execute(f"{cols} WHERE ad_key IN ({','.join('?' * len(chunk))})", chunk)
+                )
+        changed = list(rows.values())
+        if not changed:
+            return 0
+        # pandas doar aici (ca la export): fiecare preț / monedă distinctă se parsează o singură dată
+        import pandas as pd
+
+        from postprocess import postprocess
+
+        cols = ["ad_key", "pret", "pret_valoare", "pret_moneda", "localitate"]
+        df = postprocess(pd.DataFrame([r[:-1] for r in changed], columns=cols, dtype="string"))
+        recs = [
+            (r[0], None if pd.isna(num) else float(num), str(cur), normalize_text(r[4] or ""), float(r[5]))
+            for r, num, cur in zip(changed, df["pret_num"], df["pret_moneda"].fillna(""))
+        ]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT INTO ad_query(ad_key, pret_num, moneda, loc_key, last_seen) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(ad_key) DO UPDATE SET pret_num=excluded.pret_num, moneda=excluded.moneda, "
+                    "loc_key=excluded.loc_key, last_seen=excluded.last_seen",
+                    recs,
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(recs)
+
+    def refresh(self) -> Dict[str, int]:
+        """Anunțurile noi din store, fișierele noi/schimbate din `sources`, apoi indexul de căutare al celor atinse."""
+        keys = self.sync_store()
+        files = rows = 0
+        for path in self._source_files():
+            n = self.ingest_file(path)
+            files += int(n > 0)
+            rows += n
+        ads = self._reindex(keys)
+        self.last_refresh = time.time()
+        return {"files": files, "rows": rows, "ads": ads}
+
+    # ---- căutare ----
+    def search(
+        self,
+        phone: Optional[str] = None,
+        user_id: Optional[str] = None,
+        id_anunt: Optional[str] = None,
+        localitate: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        currency: Optional[str] = None,
+        repost_cluster: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Anunțurile care trec de toate filtrele date, ordonate după cheie, câte `limit` pe pagină.
+
+        Întoarce {"items": [...], "next": cheia de dat ca `after` pentru pagina următoare sau None}; fiecare anunț
+        are câmpurile store-ului, `pret_num`, `moneda` și lista `telefoane`.
+        """
+        where: List[str] = []
+        args: List[Any] = []
+        if phone:
+            where.append("a.ad_key IN (SELECT ad_key FROM phones WHERE telefon=?)")
+            args.append(clean_phone(phone))
+        for col, val in (("user_id", user_id), ("id_anunt", id_anunt), ("repost_cluster", repost_cluster)):
+            if val:
+                where.append(f"a.{col}=?")
+                args.append(str(val).strip())
+        if localitate:
+            where.append("q.loc_key >= ? AND q.loc_key < ?")
+            args.extend(_loc_bounds(localitate))
+        if min_price is not None:
+            where.append("q.pret_num >= ?")
+            args.append(float(min_price))
+        if max_price is not None:
+            where.append("q.pret_num <= ?")
+            args.append(float(max_price))
+        if currency:
+            where.append("q.moneda=?")
+            args.append(currency.strip().upper())
+        if after:
+            where.append("a.ad_key > ?")
+            args.append(after)
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        sql = (
+            f"SELECT a.ad_key, a.url, {', '.join(f'a.{f}' for f in STORE_FIELDS)}, a.first_seen, a.last_seen, "
+            "a.last_run, q.pret_num, COALESCE(q.moneda, '') AS moneda "
+            "FROM ads a LEFT JOIN ad_query q ON q.ad_key = a.ad_key "
+            f"{'WHERE ' + ' AND '.join(where) if where else ''} ORDER BY a.ad_key LIMIT ?"
+        )
+        with self._lock:
+            cur = self._db.execute(sql, (*args, limit + 1))
+            cols = [c[0] for c in cur.description]
+            items = [dict(zip(cols, r)) for r in cur]
+            more = len(items) > limit
+            items = items[:limit]
+            phones: Dict[str, List[str]] = {it["ad_key"]: [] for it in items}
+            if items:
+                for key, tel in self._db.execute(
+                    f"SELECT ad_key, telefon FROM phones WHERE ad_key IN ({','.join('?' * len(phones))}) "
+                    "ORDER BY ad_key, first_seen, telefon",
+                    list(phones),
+                ):
+                    phones[key].append(tel)
+        for it in items:
+            it["telefoane"] = phones[it["ad_key"]]
+        return {"items": items, "next": items[-1]["ad_key"] if more else None}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = self._db.execute("SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM ingested").fetchone()
+            indexed = self._db.execute("SELECT COUNT(*) FROM ad_query").fetchone()[0]
+        return {
+            **self.store.counts(),
+            "indexed": int(indexed),
+            "files": int(files[0]),
+            "file_rows": int(files[1]),
+            "last_refresh": self.last_refresh,
+        }
+
+
+def parse_query(qs: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Parametrii GET /ads => argumentele lui `search`; ValueError pentru valori invalide."""
+    out: Dict[str, Any] = {}
+    for name in (*FILTERS, "limit", "after"):
+        val = (qs.get(name) or [""])[-1].strip()
+        if not val:
+            continue
+        if name in ("min_price", "max_price"):
+            out[name] = float(val.replace(",", "."))
+        elif name == "limit":
+            out[name] = int(val)
+        else:
+            out[name] = val
+    return out
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    index: QueryIndex
+
+    def _json(self, code: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802 - API http.server
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._json(200, {"ok": True})
+        elif url.path == "/stats":
+            self._json(200, self.index.stats())
+        elif url.path == "/ads":
+            try:
+                params = parse_query(parse_qs(url.query))
+            except ValueError as e:
+                self._json(400, {"error": str(e)})
+                return
+            t0 = time.perf_counter()
+            page = self.index.search(**params)
+            page["took_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            self._json(200, page)
+        else:
+            self._json(404, {"error": "not found", "paths": ["/ads", "/stats", "/health"]})
+
+    def log_message(self, format, *args):
+        return
+
+
+def _refresh_loop(index: QueryIndex, every_s: float, stop: threading.Event) -> None:
+    while not stop.wait(every_s):
+        try:
+            index.refresh()
+        except Exception:
+            pass  # fișier în curs de scriere / store blocat: reîncercăm la pasul următor
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int], handler: type):
+        super().__init__(addr, handler)
+        self.stop_refresh = threading.Event()
+
+    def shutdown(self) -> None:
+        self.stop_refresh.set()
+        super().shutdown()
+
+
+def start_query_server(index: QueryIndex, port: int, host: str = "127.0.0.1", refresh_s: float = 60.0) -> QueryServer:
+    """Pornește serverul (GET /ads, /stats, /health) și refresh-ul periodic în thread-uri daemon.
+
+    Oprire cu `server.shutdown()` (oprește și refresh-ul).
+    """
+    server = QueryServer((host, port), type("QueryHandler", (_QueryHandler,), {"index": index}))
+    threading.Thread(target=server.serve_forever, name="query-http", daemon=True).start()
+    if refresh_s > 0:
+        args = (index, refresh_s, server.stop_refresh)
+        threading.Thread(target=_refresh_loop, args=args, name="query-refresh", daemon=True).start()
+    return server
+
+
+def iter_all(index: QueryIndex, page_size: int = MAX_LIMIT, **filters: Any) -> Iterable[Dict[str, Any]]:
+    """Toate anunțurile care trec de filtre, pagină cu pagină."""
+    after = None
+    while True:
+        page = index.search(limit=page_size, after=after, **filters)
+        yield from page["items"]
+        after = page["next"]
+        if after is None:
+            return
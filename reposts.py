@@ -0,0 +1,231 @@
+"""Reposturi: același anunț republicat sub alt ID/URL, găsit după textul lui (titlu + descriere).
+
+Textul normalizat (fără diacritice, litere mici) se împarte în shingle-uri de 5 caractere; semnătura MinHash
+(`num_perm` minime ale unor permutări hash, calculate vectorizat cu NumPy) estimează similaritatea Jaccard
+dintre două anunțuri fără a le compara textul. LSH: semnătura se taie în `bands` benzi de câte `rows` valori;
+două anunțuri care au o bandă identică devin candidați (prag aproximativ (1/bands)^(1/rows), ~0.77 implicit),
+iar candidații se confirmă cu similaritatea estimată ≥ `threshold`.
+
+Indexul stă în SQLite (`<prefix>.reposts.sqlite`) și crește incremental de la o rulare la alta: fiecare anunț
+are semnătura, vânzătorul, telefoanele și clusterul lui; benzile sunt chei întregi indexate, deci o căutare
+înseamnă o singură interogare `IN (...)` pe index, independentă de mărimea corpusului.
+Clusterul unui anunț = clusterul celui mai asemănător anunț deja indexat, altfel cheia lui (ID-ul anunțului).
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from helpers import normalize_text
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ads (
+    ad_key TEXT PRIMARY KEY,
+    cluster TEXT NOT NULL,
+    url TEXT,
+    user_id TEXT,
+    seller TEXT,
+    phones TEXT,
+    sig BLOB NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    bkey INTEGER NOT NULL,
+    ad_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_bands_key ON bands(bkey);
+CREATE INDEX IF NOT EXISTS ix_ads_cluster ON ads(cluster);
+"""
+
+
+def shingles(text: str, k: int = 5) -> List[bytes]:
+    """Shingle-uri de `k` caractere din textul normalizat (textele scurte = un singur shingle)."""
+    norm = normalize_text(text).encode("utf-8")
+    if not norm:
+        return []
+    if len(norm) <= k:
+        return [norm]
+    return list({norm[i : i + k] for i in range(len(norm) - k + 1)})
+
+
+def normalize_seller(name: str) -> str:
+    return normalize_text(name)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """uint32[num_perm]; None pentru text gol."""
+        sh = shingles(text)
+        if not sh:
+            return None
+        x = np.fromiter((zlib.crc32(s) for s in sh), dtype=np.uint64, count=len(sh))
+        # (a·x + b) mod p, trunchiat la 32 biți; înmulțirea pe uint64 poate depăși (ca în datasketch), e voit
+        with np.errstate(over="ignore"):
+            h = (np.outer(self._a, x) + self._b[:, None]) % _MERSENNE & _MAX_HASH
+        return h.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard estimat: fracțiunea de poziții egale în două semnături."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def band_keys(sig: np.ndarray, bands: int, rows: int) -> List[int]:
+    """O cheie întreagă (64 biți, cu semn, ca în SQLite) per bandă; include indexul benzii."""
+    out = []
+    for i in range(bands):
+        chunk = sig[i * rows : (i + 1) * rows].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=i.to_bytes(2, "little")).digest()
+        out.append(int.from_bytes(digest, "little", signed=True))
+    return out
+
+
+@dataclass
+class RepostMatch:
+    ad_key: str
+    cluster: str
+    similarity: float
+    url: str = ""
+    user_id: str = ""
+    seller: str = ""
+    phones: Tuple[str, ...] = ()
+
+    def same_seller(self, user_id: str = "", seller: str = "") -> bool:
+        """Același vânzător: user_id egal sau, când unul lipsește, același nume afișat."""
+        if user_id and self.user_id:
+            return user_id == self.user_id
+        return bool(seller) and normalize_seller(seller) == self.seller
+
+
+class RepostIndex:
+    def __init__(
+        self,
+        path: str,
+        num_perm: int = 64,
+        bands: int = 8,
+        threshold: float = 0.8,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm={num_perm} nu se împarte în {bands} benzi")
+        self.path = path
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA busy_timeout=60000")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    def count(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM ads").fetchone()[0])
+
+    def _best(self, sig: np.ndarray, exclude: str = "") -> Optional[RepostMatch]:
+        keys = band_keys(sig, self.bands, self.rows)
+        rows = self._db.execute(
+            "SELECT a.ad_key, a.cluster, a.sig, a.url, a.user_id, a.seller, a.phones FROM ads a "
+            f"WHERE a.ad_key IN (SELECT ad_key FROM bands WHERE bkey IN ({','.join('?' * len(keys))}))",
+            keys,
+        ).fetchall()
+        best: Optional[RepostMatch] = None
+        for ad_key, cluster, blob, url, user_id, seller, phones in rows:
+            if ad_key == exclude:
+                continue
+            sim = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+            if sim >= self.threshold and (best is None or sim > best.similarity):
+                best = RepostMatch(
+                    ad_key,
+                    cluster,
+                    sim,
+                    url or "",
+                    user_id or "",
+                    seller or "",
+                    tuple(filter(None, (phones or "").split(","))),
+                )
+        return best
+
+    def lookup(self, text: str, exclude: str = "") -> Optional[RepostMatch]:
+        """Cel mai asemănător anunț indexat (similaritate ≥ threshold), fără a modifica indexul."""
+        sig = self.hasher.signature(text)
+        return self._best(sig, exclude) if sig is not None else None
+
+    def add(
+        self,
+        ad_key: str,
+        text: str,
+        url: str = "",
+        user_id: str = "",
+        seller: str = "",
+        phones: Iterable[str] = (),
+        now: Optional[float] = None,
+    ) -> Tuple[str, Optional[RepostMatch]]:
+        """Indexează (sau reindexează) un anunț; întoarce (cluster, anunțul asemănător găsit sau None).
+
+        Un anunț deja indexat își păstrează clusterul; unul nou ia clusterul celui mai asemănător anunț.
+        """
+        now = time.time() if now is None else now
+        sig = self.hasher.signature(text)
+        if sig is None:
+            return ad_key, None
+        match = self._best(sig, exclude=ad_key)
+        prev = self._db.execute("SELECT cluster FROM ads WHERE ad_key=?", (ad_key,)).fetchone()
+        cluster = prev[0] if prev else (match.cluster if match else ad_key)
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "INSERT INTO ads(ad_key, cluster, url, user_id, seller, phones, sig, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(ad_key) DO UPDATE SET url=excluded.url, "
+                "user_id=COALESCE(NULLIF(excluded.user_id, ''), ads.user_id), seller=excluded.seller, "
+                "phones=COALESCE(NULLIF(excluded.phones, ''), ads.phones), sig=excluded.sig, "
+                "last_seen=excluded.last_seen",
+                (ad_key, cluster, url, user_id, normalize_seller(seller), ",".join(phones), sig.tobytes(), now, now),
+            )
+            if prev:
+                self._db.execute("DELETE FROM bands WHERE ad_key=?", (ad_key,))
+            self._db.executemany(
+                "INSERT INTO bands(bkey, ad_key) VALUES (?, ?)",
+                [(k, ad_key) for k in band_keys(sig, self.bands, self.rows)],
+            )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return cluster, match
+
+    def cluster_sizes(self, min_size: int = 2) -> List[Tuple[str, int]]:
+        """Clusterele cu cel puțin `min_size` anunțuri (cele mai mari întâi)."""
+        return [
+            (c, int(n))
+            for c, n in self._db.execute(
+                "SELECT cluster, COUNT(*) n FROM ads GROUP BY cluster HAVING n >= ? ORDER BY n DESC, cluster",
+                (min_size,),
+            )
+        ]
+
+
+def ad_text(title: str, description: str) -> str:
+    return f"{title or ''} {description or ''}".strip()
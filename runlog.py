@@ -0,0 +1,123 @@
+"""Logging ne-blocant: thread-ul de crawl pune doar înregistrarea într-o coadă (`QueueHandler`), iar un
+`QueueListener` pe thread propriu o scrie în consolă și în fișiere.
+
+Formatul fișierelor e text (ca înainte) sau JSON lines (`LOG_FORMAT=json`): un obiect pe linie cu `run_id`,
+`stage`, `status`, `url`, `duration_s`, `outcome` ca câmpuri, interogabil în bloc (jq, pandas) în loc de grep.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-7s | run=%(run_id)s | %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# câmpurile structurate pe care `log_stage` le atașează înregistrării (extra=...)
+FIELDS = ("stage", "status", "url", "duration_s", "outcome", "proxy", "phones", "strategy", "profile", "error")
+
+_LISTENER: Optional[QueueListener] = None
+_EXC_FORMATTER = logging.Formatter()
+
+
+class RunContextFilter(logging.Filter):
+    """Pune `run_id` pe orice înregistrare (inclusiv din selenium/urllib3), ca formatul text să nu crape."""
+
+    def __init__(self, run_id: Optional[str]):
+        super().__init__()
+        self.run_id = run_id or "-"
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "run_id"):
+            record.run_id = self.run_id
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", None),
+        }
+        for name in FIELDS:
+            v = getattr(record, name, None)
+            if v is not None:
+                out[name] = v
+        out["msg"] = record.getMessage()
+        # din coadă vine doar `exc_text` (traceback-ul deja formatat de `RecordQueueHandler`)
+        exc = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc:
+            out["exc"] = exc
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class RecordQueueHandler(QueueHandler):
+    """Ca `QueueHandler`, dar traceback-ul rămâne separat de mesaj, în `exc_text`.
+
+    `QueueHandler.prepare` formatează înregistrarea pe thread-ul apelant și lipește traceback-ul la `msg`, deci
+    formatterul JSON de pe listener n-ar mai vedea excepția; formatul text adaugă `exc_text` după mesaj ca înainte.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None  # ca în QueueHandler: coada nu ține în viață frame-urile traceback-ului
+        record.exc_text = exc_text
+        return record
+
+
+def text_formatter() -> logging.Formatter:
+    return logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT)
+
+
+def start_queue_logging(
+    handlers: List[logging.Handler],
+    level: int = logging.INFO,
+    run_id: Optional[str] = None,
+) -> QueueListener:
+    """Root logger => QueueHandler => QueueListener(handlers); un apel anterior e oprit și înlocuit."""
+    global _LISTENER
+    stop_queue_logging()
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.setLevel(level)
+
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    qh = RecordQueueHandler(q)
+    qh.addFilter(RunContextFilter(run_id))
+    root.addHandler(qh)
+    _LISTENER = QueueListener(q, *handlers, respect_handler_level=True)
+    _LISTENER.start()
+    return _LISTENER
+
+
+def stop_queue_logging() -> None:
+    """Golește coada și închide handler-ele (rulat și la ieșirea procesului)."""
+    global _LISTENER
+    if _LISTENER is None:
+        return
+    listener, _LISTENER = _LISTENER, None
+    try:
+        listener.stop()
+    finally:
+        for h in listener.handlers:
+            try:
+                h.close()
+            except Exception:
+                pass
+
+
+atexit.register(stop_queue_logging)
@@ -0,0 +1,274 @@
+"""Raport de performanță din istoricul rulărilor (`logs/runs/index.jsonl`, scris de `finalize_run_index`).
+
+Doar stdlib, ca `cli.py stats`. Per rulare se calculează anunțuri/minut, telefoane/anunț și rata de erori
+(erori / (anunțuri salvate + erori)); rulările se grupează pe (versiune, host) cu mediane.
+Regresie: pentru fiecare host, prima rulare a unei versiuni noi deschide o comparație între medianele
+anunțuri/minut ale versiunii și ale ultimelor `baseline_runs` rulări anterioare (alte versiuni, același host);
+sub `1 - threshold` din baseline => regresie. Rulările fără anunțuri salvate sau mai scurte de `min_duration_s`
+nu intră în calcule (crash la pornire, Ctrl+C), dar apar în numărătoare.
+Output: Markdown (`render_markdown`) sau o pagină HTML statică (`render_html`), fără JS/CSS extern.
+"""
+
+import html
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BASELINE_RUNS = 10
+DEFAULT_THRESHOLD = 0.15  # versiunea nouă e regresie sub 85% din baseline
+DEFAULT_MIN_DURATION_S = 30.0
+
+
+@dataclass
+class RunPoint:
+    run_id: str
+    ts_utc: str
+    version: str
+    host: str
+    mode: str
+    duration_s: float
+    ads_saved: int
+    phones_found: int
+    errors: int
+
+    @property
+    def ads_per_min(self) -> float:
+        return self.ads_saved / (self.duration_s / 60.0) if self.duration_s > 0 else 0.0
+
+    @property
+    def phones_per_ad(self) -> float:
+        return self.phones_found / self.ads_saved if self.ads_saved else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        done = self.ads_saved + self.errors
+        return self.errors / done if done else 0.0
+
+
+@dataclass
+class GroupStats:
+    version: str
+    host: str
+    runs: int = 0
+    ads_per_min: Optional[float] = None
+    phones_per_ad: Optional[float] = None
+    error_rate: Optional[float] = None
+    duration_s: Optional[float] = None
+    last_ts: str = ""
+
+
+@dataclass
+class Regression:
+    host: str
+    version: str
+    baseline_versions: List[str]
+    ads_per_min: float
+    baseline_ads_per_min: float
+    runs: int
+    baseline_runs: int
+
+    @property
+    def change(self) -> float:
+        return self.ads_per_min / self.baseline_ads_per_min - 1.0
+
+
+@dataclass
+class RunReport:
+    total_runs: int
+    used_runs: int
+    groups: List[GroupStats] = field(default_factory=list)
+    regressions: List[Regression] = field(default_factory=list)
+    trend: List[RunPoint] = field(default_factory=list)  # ultimele rulări folosite, cronologic
+
+
+def run_point(r: Dict[str, Any]) -> Optional[RunPoint]:
+    """O linie din index.jsonl => RunPoint; None dacă lipsește durata."""
+    try:
+        duration = float(r.get("duration_s") or 0)
+    except (TypeError, ValueError):
+        return None
+    if duration <= 0:
+        return None
+
+    def num(key: str) -> int:
+        try:
+            return int(r.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    return RunPoint(
+        run_id=str(r.get("run_id") or ""),
+        ts_utc=str(r.get("ts_utc") or ""),
+        version=str(r.get("version") or "?"),
+        host=str(r.get("host") or "?"),
+        mode=str(r.get("mode") or "single"),
+        duration_s=duration,
+        ads_saved=num("ads_saved"),
+        phones_found=num("phones_found"),
+        errors=num("errors"),
+    )
+
+
+def _median(xs: Iterable[float]) -> Optional[float]:
+    xs = list(xs)
+    return statistics.median(xs) if xs else None
+
+
+def _group(points: List[RunPoint], version: str, host: str) -> GroupStats:
+    return GroupStats(
+        version=version,
+        host=host,
+        runs=len(points),
+        ads_per_min=_median(p.ads_per_min for p in points),
+        phones_per_ad=_median(p.phones_per_ad for p in points),
+        error_rate=_median(p.error_rate for p in points),
+        duration_s=_median(p.duration_s for p in points),
+        last_ts=max(p.ts_utc for p in points),
+    )
+
+
+def find_regressions(
+    points: List[RunPoint], baseline_runs: int = DEFAULT_BASELINE_RUNS, threshold: float = DEFAULT_THRESHOLD
+) -> List[Regression]:
+    """Versiunile (per host) mai lente decât baseline-ul rulărilor anterioare lor, în ordine cronologică."""
+    out: List[Regression] = []
+    by_host: Dict[str, List[RunPoint]] = {}
+    for p in points:
+        by_host.setdefault(p.host, []).append(p)
+    for host, runs in by_host.items():
+        first: Dict[str, int] = {}
+        for i, p in enumerate(runs):
+            first.setdefault(p.version, i)
+        for version, i in first.items():
+            base = [p for p in runs[:i] if p.version != version][-baseline_runs:]
+            cur = [p for p in runs[i:] if p.version == version]
+            if not base or not cur:
+                continue
+            cur_apm = statistics.median(p.ads_per_min for p in cur)
+            base_apm = statistics.median(p.ads_per_min for p in base)
+            if base_apm > 0 and cur_apm < base_apm * (1.0 - threshold):
+                versions = list(dict.fromkeys(p.version for p in base))
+                out.append(Regression(host, version, versions, cur_apm, base_apm, len(cur), len(base)))
+    return out
+
+
+def build_report(
+    runs: List[Dict[str, Any]],
+    baseline_runs: int = DEFAULT_BASELINE_RUNS,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_duration_s: float = DEFAULT_MIN_DURATION_S,
+    trend_runs: int = 30,
+) -> RunReport:
+    """Rulările din index.jsonl (ordinea din fișier) => grupuri pe (versiune, host), regresii și trendul recent."""
+    points = [p for p in map(run_point, runs) if p is not None]
+    points = [p for p in points if p.ads_saved > 0 and p.duration_s >= min_duration_s]
+    points.sort(key=lambda p: p.ts_utc)  # stabil: rulările fără ts_utc își păstrează ordinea din fișier
+    keys: Dict[Tuple[str, str], List[RunPoint]] = {}
+    for p in points:
+        keys.setdefault((p.version, p.host), []).append(p)
+    groups = [_group(ps, v, h) for (v, h), ps in keys.items()]
+    groups.sort(key=lambda g: (g.host, g.last_ts))
+    return RunReport(
+        total_runs=len(runs),
+        used_runs=len(points),
+        groups=groups,
+        regressions=find_regressions(points, baseline_runs, threshold),
+        trend=points[-trend_runs:] if trend_runs > 0 else [],
+    )
+
+
+def _fmt(v: Optional[float], spec: str) -> str:
+    return "-" if v is None else format(v, spec)
+
+
+def _group_rows(rep: RunReport) -> List[List[str]]:
+    return [
+        [
+            g.version,
+            g.host,
+            str(g.runs),
+            _fmt(g.ads_per_min, ".1f"),
+            _fmt(g.phones_per_ad, ".2f"),
+            _fmt(g.error_rate, ".1%"),
+            _fmt(g.duration_s and g.duration_s / 60.0, ".1f"),
+            g.last_ts,
+        ]
+        for g in rep.groups
+    ]
+
+
+def _trend_rows(rep: RunReport) -> List[List[str]]:
+    return [
+        [
+            p.ts_utc,
+            p.version,
+            p.host,
+            p.mode,
+            f"{p.ads_per_min:.1f}",
+            f"{p.phones_per_ad:.2f}",
+            f"{p.error_rate:.1%}",
+            f"{p.duration_s / 60.0:.1f}",
+        ]
+        for p in rep.trend
+    ]
+
+
+def _regression_lines(rep: RunReport) -> List[str]:
+    return [
+        f"v{r.version} pe {r.host}: {r.ads_per_min:.1f} anunțuri/min vs {r.baseline_ads_per_min:.1f} "
+        f"({r.change:+.0%}; {r.runs} rulări vs {r.baseline_runs}, baseline {', '.join(r.baseline_versions)})"
+        for r in rep.regressions
+    ]
+
+
+GROUP_HEADER = ["versiune", "host", "rulări", "anunțuri/min", "telefoane/anunț", "erori", "durată (min)", "ultima"]
+TREND_HEADER = ["ts_utc", "versiune", "host", "mod", "anunțuri/min", "telefoane/anunț", "erori", "durată (min)"]
+
+
+def render_markdown(rep: RunReport) -> str:
+    def table(header: List[str], rows: List[List[str]]) -> List[str]:
+        out = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+        return out + ["| " + " | ".join(c.replace("|", "\\|") for c in row) + " |" for row in rows]
+
+    lines = ["# Raport rulări", "", f"Rulări în index: {rep.total_runs}, folosite: {rep.used_runs}", ""]
+    lines += ["## Regresii", ""]
+    lines += [f"- {x}" for x in _regression_lines(rep)] or ["Niciuna."]
+    lines += ["", "## Pe versiune și host (mediane)", ""] + table(GROUP_HEADER, _group_rows(rep))
+    lines += ["", "## Ultimele rulări", ""] + table(TREND_HEADER, _trend_rows(rep))
+    return "\n".join(lines) + "\n"
+
+
+def _svg_trend(rep: RunReport, width: int = 720, height: int = 160) -> str:
+    """Linia anunțuri/minut a ultimelor rulări, SVG inline (fără dependențe)."""
+    ys = [p.ads_per_min for p in rep.trend]
+    if len(ys) < 2:
+        return ""
+    top = max(ys) or 1.0
+    step = width / (len(ys) - 1)
+    pts = " ".join(f"{i * step:.1f},{height - y / top * (height - 10):.1f}" for i, y in enumerate(ys))
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="#2a6" stroke-width="2" points="{pts}"/>'
+        f'<text x="2" y="12" font-size="11">{top:.1f} anunțuri/min</text></svg>'
+    )
+
+
+def render_html(rep: RunReport) -> str:
+    def table(header: List[str], rows: List[List[str]]) -> str:
+        head = "".join(f"<th>{html.escape(h)}</th>" for h in header)
+        body = "".join("<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in row) + "</tr>" for row in rows)
+        return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+    regs = _regression_lines(rep)
+    items = "".join(f'<li class="bad">{html.escape(x)}</li>' for x in regs)
+    reg_html = f"<ul>{items}</ul>" if regs else "<p>Niciuna.</p>"
+    return (
+        '<!doctype html><html lang="ro"><head><meta charset="utf-8"><title>Raport rulări</title>'
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+        "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}.bad{color:#b00}</style></head><body>"
+        f"<h1>Raport rulări</h1><p>Rulări în index: {rep.total_runs}, folosite: {rep.used_runs}</p>"
+        f"<h2>Regresii</h2>{reg_html}"
+        f"<h2>Pe versiune și host (mediane)</h2>{table(GROUP_HEADER, _group_rows(rep))}"
+        f"<h2>Ultimele rulări</h2>{_svg_trend(rep)}{table(TREND_HEADER, _trend_rows(rep))}"
+        "</body></html>\n"
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-"""
+r"""
 OLX scraper – Selenium 4 (fără selenium-wire), Geonode proxy, login persistent, retry/backoff,
 extrage telefon + câmpuri suplimentare, export incremental CSV/JSONL și XLSX final, log de rulare.
 
@@ -10,8 +10,11 @@ Rulează:
   $env:OLX_EMAIL="emailul_tau"
   $env:OLX_PASSWORD="parola_ta"
   python .\scraper_olx.py
+  # sau prin CLI (subcomenzi crawl/export/reparse/stats/login, config din flag-uri sau env)
+  python .\cli.py crawl --max-pages 1
 """
 
+import atexit
 import csv
 import json
 import logging
@@ -22,20 +25,21 @@ import re
 import socket
 import subprocess
 import sys
+import threading
 import time
-import unicodedata
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import pandas as pd
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
     ElementNotInteractableException,
     InvalidSessionIdException,
+    NoSuchWindowException,
     WebDriverException,
 )
 from selenium.webdriver.chrome.options import Options
@@ -45,6 +49,37 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from cardstate import NEW, UNCHANGED, CardMeta, CardStateStore
+from cdpdriver import CdpDriver
+from checkpoint import CheckpointJournal
+from chromeprofile import CACHE_ENTRIES_JS, CacheStats, ProfileLease, ProfilePool, chrome_profile_args
+from fetchprofile import (
+    DESKTOP,
+    KEY_FIELDS,
+    MOBILE_UA_POOL,
+    ad_url,
+    desktop_url,
+    emulation_commands,
+    missing_fields,
+    mobile_emulation,
+    mobile_url,
+    normalize_profile,
+)
+from frontier import AdFrontier, score_ad
+from helpers import PHONE_RE
+from listwork import ListingPlan, RateLimiter, next_list_pages
+from metrics import MetricsRegistry, RateWindow, start_metrics_server
+from outputstore import FLAT_COLUMNS, OUTPUT_MODES, AdStore, group_flat_rows
+from phonecapture import DOM, DOM_CLICK, MOBILE, NETWORK, NONE, PERF_LOGGING_PREFS, REPOST, NetworkPhoneSniffer
+from runlog import JsonLinesFormatter, start_queue_logging, text_formatter
+from sampler import StackSampler
+from seedschedule import SeedSchedule
+from snapshots import SnapshotWriter
+from taskqueue import Heartbeat, Task, TaskQueue, default_worker_id
+
+if TYPE_CHECKING:  # reposts trage NumPy: importat abia în `repost_index()`
+    from reposts import RepostIndex, RepostMatch
+
 try:
     from tqdm import tqdm
 except Exception:  # pragma: no cover
@@ -55,12 +90,78 @@ except Exception:  # pragma: no cover
 
 __version__ = "1.0.0"
 
+
 # ------------------------ Config general ------------------------
-HEADLESS = True
-OUTPUT_PREFIX = "anunturi_autorulote"
-EXPORT_JSONL = True
+# valorile vin din env (setat și de flag-urile din cli.py), cu default-urile de mai jos
+def _env_bool(name: str, default: bool) -> bool:
+    raw = (os.getenv(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "da", "on")
+
+
+def _env_num(name: str, default, cast=int):
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        return default
+
+
+HEADLESS = _env_bool("HEADLESS", True)
+OUTPUT_PREFIX = os.getenv("OUTPUT_PREFIX", "anunturi_autorulote")
+EXPORT_JSONL = _env_bool("EXPORT_JSONL", True)
+# flat = CSV/JSONL cu un rând per telefon (ca înainte); normalized = tabele ads + phones în SQLite, upsert între
+# rulări (JSONL cu un rând per anunț); both = amândouă
+OUTPUT_MODE = os.getenv("OUTPUT_MODE", "flat").strip().lower()
+AD_STORE_FILE = os.getenv("AD_STORE_FILE", f"{OUTPUT_PREFIX}.ads.sqlite")
+# coloane tipizate (preț/vizualizări/garanție numerice, monedă, tip vânzător) în XLSX-ul rulării (postprocess.py)
+POSTPROCESS = _env_bool("POSTPROCESS", True)
+RATES_FILE = os.getenv("RATES_FILE", "rates.json")  # curs local EUR/RON; lipsă = fără pret_eur/pret_ron
+# reposturi (reposts.py): index MinHash-LSH pe titlu + descriere, persistent între rulări => `repost_cluster`
+REPOST_INDEX = _env_bool("REPOST_INDEX", True)
+REPOST_FILE = os.getenv("REPOST_FILE", f"{OUTPUT_PREFIX}.reposts.sqlite")
+REPOST_THRESHOLD = _env_num("REPOST_THRESHOLD", 0.8, float)  # similaritate Jaccard estimată
+# repost al aceluiași vânzător, cu telefon cunoscut: fără reveal (se refolosesc telefoanele anunțului original)
+REPOST_SKIP = _env_bool("REPOST_SKIP", False)
+# jurnal pentru `--resume` (seed/pagină/linkuri rămase), rescris atomic pe parcursul crawl-ului
+CHECKPOINT_FILE = os.getenv("CHECKPOINT_FILE", f"{OUTPUT_PREFIX}.checkpoint.json")
+# în frontieră jurnalul se rescrie (cu fsync) cel mult o dată la N anunțuri sau T secunde; la reluare,
+# anunțurile scrise după ultima rescriere sunt sărite pe baza URL-urilor deja în JSONL
+CHECKPOINT_EVERY_ADS = max(1, _env_num("CHECKPOINT_EVERY_ADS", 25))
+CHECKPOINT_EVERY_S = _env_num("CHECKPOINT_EVERY_S", 10.0, float)
+
+# mod distribuit (coordinator/worker) peste o coadă SQLite partajată
+QUEUE_PATH = os.getenv("QUEUE_PATH", "olx_queue.sqlite")
+LEASE_SECONDS = 180  # un task fără heartbeat atâta timp e reluat de alt worker
+HEARTBEAT_SECONDS = 30
+TASK_MAX_SECONDS = 900  # după atât, heartbeat-ul se oprește (task blocat => lease expiră)
+MAX_TASK_ATTEMPTS = 3
+QUEUE_POLL_SECONDS = 5.0
+
+# stare per card de listă: anunțurile cunoscute și neschimbate (titlu/preț/localitate) nu se mai vizitează
+CARD_STATE_FILE = os.getenv("CARD_STATE_FILE", f"{OUTPUT_PREFIX}.cards.sqlite")
+
+MAX_PAGES_PER_SEED = _env_num("MAX_PAGES_PER_SEED", None)  # None = fără limită; 1 pentru test rapid
+# buget de timp pentru vizite; restul frontierei rămâne în checkpoint (--resume)
+MAX_RUN_MINUTES = _env_num("MAX_RUN_MINUTES", None, float)
+
+# mod daemon: re-crawl per seed la interval adaptat ritmului de anunțuri noi
+SCHEDULE_FILE = os.getenv("SCHEDULE_FILE", f"{OUTPUT_PREFIX}.schedule.json")
+DAEMON_MIN_INTERVAL_MIN = 10
+DAEMON_MAX_INTERVAL_MIN = 360
+DAEMON_TARGET_NEW = 5  # anunțuri noi dorite per trecere; intervalul se ajustează ca să le prindă
+DAEMON_ROTATE_HOURS = 24  # export XLSX + fișiere CSV/JSONL noi
+
+# workeri de listă în paralel (câte un Chrome, proxy-uri `list` pe rând); împart frontiera și dedup-ul
+LIST_WORKERS = max(1, _env_num("LIST_WORKERS", 1))
+# pagina 1 arată „Am găsit N rezultate” => restul paginilor se programează deodată (fan-out pe workeri)
+PAGE_FANOUT = _env_bool("PAGE_FANOUT", True)
+LIST_PAGE_CAP = 25  # OLX nu servește mai mult de 25 de pagini per căutare
+LIST_PAGES_PER_MIN = _env_num("LIST_PAGES_PER_MIN", 0, float)  # plafon comun al workerilor; 0 = fără
 
-MAX_PAGES_PER_SEED = None  # None = fără limită; pune 1 pentru test rapid
 MAX_PAGE_RETRIES = 4
 MAX_AD_RETRIES = 3
 BACKOFF_BASE = 1.0
@@ -69,9 +170,56 @@ BACKOFF_JITTER = 0.35
 SLEEP_BETWEEN_ADS = 0.9
 JITTER = (0.6, 1.3)  # pauze aleatoare între anunțuri (secunde)
 
+# AD_TABS > 1: un singur Chrome logat încarcă anunțuri în K tab-uri simultan (vezi TabPool)
+AD_TABS = max(1, _env_num("AD_TABS", 1))
+TAB_LOAD_TIMEOUT = 40.0  # după atât extragem din tab oricum (pagina e utilizabilă și fără ultimele resurse)
+
+# profil Chrome persistent per rol (list/ad): cache HTTP cald între rulări; gol = profil temporar (ca înainte)
+CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR", "")
+CHROME_CACHE_MB = _env_num("CHROME_CACHE_MB", 256, float)  # --disk-cache-size
+CHROME_PROFILE_MAX_AGE_H = _env_num("CHROME_PROFILE_MAX_AGE_H", 72, float)  # rotație: profil șters și refăcut
+CHROME_PROFILE_MAX_MB = _env_num("CHROME_PROFILE_MAX_MB", 1024, float)
+CHROME_PROFILE_SLOTS = max(1, _env_num("CHROME_PROFILE_SLOTS", 4))  # profiluri per rol (procese/drivere simultane)
+
+# telefonul din răspunsul API (CDP, performance log) în loc de DOM după pauze fixe
+PHONE_NETWORK_CAPTURE = _env_bool("PHONE_NETWORK_CAPTURE", True)
+PHONE_WAIT_S = 4.0  # cât așteptăm răspunsul API după click, înainte de fallback pe DOM
+
+# profilul paginilor de anunț: "desktop" (ca înainte) sau "mobile" = m.olx.ro întâi, desktop doar la câmpuri lipsă
+AD_PROFILE = normalize_profile(os.getenv("AD_PROFILE", DESKTOP))
+
 ASSISTED_LOGIN_TIMEOUT = 90
-DEBUG_SNAPSHOTS = False
-COOKIES_FILE = "olx_cookies.json"
+DEBUG_SNAPSHOTS = _env_bool("DEBUG_SNAPSHOTS", False)
+# snapshot-urile de debug se scriu în fundal (snapshots.SnapshotWriter), eșantionate și cu buget de disc
+DEBUG_DIR = os.getenv("DEBUG_DIR", "_debug")
+DEBUG_SAMPLE_RATE = _env_num("DEBUG_SAMPLE_RATE", 0.25, float)
+DEBUG_MAX_PER_TAG = _env_num("DEBUG_MAX_PER_TAG", 50)  # per rulare (proces)
+DEBUG_MAX_MB = _env_num("DEBUG_MAX_MB", 200, float)
+DEBUG_KEEP_DAYS = _env_num("DEBUG_KEEP_DAYS", 7, float)
+DEBUG_SCREENSHOTS = _env_bool("DEBUG_SCREENSHOTS", True)
+COOKIES_FILE = os.getenv("COOKIES_FILE", "olx_cookies.json")
+
+# site + fișiere externe (suprascrise de harness-ul de load test, ex. OLX_BASE_URL=http://127.0.0.1:8765)
+OLX_BASE_URL = os.getenv("OLX_BASE_URL", "https://www.olx.ro").rstrip("/")
+URLS_FILE = os.getenv("URLS_FILE", "urls.txt")
+PROXIES_FILE = os.getenv("PROXIES_FILE", "proxies.json")
+SECRETS_FILE = os.getenv("SECRETS_FILE", "secrets.env")
+# backend-ul browserului: "selenium" (chromedriver) sau "cdp" (cdpdriver.CdpDriver: DevTools direct, din asyncio)
+DRIVER_BACKENDS = ("selenium", "cdp")
+DRIVER_BACKEND = (os.getenv("DRIVER_BACKEND") or "selenium").strip().lower()
+if DRIVER_BACKEND not in DRIVER_BACKENDS:
+    DRIVER_BACKEND = "selenium"
+# fabrica de drivere (ep=, ua=, role=) în locul lui Chrome, ex. `fakedriver.FakeSite.new_driver` în soak.py
+DRIVER_FACTORY: Optional[Callable[..., Any]] = None
+# scala pauzelor și așteptărilor fixe din UI (cookie-uri, scroll, reveal); 0 = fără pauze (backend fals)
+UI_TIME_SCALE = max(0.0, _env_num("UI_TIME_SCALE", 1.0, float))
+
+# metrici live (opt-in): METRICS_PORT=9108 -> http://127.0.0.1:9108/metrics
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0") or 0)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# profiler prin eșantionare (opt-in): SAMPLE_PROFILER=1 -> logs/runs/run-<id>.collapsed (flamegraph)
+SAMPLE_PROFILER = _env_bool("SAMPLE_PROFILER", False)
+SAMPLE_PROFILER_HZ = _env_num("SAMPLE_PROFILER_HZ", 50, float)
 
 # viewport + UA
 VIEWPORT_W = (1200, 1920)
@@ -97,6 +245,13 @@ UA_POOL = [
     },
 ]
 FIXED_AD_UA = UA_POOL[0]
+FIXED_MOBILE_AD_UA = MOBILE_UA_POOL[0]
+
+
+def ad_ua() -> dict:
+    """UA-ul fix al driverului ad, după `AD_PROFILE`."""
+    return FIXED_MOBILE_AD_UA if AD_PROFILE != DESKTOP else FIXED_AD_UA
+
 
 # ------------------------ Logging rulare ------------------------
 RUN_ID: Optional[str] = None
@@ -116,18 +271,26 @@ _basic_console_logging()
 log = logging.getLogger("olx")
 
 
-def log_stage(stage: str, status: str, details: str = ""):
+def log_stage(stage: str, status: str, details: str = "", **fields: Any):
+    """`[STAGE] status | details`; `fields` (url, duration_s, proxy, ...) ajung ca atribute în înregistrare,
+    deci ca și câmpuri separate în logurile JSON lines (`LOG_FORMAT=json`)."""
     msg = f"[{stage}] {status}"
     if details:
         msg += f" | {details}"
-    log.info(msg)
+    if status.startswith("END"):
+        fields.setdefault("outcome", "fail" if "FAIL" in status else "ok")
+    log.info(msg, extra={"stage": stage, "status": status, **fields})
 
 
 def init_run_logging():
-    """Consolă + logs/all.log zilnic + logs/runs/run-<RUN_ID>.log"""
+    """Consolă + logs/all.log zilnic + logs/runs/run-<RUN_ID>.log, scrise de un QueueListener pe thread propriu.
+
+    Cu `LOG_FORMAT=json` fișierele sunt JSON lines (`all.jsonl`, `run-<RUN_ID>.jsonl`); consola rămâne text.
+    """
     import uuid
+    from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 
-    global RUN_ID, RUN_START_TS, RUN_LOG_PATH, log
+    global RUN_ID, RUN_START_TS, RUN_LOG_PATH
 
     RUN_START_TS = time.time()
     ts = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
@@ -137,25 +300,16 @@ def init_run_logging():
     os.makedirs(os.path.join(logs_dir, "runs"), exist_ok=True)
 
     level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
-    root = logging.getLogger()
-    for h in list(root.handlers):
-        root.removeHandler(h)
-    root.setLevel(level)
-
-    fmt = logging.Formatter(
-        "%(asctime)s | %(levelname)-7s | run=%(run_id)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    as_json = (os.getenv("LOG_FORMAT") or "text").strip().lower() == "json"
+    ext = "jsonl" if as_json else "log"
+    file_fmt = JsonLinesFormatter() if as_json else text_formatter()
 
     ch = logging.StreamHandler()
     ch.setLevel(level)
-    ch.setFormatter(fmt)
-    root.addHandler(ch)
-
-    from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+    ch.setFormatter(text_formatter())
 
     th = TimedRotatingFileHandler(
-        filename=os.path.join(logs_dir, "all.log"),
+        filename=os.path.join(logs_dir, f"all.{ext}"),
         when="midnight",
         backupCount=int(os.getenv("LOG_KEEP_DAYS", "60")),
         encoding="utf-8",
@@ -163,10 +317,9 @@ def init_run_logging():
         delay=False,
     )
     th.setLevel(level)
-    th.setFormatter(fmt)
-    root.addHandler(th)
+    th.setFormatter(file_fmt)
 
-    RUN_LOG_PATH = os.path.join(logs_dir, "runs", f"run-{RUN_ID}.log")
+    RUN_LOG_PATH = os.path.join(logs_dir, "runs", f"run-{RUN_ID}.{ext}")
     rh = RotatingFileHandler(
         filename=RUN_LOG_PATH,
         maxBytes=int(float(os.getenv("RUN_LOG_MAX_MB", "10")) * 1024 * 1024),
@@ -175,11 +328,9 @@ def init_run_logging():
         delay=False,
     )
     rh.setLevel(level)
-    rh.setFormatter(fmt)
-    root.addHandler(rh)
+    rh.setFormatter(file_fmt)
 
-    logger = logging.getLogger("olx")
-    log = logging.LoggerAdapter(logger, {"run_id": RUN_ID})
+    start_queue_logging([ch, th, rh], level=level, run_id=RUN_ID)
 
 
 def finalize_run_index(extra: dict | None = None):
@@ -202,6 +353,11 @@ def finalize_run_index(extra: dict | None = None):
             "run_log": RUN_LOG_PATH,
             "version": __version__,
         }
+        summary.update(cache_summary())
+        if PHONE_STRATEGY_COUNTS:
+            summary["phone_strategy"] = dict(PHONE_STRATEGY_COUNTS)
+        if AD_PROFILE_COUNTS:
+            summary["ad_profile"] = {"mode": AD_PROFILE, **AD_PROFILE_COUNTS}
         if isinstance(extra, dict):
             summary.update(extra)
         idx_path = os.path.join(os.getenv("LOG_DIR", "logs"), "runs", "index.jsonl")
@@ -212,33 +368,108 @@ def finalize_run_index(extra: dict | None = None):
         pass
 
 
-# === Regex helpers (raw strings: evită W605) ===
-import re
+def start_sampler() -> Optional[StackSampler]:
+    """Profilerul prin eșantionare al rulării (dacă `SAMPLE_PROFILER`), cu fișierul lângă logul rulării."""
+    if not SAMPLE_PROFILER:
+        return None
+    path = os.path.join(os.getenv("LOG_DIR", "logs"), "runs", f"run-{RUN_ID}.collapsed")
+    log_stage("PROFILER", "STARTING", f"{SAMPLE_PROFILER_HZ:g} Hz => {path}")
+    return StackSampler(path, hz=SAMPLE_PROFILER_HZ).start()
 
-RE_ID = re.compile(r"\bID[:\s]+(\d+)", re.IGNORECASE)
-RE_VIEWS = re.compile(r"Vizualizări?:\s*([\d\.\s]+)", re.IGNORECASE)  # acceptă și 'Vizualizari'
-RE_GARANTIE = re.compile(
-    r"\bGarantie\b.*?[:\-]?\s*([\d\s\.]+(?:\s*(?:RON|Lei|EUR|€))?)",
-    re.IGNORECASE,
-)
-RE_PRICE = re.compile(
-    r"(\d+(?:[\.\s]\d{3})*(?:,\d+)?)[\s\u00A0]*(EUR|€|RON|Lei)",
-    re.IGNORECASE,
-)
-RE_PHONE = re.compile(
-    r"(?:\+?4?0|0)\d(?:[\s\.\-]?\d){8,}",
-    re.IGNORECASE,
-)
+
+def stop_sampler(sampler: Optional[StackSampler]) -> Dict[str, Any]:
+    """Oprește samplerul și scrie fișierul; sumarul (cheia `profile`) merge în index.jsonl."""
+    if sampler is None:
+        return {}
+    try:
+        summary = sampler.stop()
+    except Exception as e:
+        log_stage("PROFILER", "END FAIL", str(e))
+        return {}
+    log_stage("PROFILER", "END OK", f"eșantioane={summary['samples']} | overhead={summary['overhead_s']}s")
+    return {"profile": summary}
 
 
-def sanitize_text(s: str) -> str:
-    if not s:
-        return ""
-    return re.sub(r"\s+", " ", s).strip()
+# ------------------------ Metrici live ------------------------
+METRICS = MetricsRegistry(namespace="olx")
+M_STAGE_SECONDS = METRICS.histogram(
+    "stage_duration_seconds", "Durata pe etapă (list_page, ad_page, extract_fields, reveal_phone)"
+)
+M_DRIVER_RESTARTS = METRICS.counter("driver_restarts", "Drivere Chrome recreate (sesiune moartă)")
+M_PROXY_UP = METRICS.gauge("proxy_up", "1 dacă ultima cerere prin endpoint a reușit, 0 altfel")
+M_PROXY_FAILURES = METRICS.counter("proxy_failures", "Cereri eșuate per endpoint proxy")
+M_QUEUE_DEPTH = METRICS.gauge("queue_depth", "Elemente în așteptare (seeds, frontier, parsing)")
+M_CACHE_REQUESTS = METRICS.counter("http_cache_requests", "Resurse încărcate de Chrome, pe rol și hit/miss")
+M_CACHE_BYTES_SAVED = METRICS.counter("http_cache_bytes_saved", "Bytes nedescărcați datorită cache-ului Chrome")
+CACHE_STATS: Dict[str, CacheStats] = {"list": CacheStats(), "ad": CacheStats()}
+M_PHONE_STRATEGY = METRICS.counter("phone_strategy", "Reveal-uri de telefon, pe strategia care a dat rezultatul")
+PHONE_STRATEGY_COUNTS: Dict[str, int] = {}
+M_REPOSTS = METRICS.counter("repost_actions", "Anunțuri recunoscute ca reposturi (index MinHash-LSH), pe acțiune")
+M_AD_PROFILE = METRICS.counter("ad_profile", "Anunțuri capturate, pe varianta de pagină folosită (mobile/desktop)")
+AD_PROFILE_COUNTS: Dict[str, int] = {}
+ADS_RATE = RateWindow(window_s=300.0)
+METRICS.gauge("ads_per_minute", "Anunțuri salvate pe minut (fereastră glisantă 5 min)").set_function(
+    ADS_RATE.per_minute
+)
 
 
-def strip_diacritics(text: str) -> str:
-    return "".join(c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn")
+def record_cache_usage(driver, role: str) -> None:
+    """Adună hit/miss-urile de cache HTTP ale documentului curent (Resource Timing); erorile se ignoră."""
+    try:
+        entries = driver.execute_script(CACHE_ENTRIES_JS) or []
+    except Exception:
+        return
+    st = CACHE_STATS[role]
+    hits, requests, saved = st.hits, st.requests, st.bytes_saved
+    st.add(entries)
+    M_CACHE_REQUESTS.inc(st.hits - hits, role=role, result="hit")
+    M_CACHE_REQUESTS.inc(st.requests - requests - (st.hits - hits), role=role, result="miss")
+    M_CACHE_BYTES_SAVED.inc(st.bytes_saved - saved, role=role)
+
+
+def cache_summary() -> Dict[str, Any]:
+    """Hit ratio + bytes economisiți pe toată rularea (și per rol), pentru index.jsonl."""
+    total = CacheStats()
+    for st in CACHE_STATS.values():
+        total.requests += st.requests
+        total.hits += st.hits
+        total.bytes_saved += st.bytes_saved
+        total.bytes_transferred += st.bytes_transferred
+    if not total.requests:
+        return {}
+    out: Dict[str, Any] = total.as_dict()
+    out["cache_by_role"] = {role: st.as_dict() for role, st in CACHE_STATS.items() if st.requests}
+    return out
+
+
+def _proxy_label(ep) -> str:
+    return f"{ep.host}:{ep.port}" if ep else "direct"
+
+
+def _mark_proxy(role: str, proxy: str, ok: bool) -> None:
+    if not proxy:
+        return
+    M_PROXY_UP.set(1 if ok else 0, role=role, endpoint=proxy)
+    if not ok:
+        M_PROXY_FAILURES.inc(role=role, endpoint=proxy)
+
+
+# === Parsare (CPU, fără driver) – vezi parsing.py ===
+from parsing import (  # noqa: E402,F401 - re-exportate pentru compatibilitate
+    EMPTY_FIELDS,
+    RE_GARANTIE,
+    RE_ID,
+    RE_PHONE,
+    RE_PRICE,
+    RE_VIEWS,
+    ParsePool,
+    extract_identifiers_from_html,
+    parse_price,
+    parse_snapshot,
+    parse_total_count,
+    sanitize_text,
+    strip_diacritics,
+)
 
 
 def normalize_url(href: str) -> str:
@@ -261,23 +492,33 @@ def clean_phone(s: str) -> str:
     return digits
 
 
-def parse_price(raw: str) -> Tuple[str, str]:
-    if not raw:
-        return "", ""
-    m = re.search(r"([\d\.\s]+)\s*(RON|Lei|LEI|EUR|€)?", raw, re.IGNORECASE)
-    if not m:
-        return "", ""
-    val = re.sub(r"[^\d]", "", m.group(1) or "").strip()
-    cur = (m.group(2) or "").upper().replace("LEI", "RON").replace("EURO", "EUR")
-    return val, cur or ""
-
-
 def exp_backoff(attempt: int) -> None:
     base = BACKOFF_BASE * (BACKOFF_FACTOR ** (attempt - 1))
     jitter = base * BACKOFF_JITTER
     time.sleep(random.uniform(max(0.05, base - jitter), base + jitter))
 
 
+def pause(seconds: float) -> None:
+    """Pauză fixă de UI (animații, scroll), scalată cu `UI_TIME_SCALE`."""
+    if seconds * UI_TIME_SCALE > 0:
+        time.sleep(seconds * UI_TIME_SCALE)
+
+
+def wait_until(driver, timeout: float) -> WebDriverWait:
+    """WebDriverWait cu timeout-ul și pasul de polling scalate cu `UI_TIME_SCALE`."""
+    return WebDriverWait(driver, timeout * UI_TIME_SCALE, poll_frequency=max(0.001, 0.5 * UI_TIME_SCALE))
+
+
+def _session_lost(e: BaseException) -> bool:
+    """Chrome mort / sesiune pierdută: driverul trebuie refăcut, nu doar pagina reîncercată."""
+    if isinstance(e, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    msg = str(e).lower()
+    return isinstance(e, WebDriverException) and any(
+        m in msg for m in ("invalid session id", "chrome not reachable", "disconnected", "session deleted")
+    )
+
+
 # ------------------------ Config extern ------------------------
 @dataclass
 class ProxyEndpoint:
@@ -349,20 +590,74 @@ def apply_stealth(driver, ua: dict) -> None:
     )
 
 
-def make_driver(ep: Optional[ProxyEndpoint], verify_ssl: bool, ua: Optional[dict] = None):
+class ProfiledChrome(webdriver.Chrome):
+    """Chrome cu `--user-data-dir` persistent; `quit()` eliberează și lock-ul profilului."""
+
+    profile: Optional[ProfileLease] = None
+
+    def quit(self) -> None:
+        try:
+            super().quit()
+        finally:
+            if self.profile is not None:
+                self.profile.release()
+                self.profile = None
+
+
+# rolurile ale căror sloturi în plus (CHROME_PROFILE_SLOTS micșorat) au fost deja șterse în acest proces
+_PROFILES_CLEANED: Set[str] = set()
+
+
+def acquire_profile(role: str) -> Optional[ProfileLease]:
+    if not (CHROME_PROFILE_DIR and role):
+        return None
+    pool = ProfilePool(
+        CHROME_PROFILE_DIR,
+        role,
+        slots=CHROME_PROFILE_SLOTS,
+        max_age_h=CHROME_PROFILE_MAX_AGE_H,
+        max_mb=CHROME_PROFILE_MAX_MB,
+    )
+    if role not in _PROFILES_CLEANED:
+        _PROFILES_CLEANED.add(role)
+        for path in pool.cleanup():
+            log_stage("PROFILE", "INFO", f"slot peste CHROME_PROFILE_SLOTS={CHROME_PROFILE_SLOTS} șters: {path}")
+    lease = pool.acquire()
+    if lease is None:
+        log_stage("PROFILE", "INFO", f"toate cele {CHROME_PROFILE_SLOTS} profiluri '{role}' sunt ocupate; temporar")
+    elif lease.rotated:
+        log_stage("PROFILE", "INFO", f"profil rotit (vechi/prea mare): {lease.path}")
+    return lease
+
+
+def make_driver(ep: Optional[ProxyEndpoint], verify_ssl: bool, ua: Optional[dict] = None, role: str = ""):
+    """Chrome nou; cu `CHROME_PROFILE_DIR` și un `role` (list/ad) folosește un profil persistent al rolului.
+
+    `DRIVER_BACKEND=cdp` întoarce un `CdpDriver` (aceleași argumente, același API folosit de scraper).
+    """
     if ua is None:
         ua = random.choice(UA_POOL)
-    w, h = random.randint(*VIEWPORT_W), random.randint(*VIEWPORT_H)
+    if DRIVER_FACTORY is not None:
+        return DRIVER_FACTORY(ep=ep, ua=ua, role=role)
     opts = Options()
     if HEADLESS:
         opts.add_argument("--headless=new")
-    opts.add_argument(f"--window-size={w},{h}")
+    if "device" in ua:
+        # UA mobil: viewport, DPR și touch de telefon (pagina m.olx.ro)
+        opts.add_experimental_option("mobileEmulation", mobile_emulation(ua))
+    else:
+        w, h = random.randint(*VIEWPORT_W), random.randint(*VIEWPORT_H)
+        opts.add_argument(f"--window-size={w},{h}")
     opts.add_argument("--no-sandbox")
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--disable-blink-features=AutomationControlled")
     opts.add_argument(f"--lang={ua['lang']}")
     opts.add_argument(f"--user-agent={ua['ua']}")
     opts.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
+    if role == "ad" and PHONE_NETWORK_CAPTURE:
+        # evenimentele CDP Network în get_log("performance"), pentru NetworkPhoneSniffer
+        opts.set_capability("goog:loggingPrefs", PERF_LOGGING_PREFS)
+        opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
     opts.add_argument("--log-level=3")
 
     # forțează conexiune directă (ignoră proxy OS/PAC)
@@ -380,8 +675,25 @@ def make_driver(ep: Optional[ProxyEndpoint], verify_ssl: bool, ua: Optional[dict
             raise ValueError(f"Protocol necunoscut: {ep.protocol}")
         opts.add_argument(f"--proxy-server={proxy_arg}")
 
-    service = Service(log_output=subprocess.DEVNULL)
-    d = webdriver.Chrome(options=opts, service=service)
+    lease = acquire_profile(role)
+    if lease is not None:
+        for arg in chrome_profile_args(lease, CHROME_CACHE_MB):
+            opts.add_argument(arg)
+
+    try:
+        if DRIVER_BACKEND == "cdp":
+            # aceleași argumente Chrome, fără chromedriver; perf log-ul vine din evenimentele Network ale tab-ului
+            d = CdpDriver.launch(opts.arguments, network_log=role == "ad" and PHONE_NETWORK_CAPTURE)
+        else:
+            d = ProfiledChrome(options=opts, service=Service(log_output=subprocess.DEVNULL))
+    except Exception:
+        if lease is not None:
+            lease.release()
+        raise
+    d.profile = lease
+    if DRIVER_BACKEND == "cdp" and "device" in ua:
+        # `mobileEmulation` e o opțiune chromedriver; pe CDP aceleași comenzi Emulation.*, pe fiecare tab
+        d.emulate(emulation_commands(ua))
     d.set_page_load_timeout(60)
     d.set_script_timeout(60)
     d.implicitly_wait(2)
@@ -418,10 +730,10 @@ def accept_cookies_if_any(driver) -> None:
     ]
     for by, sel in cands:
         try:
-            btn = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((by, sel)))
+            btn = wait_until(driver, 3).until(EC.element_to_be_clickable((by, sel)))
             driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
             btn.click()
-            time.sleep(0.2)
+            pause(0.2)
             return
         except Exception:
             pass
@@ -450,9 +762,10 @@ def save_cookies(driver, path=COOKIES_FILE) -> None:
         log_stage("LOGIN", "INFO", f"nu am putut salva cookies: {e}")
 
 
-def load_cookies(driver, base="https://www.olx.ro/", path=COOKIES_FILE) -> bool:
+def load_cookies(driver, base: Optional[str] = None, path=COOKIES_FILE) -> bool:
     if not os.path.exists(path):
         return False
+    base = base or f"{OLX_BASE_URL}/"
     try:
         driver.get(base)
         for ck in json.load(open(path, "r", encoding="utf-8")):
@@ -470,11 +783,12 @@ def load_cookies(driver, base="https://www.olx.ro/", path=COOKIES_FILE) -> bool:
 def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrome:
     def _rebuild():
         log_stage("LOGIN", "INFO", "recreez driver (sesiune invalidă)")
+        M_DRIVER_RESTARTS.inc(role="ad")
         try:
             ad_driver.quit()
         except Exception:
             pass
-        return make_driver(ep=None, verify_ssl=True, ua=FIXED_AD_UA)
+        return make_driver(ep=None, verify_ssl=True, ua=ad_ua(), role="ad")
 
     # 1) autologin din cookies
     try:
@@ -486,10 +800,10 @@ def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrom
 
     # 2) homepage
     try:
-        ad_driver.get("https://www.olx.ro/")
+        ad_driver.get(f"{OLX_BASE_URL}/")
     except InvalidSessionIdException:
         ad_driver = _rebuild()
-        ad_driver.get("https://www.olx.ro/")
+        ad_driver.get(f"{OLX_BASE_URL}/")
 
     accept_cookies_if_any(ad_driver)
     if is_logged_in(ad_driver):
@@ -501,25 +815,25 @@ def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrom
     if email and password:
         try:
             try:
-                ad_driver.get("https://www.olx.ro/cont/")
+                ad_driver.get(f"{OLX_BASE_URL}/cont/")
             except InvalidSessionIdException:
                 ad_driver = _rebuild()
-                ad_driver.get("https://www.olx.ro/cont/")
+                ad_driver.get(f"{OLX_BASE_URL}/cont/")
 
             accept_cookies_if_any(ad_driver)
-            WebDriverWait(ad_driver, 20).until(
+            wait_until(ad_driver, 20).until(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, "input[type='email'],input[name='email'],input[name='username']")
                 )
             ).send_keys(email)
 
             ad_driver.find_element(By.CSS_SELECTOR, "button[type='submit'],button[data-testid*='next']").click()
-            WebDriverWait(ad_driver, 20).until(
+            wait_until(ad_driver, 20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password'],input[name='password']"))
             ).send_keys(password)
             ad_driver.find_element(By.CSS_SELECTOR, "button[type='submit'],button[data-testid*='login']").click()
 
-            WebDriverWait(ad_driver, 30).until(lambda d: is_logged_in(d))
+            wait_until(ad_driver, 30).until(lambda d: is_logged_in(d))
             save_cookies(ad_driver)
             log_stage("LOGIN", "END OK", "auto")
             return ad_driver
@@ -530,16 +844,17 @@ def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrom
 
     # 4) login asistat
     try:
-        ad_driver.get("https://www.olx.ro/cont/")
+        ad_driver.get(f"{OLX_BASE_URL}/cont/")
     except InvalidSessionIdException:
         ad_driver = _rebuild()
-        ad_driver.get("https://www.olx.ro/cont/")
+        ad_driver.get(f"{OLX_BASE_URL}/cont/")
 
     accept_cookies_if_any(ad_driver)
     log_stage("LOGIN", "EXECUTING", f"manual, ai ~{ASSISTED_LOGIN_TIMEOUT}s în fereastră")
     t0 = time.time()
     while time.time() - t0 < ASSISTED_LOGIN_TIMEOUT:
         try:
+            ad_driver.current_url  # is_logged_in înghite erorile: o sesiune moartă iese la iveală aici
             if is_logged_in(ad_driver):
                 save_cookies(ad_driver)
                 log_stage("LOGIN", "END OK", "manual")
@@ -547,10 +862,10 @@ def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrom
         except InvalidSessionIdException:
             ad_driver = _rebuild()
             try:
-                ad_driver.get("https://www.olx.ro/cont/")
+                ad_driver.get(f"{OLX_BASE_URL}/cont/")
             except InvalidSessionIdException:
                 ad_driver = _rebuild()
-        time.sleep(1.5)
+        pause(1.5)
 
     log_stage("LOGIN", "END FAIL", "nu s-a finalizat autentificarea")
     return ad_driver
@@ -559,7 +874,7 @@ def ensure_single_login(ad_driver, email: str, password: str) -> webdriver.Chrom
 # ------------------------ Listă & anunț ------------------------
 def wait_for_list(driver) -> None:
     try:
-        WebDriverWait(driver, 12).until(
+        wait_until(driver, 12).until(
             EC.any_of(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, "[data-cy='l-card']")),
                 EC.presence_of_element_located(
@@ -576,27 +891,74 @@ def wait_for_list(driver) -> None:
 
 def parse_total_results(driver) -> Optional[int]:
     try:
-        el = driver.find_element(By.XPATH, "//*[contains(., 'Am găsit') and contains(., 'rezultat')]")
-        txt = el.text.replace(".", "")
-        m = re.search(r"(\d+)", txt)
-        if m:
-            return int(m.group(1))
+        els = driver.find_elements(By.CSS_SELECTOR, "[data-testid='total-count']")
+        if not els:
+            # elementul care conține chiar fraza, nu <html> (al cărui text e toată pagina)
+            els = driver.find_elements(By.XPATH, "//*[contains(text(), 'Am găsit')]")
+        for el in els:
+            total = parse_total_count(el.text)
+            if total is not None:
+                return total
     except Exception:
         pass
     return None
 
 
-def collect_links(driver) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+# un singur round-trip WebDriver pentru toate cardurile paginii (href + metadatele vizibile pe card)
+_CARDS_JS = """
+return Array.from(document.querySelectorAll("[data-cy='l-card']")).map(function (c) {
+  function txt(sel) { var e = c.querySelector(sel); return e ? (e.innerText || e.textContent || "") : ""; }
+  var a = c.querySelector("a[href*='/d/oferta/']");
+  var t = c.querySelector("[data-cy='ad-card-title']");
+  if (t) { t = t.querySelector("h4, h6") || t; }
+  return {
+    href: a ? a.href : "",
+    title: t ? (t.innerText || t.textContent || "") : "",
+    price: txt("[data-testid='ad-price']"),
+    location_date: txt("[data-testid='location-date']"),
+    promoted: !!c.querySelector("[data-testid='adCard-featured']")
+  };
+});
+"""
+
+
+def collect_cards(driver) -> Dict[str, CardMeta]:
+    """url -> metadatele cardului (titlu, preț, localitate - dată, promovat); {} dacă layout-ul nu se potrivește."""
+    try:
+        raw = driver.execute_script(_CARDS_JS) or []
+    except Exception:
+        return {}
+    cards: Dict[str, CardMeta] = {}
+    for c in raw:
+        href = (c or {}).get("href") or ""
+        if "/d/oferta/" not in href:
+            continue
+        url = normalize_url(href)
+        cards.setdefault(
+            url,
+            CardMeta(
+                url=url,
+                title=sanitize_text(c.get("title") or ""),
+                price=sanitize_text(c.get("price") or ""),
+                location_date=sanitize_text(c.get("location_date") or ""),
+                promoted=bool(c.get("promoted")),
+            ),
+        )
+    return cards
+
+
+def collect_links(driver) -> Tuple[List[Tuple[str, str]], Dict[str, int], Dict[str, CardMeta]]:
     stats = {"olx": 0, "autovit": 0, "other_internal": 0}
     out: List[Tuple[str, str]] = []
     seen = set()
     try:
         for _ in range(5):
             driver.execute_script("window.scrollBy(0, Math.floor(document.body.scrollHeight/5));")
-            time.sleep(0.15)
+            pause(0.15)
     except Exception:
         pass
-    time.sleep(0.2)
+    pause(0.2)
+    cards_meta = collect_cards(driver)
     anchors = []
     cards = driver.find_elements(By.CSS_SELECTOR, "[data-cy='l-card'], article")
     for c in cards:
@@ -619,9 +981,9 @@ def collect_links(driver) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
                 stats["olx"] += 1
         elif "autovit.ro" in href:
             stats["autovit"] += 1
-        elif href.startswith("https://www.olx.ro"):
+        elif href.startswith(OLX_BASE_URL):
             stats["other_internal"] += 1
-    return out, stats
+    return out, stats, cards_meta
 
 
 def first_text(driver, sels: List[Tuple[str, str]]) -> str:
@@ -636,100 +998,8 @@ def first_text(driver, sels: List[Tuple[str, str]]) -> str:
     return ""
 
 
-def extract_identifiers_from_html(html: str, page_url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    soup = BeautifulSoup(html, "html.parser")
-    ad_id = user_id = locality = None
-
-    # 1) JSON-LD
-    for tag in soup.find_all("script", {"type": "application/ld+json"}):
-        try:
-            data = json.loads(tag.string or tag.text or "")
-        except Exception:
-            continue
-        items = data if isinstance(data, list) else [data]
-        for obj in items:
-            if not isinstance(obj, dict):
-                continue
-            ad_id = ad_id or obj.get("sku")
-            ident = obj.get("identifier")
-            if not ad_id and isinstance(ident, dict):
-                ad_id = ident.get("value") or ident.get("@id") or ident.get("id")
-            if not ad_id and isinstance(ident, list):
-                for it in ident:
-                    if isinstance(it, dict):
-                        cand = it.get("value") or it.get("@id") or it.get("id")
-                        if isinstance(cand, str) and cand.strip():
-                            ad_id = cand
-                            break
-            if not ad_id:
-                for key in ("@id", "id", "url"):
-                    v = obj.get(key)
-                    if isinstance(v, str):
-                        m = re.search(r"(\d{5,})", v)
-                        if m:
-                            ad_id = m.group(1)
-                            break
-            for who in ("seller", "author", "publisher"):
-                w = obj.get(who)
-                if isinstance(w, dict):
-                    cand = w.get("@id") or w.get("id") or w.get("identifier")
-                    if isinstance(cand, dict):
-                        cand = cand.get("value") or cand.get("@id") or cand.get("id")
-                    if isinstance(cand, str):
-                        m = re.search(r"(\d{4,})", cand)
-                        user_id = m.group(1) if m else cand
-                elif isinstance(w, list):
-                    for ww in w:
-                        if isinstance(ww, dict):
-                            cand = ww.get("@id") or ww.get("id") or ww.get("identifier")
-                            if isinstance(cand, dict):
-                                cand = cand.get("value") or cand.get("@id") or cand.get("id")
-                            if isinstance(cand, str) and cand.strip():
-                                m = re.search(r"(\d{4,})", cand)
-                                user_id = m.group(1) if m else cand
-                                break
-                if user_id:
-                    break
-            addr = obj.get("address")
-            if isinstance(addr, dict):
-                locality = locality or addr.get("addressLocality") or addr.get("addressRegion")
-            elif isinstance(addr, str):
-                locality = locality or addr
-    # 2) meta/URL
-    if not ad_id:
-        for name in ("product:retailer_item_id", "al:android:url", "al:ios:url", "og:url", "twitter:url"):
-            tag = soup.find("meta", {"property": name}) or soup.find("meta", {"name": name})
-            if tag and tag.get("content"):
-                m = re.search(r"(\d{5,})", tag["content"]) or re.search(r"ID[\w-]+", tag["content"], re.I)
-                if m:
-                    ad_id = m.group(0)
-    if not ad_id:
-        m = re.search(r"(\d{5,})", page_url) or re.search(r"ID[\w-]+", page_url, re.I)
-        if m:
-            ad_id = m.group(0)
-    # user_id din profil
-    if not user_id:
-        a = soup.select_one("a[data-testid='user-profile-link'][href]")
-        if a:
-            href = a.get("href", "")
-            m = re.search(r"user(?:id)?=([\w-]+)", href, re.I)
-            if m:
-                user_id = m.group(1)
-            else:
-                segs = [s for s in href.split("/") if s]
-                if segs:
-                    user_id = segs[-1]
-    # locality DOM
-    if not locality:
-        cand = soup.select_one("[data-testid='location']") or soup.select_one("[data-testid='location-text']")
-        if cand:
-            locality = cand.get_text(strip=True)
-    if locality and "," in locality:
-        locality = locality.split(",")[0].strip()
-    return (ad_id or None), (user_id or None), (locality or None)
-
-
-def extract_fields(driver) -> Dict[str, str]:
+def capture_ad_snapshot(driver) -> Dict[str, str]:
+    """Partea „driver” a extracției: textele brute din DOM + body + HTML + URL, fără nicio parsare."""
     titlu = first_text(
         driver,
         [
@@ -767,38 +1037,26 @@ def extract_fields(driver) -> Dict[str, str]:
             (By.CSS_SELECTOR, "[data-cy='ad_description']"),
         ],
     )
-    descriere = sanitize_text(descriere)
-    pv, pc = parse_price(pret)
-
     try:
         body = driver.find_element(By.TAG_NAME, "body").text
     except Exception:
         body = ""
-    norm = strip_diacritics(body)
-
-    garantie = sanitize_text(RE_GARANTIE.search(norm).group(1)) if RE_GARANTIE.search(norm) else ""
-    id_anunt_text = sanitize_text(RE_ID.search(norm).group(1)) if RE_ID.search(norm) else ""
-    viz = sanitize_text(RE_VIEWS.search(norm).group(1)) if RE_VIEWS.search(norm) else ""
-
-    ad_id, user_id, locality = extract_identifiers_from_html(driver.page_source, driver.current_url)
-    id_final = ad_id or id_anunt_text
-
     return {
         "titlu": titlu,
         "pret": pret,
-        "pret_valoare": pv,
-        "pret_moneda": pc,
         "persoana": persoana,
-        "garantie": garantie,
-        "descriere": descriere,
-        "id_anunt": id_final or "",
-        "user_id": user_id or "",
-        "localitate": locality or "",
-        "vizualizari": viz,
         "vanzator": vanzator,
+        "descriere": descriere,
+        "body": body,
+        "html": driver.page_source,
+        "url": driver.current_url,
     }
 
 
+def extract_fields(driver) -> Dict[str, str]:
+    return parse_snapshot(capture_ad_snapshot(driver))
+
+
 # --- telefon ---
 SHOW_PHONE_SELECTORS: List[Tuple[str, str]] = [
     (By.CSS_SELECTOR, "[data-testid='show-phone-number']"),
@@ -831,163 +1089,626 @@ def _phones_from_dom(driver) -> List[str]:
     return [p for p in phones if p.startswith("07") and len(p) == 10]
 
 
-def reveal_phone_robust(driver) -> List[str]:
+def _poll_dom_phones(driver, timeout: float, step: float = 0.25) -> List[str]:
+    """DOM-ul citit repetat până apar numere sau expiră `timeout` (în loc de o pauză fixă)."""
+    deadline = time.monotonic() + timeout * UI_TIME_SCALE
+    while True:
+        nums = _phones_from_dom(driver)
+        if nums or time.monotonic() >= deadline:
+            return nums
+        pause(step)
+
+
+def _record_phone_strategy(strategy: str) -> None:
+    M_PHONE_STRATEGY.inc(strategy=strategy)
+    PHONE_STRATEGY_COUNTS[strategy] = PHONE_STRATEGY_COUNTS.get(strategy, 0) + 1
+
+
+def reveal_phone(driver) -> Tuple[List[str], str]:
+    """(telefoane, strategie): DOM deja afișat, răspunsul API prins prin CDP, DOM după click, tab mobil."""
+    phones, strategy = _reveal_phone(driver)
+    _record_phone_strategy(strategy)
+    return phones, strategy
+
+
+def _reveal_phone(driver) -> Tuple[List[str], str]:
     nums = _phones_from_dom(driver)
     if nums:
-        return sorted(set(nums))
+        return sorted(set(nums)), DOM
+    sniffer = NetworkPhoneSniffer(driver) if PHONE_NETWORK_CAPTURE else None
     for _ in range(3):
         try:
             driver.execute_script("window.scrollBy(0, 350);")
         except Exception:
             pass
-        time.sleep(0.3)
+        pause(0.3)
         clicked = False
         for by, sel in SHOW_PHONE_SELECTORS:
             try:
                 candidates = driver.find_elements(by, sel)
                 for btn in candidates:
                     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                    time.sleep(0.15)
+                    pause(0.15)
+                    if sniffer is not None:
+                        sniffer.reset()
                     if _safe_click(driver, btn):
                         clicked = True
-                        time.sleep(1.5)
-                        nums = _phones_from_dom(driver)
+                        if sniffer is not None and sniffer.available:
+                            got = sniffer.wait(PHONE_WAIT_S)
+                            if got:
+                                return got, NETWORK
+                        nums = _poll_dom_phones(driver, 1.5)
                         if nums:
-                            return sorted(set(nums))
+                            return sorted(set(nums)), DOM_CLICK
             except Exception:
                 continue
         if clicked:
             nums = _phones_from_dom(driver)
             if nums:
-                return sorted(set(nums))
+                return sorted(set(nums)), DOM_CLICK
         accept_cookies_if_any(driver)
+    # încearcă versiunea mobilă, într-o fereastră nouă; la final înapoi pe fereastra anunțului
+    # (sub TabPool e tab-ul slotului, nu prima fereastră)
+    orig = opened = None
     try:
-        # încearcă versiunea mobilă
         cur = driver.current_url
-        mobile_url = re.sub(r"^https?://(?:www\.)?olx\.ro", "https://m.olx.ro", cur, flags=re.I)
-        if mobile_url != cur:
-            driver.execute_script("window.open(arguments[0],'_blank');", mobile_url)
-            driver.switch_to.window(driver.window_handles[-1])
-            WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(0.8)
+        mobile = mobile_url(cur)
+        if mobile != cur:
+            orig = driver.current_window_handle
+            before = set(driver.window_handles)
+            driver.execute_script("window.open(arguments[0],'_blank');", mobile)
+            opened = next((h for h in driver.window_handles if h not in before), None)
+            if opened is None:
+                raise WebDriverException("fereastra mobilă nu s-a deschis")
+            driver.switch_to.window(opened)
+            wait_until(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            pause(0.8)
             accept_cookies_if_any(driver)
             nums = _phones_from_dom(driver)
             driver.close()
-            driver.switch_to.window(driver.window_handles[0])
+            opened = None
+            driver.switch_to.window(orig)
             if nums:
-                return sorted(set(nums))
+                return sorted(set(nums)), MOBILE
     except Exception:
         try:
-            if len(driver.window_handles) > 0:
-                driver.switch_to.window(driver.window_handles[0])
+            if opened is not None:
+                driver.switch_to.window(opened)
+                driver.close()
+            if orig is not None:
+                driver.switch_to.window(orig)
         except Exception:
             pass
-    return []
+    return [], NONE
+
+
+def reveal_phone_robust(driver) -> List[str]:
+    return reveal_phone(driver)[0]
 
 
 # ------------------------ Runners ------------------------
-def try_list_page(list_driver, url: str) -> List[Tuple[str, str]]:
-    log_stage("LIST_PAGE", "STARTING", f"url={url}")
+ListPage = Tuple[List[Tuple[str, str]], Dict[str, CardMeta], Optional[int], int]
+
+
+def try_list_page(list_driver, url: str, proxy: str = "") -> ListPage:
+    """(linkuri, carduri, total rezultate sau None, mărimea paginii = linkuri + carduri sărite)."""
+    log_stage("LIST_PAGE", "STARTING", f"url={url}", url=url)
+    t0 = time.perf_counter()
     try:
-        list_driver.get(url)
-        accept_cookies_if_any(list_driver)
-        wait_for_list(list_driver)
-        total = parse_total_results(list_driver)
-        links, stats = collect_links(list_driver)
-        msg = f"links={len(links)}"
+        with M_STAGE_SECONDS.time(stage="list_page"):
+            list_driver.get(url)
+            accept_cookies_if_any(list_driver)
+            wait_for_list(list_driver)
+            total = parse_total_results(list_driver)
+            links, stats, cards = collect_links(list_driver)
+        record_cache_usage(list_driver, "list")
+        _mark_proxy("list", proxy, True)
+        msg = f"links={len(links)} | cards={len(cards)}"
         if total is not None:
             msg += f" | total={total}"
         msg += f" | skipped autovit={stats.get('autovit', 0)}, other={stats.get('other_internal', 0)}"
-        log_stage("LIST_PAGE", "END OK", msg)
-        return links
+        log_stage("LIST_PAGE", "END OK", msg, url=url, duration_s=round(time.perf_counter() - t0, 3), proxy=proxy)
+        return links, cards, total, len(links) + stats.get("autovit", 0) + stats.get("other_internal", 0)
     except Exception as e:
-        log_stage("LIST_PAGE", "END FAIL", str(e))
-        return []
+        _mark_proxy("list", proxy, False)
+        log_stage("LIST_PAGE", "END FAIL", str(e), url=url, duration_s=round(time.perf_counter() - t0, 3), error=str(e))
+        if _session_lost(e):
+            raise  # driverul e mort: reîncercarea pe el n-are sens, apelantul face unul nou
+        return [], {}, None, 0
+
+
+def capture_ad(ad_driver, href: str, proxy: str = "") -> Tuple[Dict[str, str], List[str]]:
+    """Încarcă anunțul, capturează snapshot-ul și telefoanele; parsarea rămâne pe seama apelantului."""
+    log_stage("AD", "STARTING", f"url={href}", url=href)
+    t0 = time.perf_counter()
+    try:
+        ad_driver.get(ad_url(href, AD_PROFILE))
+    except Exception as e:
+        return _ad_failed(ad_driver, href, proxy, t0, e)
+    return capture_loaded_ad(ad_driver, href, proxy, t0)
 
 
-def try_ad_page(ad_driver, href: str) -> Tuple[Dict[str, str], List[str]]:
-    log_stage("AD", "STARTING", f"url={href}")
+def capture_loaded_ad(ad_driver, href: str, proxy: str, t0: float) -> Tuple[Dict[str, str], List[str]]:
+    """Snapshot + telefoane din tab-ul curent, deja navigat la `href` (de `capture_ad` sau de `TabPool`)."""
+    missing: List[str] = []
     try:
-        ad_driver.get(href)
-        WebDriverWait(ad_driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        time.sleep(0.4)
+        wait_until(ad_driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        pause(0.4)
         accept_cookies_if_any(ad_driver)
 
-        fields = extract_fields(ad_driver)
-        phones = reveal_phone_robust(ad_driver)
+        with M_STAGE_SECONDS.time(stage="capture"):
+            snap = capture_ad_snapshot(ad_driver)
+        profile = AD_PROFILE
+        missing = missing_fields(snap) if profile != DESKTOP else []
+        if missing:
+            record_cache_usage(ad_driver, "ad")
+            snap, profile = capture_desktop_fallback(ad_driver, href, missing), DESKTOP
+        if len(missing_fields(snap)) == len(KEY_FIELDS):
+            # pagină blocată / ștearsă / neîncărcată: eșec (se reîncearcă), nu un rând gol
+            raise ValueError(f"pagină fără {', '.join(KEY_FIELDS)}")
+        repost = known_repost(snap, href) if REPOST_SKIP else None
+        if repost is not None:
+            phones, strategy = list(repost.phones), REPOST
+            _record_phone_strategy(strategy)
+            M_REPOSTS.inc(action="reveal_skipped")
+        else:
+            with M_STAGE_SECONDS.time(stage="reveal_phone"):
+                phones, strategy = reveal_phone(ad_driver)
         if not phones:
+            ad_driver.current_url  # reveal-ul înghite erorile: o sesiune moartă iese la iveală aici
             debug_dump(ad_driver, href, tag="no_phone")
-
+        record_cache_usage(ad_driver, "ad")
+        M_AD_PROFILE.inc(profile=profile, fallback="yes" if missing else "no")
+        key = f"{profile}_fallback" if missing else profile
+        AD_PROFILE_COUNTS[key] = AD_PROFILE_COUNTS.get(key, 0) + 1
+        M_STAGE_SECONDS.observe(time.perf_counter() - t0, stage="ad_page")
+        _mark_proxy("ad", proxy, True)
         log_stage(
             "AD",
             "END OK",
-            f"phones={len(phones)} | ad_id={fields.get('id_anunt')} | user_id={fields.get('user_id')} "
-            f"| loc={fields.get('localitate')}",
+            f"phones={len(phones)} | via={strategy} | page={profile} | html={len(snap.get('html', ''))}B",
+            url=href,
+            duration_s=round(time.perf_counter() - t0, 3),
+            proxy=proxy,
+            phones=len(phones),
+            strategy=strategy,
+            profile=profile,
         )
-        return fields, phones
+        return snap, phones
     except Exception as e:
-        log_stage("AD", "END FAIL", str(e))
+        return _ad_failed(ad_driver, href, proxy, t0, e)
+    finally:
+        if missing:
+            try:
+                _emulate(ad_driver, FIXED_MOBILE_AD_UA)
+            except Exception:
+                pass
+
+
+def _emulate(driver, ua: dict) -> None:
+    for cmd, params in emulation_commands(ua):
+        driver.execute_cdp_cmd(cmd, params)
+
+
+def capture_desktop_fallback(ad_driver, href: str, missing: List[str]) -> Dict[str, str]:
+    """Pagina mobilă n-a avut `missing`: același tab comutat pe UA/viewport desktop, varianta desktop a anunțului.
+
+    Emularea desktop rămâne activă și pentru reveal-ul telefonului; `capture_loaded_ad` pune la loc UA-ul mobil.
+    """
+    log_stage("AD", "INFO", f"pagina mobilă fără {','.join(missing)}; fallback desktop", url=href)
+    _emulate(ad_driver, FIXED_AD_UA)
+    ad_driver.get(desktop_url(href))
+    wait_until(ad_driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    accept_cookies_if_any(ad_driver)
+    with M_STAGE_SECONDS.time(stage="capture"):
+        return capture_ad_snapshot(ad_driver)
+
+
+def _ad_failed(ad_driver, href: str, proxy: str, t0: float, e: Exception) -> Tuple[Dict[str, str], List[str]]:
+    M_STAGE_SECONDS.observe(time.perf_counter() - t0, stage="ad_page")
+    _mark_proxy("ad", proxy, False)
+    log_stage("AD", "END FAIL", str(e), url=href, duration_s=round(time.perf_counter() - t0, 3), error=str(e))
+    if _session_lost(e):
+        raise e  # fetch_ad / TabPool refac driverul și reiau anunțul
+    try:
+        debug_dump(ad_driver, href, tag="ad_fail")
+    except Exception:
+        pass
+    return {}, []
+
+
+def try_ad_page(ad_driver, href: str, proxy: str = "") -> Tuple[Dict[str, str], List[str]]:
+    snap, phones = capture_ad(ad_driver, href, proxy=proxy)
+    with M_STAGE_SECONDS.time(stage="parse"):
+        return parse_snapshot(snap), phones
+
+
+@dataclass
+class AdSession:
+    """Driverul logat pentru anunțuri + ce trebuie ca să-l recreăm când moare sesiunea."""
+
+    driver: webdriver.Chrome
+    ep: Optional[ProxyEndpoint]
+    verify_ssl: bool
+    email: str
+    password: str
+
+    @property
+    def proxy(self) -> str:
+        return _proxy_label(self.ep)
+
+    def rebuild(self) -> None:
+        M_DRIVER_RESTARTS.inc(role="ad")
         try:
-            debug_dump(ad_driver, href, tag="ad_fail")
+            self.driver.quit()
         except Exception:
             pass
-        empty = {
-            "titlu": "",
-            "pret": "",
-            "pret_valoare": "",
-            "pret_moneda": "",
-            "persoana": "",
-            "garantie": "",
-            "descriere": "",
-            "id_anunt": "",
-            "user_id": "",
-            "localitate": "",
-            "vizualizari": "",
-            "vanzator": "",
-        }
-        return empty, []
+        self.driver = make_driver(self.ep, self.verify_ssl, ua=ad_ua(), role="ad")
+        self.driver = ensure_single_login(self.driver, self.email, self.password)
+
+
+FetchedAd = Tuple[int, str, Dict[str, str], List[str]]
+
+
+def fetch_ad(sess: AdSession, href: str) -> Tuple[Dict[str, str], List[str]]:
+    """capture_ad cu retry/backoff (și la snapshot gol); la WebDriverException (sesiune moartă) refă driverul ad.
+
+    Întoarce snapshot-ul brut (de parsat cu `parse_snapshot` / `ParsePool`) și telefoanele.
+    """
+    snap: Dict[str, str] = {}
+    phones: List[str] = []
+    for attempt in range(1, MAX_AD_RETRIES + 1):
+        try:
+            snap, phones = capture_ad(sess.driver, href, proxy=sess.proxy)
+            if snap:
+                break
+        except WebDriverException as e:
+            try:
+                sess.rebuild()
+            except Exception as re_err:  # Chrome nu pornește: următoarea încercare (sau anunț) reface iar
+                log_stage("AD", "INFO", f"driver ad nerefăcut după {e.__class__.__name__}: {re_err}", url=href)
+        except Exception:
+            pass
+        exp_backoff(attempt)
+    return snap, phones
+
+
+def fetch_ads_serial(sess: AdSession, items: Iterable[Tuple[int, str]]) -> Iterator[FetchedAd]:
+    for idx, href in items:
+        snap, phones = fetch_ad(sess, href)
+        yield idx, href, snap, phones
+
+
+# starea tuturor tab-urilor într-un singur round-trip, din tab-ul controller (deschizătorul lor)
+_TABS_STATUS_JS = """
+var out = [];
+var tabs = window.__olxTabs || [];
+for (var i = 0; i < tabs.length; i++) {
+  var w = tabs[i], st = "closed";
+  try { if (w && !w.closed) { st = w.__olxPending ? "loading" : w.document.readyState; } }
+  catch (e) { st = "foreign"; }
+  out.push(st);
+}
+return out;
+"""
+_TAB_OPEN_JS = "window.__olxTabs = window.__olxTabs || []; window.__olxTabs.push(window.open('about:blank', '_blank'));"
+_TAB_NAVIGATE_JS = "var w = window.__olxTabs[arguments[0]]; w.__olxPending = true; w.location.href = arguments[1];"
+
+
+class TabPool:
+    """K tab-uri în Chrome-ul logat al sesiunii ad: navigările pornesc simultan, extragem din primul tab încărcat.
+
+    ChromeDriver blochează orice comandă pe un tab care încă se încarcă, deci navigarea și starea tab-urilor
+    trec printr-un tab „controller” de pe aceeași origine (deschizătorul lor), cu un singur execute_script.
+    Sesiunea și cookie-urile rămân într-un singur proces Chrome; latența de rețea a tab-urilor se suprapune.
+    """
+
+    def __init__(self, sess: AdSession, tabs: int):
+        self.sess = sess
+        self.k = max(1, tabs)
+        self.controller = ""
+        self.handles: List[str] = []
+
+    def _setup(self) -> None:
+        d = self.sess.driver
+        self.controller = d.current_window_handle
+        # controller-ul pe originea tab-urilor (m.olx.ro în profilul mobil), altfel starea lor e „foreign”
+        home = ad_url(f"{OLX_BASE_URL}/", AD_PROFILE)
+        if not (d.current_url or "").startswith(home.rstrip("/")):
+            d.get(home)
+        d.execute_script("window.__olxTabs = [];")
+        self.handles = []
+        for _ in range(self.k):
+            before = set(d.window_handles)
+            d.execute_script(_TAB_OPEN_JS)
+            self.handles.extend(h for h in d.window_handles if h not in before)
+        if len(self.handles) != self.k:
+            raise WebDriverException(f"tab-uri deschise {len(self.handles)}/{self.k}")
+        # backend-ul CDP atașează tab-ul (emulare mobilă, log de rețea) la primul switch: înainte de prima navigare
+        for h in self.handles:
+            d.switch_to.window(h)
+        d.switch_to.window(self.controller)
+
+    def close(self) -> None:
+        d = self.sess.driver
+        for h in self.handles:
+            try:
+                d.switch_to.window(h)
+                d.close()
+            except Exception:
+                pass
+        self.handles = []
+        try:
+            d.switch_to.window(self.controller)
+        except Exception:
+            pass
+
+    def fetch(self, items: Iterable[Tuple[int, str]]) -> Iterator[FetchedAd]:
+        """Ca `fetch_ads_serial`, dar până la K anunțuri în zbor; ordinea rezultatelor = ordinea încărcării."""
+        source = iter(items)
+        retry: "deque[Tuple[int, str, int]]" = deque()
+        busy: Dict[int, Tuple[int, str, int, float]] = {}  # slot -> (idx, href, încercare, t0)
+        free: List[int] = []
+        rebuilds = 0
+        while True:
+            try:
+                if not self.handles:
+                    self._setup()
+                    free = list(range(self.k))
+                d = self.sess.driver
+                while free:
+                    item = retry.popleft() if retry else next(((i, h, 1) for i, h in source), None)
+                    if item is None:
+                        break
+                    slot = free.pop()
+                    log_stage("AD", "STARTING", f"url={item[1]} | tab={slot}", url=item[1])
+                    # în `busy` înainte de navigare: o excepție de aici îl reia, nu îl pierde
+                    busy[slot] = (*item, time.perf_counter())
+                    d.switch_to.window(self.controller)
+                    d.execute_script(_TAB_NAVIGATE_JS, slot, ad_url(item[1], AD_PROFILE))
+                if not busy:
+                    return
+                d.switch_to.window(self.controller)
+                states = d.execute_script(_TABS_STATUS_JS) or []
+                now = time.perf_counter()
+                ready = [
+                    slot
+                    for slot, (_i, _h, _a, t0) in busy.items()
+                    if (states[slot] if slot < len(states) else "closed") in ("complete", "foreign", "closed")
+                    or now - t0 > TAB_LOAD_TIMEOUT
+                ]
+                if not ready:
+                    time.sleep(0.1)
+                    continue
+                for slot in ready:
+                    idx, href, attempt, t0 = busy[slot]
+                    d.switch_to.window(self.handles[slot])
+                    snap, phones = capture_loaded_ad(d, href, self.sess.proxy, t0)
+                    # scos din `busy` doar după captură: dacă tab-ul cade, anunțul se reia cu cele din zbor
+                    del busy[slot]
+                    free.append(slot)
+                    if not snap and attempt < MAX_AD_RETRIES:
+                        retry.append((idx, href, attempt + 1))
+                        continue
+                    rebuilds = 0
+                    yield idx, href, snap, phones
+            except WebDriverException as e:
+                # Chrome mort / tab pierdut: driver nou, iar anunțurile din zbor se reiau
+                rebuilds += 1
+                if rebuilds > MAX_AD_RETRIES:
+                    raise
+                log_stage("AD", "INFO", f"tab pool resetat ({e.__class__.__name__}); reiau {len(busy)} anunțuri")
+                retry.extendleft((i, h, a) for i, h, a, _t in busy.values())
+                busy.clear()
+                self.handles = []
+                self.sess.rebuild()
+                exp_backoff(rebuilds)
+
+
+def fetch_ads(sess: AdSession, items: Iterable[Tuple[int, str]], tabs: int = 1) -> Iterator[FetchedAd]:
+    """(idx, href, snapshot, telefoane) pentru fiecare anunț; cu `tabs > 1` prin `TabPool`."""
+    if tabs <= 1:
+        yield from fetch_ads_serial(sess, items)
+        return
+    pool = TabPool(sess, tabs)
+    try:
+        yield from pool.fetch(items)
+    finally:
+        pool.close()
+
+
+@dataclass
+class _ParsingAd:
+    link_idx: int
+    href: str
+    phones: List[str]
+    snap: Dict[str, str]
+    future: "Future[Tuple[Dict[str, str], float]]"
+    card: Optional[CardMeta] = None
+
+
+def drain_parsed(
+    parsing: "deque[_ParsingAd]",
+    writers: "IncrementalWriters",
+    stats: Dict[str, int],
+    seen: set[str],
+    block: bool = False,
+    card_store: Optional[CardStateStore] = None,
+) -> List[int]:
+    """Scrie, în ordinea vizitării, anunțurile a căror parsare s-a terminat (toate, dacă `block`).
+
+    Întoarce `link_idx`-urile scrise (pentru checkpoint).
+    """
+    written: List[int] = []
+    while parsing and (block or parsing[0].future.done()):
+        item = parsing.popleft()
+        try:
+            fields, parse_s = item.future.result()
+        except Exception:
+            # proces mort din pool / eroare neprevăzută: reparsăm inline
+            t0 = time.perf_counter()
+            fields, parse_s = parse_snapshot(item.snap), time.perf_counter() - t0
+        M_STAGE_SECONDS.observe(parse_s, stage="parse")
+        if not any(fields.values()):
+            stats["errors"] += 1
+        elif card_store is not None and item.card is not None:
+            card_store.mark_visited(item.card, fields.get("user_id") or "", bool(item.phones))
+        rows = ad_rows(fields, item.phones, item.href)
+        tag_reposts(rows, stats)
+        writers.append_many(rows)
+        stats["phones_found"] += sum(1 for r in rows if r["telefon"])
+        stats["ads_saved"] += len(rows)
+        seen.add(item.href)
+        written.append(item.link_idx)
+        ADS_RATE.mark()
+        log_stage(
+            "AD",
+            "SAVED",
+            f"phones={len(item.phones)} | ad_id={fields.get('id_anunt')} | user_id={fields.get('user_id')} "
+            f"| loc={fields.get('localitate')}",
+        )
+    return written
+
+
+def ad_rows(fields: Dict[str, str], phones: List[str], href: str) -> List[Dict[str, str]]:
+    """Rândurile de output ale unui anunț: unul per telefon (sau unul fără telefon)."""
+    phones = list(dict.fromkeys([clean_phone(p) for p in phones if p]))
+    if not phones:
+        return [{"telefon": "", **fields, "url": href}]
+    return [{"telefon": ph, **fields, "url": href} for ph in phones]
+
+
+def plan_visits(
+    links: List[Tuple[str, str]],
+    cards: Dict[str, CardMeta],
+    store: Optional[CardStateStore],
+    known: set[str],
+    visited: set[str],
+    stats: Dict[str, int],
+) -> List[Tuple[str, str]]:
+    """Linkurile unei pagini care merită vizitate: noi sau schimbate pe card; cele neschimbate se sar.
+
+    Fără metadate de card (layout necunoscut), un anunț deja exportat (`known`) e tratat ca neschimbat.
+    """
+    fresh = []
+    for txt, href in links:
+        href = normalize_url(href)
+        if href not in visited:
+            fresh.append((txt, href))
+    verdict: Dict[str, str] = {}
+    if store is not None:
+        verdict = store.classify_many((cards[h] for _, h in fresh if h in cards), known=known)
+    out: List[Tuple[str, str]] = []
+    for txt, href in fresh:
+        v = verdict.get(href) or (UNCHANGED if href in known else NEW)
+        if v == UNCHANGED:
+            stats["ads_skipped"] += 1
+            continue
+        stats["ads_new" if v == NEW else "ads_changed"] += 1
+        out.append((txt, href))
+    log_stage("PLAN", "INFO", f"links={len(links)} | de vizitat={len(out)} | sărite={len(fresh) - len(out)}")
+    return out
+
+
+def enqueue_ads(
+    frontier: AdFrontier,
+    links: List[Tuple[str, str]],
+    cards: Dict[str, CardMeta],
+    seed_idx: int,
+    store: Optional[CardStateStore],
+) -> None:
+    """Pune linkurile planificate în frontieră cu scorul lor (card + vânzător cunoscut din vizite anterioare)."""
+    sellers = store.sellers_for(h for _, h in links) if store is not None else {}
+    for txt, href in links:
+        seller_known, phone_cached = sellers.get(href, (False, False))
+        frontier.push(txt, href, score_ad(cards.get(href), seed_idx, seller_known, phone_cached))
 
 
 # ------------------------ Export incremental ------------------------
+def typed_columns():
+    """DataFrame => DataFrame cu coloanele tipizate din postprocess.py (pandas/NumPy importate doar la export)."""
+    from postprocess import load_rates, postprocess
+
+    rates = load_rates(RATES_FILE)
+    return lambda df: postprocess(df, rates)
+
+
 class IncrementalWriters:
-    def __init__(self, prefix: str, enable_jsonl: bool = True):
+    """Output-ul rulării după `OUTPUT_MODE`: CSV/JSONL plat, store-ul normalizat `AdStore`, sau amândouă."""
+
+    def __init__(
+        self,
+        prefix: str,
+        enable_jsonl: bool = True,
+        resume_paths: Optional[Dict[str, Optional[str]]] = None,
+        mode: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ):
+        mode = mode or OUTPUT_MODE
+        self.mode = mode if mode in OUTPUT_MODES else "flat"
+        # `last_run` în store: la `--resume`, rularea întreruptă (din checkpoint), ca exportul să-i cuprindă anunțurile
+        self.run_id = run_id or RUN_ID
         ts = time.strftime("%Y%m%d-%H%M%S")
-        self.csv_path = f"{prefix}_{ts}.csv"
+        self.csv_path: Optional[str] = f"{prefix}_{ts}.csv" if self.mode != "normalized" else None
         self.jsonl_path = f"{prefix}_{ts}.jsonl" if enable_jsonl else None
+        if resume_paths and (resume_paths.get("csv") or resume_paths.get("jsonl")):
+            # reluare: continuăm în aceleași fișiere ale rulării întrerupte
+            self.csv_path = resume_paths.get("csv") if self.mode != "normalized" else None
+            self.jsonl_path = resume_paths.get("jsonl") if enable_jsonl else None
+        self.store = AdStore(AD_STORE_FILE) if self.mode != "flat" else None
         self._csv_init = False
         self._csv_fh = None
         self._csv_writer = None
-        self.cols = [
-            "telefon",
-            "titlu",
-            "pret",
-            "pret_valoare",
-            "pret_moneda",
-            "persoana",
-            "garantie",
-            "descriere",
-            "id_anunt",
-            "user_id",
-            "localitate",
-            "vizualizari",
-            "vanzator",
-            "url",
-        ]
+        self.cols = list(FLAT_COLUMNS)
         self.rows_cache: List[Dict[str, str]] = []
+        if resume_paths and self.csv_path and os.path.exists(self.csv_path):
+            with open(self.csv_path, "r", encoding="utf-8-sig", newline="") as f:
+                self.rows_cache.extend(csv.DictReader(f))
 
-    def append(self, row: Dict[str, str]):
-        if not self._csv_init:
-            self._csv_fh = open(self.csv_path, "a", newline="", encoding="utf-8-sig")
-            self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=self.cols)
+    def _open_csv(self):
+        if self._csv_init:
+            return
+        fresh = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        self._csv_fh = open(self.csv_path, "a", newline="", encoding="utf-8-sig" if fresh else "utf-8")
+        cols = self.cols
+        if not fresh:
+            # CSV reluat dintr-o versiune cu mai puține coloane: rândurile noi urmează header-ul existent
+            with open(self.csv_path, "r", newline="", encoding="utf-8-sig") as f:
+                cols = next(csv.reader(f), None) or self.cols
+        self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=cols, extrasaction="ignore")
+        if fresh:
             self._csv_writer.writeheader()
-            self._csv_init = True
-        self._csv_writer.writerow(row)
-        self._csv_fh.flush()
+        self._csv_init = True
+
+    def append(self, row: Dict[str, str]):
+        self.append_many([row])
+
+    def append_many(self, rows: List[Dict[str, str]]):
+        """Scrie toate rândurile unui anunț împreună, cu un singur flush (anunțul apare complet sau deloc)."""
+        if self.store is not None:
+            self.store.upsert_rows(rows, self.run_id)
+        if self.csv_path:
+            self._open_csv()
+            self._csv_writer.writerows(rows)
+            self._csv_fh.flush()
+            self.rows_cache.extend(rows)
         if self.jsonl_path:
+            if self.mode == "normalized":
+                # un obiect per anunț, cu telefoanele ca listă (descrierea nu se mai repetă per telefon)
+                lines = [{**fields, "url": url, "telefoane": phones} for url, fields, phones in group_flat_rows(rows)]
+            else:
+                lines = rows
             with open(self.jsonl_path, "a", encoding="utf-8") as jf:
-                jf.write(json.dumps(row, ensure_ascii=False) + "\n")
+                jf.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
                 jf.flush()
-        self.rows_cache.append(row)
+
+    def written_urls(self) -> Set[str]:
+        """URL-urile scrise deja de rulare (cu `--resume`, și cele de dinainte de întrerupere)."""
+        urls = {str(r.get("url") or "").strip() for r in self.rows_cache}
+        if self.store is not None:
+            urls |= {a["url"] for a in self.store.ads(self.run_id)}
+        urls.discard("")
+        return urls
 
     def close(self):
         try:
@@ -995,10 +1716,20 @@ class IncrementalWriters:
                 self._csv_fh.close()
         except Exception:
             pass
+        if self.store is not None:
+            self.store.close()
 
     def export_excel(self, xlsx_path: str):
         try:
-            pd.DataFrame(self.rows_cache, columns=self.cols).to_excel(xlsx_path, index=False)
+            transform = typed_columns() if POSTPROCESS else None
+            if self.mode == "normalized":
+                # foile anunturi + telefoane, doar anunțurile atinse de rularea curentă (inclusiv înainte de reluare)
+                self.store.export_excel(xlsx_path, run_id=self.run_id, transform=transform)
+                return
+            import pandas as pd  # doar pentru exportul XLSX (import lent)
+
+            df = pd.DataFrame(self.rows_cache, columns=self.cols)
+            (transform(df) if transform else df).to_excel(xlsx_path, index=False)
         except Exception as e:
             log.warning(f"Nu am putut scrie Excel: {e}")
 
@@ -1029,126 +1760,791 @@ def load_seen_urls_from_history(prefix: str) -> set[str]:
                             seen.add(str(vals[-1]).strip())
     except Exception:
         pass
+    if os.path.exists(AD_STORE_FILE):
+        # anunțurile scrise în modul normalizat nu apar în CSV-uri
+        store = AdStore(AD_STORE_FILE)
+        try:
+            seen |= store.seen_urls()
+        except Exception:
+            pass
+        finally:
+            store.close()
     return seen
 
 
 # ------------------------ Main ------------------------
-def main():
+def new_run_stats() -> Dict[str, int]:
+    return {
+        "links_total": 0,
+        "ads_saved": 0,
+        "phones_found": 0,
+        "errors": 0,
+        "ads_new": 0,
+        "ads_changed": 0,
+        "ads_skipped": 0,
+        "reposts": 0,
+    }
+
+
+@dataclass
+class CrawlState:
+    """Driverele, pool-ul de parsare și output-ul unei rulări; partajat de main() și de modul daemon."""
+
+    list_driver: Any
+    list_proxy: str
+    ad_sess: AdSession
+    parse_pool: ParsePool
+    writers: IncrementalWriters
+    card_store: CardStateStore
+    seen: set[str]
+    stats: Dict[str, int]
+    cards: Dict[str, CardMeta] = field(default_factory=dict)
+    # linkuri deja planificate în ciclul curent (un anunț poate apărea în mai multe seed-uri)
+    queued: set[str] = field(default_factory=set)
+    parsing: "deque[_ParsingAd]" = field(default_factory=deque)
+    # seed-ul care a planificat anunțul (pentru throughput-ul per seed) și contoarele per seed
+    seed_of: Dict[str, int] = field(default_factory=dict)
+    seed_stats: Dict[int, Dict[str, float]] = field(default_factory=dict)
+    # serializează planificarea/checkpoint-ul între workerii de listă (încărcarea paginilor rămâne paralelă)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def seed_summary(crawl: CrawlState, seeds: List[str]) -> List[Dict[str, object]]:
+    """Throughput per seed pentru sumarul rulării (index.jsonl)."""
+    out: List[Dict[str, object]] = []
+    for seed_idx, st in sorted(crawl.seed_stats.items()):
+        list_s = st.get("list_s", 0.0)
+        out.append(
+            {
+                "seed": seeds[seed_idx] if seed_idx < len(seeds) else seed_idx,
+                "pages": int(st.get("pages", 0)),
+                "links": int(st.get("links", 0)),
+                "planned": int(st.get("planned", 0)),
+                "duplicates": int(st.get("duplicates", 0)),
+                "ads_saved": int(st.get("ads_saved", 0)),
+                "list_s": round(list_s, 2),
+                "pages_per_min": round(st.get("pages", 0) * 60.0 / list_s, 2) if list_s else None,
+            }
+        )
+    return out
+
+
+def list_page(
+    crawl: CrawlState,
+    frontier: AdFrontier,
+    seed_idx: int,
+    seed: str,
+    page_idx: int,
+    driver: Any = None,
+    proxy: Optional[str] = None,
+) -> Optional[Tuple[List[Tuple[str, str]], Optional[int], int]]:
+    """Listează o pagină a unui seed (cu retry) și pune anunțurile planificate în frontieră.
+
+    Întoarce (linkurile planificate, total rezultate, mărimea paginii); None = pagina nu are anunțuri
+    (sfârșitul seed-ului sau eșec).
+    """
+    driver = crawl.list_driver if driver is None else driver
+    proxy = crawl.list_proxy if proxy is None else proxy
+    url = seed if page_idx == 1 else _with_page(seed, page_idx)
+    t0 = time.perf_counter()
+    links: List[Tuple[str, str]] = []
+    page_cards: Dict[str, CardMeta] = {}
+    total, size = None, 0
+    for attempt in range(1, MAX_PAGE_RETRIES + 1):
+        links, page_cards, total, size = try_list_page(driver, url, proxy=proxy)
+        if links:
+            break
+        exp_backoff(attempt)
+    with crawl.lock:
+        st = crawl.seed_stats.setdefault(seed_idx, {})
+        st["list_s"] = st.get("list_s", 0.0) + time.perf_counter() - t0
+        if not links:
+            log_stage("LIST_PAGE", "EMPTY", f"url={url}", url=url)
+            return None
+        dups = sum(1 for _, h in links if normalize_url(h) in crawl.queued)
+        planned = plan_visits(links, page_cards, crawl.card_store, crawl.seen, crawl.queued, crawl.stats)
+        crawl.queued.update(normalize_url(h) for _, h in links)
+        crawl.cards.update(page_cards)
+        enqueue_ads(frontier, planned, crawl.cards, seed_idx, crawl.card_store)
+        for _, h in planned:
+            crawl.seed_of.setdefault(h, seed_idx)
+        for key, n in (("pages", 1), ("links", len(links)), ("planned", len(planned)), ("duplicates", dups)):
+            st[key] = st.get(key, 0) + n
+        M_QUEUE_DEPTH.set(len(frontier), queue="frontier")
+    return planned, total, size
+
+
+def list_seeds(
+    crawl: CrawlState,
+    frontier: AdFrontier,
+    seeds: List[str],
+    plan: ListingPlan,
+    journal: Optional[CheckpointJournal] = None,
+    workers: int = 1,
+    new_driver: Optional[Any] = None,
+    fanned: Optional[Dict[int, Tuple[int, int]]] = None,
+) -> None:
+    """Listează paginile din `plan` cu `workers` workeri de listă în paralel, într-o frontieră comună.
+
+    Workerul 0 folosește `crawl.list_driver`; ceilalți primesc drivere de la `new_driver(wid)` ->
+    (driver, proxy), care refă și driverul unui worker a cărui sesiune moare. Dedup-ul între seed-uri (`crawl.queued`) și frontiera sunt comune. Când pagina 1
+    arată totalul de rezultate, toate paginile seed-ului se programează deodată (`fanned`: seed ->
+    (pagini, mărimea paginii 1)) și se împart între workeri, în limita `LIST_PAGES_PER_MIN`.
+    """
+    fanned = {} if fanned is None else fanned
+    limiter = RateLimiter(LIST_PAGES_PER_MIN)
+
+    def next_pages(seed_idx: int, page_idx: int, total: Optional[int], size: int) -> List[int]:
+        pages, fan = next_list_pages(
+            page_idx, total, size, fanned.get(seed_idx), MAX_PAGES_PER_SEED, LIST_PAGE_CAP, PAGE_FANOUT
+        )
+        if fan is not None and seed_idx not in fanned:
+            fanned[seed_idx] = fan
+            log_stage("LIST", "INFO", f"seed={seed_idx + 1} | total={total} | pagini={fan[0]} (fan-out)")
+        return pages
+
+    live: Dict[int, Any] = {}  # worker -> driverul curent (refăcut după o sesiune moartă)
+
+    def relist(wid: int, seed_idx: int, page_idx: int) -> Optional[Tuple[List[Tuple[str, str]], Optional[int], int]]:
+        for attempt in range(1, MAX_PAGE_RETRIES + 1):
+            driver, proxy = live[wid]
+            try:
+                return list_page(crawl, frontier, seed_idx, seeds[seed_idx], page_idx, driver, proxy)
+            except WebDriverException as e:
+                if new_driver is None or not _session_lost(e):
+                    raise
+                log_stage("LIST_WORKER", "INFO", f"worker={wid} | driver refăcut ({e.__class__.__name__})")
+                M_DRIVER_RESTARTS.inc(role="list")
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                live[wid] = new_driver(wid)
+                if wid == 0:
+                    crawl.list_driver, crawl.list_proxy = live[wid]
+                exp_backoff(attempt)
+        return None
+
+    def work(wid: int, driver: Any, proxy: str) -> None:
+        live[wid] = (driver, proxy)
+        while True:
+            item = plan.get()
+            if item is None:
+                return
+            seed_idx, page_idx = item
+            res: Optional[Tuple[List[Tuple[str, str]], Optional[int], int]] = None
+            try:
+                limiter.wait()
+                res = relist(wid, seed_idx, page_idx)
+            finally:
+                more = next_pages(seed_idx, page_idx, res[1], res[2]) if res is not None else []
+                if plan.done(seed_idx, page_idx, more):
+                    log_stage("SEED", "END OK", f"seed={seed_idx + 1}/{len(seeds)} | worker={wid}")
+            if journal is not None:
+                with crawl.lock:
+                    listing = plan.snapshot()
+                    first = min(listing.items(), key=lambda kv: int(kv[0]), default=(str(len(seeds)), [1]))
+                    journal.update(
+                        seed_idx=int(first[0]),
+                        page_idx=first[1][0],
+                        listing=listing,
+                        listing_fanned={str(k): list(v) for k, v in fanned.items() if str(k) in listing},
+                        pending=frontier.snapshot(),
+                        inflight=None,
+                    )
+
+    def run_extra(wid: int) -> None:
+        try:
+            driver, proxy = new_driver(wid)
+        except Exception as e:
+            log_stage("LIST_WORKER", "END FAIL", f"worker={wid} | {e}")
+            return
+        try:
+            work(wid, driver, proxy)
+        finally:
+            try:
+                live.get(wid, (driver, proxy))[0].quit()
+            except Exception:
+                pass
+
+    threads = []
+    if new_driver is not None:
+        for wid in range(1, workers):
+            t = threading.Thread(target=run_extra, args=(wid,), name=f"list-worker-{wid}", daemon=True)
+            t.start()
+            threads.append(t)
+    try:
+        work(0, crawl.list_driver, crawl.list_proxy)
+    except BaseException:
+        plan.close()
+        raise
+    finally:
+        for t in threads:
+            t.join()
+
+
+def list_seed(
+    crawl: CrawlState,
+    frontier: AdFrontier,
+    seed_idx: int,
+    seed: str,
+    start_page: int = 1,
+    journal: Optional[CheckpointJournal] = None,
+    stop_when_stale: bool = False,
+) -> int:
+    """Listează secvențial paginile unui seed în frontieră; întoarce nr. de pagini listate.
+
+    `stop_when_stale`: oprește paginarea la prima pagină fără nimic nou/schimbat (seed sortat după dată).
+    """
+    page_idx, pages = start_page, 0
+    while MAX_PAGES_PER_SEED is None or page_idx <= MAX_PAGES_PER_SEED:
+        res = list_page(crawl, frontier, seed_idx, seed, page_idx)
+        if res is None:
+            break
+        planned = res[0]
+        pages += 1
+        page_idx += 1
+        if journal is not None:
+            journal.update(seed_idx=seed_idx, page_idx=page_idx, pending=frontier.snapshot(), inflight=None)
+        if stop_when_stale and not planned:
+            break
+    return pages
+
+
+def visit_frontier(
+    crawl: CrawlState,
+    order: List[Tuple[str, str, float]],
+    journal: Optional[CheckpointJournal] = None,
+    deadline: Optional[float] = None,
+) -> int:
+    """Vizitează anunțurile în ordinea dată (priorității); întoarce indexul primului anunț nevizitat.
+
+    Cu `AD_TABS > 1` anunțurile se termină în ordinea încărcării, deci checkpoint-ul ține explicit
+    lista celor încă nescrise (în zbor, în parsare sau nepornite).
+    """
+    if order:
+        log_stage("FRONTIER", "INFO", f"anunțuri={len(order)} | scor {order[0][2]:.2f} → {order[-1][2]:.2f}")
+    parsing, workers = crawl.parsing, crawl.parse_pool.workers
+    written: Set[int] = set()
+    low = next_idx = 0
+    since_save, saved_at = 0, time.monotonic()
+
+    def pending() -> Optional[List[List[object]]]:
+        nonlocal low
+        while low in written:
+            low += 1
+        return [list(order[i]) for i in range(low, len(order)) if i not in written] or None
+
+    def write(block: bool = False) -> None:
+        for i in drain_parsed(parsing, crawl.writers, crawl.stats, crawl.seen, block, crawl.card_store):
+            written.add(i)
+            seed_idx = crawl.seed_of.get(order[i][1])
+            if seed_idx is not None:
+                st = crawl.seed_stats.setdefault(seed_idx, {})
+                st["ads_saved"] = st.get("ads_saved", 0) + 1
+
+    def started() -> Iterator[Tuple[int, str]]:
+        nonlocal next_idx, since_save, saved_at
+        for link_idx, (_txt, href, _score) in enumerate(order):
+            if deadline is not None and time.time() > deadline:
+                log_stage("FRONTIER", "INFO", f"buget de timp epuizat; rămân {len(order) - link_idx} anunțuri")
+                return
+            next_idx = link_idx + 1
+            M_QUEUE_DEPTH.set(len(order) - link_idx, queue="frontier")
+            crawl.stats["links_total"] += 1
+            since_save += 1
+            if journal is not None and (
+                since_save >= CHECKPOINT_EVERY_ADS or time.monotonic() - saved_at >= CHECKPOINT_EVERY_S
+            ):
+                journal.update(pending=pending(), inflight=href)
+                since_save, saved_at = 0, time.monotonic()
+            yield link_idx, href
+
+    for link_idx, href, snap, phones in tqdm(fetch_ads(crawl.ad_sess, started(), AD_TABS), total=len(order)):
+        parsing.append(_ParsingAd(link_idx, href, phones, snap, crawl.parse_pool.submit(snap), crawl.cards.get(href)))
+        M_QUEUE_DEPTH.set(len(parsing), queue="parsing")
+        write()
+        if len(parsing) > max(2, 2 * workers):
+            write(block=True)
+
+        time.sleep(random.uniform(*JITTER))
+
+    write(block=True)
+    M_QUEUE_DEPTH.set(len(order) - next_idx, queue="frontier")
+    if journal is not None:
+        journal.update(pending=pending(), inflight=None)
+    return next_idx
+
+
+def export_run(writers: IncrementalWriters, stats: Dict[str, int]) -> str:
+    """Export final XLSX + meta JSON al rulării; întoarce calea XLSX."""
+    log_stage("EXPORT", "STARTING")
+    ts = time.strftime("%Y%m%d-%H%M%S")
+    xlsx_path = f"{OUTPUT_PREFIX}_{ts}.xlsx"
+    writers.export_excel(xlsx_path)
+    writers.close()
+    # meta JSON al rularii
+    meta = {
+        "version": __version__,
+        "xlsx": xlsx_path,
+        "csv": writers.csv_path,
+        "jsonl": writers.jsonl_path,
+        "output_mode": writers.mode,
+        "ads_store": writers.store.path if writers.store is not None else None,
+        "stats": stats,
+    }
+    with open(f"{OUTPUT_PREFIX}_{ts}.runmeta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    log_stage("EXPORT", "END OK", f"xlsx={xlsx_path} | csv={writers.csv_path} | phones={stats['phones_found']}")
+    return xlsx_path
+
+
+def main(resume: bool = False) -> Dict[str, int]:
     init_run_logging()
     log_stage("BOOT", "STARTING", f"v{__version__} | headless={HEADLESS}")
+    metrics_server = None
+    if METRICS_PORT:
+        try:
+            metrics_server = start_metrics_server(METRICS, METRICS_PORT, METRICS_HOST)
+            log_stage("METRICS", "END OK", f"http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            log_stage("METRICS", "END FAIL", str(e))
+    sampler = start_sampler()
 
     # config extern
-    proxies = load_proxies("proxies.json")
-    email, password = load_secrets("secrets.env")
-    seeds = read_urls("urls.txt")
+    proxies = load_proxies(PROXIES_FILE)
+    email, password = load_secrets(SECRETS_FILE)
+    seeds = read_urls(URLS_FILE)
     seen_urls_history = load_seen_urls_from_history(OUTPUT_PREFIX)
+    card_store = CardStateStore(CARD_STATE_FILE)
 
     # drivere
     list_ep = random.choice(proxies.list_endpoints) if proxies.list_endpoints else None
     ad_ep = random.choice(proxies.ad_endpoints) if proxies.ad_endpoints else None
 
-    list_driver = make_driver(list_ep, proxies.verify_ssl, ua=None)
-    ad_driver = make_driver(ad_ep, proxies.verify_ssl, ua=FIXED_AD_UA)
+    list_driver = make_driver(list_ep, proxies.verify_ssl, ua=None, role="list")
+    ad_driver = make_driver(ad_ep, proxies.verify_ssl, ua=ad_ua(), role="ad")
 
     # login single (cu cookies)
     ad_driver = ensure_single_login(ad_driver, email, password)
+    ad_sess = AdSession(ad_driver, ad_ep, proxies.verify_ssl, email, password)
+
+    # checkpoint: la `--resume` continuăm exact de la seed/pagina/linkul unde s-a oprit rularea anterioară
+    journal = CheckpointJournal(CHECKPOINT_FILE)
+    state = journal.load() if resume else None
+    if state is not None and not journal.matches(seeds):
+        log_stage("RESUME", "INFO", "urls.txt s-a schimbat față de checkpoint; pornesc de la zero")
+        state = None
+    writers = IncrementalWriters(
+        OUTPUT_PREFIX,
+        enable_jsonl=EXPORT_JSONL,
+        resume_paths=state.get("outputs") if state else None,
+        run_id=state.get("run_id") if state else None,
+    )
+    if state is None:
+        journal.start(writers.run_id, seeds, {"csv": writers.csv_path, "jsonl": writers.jsonl_path})
+        listing, resume_pending = {i: [1] for i in range(len(seeds))}, None
+        fanned: Dict[int, Tuple[int, int]] = {}
+    else:
+        start_seed, start_page = int(state.get("seed_idx", 0)), int(state.get("page_idx", 1))
+        if state.get("listing") is not None:
+            listing = ListingPlan.from_snapshot(state["listing"])
+        else:  # checkpoint secvențial: seed-ul curent de la pagina lui, următoarele de la 1
+            listing = {i: [start_page if i == start_seed else 1] for i in range(start_seed, len(seeds))}
+        fanned = {int(k): (int(v[0]), int(v[1])) for k, v in (state.get("listing_fanned") or {}).items()}
+        resume_pending = state.get("pending")
+        log_stage(
+            "RESUME",
+            "END OK",
+            f"seed={start_seed + 1}/{len(seeds)} | page={start_page} | seeds nelistate={len(listing)} "
+            f"| pending={len(resume_pending or [])} | inflight={state.get('inflight')} | csv={writers.csv_path} "
+            f"| run_id={writers.run_id}",
+        )
 
-    writers = IncrementalWriters(OUTPUT_PREFIX, enable_jsonl=EXPORT_JSONL)
-    stats = {"links_total": 0, "ads_saved": 0, "phones_found": 0, "errors": 0}
-
-    try:
-        for seed in seeds:
-            page_idx = 1
-            seen_this_seed = set()
-            while True and (MAX_PAGES_PER_SEED is None or page_idx <= MAX_PAGES_PER_SEED):
-                url = seed if page_idx == 1 else _with_page(seed, page_idx)
-                links = []
-                for attempt in range(1, MAX_PAGE_RETRIES + 1):
-                    links = try_list_page(list_driver, url)
-                    if links:
-                        break
-                    exp_backoff(attempt)
-                if not links:
-                    log_stage("LIST_PAGE", "EMPTY", f"url={url}")
-                    break
-
-                # procesează anunțurile
-                for _txt, href in tqdm(links, total=len(links)):
-                    href = normalize_url(href)
-                    if href in seen_urls_history or href in seen_this_seed:
-                        continue
-                    seen_this_seed.add(href)
-                    stats["links_total"] += 1
-
-                    fields: Dict[str, str] = {}
-                    phones: List[str] = []
-                    for attempt in range(1, MAX_AD_RETRIES + 1):
-                        try:
-                            fields, phones = try_ad_page(ad_driver, href)
-                            break
-                        except WebDriverException:
-                            # sesiune moartă? refă driverul ad
-                            try:
-                                ad_driver.quit()
-                            except Exception:
-                                pass
-                            ad_driver = make_driver(ad_ep, proxies.verify_ssl, ua=FIXED_AD_UA)
-                            ad_driver = ensure_single_login(ad_driver, email, password)
-                            exp_backoff(attempt)
-                        except Exception:
-                            exp_backoff(attempt)
-
-                    phones = list(dict.fromkeys([clean_phone(p) for p in phones if p]))
-                    if phones:
-                        for ph in phones:
-                            writers.append({"telefon": ph, **fields, "url": href})
-                            stats["phones_found"] += 1
-                            stats["ads_saved"] += 1
-                    else:
-                        writers.append({"telefon": "", **fields, "url": href})
-                        stats["ads_saved"] += 1
-
-                    time.sleep(random.uniform(*JITTER))
+    stats = new_run_stats()
+    METRICS.expose_stats(lambda: stats)
+    parse_pool = ParsePool()
+    log_stage("BOOT", "INFO", f"parse workers={parse_pool.workers}")
+    crawl = CrawlState(
+        list_driver, _proxy_label(list_ep), ad_sess, parse_pool, writers, card_store, seen_urls_history, stats
+    )
 
-                page_idx += 1
+    # frontiera: toate anunțurile listate, vizitate apoi în ordinea priorității (nu a paginii)
+    frontier = AdFrontier()
+    if resume_pending:
+        # anunțurile scrise după ultimul `journal.update` sunt încă în `pending`: nu le mai vizităm (dubluri în CSV)
+        written = writers.written_urls()
+        resume_pending = [item for item in resume_pending if str(item[1]) not in written]
+        log_stage("RESUME", "INFO", f"pending de vizitat={len(resume_pending)} | deja scrise={len(written)}")
+    for item in resume_pending or []:
+        frontier.push(str(item[0]), str(item[1]), float(item[2]) if len(item) > 2 else 0.0)
+    deadline = time.time() + MAX_RUN_MINUTES * 60 if MAX_RUN_MINUTES else None
+
+    def extra_list_driver(wid: int) -> Tuple[Any, str]:
+        eps = proxies.list_endpoints
+        ep = eps[(eps.index(list_ep) + wid) % len(eps)] if eps and list_ep in eps else None
+        return make_driver(ep, proxies.verify_ssl, ua=None, role="list"), _proxy_label(ep)
 
-        # export final XLSX + meta
-        log_stage("EXPORT", "STARTING")
-        ts = time.strftime("%Y%m%d-%H%M%S")
-        xlsx_path = f"{OUTPUT_PREFIX}_{ts}.xlsx"
-        writers.export_excel(xlsx_path)
-        writers.close()
-        # meta JSON al rularii
-        meta = {
-            "version": __version__,
-            "xlsx": xlsx_path,
-            "csv": writers.csv_path,
-            "jsonl": writers.jsonl_path,
-            "stats": stats,
-        }
-        with open(f"{OUTPUT_PREFIX}_{ts}.runmeta.json", "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
-        log_stage("EXPORT", "END OK", f"xlsx={xlsx_path} | csv={writers.csv_path} | phones={stats['phones_found']}")
+    try:
+        # 1) listare: paginile sunt ieftine față de vizitele de anunț, deci le parcurgem pe toate întâi;
+        #    cu LIST_WORKERS > 1 seed-urile se listează în paralel, în aceeași frontieră
+        M_QUEUE_DEPTH.set(len(listing), queue="seeds")
+        workers = min(LIST_WORKERS, max(1, len(listing)))
+        log_stage("LIST", "STARTING", f"seeds={len(listing)} | workers={workers}")
+        list_seeds(crawl, frontier, seeds, ListingPlan(listing), journal, workers, extra_list_driver, fanned)
+        journal.update(seed_idx=len(seeds), page_idx=1, listing={}, pending=frontier.snapshot(), inflight=None)
+
+        # 2) vizite, cele mai valoroase întâi
+        order = [frontier.pop() for _ in range(len(frontier))]
+        next_idx = visit_frontier(crawl, order, journal, deadline)
+
+        export_run(writers, stats)
+        if next_idx >= len(order):
+            journal.complete()
+        return stats
 
     finally:
-        try:
-            list_driver.quit()
-        except Exception:
-            pass
-        try:
-            ad_driver.quit()
-        except Exception:
-            pass
+        parse_pool.shutdown()
+        card_store.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        for d in (crawl.list_driver, ad_sess.driver):
+            try:
+                d.quit()
+            except Exception:
+                pass
         finalize_run_index(
             {
                 "phones_found": stats["phones_found"],
                 "ads_saved": stats["ads_saved"],
                 "links_total": stats["links_total"],
+                "errors": stats["errors"],
+                "ads_new": stats["ads_new"],
+                "ads_changed": stats["ads_changed"],
+                "ads_skipped": stats["ads_skipped"],
+                "seeds": seed_summary(crawl, seeds),
+                **stop_sampler(sampler),
             }
         )
         log_stage("BOOT", "END")
 
 
+# ------------------------ Mod daemon ------------------------
+def run_daemon() -> None:
+    """Proces de lungă durată: drivere și sesiune calde, fiecare seed re-crawl-uit pe intervalul lui.
+
+    Paginarea unui seed se oprește la prima pagină fără nimic nou/schimbat, deci seed-urile ar trebui
+    sortate după dată (ex. `search[order]=created_at:desc`). Se oprește cu Ctrl+C (export final).
+    """
+    init_run_logging()
+    log_stage("DAEMON", "STARTING", f"v{__version__} | headless={HEADLESS} | schedule={SCHEDULE_FILE}")
+    metrics_server = None
+    if METRICS_PORT:
+        try:
+            metrics_server = start_metrics_server(METRICS, METRICS_PORT, METRICS_HOST)
+        except OSError as e:
+            log_stage("METRICS", "END FAIL", str(e))
+    sampler = start_sampler()
+
+    proxies = load_proxies(PROXIES_FILE)
+    email, password = load_secrets(SECRETS_FILE)
+    seeds = read_urls(URLS_FILE)
+    card_store = CardStateStore(CARD_STATE_FILE)
+    list_ep = random.choice(proxies.list_endpoints) if proxies.list_endpoints else None
+    ad_ep = random.choice(proxies.ad_endpoints) if proxies.ad_endpoints else None
+    list_driver = make_driver(list_ep, proxies.verify_ssl, ua=None, role="list")
+    ad_driver = ensure_single_login(make_driver(ad_ep, proxies.verify_ssl, ua=ad_ua(), role="ad"), email, password)
+    ad_sess = AdSession(ad_driver, ad_ep, proxies.verify_ssl, email, password)
+
+    stats = new_run_stats()
+    METRICS.expose_stats(lambda: stats)
+    parse_pool = ParsePool()
+    writers = IncrementalWriters(OUTPUT_PREFIX, enable_jsonl=EXPORT_JSONL)
+    crawl = CrawlState(
+        list_driver,
+        _proxy_label(list_ep),
+        ad_sess,
+        parse_pool,
+        writers,
+        card_store,
+        load_seen_urls_from_history(OUTPUT_PREFIX),
+        stats,
+    )
+    schedule = SeedSchedule(
+        SCHEDULE_FILE,
+        min_interval_s=DAEMON_MIN_INTERVAL_MIN * 60,
+        max_interval_s=DAEMON_MAX_INTERVAL_MIN * 60,
+        target_new=DAEMON_TARGET_NEW,
+    )
+    rotate_at = time.time() + DAEMON_ROTATE_HOURS * 3600
+
+    try:
+        while True:
+            try:
+                seeds = read_urls(URLS_FILE)  # urls.txt se poate edita cu daemonul pornit
+            except (OSError, ValueError) as e:
+                log_stage("DAEMON", "INFO", f"urls.txt ilizibil ({e}); păstrez lista anterioară")
+            schedule.sync(seeds)
+            seed, wait = schedule.next_due()
+            if seed is None or wait > 0:
+                time.sleep(min(max(wait, 1.0), 30.0))
+                continue
+
+            seed_idx = seeds.index(seed)
+            before_new, before_changed = stats["ads_new"], stats["ads_changed"]
+            crawl.queued.clear()
+            crawl.cards.clear()
+            frontier = AdFrontier()
+            try:
+                pages = list_seed(crawl, frontier, seed_idx, seed, stop_when_stale=True)
+            except WebDriverException as e:
+                log_stage("DAEMON", "INFO", f"listare întreruptă ({e.__class__.__name__})")
+                pages = 0
+            if pages == 0:
+                # nicio pagină listată: driverul de listă e probabil mort după ore de rulare => unul nou
+                try:
+                    crawl.list_driver.quit()
+                except Exception:
+                    pass
+                crawl.list_driver = make_driver(list_ep, proxies.verify_ssl, ua=None, role="list")
+                M_DRIVER_RESTARTS.inc(role="list")
+            visit_frontier(crawl, [frontier.pop() for _ in range(len(frontier))])
+            new_ads = stats["ads_new"] - before_new
+            interval = schedule.record(seed, new_ads, pages)
+            log_stage(
+                "DAEMON",
+                "INFO",
+                f"seed={seed_idx + 1}/{len(seeds)} | pagini={pages} | noi={new_ads} "
+                f"| schimbate={stats['ads_changed'] - before_changed} | următorul peste {interval / 60:.0f} min",
+            )
+
+            if time.time() >= rotate_at:
+                export_run(crawl.writers, stats)
+                crawl.writers = IncrementalWriters(OUTPUT_PREFIX, enable_jsonl=EXPORT_JSONL)
+                rotate_at = time.time() + DAEMON_ROTATE_HOURS * 3600
+    except KeyboardInterrupt:
+        log_stage("DAEMON", "INFO", "oprit manual")
+    finally:
+        export_run(crawl.writers, stats)
+        parse_pool.shutdown()
+        card_store.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        for d in (crawl.list_driver, ad_sess.driver):
+            try:
+                d.quit()
+            except Exception:
+                pass
+        finalize_run_index({"mode": "daemon", **stats, **stop_sampler(sampler)})
+        log_stage("DAEMON", "END")
+
+
+# ------------------------ Mod distribuit: coordinator / worker ------------------------
+def _list_task(
+    seed_idx: int, seed: str, page: int, fan: Optional[Tuple[int, int]] = None
+) -> Tuple[str, str, Dict[str, object]]:
+    url = seed if page == 1 else _with_page(seed, page)
+    payload: Dict[str, object] = {"seed_idx": seed_idx, "seed": seed, "page": page, "url": url}
+    if fan is not None:
+        payload["fanout"] = list(fan)
+    return "list", f"list:{url}", payload
+
+
+def _run_list_task(
+    list_driver,
+    task: Task,
+    seen: set[str],
+    proxy: str,
+    card_store: Optional[CardStateStore] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Tuple[str, str, Dict[str, object]]]:
+    """O pagină de listă => task-uri `ad` pentru anunțurile noi/schimbate + task-urile paginilor următoare.
+
+    Pagina 1 cu total cunoscut programează toate paginile seed-ului deodată, deci workerii le iau în paralel.
+    """
+    p = task.payload
+    links: List[Tuple[str, str]] = []
+    cards: Dict[str, CardMeta] = {}
+    for attempt in range(1, MAX_PAGE_RETRIES + 1):
+        links, cards, total, size = try_list_page(list_driver, str(p["url"]), proxy=proxy)
+        if links:
+            break
+        exp_backoff(attempt)
+    if not links:
+        log_stage("LIST_PAGE", "EMPTY", f"url={p['url']}")
+        return []
+    if stats is None:
+        stats = {"ads_new": 0, "ads_changed": 0, "ads_skipped": 0}
+    new: List[Tuple[str, str, Dict[str, object]]] = []
+    planned = plan_visits(links, cards, card_store, seen, set(), stats)
+    sellers = card_store.sellers_for(h for _, h in planned) if card_store is not None else {}
+    for _txt, href in planned:
+        card = cards.get(href)
+        seller_known, phone_cached = sellers.get(href, (False, False))
+        payload: Dict[str, object] = {
+            "url": href,
+            "seed_idx": p["seed_idx"],
+            "priority": round(score_ad(card, int(p["seed_idx"]), seller_known, phone_cached), 4),  # type: ignore
+        }
+        if card is not None:
+            payload["card"] = card.as_dict()
+        new.append(("ad", href, payload))
+    fan_in = p.get("fanout")
+    pages, fan = next_list_pages(
+        int(p["page"]),  # type: ignore[arg-type]
+        total,
+        size,
+        (int(fan_in[0]), int(fan_in[1])) if isinstance(fan_in, list) else None,
+        MAX_PAGES_PER_SEED,
+        LIST_PAGE_CAP,
+        PAGE_FANOUT,
+    )
+    for page in pages:
+        new.append(_list_task(int(p["seed_idx"]), str(p["seed"]), page, fan))  # type: ignore[arg-type]
+    return new
+
+
+def export_results(queue: TaskQueue, writers: IncrementalWriters, stats: Dict[str, int]) -> int:
+    """Mută în CSV/JSONL rezultatele încă neexportate din coadă (fiecare anunț o singură dată)."""
+    n = 0
+    for rows in queue.pop_unexported():
+        tag_reposts(rows, stats)
+        writers.append_many(rows)
+        stats["ads_saved"] += len(rows)
+        stats["phones_found"] += sum(1 for r in rows if r.get("telefon"))
+        ADS_RATE.mark()
+        n += 1
+    return n
+
+
+def run_coordinator(queue_path: str = QUEUE_PATH, wait: bool = True) -> None:
+    """Pune seed-urile din urls.txt în coadă, urmărește progresul workerilor și exportă rezultatele."""
+    init_run_logging()
+    seeds = read_urls(URLS_FILE)
+    queue = TaskQueue(queue_path, lease_s=LEASE_SECONDS, max_attempts=MAX_TASK_ATTEMPTS)
+    added = queue.add_many(_list_task(i, seed, 1) for i, seed in enumerate(seeds))
+    log_stage("COORD", "STARTING", f"v{__version__} | queue={queue_path} | seeds noi={added}/{len(seeds)}")
+
+    writers = IncrementalWriters(OUTPUT_PREFIX, enable_jsonl=EXPORT_JSONL)
+    stats = {"links_total": 0, "ads_saved": 0, "phones_found": 0, "errors": 0}
+    try:
+        while True:
+            reclaimed = queue.reclaim_expired()
+            exported = export_results(queue, writers, stats)
+            c = queue.counts()
+            for status, n in c.items():
+                M_QUEUE_DEPTH.set(n, queue=f"tasks_{status}")
+            log_stage(
+                "COORD",
+                "INFO",
+                f"pending={c['pending']} | leased={c['leased']} | done={c['done']} | failed={c['failed']} "
+                f"| exported={exported} | reclaimed={reclaimed}",
+            )
+            if not wait or queue.is_drained():
+                break
+            time.sleep(QUEUE_POLL_SECONDS)
+        export_results(queue, writers, stats)
+        export_run(writers, stats)
+    finally:
+        writers.close()
+        queue.close()
+        finalize_run_index({"mode": "coordinator", **stats})
+        log_stage("COORD", "END")
+
+
+def run_worker(queue_path: str = QUEUE_PATH, worker_id: Optional[str] = None) -> None:
+    """Ia task-uri din coadă până se golește; driverele se pornesc doar când e nevoie de ele."""
+    init_run_logging()
+    owner = worker_id or default_worker_id()
+    log_stage("WORKER", "STARTING", f"v{__version__} | id={owner} | queue={queue_path}")
+    sampler = start_sampler()
+    proxies = load_proxies(PROXIES_FILE)
+    email, password = load_secrets(SECRETS_FILE)
+    seen_urls_history = load_seen_urls_from_history(OUTPUT_PREFIX)
+    card_store = CardStateStore(CARD_STATE_FILE)
+    list_ep = random.choice(proxies.list_endpoints) if proxies.list_endpoints else None
+    ad_ep = random.choice(proxies.ad_endpoints) if proxies.ad_endpoints else None
+    queue = TaskQueue(queue_path, lease_s=LEASE_SECONDS, max_attempts=MAX_TASK_ATTEMPTS)
+    list_driver = None
+    ad_sess: Optional[AdSession] = None
+    stats = {
+        "links_total": 0,
+        "ads_saved": 0,
+        "phones_found": 0,
+        "errors": 0,
+        "ads_new": 0,
+        "ads_changed": 0,
+        "ads_skipped": 0,
+    }
+
+    try:
+        while True:
+            task = queue.lease(owner)
+            if task is None:
+                if queue.is_drained():
+                    break
+                time.sleep(QUEUE_POLL_SECONDS)
+                continue
+            rows: Optional[List[Dict[str, str]]] = None
+            card: Optional[CardMeta] = None
+            new_tasks: List[Tuple[str, str, Dict[str, object]]] = []
+            with Heartbeat(queue_path, task, owner, LEASE_SECONDS, HEARTBEAT_SECONDS, TASK_MAX_SECONDS) as hb:
+                try:
+                    if task.kind == "list":
+                        if list_driver is None:
+                            list_driver = make_driver(list_ep, proxies.verify_ssl, ua=None, role="list")
+                        new_tasks = _run_list_task(
+                            list_driver, task, seen_urls_history, _proxy_label(list_ep), card_store, stats
+                        )
+                    else:
+                        if ad_sess is None:
+                            d = make_driver(ad_ep, proxies.verify_ssl, ua=ad_ua(), role="ad")
+                            ad_sess = AdSession(
+                                ensure_single_login(d, email, password), ad_ep, proxies.verify_ssl, email, password
+                            )
+                        snap, phones = fetch_ad(ad_sess, task.key)
+                        fields = parse_snapshot(snap)
+                        if not any(fields.values()):
+                            stats["errors"] += 1
+                        else:
+                            card = CardMeta.from_dict(task.payload.get("card"))  # type: ignore[arg-type]
+                        rows = ad_rows(fields, phones, task.key)
+                except WebDriverException as e:
+                    # Chrome a murit: eliberăm task-ul imediat și pornim drivere noi la următorul task
+                    queue.fail(task, owner, str(e))
+                    for d in (list_driver, ad_sess.driver if ad_sess else None):
+                        try:
+                            if d is not None:
+                                d.quit()
+                        except Exception:
+                            pass
+                    list_driver, ad_sess = None, None
+                    M_DRIVER_RESTARTS.inc(role=task.kind)
+                    continue
+            if hb.lost or not queue.complete(task, owner, rows=rows, new_tasks=new_tasks):
+                log_stage("WORKER", "INFO", f"lease pierdut pentru {task.key}; rezultatul e ignorat")
+                continue
+            if rows is not None:
+                if card is not None:
+                    card_store.mark_visited(card, rows[0].get("user_id") or "", any(r["telefon"] for r in rows))
+                stats["links_total"] += 1
+                stats["ads_saved"] += len(rows)
+                stats["phones_found"] += sum(1 for r in rows if r["telefon"])
+                ADS_RATE.mark()
+            time.sleep(random.uniform(*JITTER))
+    finally:
+        for d in (list_driver, ad_sess.driver if ad_sess else None):
+            try:
+                if d is not None:
+                    d.quit()
+            except Exception:
+                pass
+        queue.close()
+        card_store.close()
+        finalize_run_index({"mode": "worker", "worker_id": owner, **stats, **stop_sampler(sampler)})
+        log_stage("WORKER", "END")
+
+
 # utilitar pentru paginare
 def _with_page(url: str, page: int) -> str:
     s = urlsplit(url)
@@ -1159,33 +2555,118 @@ def _with_page(url: str, page: int) -> str:
 
 
 # debug dumps (opțional)
-def _ensure_dir(p: str) -> None:
-    try:
-        os.makedirs(p, exist_ok=True)
-    except Exception:
-        pass
+_SNAPSHOTS: Optional[SnapshotWriter] = None
+
+
+def snapshot_writer() -> SnapshotWriter:
+    """Writer-ul de fundal al rulării, pornit la primul snapshot; golit la ieșirea procesului."""
+    global _SNAPSHOTS
+    if _SNAPSHOTS is None:
+        _SNAPSHOTS = SnapshotWriter(
+            DEBUG_DIR,
+            run_id=RUN_ID,
+            sample_rate=DEBUG_SAMPLE_RATE,
+            max_per_tag=DEBUG_MAX_PER_TAG,
+            max_mb=DEBUG_MAX_MB,
+            keep_days=DEBUG_KEEP_DAYS,
+        )
+        atexit.register(_SNAPSHOTS.close)
+    return _SNAPSHOTS
+
+
+_REPOSTS: Optional[RepostIndex] = None
+
+
+def repost_index() -> Optional[RepostIndex]:
+    """Indexul de reposturi, deschis la prima folosire; None cu REPOST_INDEX=0."""
+    global _REPOSTS
+    if _REPOSTS is None and REPOST_INDEX:
+        from reposts import RepostIndex  # NumPy doar cu indexul pornit (import lent)
+
+        _REPOSTS = RepostIndex(REPOST_FILE, threshold=REPOST_THRESHOLD)
+        atexit.register(_REPOSTS.close)
+    return _REPOSTS
+
+
+def known_repost(snap: Dict[str, str], href: str) -> Optional[RepostMatch]:
+    """Anunț indexat cu același text, al aceluiași vânzător (nume afișat) și cu telefon cunoscut; altfel None.
+
+    Rulează înainte de reveal, pe snapshot-ul brut: `user_id` nu e încă parsat, deci vânzătorul se compară
+    după nume.
+    """
+    idx = repost_index()
+    if idx is None:
+        return None
+    from reposts import ad_text
+
+    with M_STAGE_SECONDS.time(stage="repost_lookup"):
+        match = idx.lookup(ad_text(snap.get("titlu", ""), snap.get("descriere", "")))
+    if match is None or not match.phones or not match.same_seller(seller=snap.get("vanzator", "")):
+        return None
+    log_stage("AD", "REPOST", f"al {match.url} | sim={match.similarity:.2f} | fără reveal", url=href)
+    return match
+
+
+def tag_reposts(rows: List[Dict[str, str]], stats: Dict[str, int]) -> None:
+    """Indexează anunțurile din `rows` (rânduri plate) și le pune `repost_cluster`."""
+    idx = repost_index()
+    if idx is None:
+        return
+    from reposts import ad_text
+
+    for url, fields, phones in group_flat_rows(rows):
+        with M_STAGE_SECONDS.time(stage="repost_index"):
+            cluster, match = idx.add(
+                fields.get("id_anunt") or url,
+                ad_text(fields.get("titlu", ""), fields.get("descriere", "")),
+                url=url,
+                user_id=fields.get("user_id", ""),
+                seller=fields.get("vanzator", ""),
+                phones=phones,
+            )
+        if match is not None:
+            stats["reposts"] = stats.get("reposts", 0) + 1
+            M_REPOSTS.inc(action="tagged")
+        for r in rows:
+            if r.get("url") == url:
+                r["repost_cluster"] = cluster
 
 
 def debug_dump(ad_driver, url: str, tag: str = "no_phone") -> None:
     if not DEBUG_SNAPSHOTS:
         return
-    ts = time.strftime("%Y%m%d-%H%M%S")
-    base = os.path.join("_debug", f"{tag}_{ts}")
-    _ensure_dir(base)
-    try:
-        ad_driver.save_screenshot(os.path.join(base, "page.png"))
-    except Exception:
-        pass
+    writer = snapshot_writer()
+    if not writer.should_capture(tag):
+        return
+    html: Optional[str] = None
+    png: Optional[bytes] = None
     try:
         html = ad_driver.page_source
-        open(os.path.join(base, "page.html"), "w", encoding="utf-8").write(html)
-    except Exception:
-        pass
-    try:
-        open(os.path.join(base, "README.txt"), "w", encoding="utf-8").write(f"URL: {url}\nTimestamp: {ts}\n")
     except Exception:
         pass
+    if DEBUG_SCREENSHOTS:
+        try:
+            png = ad_driver.get_screenshot_as_png()
+        except Exception:
+            pass
+    writer.submit(tag, url, html, png)
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    ap = argparse.ArgumentParser(description="OLX scraper")
+    ap.add_argument("--resume", action="store_true", help=f"continuă rularea întreruptă din {CHECKPOINT_FILE}")
+    ap.add_argument("--mode", choices=["single", "daemon", "coordinator", "worker"], default="single")
+    ap.add_argument("--queue", default=QUEUE_PATH, help="coada SQLite partajată (mod coordinator/worker)")
+    ap.add_argument("--worker-id", default=None)
+    ap.add_argument("--no-wait", action="store_true", help="coordinator: un singur pas enqueue + export")
+    args = ap.parse_args()
+    if args.mode == "coordinator":
+        run_coordinator(args.queue, wait=not args.no_wait)
+    elif args.mode == "worker":
+        run_worker(args.queue, worker_id=args.worker_id)
+    elif args.mode == "daemon":
+        run_daemon()
+    else:
+        main(resume=args.resume)
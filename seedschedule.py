@@ -0,0 +1,100 @@
+"""Planificarea re-crawl-urilor în modul daemon: fiecare seed are propriul interval, adaptat la ritmul lui.
+
+După fiecare crawl al unui seed măsurăm anunțurile noi pe oră (medie exponențială) și alegem intervalul
+care ar aduce ~`target_new` anunțuri noi la următoarea trecere: categoriile aglomerate se verifică des,
+cele liniștite rar. Starea se păstrează atomic în `<prefix>.schedule.json`, deci supraviețuiește restart-urilor.
+"""
+
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from checkpoint import atomic_write_json
+
+
+@dataclass
+class SeedState:
+    interval_s: float
+    next_due: float = 0.0
+    last_crawl: float = 0.0
+    rate_per_h: Optional[float] = None
+    crawls: int = 0
+    new_total: int = 0
+    pages_total: int = 0
+
+
+class SeedSchedule:
+    def __init__(
+        self,
+        path: str,
+        min_interval_s: float = 600.0,
+        max_interval_s: float = 6 * 3600.0,
+        target_new: float = 5.0,
+        alpha: float = 0.3,
+        quiet_backoff: float = 1.5,
+    ):
+        self.path = path
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max_interval_s
+        self.target_new = target_new
+        self.alpha = alpha
+        self.quiet_backoff = quiet_backoff
+        self.seeds: Dict[str, SeedState] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.seeds = {k: SeedState(**v) for k, v in (data.get("seeds") or {}).items()}
+            except (OSError, ValueError, TypeError):
+                self.seeds = {}
+
+    def _clamp(self, v: float) -> float:
+        return min(self.max_interval_s, max(self.min_interval_s, v))
+
+    def sync(self, seeds: Iterable[str], now: Optional[float] = None) -> None:
+        """Seed-urile noi din urls.txt sunt scadente imediat; cele scoase din fișier sunt uitate."""
+        now = time.time() if now is None else now
+        seeds = list(seeds)
+        start = math.sqrt(self.min_interval_s * self.max_interval_s)
+        for seed in seeds:
+            if seed not in self.seeds:
+                self.seeds[seed] = SeedState(interval_s=start, next_due=now)
+        for gone in set(self.seeds) - set(seeds):
+            del self.seeds[gone]
+
+    def next_due(self, now: Optional[float] = None) -> Tuple[Optional[str], float]:
+        """(seed-ul cel mai restant, secunde până la scadență; <= 0 = de crawl-uit acum)."""
+        if not self.seeds:
+            return None, self.min_interval_s
+        now = time.time() if now is None else now
+        seed, st = min(self.seeds.items(), key=lambda kv: kv[1].next_due)
+        return seed, st.next_due - now
+
+    def record(self, seed: str, new_ads: int, pages: int = 0, now: Optional[float] = None) -> float:
+        """Actualizează ritmul seed-ului după un crawl și programează următorul; întoarce intervalul ales."""
+        now = time.time() if now is None else now
+        st = self.seeds.setdefault(seed, SeedState(interval_s=self.min_interval_s))
+        if st.crawls:
+            # primul crawl numără tot inventarul necunoscut, nu ritmul => ritmul se măsoară de la al doilea
+            elapsed_h = max(now - st.last_crawl, 1.0) / 3600.0
+            observed = new_ads / elapsed_h
+            st.rate_per_h = (
+                observed if st.rate_per_h is None else self.alpha * observed + (1 - self.alpha) * st.rate_per_h
+            )
+            if st.rate_per_h > 0:
+                st.interval_s = self._clamp(self.target_new / st.rate_per_h * 3600.0)
+            else:
+                st.interval_s = self._clamp(st.interval_s * self.quiet_backoff)
+        st.last_crawl = now
+        st.next_due = now + st.interval_s
+        st.crawls += 1
+        st.new_total += new_ads
+        st.pages_total += pages
+        self.save()
+        return st.interval_s
+
+    def save(self) -> None:
+        atomic_write_json(self.path, {"seeds": {k: asdict(v) for k, v in self.seeds.items()}})
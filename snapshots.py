@@ -0,0 +1,199 @@
+"""Snapshot-uri de debug (HTML + screenshot) scrise pe un thread de fundal, eșantionate și cu buget de disc.
+
+Pe thread-ul de crawl rămâne doar citirea din driver (`page_source`, screenshot PNG); compresia gzip,
+scrierea pe disc și curățenia `_debug/` se fac în fundal. Fiecare snapshot are un ID unic
+(`<tag>_<run_id>_<hex>`) și un `meta.json` cu run ID-ul, URL-ul anunțului și momentul capturii.
+Un snapshot pe care coada plină nu-l mai poate primi se aruncă (numărat în `stats["dropped"]`): crawl-ul
+nu așteaptă niciodată după disc.
+"""
+
+import gzip
+import json
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+HTML_NAME = "page.html.gz"
+PNG_NAME = "page.png"
+META_NAME = "meta.json"
+
+
+@dataclass
+class _Snapshot:
+    snap_id: str
+    tag: str
+    url: str
+    ts: float
+    html: Optional[str]
+    png: Optional[bytes]
+
+
+class SnapshotWriter:
+    def __init__(
+        self,
+        root: str = "_debug",
+        run_id: Optional[str] = None,
+        sample_rate: float = 1.0,
+        max_per_tag: int = 50,
+        max_mb: float = 200.0,
+        keep_days: float = 7.0,
+        queue_size: int = 16,
+    ):
+        self.root = root
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.max_per_tag = max_per_tag
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.keep_s = keep_days * 86400.0
+        self.stats: Dict[str, int] = {"sampled_out": 0, "capped": 0, "dropped": 0, "written": 0, "pruned": 0}
+        self._per_tag: Dict[str, int] = {}
+        self._q: "queue.Queue[Optional[_Snapshot]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="debug-snapshots", daemon=True)
+        self._thread.start()
+
+    def should_capture(self, tag: str) -> bool:
+        """Decizia de eșantionare, luată înainte de a citi ceva din driver (citirea e partea scumpă)."""
+        with self._lock:
+            if self._per_tag.get(tag, 0) >= self.max_per_tag:
+                self.stats["capped"] += 1
+                return False
+            if random.random() >= self.sample_rate:
+                self.stats["sampled_out"] += 1
+                return False
+            if self._q.full():
+                self.stats["dropped"] += 1
+                return False
+            self._per_tag[tag] = self._per_tag.get(tag, 0) + 1
+            return True
+
+    def submit(self, tag: str, url: str, html: Optional[str], png: Optional[bytes] = None) -> Optional[str]:
+        snap = _Snapshot(f"{tag}_{self.run_id}_{uuid.uuid4().hex[:10]}", tag, url, time.time(), html, png)
+        try:
+            self._q.put_nowait(snap)
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+            return None
+        return snap.snap_id
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Scrie ce e în coadă și oprește thread-ul (idempotent)."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    # ---- thread de fundal ----
+    def _run(self) -> None:
+        while True:
+            snap = self._q.get()
+            if snap is None:
+                return
+            try:
+                self._write(snap)
+                self.stats["written"] += 1
+                self.stats["pruned"] += len(self.prune())
+            except Exception:
+                pass  # debug-ul nu are voie să strice rularea
+
+    def _write(self, snap: _Snapshot) -> None:
+        d = os.path.join(self.root, snap.snap_id)
+        os.makedirs(d, exist_ok=True)
+        if snap.html is not None:
+            with gzip.open(os.path.join(d, HTML_NAME), "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(snap.html)
+        if snap.png:
+            with open(os.path.join(d, PNG_NAME), "wb") as f:
+                f.write(snap.png)  # PNG e deja comprimat
+        meta = {
+            "id": snap.snap_id,
+            "run_id": self.run_id,
+            "tag": snap.tag,
+            "url": snap.url,
+            "ts": snap.ts,
+            "ts_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(snap.ts)),
+        }
+        with open(os.path.join(d, META_NAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def prune(self, now: Optional[float] = None) -> List[str]:
+        """Retenție: șterge snapshot-urile mai vechi de `keep_days`, apoi pe cele mai vechi peste `max_mb`.
+
+        Doar directoarele scrise de writer (cu `meta.json`); snapshot-urile vechi din `_debug/` (șabloanele
+        mock-ului de load test) nu se ating.
+        """
+        now = time.time() if now is None else now
+        entries: List[Tuple[float, int, str]] = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return []
+        for name in names:
+            d = os.path.join(self.root, name)
+            if not os.path.isfile(os.path.join(d, META_NAME)):
+                continue
+            size = 0
+            for f in os.listdir(d):
+                try:
+                    size += os.path.getsize(os.path.join(d, f))
+                except OSError:
+                    pass
+            try:
+                entries.append((os.path.getmtime(d), size, d))
+            except OSError:
+                continue
+        entries.sort()
+        total = sum(size for _m, size, _d in entries)
+        removed: List[str] = []
+        for mtime, size, d in entries:
+            if now - mtime <= self.keep_s and total <= self.max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+            removed.append(d)
+        return removed
+
+
+def snapshot_html_path(d: str) -> Optional[str]:
+    """`page.html.gz` (SnapshotWriter) sau `page.html` (snapshot-uri vechi / salvate manual)."""
+    for name in (HTML_NAME, "page.html"):
+        p = os.path.join(d, name)
+        if os.path.isfile(p):
+            return p
+    return None
+
+
+def read_snapshot_html(d: str) -> str:
+    p = snapshot_html_path(d)
+    if p is None:
+        raise FileNotFoundError(os.path.join(d, HTML_NAME))
+    opener = gzip.open if p.endswith(".gz") else open
+    with opener(p, "rt", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def snapshot_url(d: str) -> str:
+    """URL-ul anunțului din `meta.json` sau, pentru snapshot-urile vechi, din `README.txt`."""
+    try:
+        with open(os.path.join(d, META_NAME), "r", encoding="utf-8") as f:
+            return str(json.load(f).get("url") or "")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        with open(os.path.join(d, "README.txt"), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("URL:"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return ""
@@ -0,0 +1,165 @@
+"""Soak test fără Chrome și fără rețea: `scraper_olx.main()` pe backend-ul fals `fakedriver`, cu defecte injectate.
+
+Mii de anunțuri simulate trec prin tot pipeline-ul (listare, captură, reveal, parsare, output) în câteva
+secunde; sesiunile moarte, timeout-urile, paginile blocate și selectorii lipsă exercită căile de recuperare.
+Raportul: anunțuri/secundă, latența de recuperare după o sesiune moartă (p50/max, câte n-au fost recuperate),
+anunțuri pierdute (din catalog, fără niciun rând complet), rânduri duplicate/parțiale, telefoane găsite vs.
+așteptate și defectele injectate.
+
+Rulează:
+  python soak.py --ads 3000 --death-rate 0.01 --timeout-rate 0.02 --block-rate 0.02 --missing-rate 0.02
+  python soak.py --ads 500 --json soak_report.json
+"""
+
+import glob
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Optional
+
+from fakedriver import FAKE_BASE_URL, FakeSite, FaultConfig
+from loadtest import _audit_outputs, _stage_latency
+from mock_olx import MockConfig, MockOlx
+
+
+def _lost_ads(mock: MockOlx, prefix: str) -> Dict[str, int]:
+    """Anunțuri din catalog fără rând cu titlu (pierdute) și rânduri cu câmpuri cheie lipsă (parțiale)."""
+    import csv
+    import re
+
+    complete, partial, rows = set(), 0, 0
+    for path in glob.glob(f"{prefix}_*.csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for r in csv.DictReader(f):
+                rows += 1
+                m = re.search(r"-(ID[0-9A-Za-z]+)\.html", r.get("url", ""))
+                if m and r.get("titlu"):
+                    complete.add(m.group(1))
+                if r.get("titlu") and not (r.get("pret") and r.get("descriere") and r.get("vanzator")):
+                    partial += 1
+    return {"lost_ads": sum(1 for ad in mock.ads if ad.code not in complete), "partial_rows": partial}
+
+
+def run_soak(
+    cfg: MockConfig,
+    faults: FaultConfig,
+    workdir: str = "_soak",
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Rulează main() pe `FakeSite` într-un director de lucru izolat și întoarce raportul."""
+    import scraper_olx as so  # înainte de chdir: cu `python -c` modulele se caută în directorul curent
+
+    mock = MockOlx(cfg)
+    site = FakeSite(mock, faults)
+    cwd = os.getcwd()
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    os.environ.setdefault("LOG_DIR", "logs")
+    env0 = os.environ.get("PARSE_WORKERS")
+    os.environ["PARSE_WORKERS"] = "0"  # parsare inline: fără procese de pornit pentru câteva secunde de rulare
+    conf = {
+        "DRIVER_FACTORY": site.new_driver,
+        "OLX_BASE_URL": FAKE_BASE_URL,
+        "UI_TIME_SCALE": 0.0,
+        "URLS_FILE": "urls.txt",
+        "PROXIES_FILE": "proxies.soak.json",
+        "SECRETS_FILE": "secrets.soak.env",
+        "COOKIES_FILE": "soak.cookies.json",
+        "OUTPUT_PREFIX": "soak",
+        "CHECKPOINT_FILE": "soak.checkpoint.json",
+        "CARD_STATE_FILE": "soak.cards.sqlite",
+        "AD_STORE_FILE": "soak.ads.sqlite",
+        "REPOST_FILE": "soak.reposts.sqlite",
+        "MAX_PAGES_PER_SEED": None,
+        "AD_TABS": 1,
+        "PHONE_NETWORK_CAPTURE": False,
+        "DEBUG_SNAPSHOTS": False,
+        "JITTER": (0.0, 0.0),
+        "BACKOFF_BASE": 0.0,
+    }
+    conf.update(overrides or {})
+    saved = {k: getattr(so, k) for k in conf if hasattr(so, k)}
+    try:
+        for k, v in conf.items():
+            setattr(so, k, v)
+        with open("urls.txt", "w", encoding="utf-8") as f:
+            f.write(f"{FAKE_BASE_URL}/oferte/\n")
+        for old in glob.glob("soak_*.csv") + glob.glob("soak.*.sqlite") + glob.glob("soak.*.json"):
+            os.remove(old)
+
+        stages0 = so.M_STAGE_SECONDS.totals()
+        t0 = time.perf_counter()
+        stats = so.main() or {}
+        elapsed = time.perf_counter() - t0
+        audit = _audit_outputs(mock, "soak")
+        audit.update(_lost_ads(mock, "soak"))
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "ads_per_second": round(audit["ads"] / elapsed, 1) if elapsed else 0.0,
+            "stats": stats,
+            "stages": _stage_latency(so.M_STAGE_SECONDS, stages0),
+            "faults": site.finish(),
+            "outputs": audit,
+            "mock": {"ads": cfg.n_ads, "page_size": cfg.page_size, "phone_rate": cfg.phone_rate},
+        }
+    finally:
+        for k, v in saved.items():
+            setattr(so, k, v)
+        if env0 is None:
+            os.environ.pop("PARSE_WORKERS", None)
+        else:
+            os.environ["PARSE_WORKERS"] = env0
+        os.chdir(cwd)
+
+
+def format_report(rep: Dict[str, Any]) -> str:
+    f, out = rep["faults"], rep["outputs"]
+    return "\n".join(
+        [
+            f"durata: {rep['elapsed_s']}s | anunțuri/s: {rep['ads_per_second']}",
+            f"defecte: sesiuni moarte={f['session_deaths']} timeout={f['timeouts']} blocate={f['blocked']} "
+            f"selectori lipsă={f['missing_selectors']} | drivere={f['drivers']} pagini={f['page_loads']}",
+            f"recuperare: {f['recoveries']}/{f['session_deaths']} p50={f['recovery_p50_ms'] or '-'}ms "
+            f"max={f['recovery_max_ms'] or '-'}ms nerecuperate={f['unrecovered']}",
+            f"output: anunțuri={out['ads']}/{out['catalog_ads']} pierdute={out['lost_ads']} rânduri={out['rows']} "
+            f"goale={out['empty_rows']} parțiale={out['partial_rows']} duplicate={out['duplicate_rows']} "
+            f"telefoane={out['phones_found']}/{out['phones_expected']}",
+        ]
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Soak test pe backend-ul WebDriver fals, cu defecte injectate")
+    ap.add_argument("--ads", type=int, default=2000)
+    ap.add_argument("--page-size", type=int, default=0, help="0 = cât încape în cele 25 de pagini ale unui seed")
+    ap.add_argument("--phone-rate", type=float, default=0.8)
+    ap.add_argument("--death-rate", type=float, default=0.01, help="sesiune moartă, per pagină încărcată")
+    ap.add_argument("--timeout-rate", type=float, default=0.02)
+    ap.add_argument("--block-rate", type=float, default=0.02)
+    ap.add_argument("--missing-rate", type=float, default=0.02, help="element cheie lipsă pe pagina de anunț")
+    ap.add_argument("--seed", type=int, default=11)
+    ap.add_argument("--workdir", default="_soak")
+    ap.add_argument("--json", default=None, help="scrie raportul complet și ca JSON")
+    args = ap.parse_args()
+
+    mock_cfg = MockConfig(
+        n_ads=args.ads,
+        page_size=args.page_size or max(40, math.ceil(args.ads / 25)),
+        phone_rate=args.phone_rate,
+        snapshot_dir="",  # template-urile minimale: parsarea rapidă, fără snapshot-urile reale de 500 KB
+    )
+    fault_cfg = FaultConfig(
+        session_death_rate=args.death_rate,
+        timeout_rate=args.timeout_rate,
+        block_rate=args.block_rate,
+        missing_selector_rate=args.missing_rate,
+        seed=args.seed,
+    )
+    result = run_soak(mock_cfg, fault_cfg, workdir=args.workdir)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,256 @@
+"""Coadă de task-uri partajată (SQLite, fără broker extern) cu lease-uri, heartbeat și rezultate exactly-once.
+
+Task-uri: `list` (o pagină de listă a unui seed) și `ad` (un URL de anunț). Un worker ia un task cu
+`lease()`, îl ține în viață cu `heartbeat()` și îl închide cu `complete()`; dacă procesul moare
+(ex. a murit Chrome-ul și worker-ul cu el), lease-ul expiră și task-ul e reluat automat de alt worker.
+Rezultatele se scriu în tabela `results` cheie = URL, în aceeași tranzacție care verifică lease-ul,
+deci un anunț ajunge o singură dată în output chiar dacă a fost procesat de doi workeri.
+
+Pentru mai multe host-uri, fișierul stă pe un volum partajat; folosim jurnalul SQLite clasic
+(nu WAL), care funcționează cu locking-ul de fișiere al share-urilor de rețea.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    priority REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    task_id INTEGER,
+    rows TEXT NOT NULL,
+    worker TEXT,
+    ts REAL NOT NULL,
+    exported INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# ad-urile înaintea paginilor de listă: pipeline-ul se golește înainte să descoperim și mai mult;
+# între anunțuri decide `priority` (scorul din frontier.py, trimis în payload)
+KIND_ORDER = "CASE kind WHEN 'ad' THEN 0 ELSE 1 END"
+
+
+@dataclass
+class Task:
+    id: int
+    kind: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class TaskQueue:
+    def __init__(self, path: str, lease_s: float = 180.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA busy_timeout=60000")
+        self._db.executescript(SCHEMA)
+        if "priority" not in {r[1] for r in self._db.execute("PRAGMA table_info(tasks)")}:
+            self._db.execute("ALTER TABLE tasks ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_tasks_status ON tasks(status, kind, priority, id)")
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    # --- tranzacții scurte, cu lock de scriere luat de la început (BEGIN IMMEDIATE) ---
+    def _tx(self):
+        return _Tx(self._db)
+
+    def add(self, kind: str, key: str, payload: Dict[str, Any]) -> bool:
+        """Adaugă un task dacă nu există deja (cheia e unică la nivel de coadă)."""
+        with self._tx() as db:
+            return self._insert(db, kind, key, payload)
+
+    def add_many(self, items: Iterable[Tuple[str, str, Dict[str, Any]]]) -> int:
+        with self._tx() as db:
+            return sum(1 for kind, key, payload in items if self._insert(db, kind, key, payload))
+
+    @staticmethod
+    def _insert(db: sqlite3.Connection, kind: str, key: str, payload: Dict[str, Any]) -> bool:
+        now = time.time()
+        cur = db.execute(
+            "INSERT OR IGNORE INTO tasks(kind, key, payload, priority, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, key, json.dumps(payload, ensure_ascii=False), float(payload.get("priority") or 0), now, now),
+        )
+        return cur.rowcount == 1
+
+    def reclaim_expired(self) -> int:
+        """Lease-urile expirate (worker mort / fără heartbeat) revin în `pending` sau devin `failed`."""
+        with self._tx() as db:
+            return self._reclaim(db, time.time())
+
+    def _reclaim(self, db: sqlite3.Connection, now: float) -> int:
+        db.execute(
+            "UPDATE tasks SET status='failed', owner=NULL, last_error='lease expirat', updated=? "
+            "WHERE status='leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        cur = db.execute(
+            "UPDATE tasks SET status='pending', owner=NULL, updated=? WHERE status='leased' AND lease_until < ?",
+            (now, now),
+        )
+        return cur.rowcount
+
+    def lease(self, owner: str, kinds: Optional[List[str]] = None) -> Optional[Task]:
+        now = time.time()
+        with self._tx() as db:
+            self._reclaim(db, now)
+            sql = "SELECT id, kind, key, payload, attempts FROM tasks WHERE status='pending'"
+            args: List[Any] = []
+            if kinds:
+                sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+                args.extend(kinds)
+            sql += f" ORDER BY {KIND_ORDER}, priority DESC, id LIMIT 1"
+            row = db.execute(sql, args).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET status='leased', owner=?, lease_until=?, attempts=attempts+1, updated=? "
+                "WHERE id=?",
+                (owner, now + self.lease_s, now, row[0]),
+            )
+        return Task(id=row[0], kind=row[1], key=row[2], payload=json.loads(row[3]), attempts=row[4] + 1)
+
+    def heartbeat(self, task_id: int, owner: str) -> bool:
+        """Prelungește lease-ul; False = task-ul nu mai e al nostru (a expirat și a fost reluat)."""
+        now = time.time()
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE tasks SET lease_until=?, updated=? WHERE id=? AND owner=? AND status='leased'",
+                (now + self.lease_s, now, task_id, owner),
+            )
+            return cur.rowcount == 1
+
+    def complete(
+        self,
+        task: Task,
+        owner: str,
+        rows: Optional[List[Dict[str, Any]]] = None,
+        new_tasks: Iterable[Tuple[str, str, Dict[str, Any]]] = (),
+    ) -> bool:
+        """Închide task-ul atomic: rezultat + task-uri noi + status `done`, doar dacă lease-ul e încă valid."""
+        now = time.time()
+        with self._tx() as db:
+            owned = db.execute(
+                "SELECT 1 FROM tasks WHERE id=? AND owner=? AND status='leased'", (task.id, owner)
+            ).fetchone()
+            if not owned:
+                return False
+            if rows is not None:
+                db.execute(
+                    "INSERT OR IGNORE INTO results(key, task_id, rows, worker, ts) VALUES (?, ?, ?, ?, ?)",
+                    (task.key, task.id, json.dumps(rows, ensure_ascii=False), owner, now),
+                )
+            for kind, key, payload in new_tasks:
+                self._insert(db, kind, key, payload)
+            db.execute("UPDATE tasks SET status='done', owner=NULL, updated=? WHERE id=?", (now, task.id))
+            return True
+
+    def fail(self, task: Task, owner: str, error: str = "") -> None:
+        """Eliberează task-ul imediat (retry de alt worker) sau îl marchează `failed` după max_attempts."""
+        now = time.time()
+        status = "failed" if task.attempts >= self.max_attempts else "pending"
+        with self._tx() as db:
+            db.execute(
+                "UPDATE tasks SET status=?, owner=NULL, last_error=?, updated=? "
+                "WHERE id=? AND owner=? AND status='leased'",
+                (status, error[:500], now, task.id, owner),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        out = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        for status, n in self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            out[status] = n
+        return out
+
+    def is_drained(self) -> bool:
+        c = self.counts()
+        return c["pending"] == 0 and c["leased"] == 0
+
+    def pop_unexported(self) -> Iterator[List[Dict[str, Any]]]:
+        """Rândurile rezultatelor încă neexportate; fiecare rezultat e marcat exportat după ce a fost consumat."""
+        rows = self._db.execute("SELECT key, rows FROM results WHERE exported=0 ORDER BY ts").fetchall()
+        for key, data in rows:
+            yield json.loads(data)
+            with self._tx() as db:
+                db.execute("UPDATE results SET exported=1 WHERE key=?", (key,))
+
+
+class _Tx:
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class Heartbeat:
+    """Thread care reînnoiește lease-ul task-ului curent; se oprește singur după `max_s` (task blocat)."""
+
+    def __init__(self, path: str, task: Task, owner: str, lease_s: float, every_s: float, max_s: float):
+        self.path, self.task, self.owner = path, task, owner
+        self.lease_s, self.every_s, self.max_s = lease_s, every_s, max_s
+        self.lost = False
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, name=f"heartbeat-{task.id}", daemon=True)
+
+    def _run(self) -> None:
+        q = TaskQueue(self.path, lease_s=self.lease_s)
+        t0 = time.time()
+        try:
+            while not self._stop.wait(self.every_s):
+                if time.time() - t0 > self.max_s:
+                    return
+                try:
+                    if not q.heartbeat(self.task.id, self.owner):
+                        self.lost = True
+                        return
+                except sqlite3.Error:
+                    continue
+        finally:
+            q.close()
+
+    def __enter__(self) -> "Heartbeat":
+        self._t.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._t.join(timeout=5)
+        return False
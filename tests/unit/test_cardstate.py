@@ -0,0 +1,33 @@
+from cardstate import CHANGED, NEW, UNCHANGED, CardMeta, CardStateStore
+
+URL = "https://www.olx.ro/d/oferta/adria-coral-IDabc.html"
+
+
+def _card(**kw):
+    base = {"url": URL, "title": "Adria Coral 2024", "price": "1 500 €", "location_date": "Cluj-Napoca - Azi la 10:15"}
+    base.update(kw)
+    return CardMeta(**base)
+
+
+def test_new_then_unchanged_after_visit(tmp_path):
+    store = CardStateStore(str(tmp_path / "cards.sqlite"))
+    assert store.classify_many([_card()]) == {URL: NEW}
+    # vizită eșuată (fără mark_visited) => tot de vizitat la rularea următoare
+    assert store.classify_many([_card()]) == {URL: NEW}
+    store.mark_visited(_card())
+    # data și badge-ul promovat nu contează, prețul da
+    assert store.classify_many([_card(location_date="Cluj-Napoca - 12 octombrie 2026", promoted=True)]) == {
+        URL: UNCHANGED
+    }
+    assert store.classify_many([_card(price="1 350 €")]) == {URL: CHANGED}
+    assert store.classify_many([_card(location_date="Cluj-Napoca - Reactualizat azi la 09:00")]) == {URL: CHANGED}
+    store.close()
+
+
+def test_history_urls_become_baseline(tmp_path):
+    store = CardStateStore(str(tmp_path / "cards.sqlite"))
+    assert store.classify_many([_card()], known={URL}) == {URL: UNCHANGED}
+    assert store.classify_many([_card(title="Adria Coral 2024 - pret redus")]) == {URL: CHANGED}
+    assert store.count() == 1
+    assert CardMeta.from_dict(_card().as_dict()) == _card()
+    store.close()
@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import hashlib
+import json
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, TimeoutException
+
+from cdpdriver import (
+    OP_TEXT,
+    WS_GUID,
+    CdpBrowser,
+    CdpConnection,
+    CdpDriver,
+    LoopThread,
+    WebSocket,
+    cdp_cookie,
+    encode_frame,
+    read_frame,
+    selenium_cookie,
+)
+from phonecapture import cdp_events
+
+
+def test_frame_roundtrip_all_length_encodings():
+    async def run():
+        reader = asyncio.StreamReader()
+        payloads = [b"", b"x" * 5, b"y" * 300, bytes(range(256)) * 300]
+        for p in payloads:
+            reader.feed_data(encode_frame(OP_TEXT, p))
+        reader.feed_data(encode_frame(OP_TEXT, b"server", mask=False))
+        return [await read_frame(reader) for _ in range(len(payloads) + 1)]
+
+    frames = asyncio.run(run())
+    assert [f[2] for f in frames] == [b"", b"x" * 5, b"y" * 300, bytes(range(256)) * 300, b"server"]
+    assert all(fin and op == OP_TEXT for fin, op, _ in frames)
+
+
+class FakeChrome:
+    """Server websocket minimal care răspunde la câteva comenzi CDP, ca un Chrome cu un tab."""
+
+    def __init__(self):
+        self.received = []
+        self.targets = ["T1"]
+        self.server = None
+        self.writers = []
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._client, "127.0.0.1", 0)
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/devtools/browser/x"
+
+    async def stop(self):
+        for w in self.writers:
+            w.close()
+        self.server.close()
+
+    async def _client(self, reader, writer):
+        self.writers.append(writer)
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        key = next(line.split(":", 1)[1].strip() for line in head.split("\r\n") if line.lower().startswith("sec-"))
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            f"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+
+        def send(msg):
+            writer.write(encode_frame(OP_TEXT, json.dumps(msg).encode(), mask=False))
+
+        try:
+            while True:
+                _, _, payload = await read_frame(reader)
+                msg = json.loads(payload)
+                self.received.append(msg)
+                mid, method, sid = msg["id"], msg["method"], msg.get("sessionId")
+                if method == "Target.getTargets":
+                    infos = [{"targetId": t, "type": "page"} for t in self.targets]
+                    send({"id": mid, "result": {"targetInfos": infos}})
+                elif method == "Target.attachToTarget":
+                    send({"id": mid, "result": {"sessionId": "S" + msg["params"]["targetId"][1:]}})
+                elif method == "Page.navigate":
+                    send({"id": mid, "result": {"frameId": "F", "loaderId": "L"}})
+                    if "slow" not in msg["params"]["url"]:
+                        send({"method": "Network.responseReceived", "sessionId": sid, "params": {"requestId": "1"}})
+                        send({"method": "Page.loadEventFired", "sessionId": sid, "params": {}})
+                elif method == "Runtime.evaluate":
+                    send({"id": mid, "sessionId": sid, "result": {"result": {"type": "number", "value": 42}}})
+                elif method == "Boom":
+                    send({"id": mid, "error": {"code": -32000, "message": "No target with given id found"}})
+                elif method == "Die":
+                    writer.close()
+                    return
+                else:
+                    send({"id": mid, "result": {}})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+def test_connection_routing_errors_and_disconnect():
+    async def run():
+        chrome = FakeChrome()
+        url = await chrome.start()
+        browser = CdpBrowser(CdpConnection(await WebSocket.connect(url)))
+        try:
+            page = await browser.attach((await browser.pages())[0], network_log=True)
+            await page.navigate("http://mock/d/oferta/x-ID1.html")
+            assert await page.evaluate("21 * 2") == 42
+            assert [e["method"] for e in page.events] == ["Network.responseReceived"]
+            with pytest.raises(TimeoutException):
+                await page.navigate("http://mock/slow", timeout=0.2)
+            with pytest.raises(NoSuchWindowException):
+                await browser.conn.send("Boom")
+            with pytest.raises(InvalidSessionIdException):
+                await browser.conn.send("Die")
+            with pytest.raises(InvalidSessionIdException):
+                await page.evaluate("1")
+        finally:
+            await chrome.stop()
+        sent = [m["method"] for m in chrome.received]
+        assert sent[:4] == ["Target.getTargets", "Target.attachToTarget", "Page.enable", "Network.enable"]
+        assert all(m.get("sessionId") == "S1" for m in chrome.received if m["method"].startswith(("Page.", "Run")))
+
+    asyncio.run(run())
+
+
+def test_sync_driver_facade_and_performance_log():
+    loop = LoopThread()
+    chrome = FakeChrome()
+    url = loop.run(chrome.start())
+
+    async def connect():
+        browser = await CdpBrowser.connect(url)
+        return browser, await browser.attach("T1", network_log=True)
+
+    driver = CdpDriver(*loop.run(connect()), loop=loop, network_log=True)
+    try:
+        driver.get("http://mock/d/oferta/x-ID1.html")
+        assert driver.execute_script("return 21 * 2;") == 42
+        assert driver.window_handles == ["T1"] and driver.current_window_handle == "T1"
+        events = list(cdp_events(driver.get_log("performance")))
+        assert [e["method"] for e in events] == ["Network.responseReceived"] and driver.get_log("performance") == []
+        with pytest.raises(Exception):
+            driver.get_log("browser")
+    finally:
+        driver.quit()
+        loop.run(chrome.stop())
+    expr = next(m for m in chrome.received if m["method"] == "Runtime.evaluate")["params"]["expression"]
+    assert expr.startswith("(function() {") and "return 21 * 2;" in expr
+
+
+def test_emulation_applies_to_every_attached_tab():
+    loop = LoopThread()
+    chrome = FakeChrome()
+    url = loop.run(chrome.start())
+
+    async def connect():
+        browser = await CdpBrowser.connect(url)
+        return browser, await browser.attach("T1")
+
+    driver = CdpDriver(*loop.run(connect()), loop=loop)
+    try:
+        driver.emulate([("Emulation.setTouchEmulationEnabled", {"enabled": True})])
+        chrome.targets.append("T2")  # tab deschis de pagină (window.open), ca la TabPool
+        driver.switch_to.window("T2")
+        driver.switch_to.window("T1")
+    finally:
+        driver.quit()
+        loop.run(chrome.stop())
+    sessions = [m.get("sessionId") for m in chrome.received if m["method"] == "Emulation.setTouchEmulationEnabled"]
+    assert sessions == ["S1", "S2"]
+
+
+def test_cookie_conversions():
+    c = {"name": "a", "value": "1", "domain": ".olx.ro", "path": "/", "expires": 1900000000.5, "session": False}
+    assert selenium_cookie(c) == {"name": "a", "value": "1", "domain": ".olx.ro", "path": "/", "expiry": 1900000000}
+    assert "expiry" not in selenium_cookie({**c, "session": True, "expires": -1})
+    assert cdp_cookie({"name": "a", "value": "1", "expiry": 5}, "https://www.olx.ro/") == {
+        "name": "a",
+        "value": "1",
+        "expires": 5,
+        "url": "https://www.olx.ro/",
+    }
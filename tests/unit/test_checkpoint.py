@@ -0,0 +1,27 @@
+import os
+
+from checkpoint import CheckpointJournal
+
+
+def test_journal_roundtrip_and_resume_point(tmp_path):
+    path = str(tmp_path / "run.checkpoint.json")
+    j = CheckpointJournal(path)
+    j.start("run-1", ["https://www.olx.ro/a/"], {"csv": "out.csv", "jsonl": None})
+    j.update(seed_idx=0, page_idx=3, pending=[["t", "https://www.olx.ro/d/oferta/x-ID1.html"]], inflight=None)
+    j.update(inflight="https://www.olx.ro/d/oferta/x-ID1.html")
+
+    again = CheckpointJournal(path)
+    state = again.load()
+    assert state["page_idx"] == 3
+    assert state["inflight"].endswith("x-ID1.html")
+    assert again.matches(["https://www.olx.ro/a/"])
+    assert not again.matches(["https://www.olx.ro/b/"])
+    assert [p for p in os.listdir(tmp_path) if ".tmp-" in p] == []
+
+
+def test_completed_journal_is_not_resumed(tmp_path):
+    path = str(tmp_path / "run.checkpoint.json")
+    j = CheckpointJournal(path)
+    j.start("run-1", ["s"], {"csv": "out.csv"})
+    j.complete()
+    assert CheckpointJournal(path).load() is None
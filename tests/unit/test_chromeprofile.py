@@ -0,0 +1,82 @@
+import json
+import os
+
+import chromeprofile
+from chromeprofile import CREATED_NAME, LOCK_NAME, CacheStats, ProfilePool
+
+
+def test_slots_are_exclusive_and_reused_after_release(tmp_path):
+    pool = ProfilePool(str(tmp_path), "ad", slots=2)
+    a = pool.acquire()
+    b = pool.acquire()
+    assert a and b and a.path != b.path
+    assert pool.acquire() is None  # ambele sloturi ocupate
+    a.release()
+    c = pool.acquire()
+    assert c is not None and c.path == a.path and not c.rotated
+    b.release()
+    c.release()
+
+
+def test_lock_of_dead_process_is_taken_over(tmp_path):
+    pool = ProfilePool(str(tmp_path), "list", slots=1)
+    path = pool.slot_path(0)
+    os.makedirs(path)
+    with open(os.path.join(path, LOCK_NAME), "w", encoding="utf-8") as f:
+        json.dump({"pid": 2**22 + 12345, "ts": 0}, f)
+    lease = pool.acquire()
+    assert lease is not None and lease.path == path
+    lease.release()
+    assert not os.path.exists(os.path.join(path, LOCK_NAME))
+
+
+def test_old_or_oversized_profile_is_rotated(tmp_path, monkeypatch):
+    pool = ProfilePool(str(tmp_path), "ad", slots=1, max_age_h=1, max_mb=1)
+    lease = pool.acquire(now=1000.0)
+    cache = os.path.join(lease.path, "Default", "Cache")
+    os.makedirs(cache)
+    with open(os.path.join(cache, "blob"), "wb") as f:
+        f.write(b"x" * 1024)
+    lease.release()
+
+    again = pool.acquire(now=1000.0 + 600)
+    assert not again.rotated and os.path.exists(os.path.join(cache, "blob"))
+    again.release()
+
+    old = pool.acquire(now=1000.0 + 2 * 3600)
+    assert old.rotated
+    assert not os.path.exists(os.path.join(lease.path, "Default"))
+    assert os.path.exists(os.path.join(lease.path, CREATED_NAME))
+    old.release()
+
+    monkeypatch.setattr(chromeprofile, "dir_size", lambda _p: 2 * 1024 * 1024)
+    big = pool.acquire(now=1000.0 + 2 * 3600 + 60)
+    assert big.rotated
+    big.release()
+
+
+def test_cache_stats_hits_revalidations_and_misses():
+    st = CacheStats()
+    st.add([[0, 50_000], [300, 20_000], [10_400, 10_000], [0, 0], ["x", 1]])
+    assert st.requests == 3
+    assert st.hits == 2
+    assert st.bytes_saved == 50_000 + 19_700
+    assert st.as_dict()["cache_hit_ratio"] == round(2 / 3, 4)
+
+
+def test_slots_over_the_limit_are_removed_on_first_acquire(tmp_path, monkeypatch):
+    import scraper_olx
+
+    leases = [ProfilePool(str(tmp_path), "ad", slots=3).acquire() for _ in range(3)]
+    leases[1].release()  # slot liber; slotul 2 rămâne ținut de un driver viu
+    monkeypatch.setattr(scraper_olx, "CHROME_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(scraper_olx, "CHROME_PROFILE_SLOTS", 1)
+    monkeypatch.setattr(scraper_olx, "_PROFILES_CLEANED", set())
+
+    leases[0].release()
+    lease = scraper_olx.acquire_profile("ad")
+    assert lease.path == leases[0].path
+    assert not os.path.exists(leases[1].path) and os.path.exists(leases[2].path)
+    lease.release()
+    leases[2].release()
+    assert ProfilePool(str(tmp_path), "ad", slots=1).cleanup() == [leases[2].path]
@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from conftest import ROOT
+
+import cli
+
+HEAVY = ("pandas", "selenium", "bs4")
+# niciun subcommand în afară de crawl/login nu are voie să încarce scraperul (selenium + tot pipeline-ul)
+CRAWL = ("scraper_olx", "selenium")
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_stats_imports_no_heavy_modules(tmp_path):
+    runs = tmp_path / "runs"
+    runs.mkdir()
+    (runs / "index.jsonl").write_text(
+        json.dumps({"ts_utc": "2026-10-18T10:00:00Z", "duration_s": 61.2, "ads_saved": 12, "phones_found": 9}) + "\n",
+        encoding="utf-8",
+    )
+    out = _run(
+        "import sys, cli; cli.main(['stats', '--log-dir', %r]); "
+        "print([m for m in %r if m in sys.modules])" % (str(tmp_path), HEAVY)
+    )
+    assert "ads=12" in out
+    assert out.splitlines()[-1] == "[]"
+
+
+def test_flags_override_env(monkeypatch):
+    for env in cli.ENV_FLAGS.values():
+        monkeypatch.delenv(env, raising=False)
+    args = cli.build_parser().parse_args(["crawl", "--no-headless", "--max-pages", "2", "--urls", "seeds.txt"])
+    cli.apply_env(args)
+    assert os.environ["HEADLESS"] == "0"
+    assert os.environ["MAX_PAGES_PER_SEED"] == "2"
+    assert os.environ["URLS_FILE"] == "seeds.txt"
+    assert "MAX_RUN_MINUTES" not in os.environ
+
+
+def test_reparse_debug_snapshot(tmp_path):
+    from mock_olx import MockConfig, MockOlx
+
+    mock = MockOlx(MockConfig(n_ads=1))
+    snap = tmp_path / "ad_fail_1"
+    snap.mkdir()
+    (snap / "page.html").write_text(mock.render_ad(mock.ads[0]), encoding="utf-8")
+    (snap / "README.txt").write_text(f"URL: https://www.olx.ro{mock.ads[0].path}\n", encoding="utf-8")
+    out = tmp_path / "reparse.jsonl"
+    assert cli.main(["reparse", str(tmp_path), "--out", str(out)]) == 0
+    row = json.loads(out.read_text(encoding="utf-8"))
+    assert row["id_anunt"] == str(mock.ads[0].num_id)
+    assert row["titlu"]
+
+
+def _loaded_after(argv, forbidden) -> list:
+    """Rulează `cli.main(argv)` într-un proces nou; întoarce modulele din `forbidden` încărcate după comandă."""
+    out = _run(
+        "import json, sys, cli; code = cli.main(%r); "
+        "print(code, json.dumps([m for m in %r if m in sys.modules]))" % (list(argv), tuple(forbidden))
+    )
+    code, _, loaded = out.splitlines()[-1].partition(" ")
+    assert code == "0", out
+    return json.loads(loaded)
+
+
+def test_subcommands_import_only_their_own_dependencies(tmp_path):
+    from outputstore import FLAT_COLUMNS
+
+    csv_path = tmp_path / "olx_20260101-000000.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.DictWriter(f, fieldnames=list(FLAT_COLUMNS))
+        w.writeheader()
+        w.writerow({c: "" for c in FLAT_COLUMNS} | {"telefon": "0722111222", "pret": "15 000 €", "url": "u1"})
+    snap = tmp_path / "snaps" / "ad_fail_1"
+    snap.mkdir(parents=True)
+    (snap / "page.html").write_text("<html><body><h1>Rulota</h1></body></html>", encoding="utf-8")
+    (tmp_path / "runs").mkdir()
+    (tmp_path / "runs" / "index.jsonl").write_text(
+        json.dumps({"ts_utc": "2026-10-18T10:00:00Z", "duration_s": 61.2, "ads_saved": 12}) + "\n", encoding="utf-8"
+    )
+    prefix = str(tmp_path / "olx")
+    cases = [
+        (["export", str(csv_path), "--out", str(tmp_path / "out.xlsx"), "--prefix", prefix], CRAWL + ("bs4",)),
+        (["postprocess", str(csv_path), "--out", str(tmp_path / "pp.csv")], CRAWL + ("bs4",)),
+        (["reparse", str(tmp_path / "snaps"), "--out", str(tmp_path / "re.jsonl")], CRAWL + ("pandas",)),
+        # fără rezultate de indexat: pandas intră doar la reindexarea anunțurilor noi
+        (["query", "--prefix", str(tmp_path / "gol"), "--phone", "0722111222"], CRAWL + HEAVY + ("numpy",)),
+        (["report", "--log-dir", str(tmp_path), "--out", str(tmp_path / "r.md")], CRAWL + HEAVY + ("numpy",)),
+    ]
+    for argv, forbidden in cases:
+        assert _loaded_after(argv, forbidden) == [], argv[0]
+
+
+def _median_start(args) -> float:
+    times = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def test_cold_start_budget():
+    """Benchmark de pornire: `cli.py --help` față de un interpretor gol (`python -c pass`), pe aceeași mașină."""
+    budget = float(os.getenv("STARTUP_BUDGET_S", "0.25"))
+    baseline = _median_start(["-c", "pass"])
+    assert _median_start(["cli.py", "--help"]) - baseline < budget
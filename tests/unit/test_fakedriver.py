@@ -0,0 +1,85 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from fakedriver import FAKE_BASE_URL, FakeSite, FaultConfig
+from mock_olx import MockConfig, MockOlx
+
+SHOW_PHONE_XPATH = "//button[contains(., 'Arată') or contains(., 'Arata') or contains(., 'Show')]"
+
+
+def _site(faults=None, n_ads=5):
+    return FakeSite(MockOlx(MockConfig(n_ads=n_ads, page_size=5, phone_rate=1.0, snapshot_dir="")), faults)
+
+
+def test_list_page_cards_and_xpath():
+    d = _site().new_driver(role="list")
+    d.get("/oferte/")
+    assert d.current_url == f"{FAKE_BASE_URL}/oferte/"
+    assert len(d.find_elements(By.CSS_SELECTOR, "[data-cy='l-card']")) == 5
+    assert d.find_element(By.XPATH, "//*[contains(text(), 'Am găsit')]").text == "Am găsit 5 rezultate"
+    href = d.find_element(By.CSS_SELECTOR, "a[href*='/d/oferta/']").get_attribute("href")
+    assert href.startswith(f"{FAKE_BASE_URL}/d/oferta/")
+    cards = d.execute_script("return Array.from(document.querySelectorAll(\"[data-cy='l-card']\")).map(...)")
+    assert len(cards) == 5 and cards[0]["href"] == href and cards[0]["title"]
+    d.get("/oferte/?page=9")
+    assert d.find_elements(By.CSS_SELECTOR, "[data-cy='l-card']") == []
+    with pytest.raises(NoSuchElementException):
+        d.find_element(By.ID, "lipsa")
+
+
+def test_ad_page_phone_click_and_windows():
+    site = _site()
+    ad = site.mock.ads[0]
+    d = site.new_driver(role="ad")
+    d.get(ad.path)
+    assert ad.title in d.find_element(By.TAG_NAME, "body").text
+    assert "<script" not in d.find_element(By.TAG_NAME, "body").text
+    btn = d.find_element(By.XPATH, SHOW_PHONE_XPATH)
+    d.execute_script("arguments[0].click();", btn)
+    tels = [a.get_attribute("href") for a in d.find_elements(By.CSS_SELECTOR, "a[href^='tel:']")]
+    assert tels == [f"tel:{p}" for p in ad.phones] and site.mock.stats.phone_api == 1
+    assert d.find_elements(By.XPATH, SHOW_PHONE_XPATH) == []
+
+    d.execute_script("window.open(arguments[0],'_blank');", ad.path)
+    assert len(d.window_handles) == 2
+    d.switch_to.window(d.window_handles[-1])
+    d.close()
+    d.switch_to.window(d.window_handles[0])
+    assert d.current_url.endswith(ad.path)
+
+
+def test_session_death_until_new_driver_and_recovery():
+    site = _site(FaultConfig(session_death_rate=1.0, max_commands_to_death=0))
+    d = site.new_driver(role="ad")
+    with pytest.raises(InvalidSessionIdException):
+        d.get("/oferte/")
+    with pytest.raises(InvalidSessionIdException):
+        d.find_elements(By.TAG_NAME, "body")
+    site.faults.session_death_rate = 0.0
+    d2 = site.new_driver(role="ad")
+    d2.get("/oferte/")
+    rep = site.finish()
+    assert rep["session_deaths"] == 1 and rep["recoveries"] == 1 and rep["unrecovered"] == 0
+    assert rep["drivers"] == 2
+
+
+def test_timeouts_blocked_and_missing_selectors():
+    site = _site(FaultConfig(timeout_rate=1.0))
+    d = site.new_driver(role="ad")
+    with pytest.raises(TimeoutException):
+        d.get("/oferte/")
+
+    site = _site(FaultConfig(block_rate=1.0))
+    d = site.new_driver(role="list")
+    d.get("/oferte/")
+    assert d.title == "Access Denied" and site.finish()["blocked"] == 1
+    d.get("/")  # pagina principală (login) nu e blocată
+    assert d.find_elements(By.CSS_SELECTOR, "[data-testid='user-profile-user-name']")
+
+    site = _site(FaultConfig(missing_selector_rate=1.0, seed=3))
+    d = site.new_driver(role="ad")
+    d.get(site.mock.ads[0].path)
+    testids = ("ad-price-container", "ad_description", "user-profile-user-name", "phones-container")
+    gone = [t for t in testids if not d.find_elements(By.CSS_SELECTOR, f"[data-testid='{t}']")]
+    assert len(gone) == 1 and site.finish()["missing_selectors"] == 1
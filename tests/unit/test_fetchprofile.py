@@ -0,0 +1,65 @@
+from fetchprofile import (
+    DESKTOP,
+    MOBILE,
+    MOBILE_UA_POOL,
+    ad_url,
+    desktop_url,
+    emulation_commands,
+    missing_fields,
+    mobile_emulation,
+    mobile_url,
+    normalize_profile,
+)
+from loadtest import fetch_summary, format_profile_comparison
+
+
+def test_profile_urls_rewrite_only_olx_hosts():
+    href = "https://www.olx.ro/d/oferta/rulota-IDabc12.html?reason=x"
+    assert mobile_url(href) == "https://m.olx.ro/d/oferta/rulota-IDabc12.html?reason=x"
+    assert mobile_url("https://olx.ro/d/oferta/x.html") == "https://m.olx.ro/d/oferta/x.html"
+    assert desktop_url(mobile_url(href)) == href
+    assert mobile_url("https://www.olx.ro.evil.com/x") == "https://www.olx.ro.evil.com/x"
+    local = "http://127.0.0.1:8765/d/oferta/x-IDa.html"
+    assert ad_url(local, MOBILE) == local
+    assert ad_url(href, DESKTOP) == href
+
+
+def test_normalize_profile_defaults_to_desktop():
+    assert normalize_profile(" Mobile ") == MOBILE
+    assert normalize_profile("") == DESKTOP
+    assert normalize_profile("tablet") == DESKTOP
+
+
+def test_missing_fields_on_raw_snapshot():
+    snap = {"titlu": "Rulotă", "pret": " ", "descriere": "ok", "body": "..."}
+    assert missing_fields(snap) == ["pret"]
+    assert missing_fields({}) == ["titlu", "pret", "descriere"]
+
+
+def test_emulation_switch_commands():
+    ua = MOBILE_UA_POOL[0]
+    assert mobile_emulation(ua)["userAgent"] == ua["ua"]
+    assert mobile_emulation(ua)["deviceMetrics"]["width"] == ua["device"]["width"]
+    cmds = dict(emulation_commands(ua))
+    assert cmds["Emulation.setDeviceMetricsOverride"]["mobile"] is True
+    assert cmds["Emulation.setTouchEmulationEnabled"] == {"enabled": True}
+    desktop = dict(emulation_commands({"ua": "Mozilla/5.0 (Windows NT 10.0)", "platform": "Win32"}))
+    assert desktop["Emulation.setDeviceMetricsOverride"]["mobile"] is False
+    assert desktop["Emulation.setUserAgentOverride"]["platform"] == "Win32"
+
+
+def test_profile_comparison_report():
+    stages = {"ad_page": {"count": 10, "avg_s": 2.0, "total_s": 20.0}}
+    desktop = fetch_summary("desktop", stages, {"ad_pages": 10, "ad_bytes": 200_000}, 1_000_000)
+    mobile = fetch_summary(
+        "mobile",
+        {"ad_page": {"count": 10, "avg_s": 1.5, "total_s": 15.0}},
+        {"ad_pages": 11, "ad_pages_mobile": 10, "ad_bytes": 40_000},
+        0,
+        {"mobile": 9, "desktop_fallback": 1},
+    )
+    assert desktop["bytes_per_ad"] == 100_000
+    assert mobile["bytes_per_ad"] == 4_000  # fără Resource Timing: HTML-ul servit
+    out = format_profile_comparison([{"fetch": desktop}, {"fetch": mobile}])
+    assert "bytes -96%" in out and "timp -25%" in out
+    assert "desktop_fallback=1" in out
@@ -0,0 +1,44 @@
+from datetime import date
+
+from cardstate import CardMeta, CardStateStore
+from frontier import AdFrontier, card_age_days, score_ad
+
+TODAY = date(2026, 10, 18)
+
+
+def _card(n, when, promoted=False):
+    return CardMeta(
+        url=f"https://www.olx.ro/d/oferta/a-ID{n}.html",
+        title=f"A{n}",
+        price="100 €",
+        location_date=f"Brașov - {when}",
+        promoted=promoted,
+    )
+
+
+def test_card_age_days():
+    assert card_age_days("Azi la 10:15", TODAY) == 0
+    assert card_age_days("Reactualizat ieri la 21:00", TODAY) == 1
+    assert card_age_days("11 octombrie 2026", TODAY) == 7
+    assert card_age_days("", TODAY) is None
+
+
+def test_fresh_new_seller_ads_come_first():
+    fresh, old = _card(1, "Azi la 09:00"), _card(2, "1 septembrie 2026")
+    f = AdFrontier()
+    f.push("old", old.url, score_ad(old, 0, today=TODAY))
+    f.push("known", fresh.url + "?k", score_ad(fresh, 0, seller_known=True, phone_cached=True, today=TODAY))
+    f.push("fresh", fresh.url, score_ad(fresh, 0, today=TODAY))
+    assert not f.push("dup", fresh.url, 99.0)
+    assert [row[0] for row in f.snapshot()] == ["fresh", "known", "old"]
+    assert [f.pop()[0] for _ in range(len(f))] == ["fresh", "known", "old"]
+    assert score_ad(fresh, 0, today=TODAY) > score_ad(fresh, 3, today=TODAY)
+
+
+def test_sellers_for_uses_visited_ads(tmp_path):
+    store = CardStateStore(str(tmp_path / "cards.sqlite"))
+    a, b = _card(1, "Azi"), _card(2, "Azi")
+    store.mark_visited(a, user_id="u1", has_phone=True)
+    store.mark_visited(b, user_id="u1", has_phone=False)
+    assert store.sellers_for([a.url, b.url, "https://x"]) == {a.url: (True, True), b.url: (True, True)}
+    store.close()
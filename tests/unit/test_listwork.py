@@ -0,0 +1,84 @@
+import threading
+
+from frontier import AdFrontier
+from listwork import ListingPlan
+
+
+def test_pages_are_handed_out_breadth_first_across_seeds():
+    plan = ListingPlan({0: [1], 1: [1], 2: [1]})
+    order = []
+    while (item := plan.get(timeout=0.1)) is not None:
+        order.append(item)
+        seed_idx, page = item
+        # seed 0 e mare (5 pagini), celelalte au câte 2
+        limit = 5 if seed_idx == 0 else 2
+        plan.done(seed_idx, page, [page + 1] if page < limit else [])
+    assert order[:3] == [(0, 1), (1, 1), (2, 1)]
+    assert order[3:6] == [(0, 2), (1, 2), (2, 2)]
+    assert order[6:] == [(0, 3), (0, 4), (0, 5)]
+    assert plan.snapshot() == {}
+
+
+def test_snapshot_keeps_inflight_pages_for_resume():
+    plan = ListingPlan({3: [2, 4]})
+    assert plan.get() == (3, 2)
+    assert plan.snapshot() == {"3": [2, 4]}
+    assert not plan.done(3, 2, [3])
+    assert ListingPlan.from_snapshot(plan.snapshot()) == {3: [3, 4]}
+
+
+def test_workers_share_one_deduplicated_frontier():
+    plan = ListingPlan({i: [1] for i in range(4)})
+    frontier = AdFrontier()
+    # fiecare seed are 3 pagini; seed-urile se suprapun pe jumătate din anunțuri
+    ads = {(s, p): [f"ad-{(s * 30 + p * 10 + k) % 70}" for k in range(10)] for s in range(4) for p in (1, 2, 3)}
+    lock = threading.Lock()
+    pushed = []
+
+    def worker():
+        while (item := plan.get(timeout=1.0)) is not None:
+            s, p = item
+            for url in ads[item]:
+                if frontier.push("", url, float(p)):
+                    with lock:
+                        pushed.append(url)
+            plan.done(s, p, [p + 1] if p < 3 else [])
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    expected = {u for urls in ads.values() for u in urls}
+    assert sorted(pushed) == sorted(expected)
+    assert len(frontier) == len(expected)
+
+
+def test_fanout_from_total_and_sequential_fallbacks():
+    from listwork import next_list_pages
+
+    # 1.234 rezultate, 40 pe pagină => 31 pagini, plafonate la 25
+    pages, fan = next_list_pages(1, 1234, 40)
+    assert pages == list(range(2, 26)) and fan == (25, 40)
+    assert next_list_pages(7, None, 40, fan) == ([], fan)
+    # totalul subestimat: ultima pagină calculată e plină => continuăm secvențial
+    assert next_list_pages(3, 90, 40, (3, 40), cap=25) == ([4], (3, 40))
+    assert next_list_pages(3, 90, 12, (3, 40)) == ([], (3, 40))
+    assert next_list_pages(1, 1234, 40, max_pages=4) == ([2, 3, 4], (4, 40))
+    # fără total: paginare secvențială, cu MAX_PAGES_PER_SEED
+    assert next_list_pages(1, None, 40) == ([2], None)
+    assert next_list_pages(2, None, 40, max_pages=2) == ([], None)
+    assert next_list_pages(1, 1234, 40, fanout=False) == ([2], None)
+
+
+def test_rate_limiter_spaces_starts_across_workers():
+    from listwork import RateLimiter
+
+    now = [100.0]
+    slept = []
+    rl = RateLimiter(120, clock=lambda: now[0], sleep=slept.append)
+    assert [rl.wait() for _ in range(3)] == [0.0, 0.5, 1.0]
+    now[0] = 110.0
+    assert rl.wait() == 0.0
+    assert slept == [0.5, 1.0]
+    assert RateLimiter(0).wait() == 0.0
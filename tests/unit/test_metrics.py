@@ -0,0 +1,48 @@
+import urllib.request
+
+from metrics import MetricsRegistry, start_metrics_server
+
+
+def test_render_counters_gauges_histograms():
+    reg = MetricsRegistry(namespace="olx")
+    reg.counter("driver_restarts", "restarts").inc(role="ad")
+    reg.gauge("queue_depth", "depth").set(7, queue="page_links")
+    h = reg.histogram("stage_duration_seconds", "lat", buckets=(0.5, 1.0))
+    h.observe(0.3, stage="ad_page")
+    h.observe(0.8, stage="ad_page")
+    reg.expose_stats(lambda: {"links_total": 3, "ads_saved": 2})
+
+    text = reg.render()
+    assert 'olx_driver_restarts_total{role="ad"} 1' in text
+    assert 'olx_queue_depth{queue="page_links"} 7' in text
+    assert 'olx_stage_duration_seconds_bucket{stage="ad_page",le="0.5"} 1' in text
+    assert 'olx_stage_duration_seconds_bucket{stage="ad_page",le="+Inf"} 2' in text
+    assert 'olx_stage_duration_seconds_count{stage="ad_page"} 2' in text
+    assert "olx_links_total 3" in text
+    assert "olx_ads_saved_total 2" in text
+    assert not text.rstrip().endswith("# EOF")
+    assert reg.render(openmetrics=True).rstrip().endswith("# EOF")
+
+
+def test_http_endpoint_serves_metrics():
+    reg = MetricsRegistry(namespace="olx")
+    reg.counter("errors", "err").inc()
+    server = start_metrics_server(reg, port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            body = resp.read().decode("utf-8")
+            assert resp.headers["Content-Type"].startswith("text/plain")
+        assert "olx_errors_total 1" in body
+    finally:
+        server.shutdown()
+
+
+def test_scraper_families_unique_with_run_stats():
+    """Contoarele scraperului și cheile din `stats` nu pot da aceeași familie: Prometheus respinge scrape-ul."""
+    import scraper_olx
+
+    reg = scraper_olx.METRICS
+    reg.expose_stats(scraper_olx.new_run_stats)
+    families = [line.split()[2] for line in reg.render().splitlines() if line.startswith("# TYPE ")]
+    assert sorted(f for f in set(families) if families.count(f) > 1) == []
@@ -0,0 +1,67 @@
+import json
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mock_olx import MockConfig, MockOlx
+from parsing import extract_identifiers_from_html
+
+
+@pytest.fixture
+def mock():
+    m = MockOlx(MockConfig(n_ads=45, page_size=20, latency_ms=(0, 0), phone_rate=1.0))
+    m.start()
+    yield m
+    m.stop()
+
+
+def _get(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return resp.read().decode("utf-8")
+
+
+def test_list_pages_paginate_cards(mock):
+    first = _get(f"{mock.base_url}/oferte/")
+    assert first.count('data-cy="l-card"') == 20
+    assert "Am găsit 45 rezultate" in first
+    assert _get(f"{mock.base_url}/oferte/?page=3").count('data-cy="l-card"') == 5
+    assert "Nu am găsit anunțuri" in _get(f"{mock.base_url}/oferte/?page=4")
+
+
+def test_ad_page_has_jsonld_and_phone_api(mock):
+    first = _get(f"{mock.base_url}/oferte/")
+    href = re.search(r'href="([^"]*/d/oferta/[^"]*)"', first).group(1)
+    page = _get(href)
+    assert "show-phone-number" in page
+    ad_id, user_id, locality = extract_identifiers_from_html(page, href)
+    ad = mock.by_num[int(ad_id)]
+    assert locality == ad.city
+    phones = json.loads(_get(f"{mock.base_url}/api/v1/offers/{ad.num_id}/limited-phones/"))["data"]["phones"]
+    assert phones == ad.phones
+
+
+def test_block_rate_serves_403():
+    m = MockOlx(MockConfig(n_ads=5, latency_ms=(0, 0), block_rate=1.0))
+    m.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _get(f"{m.base_url}/oferte/")
+        assert exc.value.code == 403
+        assert m.stats.blocked == 1
+    finally:
+        m.stop()
+
+
+def test_mobile_ua_gets_lighter_ad_page():
+    m = MockOlx(MockConfig(n_ads=30, latency_ms=(0, 0), mobile_missing_rate=0.5))
+    ad = m.ads[0]
+    desktop, mobile = m.render_ad(ad), m.render_ad(ad, mobile=True)
+    assert len(mobile) <= len(desktop)
+    assert ad.title in mobile and "show-phone-number" in mobile or not ad.phones
+    missing = [a for a in m.ads if "ad_description" not in m.render_ad(a, mobile=True)]
+    assert 0 < len(missing) < len(m.ads)
+    # alegerea e stabilă per anunț, iar varianta desktop are mereu descrierea
+    assert missing == [a for a in m.ads if "ad_description" not in m.render_ad(a, mobile=True)]
+    assert all("ad_description" in m.render_ad(a) for a in missing)
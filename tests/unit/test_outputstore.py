@@ -0,0 +1,93 @@
+import csv
+
+from outputstore import FLAT_COLUMNS, AdStore, group_flat_rows
+
+URL = "https://www.olx.ro/d/oferta/adria-coral-IDabc.html"
+
+
+def _fields(**kw):
+    base = {"titlu": "Adria Coral", "pret": "15 000 €", "descriere": "x" * 500, "id_anunt": "123", "user_id": "u1"}
+    base.update(kw)
+    return base
+
+
+def test_upsert_across_runs_keeps_first_seen_and_known_fields(tmp_path):
+    store = AdStore(str(tmp_path / "ads.sqlite"))
+    assert store.upsert(URL, _fields(), ["0722111222", "0733444555"], run_id="r1", now=100.0) == (True, 2)
+    # a doua rulare: același anunț, un telefon nou, descriere neextrasă => descrierea veche rămâne
+    assert store.upsert(URL, _fields(descriere="", pret="14 000 €"), ["0733444555", "0744"], "r2", 200.0) == (False, 1)
+    assert store.counts() == {"ads": 1, "phones": 3}
+    (ad,) = store.ads()
+    assert (ad["ad_key"], ad["pret"], ad["descriere"], ad["first_seen"], ad["last_seen"]) == (
+        "123",
+        "14 000 €",
+        "x" * 500,
+        100.0,
+        200.0,
+    )
+    phones = {p["telefon"]: (p["first_seen"], p["last_seen"], p["last_run"]) for p in store.phones()}
+    assert phones == {
+        "0722111222": (100.0, 100.0, "r1"),
+        "0733444555": (100.0, 200.0, "r2"),
+        "0744": (200.0, 200.0, "r2"),
+    }
+    assert [p["telefon"] for p in store.phones(run_id="r2")] == ["0733444555", "0744"]
+    store.close()
+
+
+def test_ad_keyed_by_url_until_id_known_and_moved_url(tmp_path):
+    store = AdStore(str(tmp_path / "ads.sqlite"))
+    store.upsert(URL, _fields(id_anunt=""), [], now=1.0)
+    store.upsert(URL, _fields(), ["0722111222"], now=2.0)
+    moved = URL.replace("adria-coral", "adria-coral-2024")
+    assert store.upsert(moved, _fields(), [], now=3.0) == (False, 0)
+    (ad,) = store.ads()
+    assert ad["ad_key"] == URL and ad["url"] == moved and ad["id_anunt"] == "123"
+    assert store.seen_urls() == {moved}
+    store.close()
+
+
+def test_flat_rows_roundtrip_and_csv_view(tmp_path):
+    rows = [
+        {"telefon": "0722111222", **_fields(), "url": URL},
+        {"telefon": "0733444555", **_fields(), "url": URL},
+        {"telefon": "", **_fields(id_anunt="9"), "url": URL + "?x"},
+    ]
+    grouped = group_flat_rows(rows + rows[:1])
+    assert [(u, p) for u, _f, p in grouped] == [(URL, ["0722111222", "0733444555"]), (URL + "?x", [])]
+    store = AdStore(str(tmp_path / "ads.sqlite"))
+    assert store.upsert_rows(rows, run_id="r1") == (2, 2)
+    assert store.upsert_rows(rows, run_id="r2") == (0, 0)  # aceleași rânduri, altă rulare: nimic duplicat
+    flat = store.flat_rows()
+    assert len(flat) == 3 and list(flat[0]) == list(FLAT_COLUMNS)
+    assert sorted((r["telefon"], r["url"]) for r in flat) == sorted((r["telefon"], r["url"]) for r in rows)
+    out = tmp_path / "flat.csv"
+    assert store.export_flat_csv(str(out)) == 3
+    with open(out, encoding="utf-8-sig", newline="") as f:
+        assert csv.DictReader(f).fieldnames == list(FLAT_COLUMNS)
+    store.close()
+
+
+def test_resumed_writers_export_ads_from_before_the_interruption(tmp_path, monkeypatch):
+    import pandas as pd
+
+    import scraper_olx
+
+    monkeypatch.setattr(scraper_olx, "AD_STORE_FILE", str(tmp_path / "ads.sqlite"))
+    monkeypatch.setattr(scraper_olx, "POSTPROCESS", False)
+    row = {c: "" for c in FLAT_COLUMNS}
+    monkeypatch.setattr(scraper_olx, "RUN_ID", "RUN-A")
+    w = scraper_olx.IncrementalWriters(str(tmp_path / "out"), enable_jsonl=False, mode="normalized")
+    w.append_many([{**row, "id_anunt": "1", "url": "u1", "telefon": "071"}])
+    w.close()
+
+    # procesul reluat are alt RUN_ID; checkpoint-ul dă rularea întreruptă
+    monkeypatch.setattr(scraper_olx, "RUN_ID", "RUN-B")
+    w = scraper_olx.IncrementalWriters(
+        str(tmp_path / "out"), enable_jsonl=False, mode="normalized", resume_paths={"csv": None}, run_id="RUN-A"
+    )
+    assert w.written_urls() == {"u1"}  # pending-ul din checkpoint care le conține nu se mai vizitează
+    w.append_many([{**row, "id_anunt": "2", "url": "u2", "telefon": "072"}])
+    w.export_excel(str(tmp_path / "out.xlsx"))
+    w.close()
+    assert sorted(pd.read_excel(tmp_path / "out.xlsx", sheet_name="anunturi", dtype=str)["id_anunt"]) == ["1", "2"]
@@ -0,0 +1,43 @@
+import json
+
+from parsing import EMPTY_FIELDS, ParsePool, parse_snapshot, parse_total_count
+
+
+def _snap(n: int) -> dict:
+    ld = {"@type": "Product", "sku": str(100000 + n), "seller": {"@id": f"user/{5000 + n}"}}
+    html = f'<html><script type="application/ld+json">{json.dumps(ld)}</script></html>'
+    return {
+        "titlu": f"Rulota {n}",
+        "pret": "5 000 Lei",
+        "descriere": "  foarte   curata \n ",
+        "body": "ID: 1",
+        "html": html,
+        "url": f"https://www.olx.ro/d/oferta/x-ID{n}.html",
+    }
+
+
+def test_parse_snapshot_fields():
+    f = parse_snapshot(_snap(1))
+    assert (f["pret_valoare"], f["pret_moneda"]) == ("5000", "RON")
+    assert f["descriere"] == "foarte curata"
+    assert f["id_anunt"] == "100001" and f["user_id"] == "5001"
+    assert parse_snapshot({}) == EMPTY_FIELDS
+
+
+def test_pool_results_keep_submission_order():
+    pool = ParsePool(workers=2)
+    try:
+        futures = [pool.submit(_snap(i)) for i in range(8)]
+        ids = [f.result(timeout=60)[0]["id_anunt"] for f in futures]
+    finally:
+        pool.shutdown()
+    assert ids == [str(100000 + i) for i in range(8)]
+    inline = ParsePool(workers=0)
+    assert inline.submit(_snap(3)).result()[0]["titlu"] == "Rulota 3"
+
+
+def test_parse_total_count_variants():
+    assert parse_total_count("Am găsit 1.234 rezultate") == 1234
+    assert parse_total_count("Am gasit peste 1 000 de anunțuri") == 1000
+    assert parse_total_count("Am găsit 7 rezultate pentru rulote") == 7
+    assert parse_total_count("Niciun rezultat") is None
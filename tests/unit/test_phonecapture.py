@@ -0,0 +1,62 @@
+import json
+
+from phonecapture import NetworkPhoneSniffer, phones_from_api_body
+
+
+def _entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}}), "level": "INFO"}
+
+
+class FakeDriver:
+    def __init__(self, batches, bodies):
+        self.batches = list(batches)
+        self.bodies = bodies
+        self.body_calls = []
+
+    def get_log(self, kind):
+        assert kind == "performance"
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, cmd, args):
+        assert cmd == "Network.getResponseBody"
+        self.body_calls.append(args["requestId"])
+        return {"body": self.bodies[args["requestId"]], "base64Encoded": False}
+
+
+API = "https://www.olx.ro/api/v1/offers/281234567/limited-phones/"
+
+
+def test_phone_read_from_api_response_as_soon_as_it_finishes():
+    driver = FakeDriver(
+        [
+            [_entry("Network.responseReceived", requestId="1", response={"url": "https://x/app.js", "status": 200})],
+            [],
+            [
+                _entry("Network.responseReceived", requestId="7", response={"url": API, "status": 200}),
+                _entry("Network.loadingFinished", requestId="7"),
+            ],
+        ],
+        {"7": json.dumps({"data": {"phones": ["+40 723 456 789", "0723456789", "021 123"]}})},
+    )
+    sniffer = NetworkPhoneSniffer(driver, poll_s=0)
+    sniffer.reset()  # evenimentele de dinaintea click-ului se aruncă
+    assert sniffer.wait(timeout=1.0) == ["0723456789"]
+    assert driver.body_calls == ["7"]
+
+
+def test_api_error_and_missing_capability():
+    driver = FakeDriver([[_entry("Network.responseReceived", requestId="2", response={"url": API, "status": 429})]], {})
+    assert NetworkPhoneSniffer(driver, poll_s=0).wait(timeout=1.0) == []
+
+    class NoPerfLog:
+        def get_log(self, kind):
+            raise ValueError("log type 'performance' not found")
+
+    sniffer = NetworkPhoneSniffer(NoPerfLog(), poll_s=0)
+    assert sniffer.wait(timeout=0.01) is None and not sniffer.available
+
+
+def test_phones_from_api_body_tolerates_garbage():
+    assert phones_from_api_body("not json") == []
+    assert phones_from_api_body(json.dumps({"data": None})) == []
+    assert phones_from_api_body(json.dumps({"data": {"phones": ["0744 111 222"]}})) == ["0744111222"]
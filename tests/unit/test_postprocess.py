@@ -0,0 +1,51 @@
+import json
+
+import pandas as pd
+
+from postprocess import SELLER_BUSINESS, SELLER_PRIVATE, SELLER_UNKNOWN, load_rates, postprocess, postprocess_file
+
+ROWS = [
+    {"pret": "15 000 €", "pret_valoare": "15000", "pret_moneda": "EUR", "persoana": "Persoană fizică",
+     "garantie": "1.000 Lei", "localitate": "cluj-napoca ", "vizualizari": "1.234", "url": "a"},
+    {"pret": "45.000 lei", "pret_valoare": "", "pret_moneda": "", "persoana": "Firmă",
+     "garantie": "500", "localitate": "Cluj-Napoca", "vizualizari": "", "url": "b"},
+    {"pret": "Schimb", "pret_valoare": "", "pret_moneda": "", "persoana": "", "garantie": "",
+     "localitate": "", "vizualizari": "12 345", "url": "c"},
+]  # fmt: skip
+
+
+def test_typed_columns():
+    out = postprocess(pd.DataFrame(ROWS), {"EUR": 1.0, "RON": 5.0})
+    assert out["pret_num"].tolist()[:2] == [15000.0, 45000.0] and pd.isna(out["pret_num"][2])
+    assert out["pret_moneda"].tolist() == ["EUR", "RON", ""]
+    assert out["pret_eur"].tolist()[:2] == [15000.0, 9000.0]
+    assert out["pret_ron"].tolist()[:2] == [75000.0, 45000.0]
+    assert out["garantie_num"].tolist()[:2] == [1000.0, 500.0]
+    # garanția fără monedă ia moneda prețului
+    assert out["garantie_moneda"].tolist() == ["RON", "RON", ""]
+    assert out["vizualizari_num"].tolist() == [1234, pd.NA, 12345]
+    assert out["tip_vanzator"].tolist() == [SELLER_PRIVATE, SELLER_BUSINESS, SELLER_UNKNOWN]
+    assert out["localitate"].dtype == "category" and out["localitate"].cat.categories.tolist() == ["Cluj-Napoca"]
+    # coloanele text originale rămân
+    assert out["pret"].tolist() == [r["pret"] for r in ROWS]
+
+
+def test_without_rates_no_conversion_and_missing_columns_ok():
+    out = postprocess(pd.DataFrame([{"telefon": "0722", "url": "x"}]))
+    assert "pret_eur" not in out.columns
+    assert out["tip_vanzator"].tolist() == [SELLER_UNKNOWN]
+
+
+def test_postprocess_file_roundtrip(tmp_path):
+    src = tmp_path / "run.csv"
+    pd.DataFrame(ROWS).to_csv(src, index=False, encoding="utf-8-sig")
+    rates = tmp_path / "rates.json"
+    rates.write_text(json.dumps({"base": "EUR", "rates": {"RON": 4.0}}), encoding="utf-8")
+    assert load_rates(str(tmp_path / "missing.json")) is None
+    assert load_rates(str(rates)) == {"RON": 4.0, "EUR": 1.0}
+    assert postprocess_file(str(src), rates=load_rates(str(rates))) == 3
+    back = pd.read_csv(src, encoding="utf-8-sig")
+    assert back["pret_eur"].tolist()[:2] == [15000.0, 11250.0]
+    # idempotent: a doua trecere nu schimbă valorile
+    postprocess_file(str(src), rates=load_rates(str(rates)))
+    assert pd.read_csv(src, encoding="utf-8-sig")["pret_num"].tolist()[:2] == [15000.0, 45000.0]
@@ -0,0 +1,129 @@
+import csv
+import json
+import urllib.request
+
+from outputstore import FLAT_COLUMNS, AdStore
+from queryindex import QueryIndex, iter_all, parse_query, read_rows, start_query_server
+
+
+def _row(ad_id, tel, **kw):
+    row = {c: "" for c in FLAT_COLUMNS}
+    row.update(
+        telefon=tel,
+        titlu=f"Rulota {ad_id}",
+        pret="15 000 €",
+        pret_valoare="15.000",
+        pret_moneda="€",
+        id_anunt=ad_id,
+        user_id="u1",
+        localitate="Cluj-Napoca",
+        url=f"https://www.olx.ro/d/oferta/x-ID{ad_id}.html",
+    )
+    row.update(kw)
+    return row
+
+
+def _write_csv(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8-sig" if mode == "w" else "utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(FLAT_COLUMNS))
+        if mode == "w":
+            w.writeheader()
+        w.writerows(rows)
+
+
+def test_refresh_ingests_only_new_rows_and_searches_by_index(tmp_path):
+    out = tmp_path / "anunturi_20250101-000000.csv"
+    _write_csv(out, [_row("1", "0722111222"), _row("1", "0733444555"), _row("2", "0744", user_id="u2")])
+    idx = QueryIndex(str(tmp_path / "query.sqlite"), sources=[str(tmp_path / "anunturi_*.csv")])
+    assert idx.refresh() == {"files": 1, "rows": 3, "ads": 2}
+    assert idx.refresh() == {"files": 0, "rows": 0, "ads": 0}
+
+    # rularea continuă: doar rândurile adăugate intră la refresh-ul următor
+    _write_csv(
+        out, [_row("3", "", localitate="Brașov", pret="2.500 Lei", pret_valoare="2.500", pret_moneda="Lei")], "a"
+    )
+    assert idx.refresh() == {"files": 1, "rows": 1, "ads": 1}
+
+    (ad,) = idx.search(phone="+40 733 444 555")["items"]
+    assert (ad["id_anunt"], ad["telefoane"], ad["pret_num"], ad["moneda"]) == (
+        "1",
+        ["0722111222", "0733444555"],
+        15000.0,
+        "EUR",
+    )
+    assert [a["ad_key"] for a in idx.search(user_id="u2")["items"]] == ["2"]
+    assert [a["ad_key"] for a in idx.search(localitate="cluj")["items"]] == ["1", "2"]
+    assert [a["ad_key"] for a in idx.search(localitate="Brasov", max_price=3000, currency="RON")["items"]] == ["3"]
+    assert idx.search(min_price=10000, currency="RON")["items"] == []
+    assert idx.stats()["ads"] == 3
+    idx.close()
+
+
+def test_reindex_follows_store_writes_and_paginates(tmp_path):
+    path = str(tmp_path / "ads.sqlite")
+    store = AdStore(path)  # crawl-ul în modul normalizat scrie direct în store
+    idx = QueryIndex(str(tmp_path / "query.sqlite"), store=path)
+    for i in range(7):
+        store.upsert(f"u{i}", {"id_anunt": f"{i:02d}", "pret": f"{i}00 €"}, [f"07{i}"], now=float(i + 1))
+    assert idx.refresh()["ads"] == 7
+    store.upsert("u3", {"id_anunt": "03", "pret": "999 €"}, [], now=100.0)
+    assert idx.refresh()["ads"] == 1
+    assert idx.search(id_anunt="03")["items"][0]["pret_num"] == 999.0
+
+    page = idx.search(limit=3)
+    assert [a["ad_key"] for a in page["items"]] == ["00", "01", "02"] and page["next"] == "02"
+    assert [a["ad_key"] for a in idx.search(limit=3, after="05")["items"]] == ["06"]
+    assert len(list(iter_all(idx, page_size=2))) == 7
+    store.close()
+    idx.close()
+
+
+def test_file_ingestion_leaves_scraper_store_untouched(tmp_path):
+    path = str(tmp_path / "ads.sqlite")
+    store = AdStore(path)
+    store.upsert(_row("1", "")["url"], {"id_anunt": "1", "titlu": "vechi"}, ["0722111222"], run_id="RUN-A", now=5.0)
+    out = tmp_path / "anunturi_20250101-000000.csv"
+    _write_csv(out, [_row("1", "0733444555"), _row("2", "0744")])
+    idx = QueryIndex(str(tmp_path / "query.sqlite"), sources=[str(out)], store=path)
+    assert idx.refresh()["ads"] == 2
+    assert idx.search(id_anunt="1")["items"][0]["telefoane"] == ["0722111222", "0733444555"]
+
+    # exportul rulării RUN-A (OUTPUT_MODE=normalized) vede același anunț, cu aceiași timpi și telefoane
+    assert [(a["ad_key"], a["last_run"], a["last_seen"]) for a in store.ads(run_id="RUN-A")] == [("1", "RUN-A", 5.0)]
+    assert store.counts() == {"ads": 1, "phones": 1}
+    assert "ad_query" not in {r[0] for r in store._db.execute("SELECT name FROM sqlite_master")}
+    store.close()
+    idx.close()
+
+
+def test_read_rows_jsonl_normalized_and_partial_line(tmp_path):
+    p = tmp_path / "run.jsonl"
+    ad = {"id_anunt": "9", "url": "u9", "telefoane": ["071", "072"]}
+    p.write_text(json.dumps(ad) + "\n" + '{"id_anunt": "1', encoding="utf-8")
+    rows, n = read_rows(str(p))
+    assert n == 1 and [r["telefon"] for r in rows] == ["071", "072"]
+
+
+def test_http_query_service(tmp_path):
+    out = tmp_path / "anunturi_20250101-000000.csv"
+    _write_csv(out, [_row("1", "0722111222"), _row("2", "0744")])
+    idx = QueryIndex(str(tmp_path / "query.sqlite"), sources=[str(out)])
+    idx.refresh()
+    server = start_query_server(idx, 0, refresh_s=0)
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urllib.request.urlopen(f"{base}/ads?phone=0722111222") as r:
+            page = json.loads(r.read())
+        assert [a["id_anunt"] for a in page["items"]] == ["1"] and page["next"] is None
+        with urllib.request.urlopen(f"{base}/stats") as r:
+            assert json.loads(r.read())["ads"] == 2
+        try:
+            urllib.request.urlopen(f"{base}/ads?min_price=abc")
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+        else:
+            raise AssertionError("preț invalid acceptat")
+    finally:
+        server.shutdown()
+        idx.close()
+    assert parse_query({"limit": ["5"], "max_price": ["2,5"], "phone": [""]}) == {"limit": 5, "max_price": 2.5}
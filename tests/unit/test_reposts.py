@@ -0,0 +1,83 @@
+import sqlite3
+import subprocess
+import sys
+
+from conftest import ROOT
+
+from outputstore import AD_FIELDS, FLAT_COLUMNS, AdStore
+from reposts import MinHasher, RepostIndex, ad_text, normalize_text, shingles, similarity
+
+DESC = (
+    "Vand rulota Adria Altea 432 PX, an 2012, stare foarte buna, fara umezeala, copertina inclusa, "
+    "mover montat, frigider trivalent, incalzire Truma, acte la zi, negociabil la fata locului. "
+)
+TEXT = ad_text("Rulota Adria Altea 432 PX 2012", DESC * 2)
+
+
+def test_normalize_and_shingles():
+    assert normalize_text("  Rulotă ȘI   Țiglă! ") == "rulota si tigla"
+    assert shingles("abc") == [b"abc"]
+    assert sorted(shingles("abcdef")) == [b"abcde", b"bcdef"]
+    assert shingles("  ") == []
+
+
+def test_signature_similarity_tracks_edits():
+    h = MinHasher()
+    a = h.signature(TEXT)
+    assert similarity(a, h.signature(TEXT.upper())) == 1.0
+    assert similarity(a, h.signature(TEXT.replace("2012", "2013") + " Pret fix.")) >= 0.8
+    assert similarity(a, h.signature("Cort camping 4 persoane, folosit o singura data, cu sac")) < 0.2
+    assert h.signature("") is None
+
+
+def test_repost_joins_cluster_of_original(tmp_path):
+    idx = RepostIndex(str(tmp_path / "r.sqlite"))
+    assert idx.add("100", TEXT, url="u100", user_id="u1", seller="Ion Pop", phones=["0722111222"]) == ("100", None)
+    cluster, match = idx.add("200", TEXT.replace("negociabil", "pret negociabil"), url="u200", seller="ION POP")
+    assert cluster == "100" and match.ad_key == "100" and match.phones == ("0722111222",)
+    assert match.same_seller(seller="Ion  Pop") and not match.same_seller(seller="Alt Vanzator")
+    assert match.same_seller(user_id="u1") and not match.same_seller(user_id="u2", seller="Ion Pop")
+    assert idx.add("300", "Cort camping 4 persoane, folosit o singura data, cu sac", url="u300") == ("300", None)
+    assert idx.cluster_sizes() == [("100", 2)]
+    idx.close()
+
+
+def test_index_persists_and_reindex_keeps_cluster(tmp_path):
+    path = str(tmp_path / "r.sqlite")
+    idx = RepostIndex(path)
+    idx.add("100", TEXT)
+    idx.add("200", TEXT + " Detalii la telefon.")
+    idx.close()
+    idx = RepostIndex(path)
+    assert idx.count() == 2
+    assert idx.lookup(TEXT, exclude="100").ad_key == "200"
+    # anunțul revizitat cu text schimbat complet își păstrează clusterul
+    assert idx.add("200", "Text complet diferit despre altceva")[0] == "100"
+    assert idx.lookup("Rulota", exclude="") is None
+    idx.close()
+
+
+def test_store_migrates_repost_cluster_column(tmp_path):
+    path = str(tmp_path / "ads.sqlite")
+    db = sqlite3.connect(path)
+    # tabela `ads` dinainte de repost_cluster
+    cols = ", ".join(f"{f} TEXT NOT NULL DEFAULT ''" for f in AD_FIELDS)
+    db.execute(
+        f"CREATE TABLE ads (ad_key TEXT PRIMARY KEY, url TEXT NOT NULL, {cols}, first_seen REAL, last_seen REAL)"
+    )
+    db.execute("ALTER TABLE ads ADD COLUMN last_run TEXT")
+    db.execute("INSERT INTO ads(ad_key, url, titlu, first_seen, last_seen) VALUES ('1', 'u1', 'Vechi', 1, 1)")
+    db.commit()
+    db.close()
+    store = AdStore(path)
+    store.upsert("u2", {"titlu": "Nou", "id_anunt": "2", "repost_cluster": "1"}, ["07"], now=2.0)
+    rows = {r["url"]: r for r in store.flat_rows()}
+    assert list(rows["u2"]) == list(FLAT_COLUMNS)
+    assert (rows["u1"]["repost_cluster"], rows["u2"]["repost_cluster"]) == ("", "1")
+    store.close()
+
+
+def test_numpy_loaded_only_with_the_repost_index():
+    code = "import sys, scraper_olx, queryindex; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "False"
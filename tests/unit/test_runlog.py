@@ -0,0 +1,62 @@
+import io
+import json
+import logging
+import threading
+
+import runlog
+
+
+def test_queue_logging_writes_json_lines_off_thread(tmp_path):
+    path = tmp_path / "run.jsonl"
+    fh = logging.FileHandler(path, encoding="utf-8")
+    fh.setFormatter(runlog.JsonLinesFormatter())
+    emitted_on = []
+
+    class Spy(logging.Handler):
+        def emit(self, record):
+            emitted_on.append(threading.current_thread().name)
+
+    runlog.start_queue_logging([fh, Spy()], run_id="run-1")
+    try:
+        logging.getLogger("olx").info(
+            "[AD] END OK | phones=1",
+            extra={"stage": "AD", "status": "END OK", "url": "https://x/ad.html", "duration_s": 1.25, "outcome": "ok"},
+        )
+        logging.getLogger("selenium").warning("fără câmpuri")
+    finally:
+        runlog.stop_queue_logging()
+        logging.basicConfig(level=logging.INFO, force=True)
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert rows[0]["run_id"] == "run-1"
+    assert rows[0]["stage"] == "AD" and rows[0]["url"] == "https://x/ad.html"
+    assert rows[0]["duration_s"] == 1.25 and rows[0]["outcome"] == "ok"
+    assert rows[1]["run_id"] == "run-1" and "stage" not in rows[1]
+    assert emitted_on and threading.main_thread().name not in emitted_on
+
+
+def test_text_format_survives_foreign_loggers():
+    record = logging.LogRecord("urllib3", logging.INFO, __file__, 1, "retry %s", ("x",), None)
+    runlog.RunContextFilter(None).filter(record)
+    assert "run=- | retry x" in runlog.text_formatter().format(record)
+
+
+def test_exception_keeps_structured_exc_field():
+    json_out, text_out = io.StringIO(), io.StringIO()
+    jh, th = logging.StreamHandler(json_out), logging.StreamHandler(text_out)
+    jh.setFormatter(runlog.JsonLinesFormatter())
+    th.setFormatter(runlog.text_formatter())
+    runlog.start_queue_logging([jh, th], run_id="run-1")
+    try:
+        try:
+            raise ValueError("stricat")
+        except ValueError:
+            logging.getLogger("olx").exception("boom %s", 1)
+    finally:
+        runlog.stop_queue_logging()
+        logging.basicConfig(level=logging.INFO, force=True)
+
+    row = json.loads(json_out.getvalue())
+    assert row["msg"] == "boom 1"
+    assert row["exc"].startswith("Traceback") and "ValueError: stricat" in row["exc"]
+    assert "run=run-1 | boom 1\nTraceback" in text_out.getvalue()
@@ -0,0 +1,54 @@
+import json
+
+import cli
+from runreport import build_report, render_html, render_markdown, run_point
+
+
+def _run(i, version, ads, duration_s=600.0, host="pc1", errors=0):
+    return {
+        "run_id": f"r{i}",
+        "ts_utc": f"2026-10-{i + 1:02d}T10:00:00Z",
+        "version": version,
+        "host": host,
+        "duration_s": duration_s,
+        "ads_saved": ads,
+        "phones_found": ads // 2,
+        "errors": errors,
+    }
+
+
+def test_run_point_rates_and_bad_lines():
+    p = run_point(_run(0, "1.0.0", 100, duration_s=300, errors=25))
+    assert p.ads_per_min == 20.0 and p.phones_per_ad == 0.5 and p.error_rate == 0.2
+    assert run_point({"duration_s": None}) is None
+    assert run_point({"duration_s": "x"}) is None
+
+
+def test_regression_against_trailing_baseline():
+    runs = [_run(i, "1.0.0", 100) for i in range(5)] + [_run(5 + i, "1.1.0", 70) for i in range(3)]
+    runs += [_run(10, "1.0.0", 20, host="pc2"), _run(11, "1.1.0", 19, host="pc2")]  # pc2: -5%, sub prag
+    runs.append(_run(12, "1.1.0", 0))  # crash la pornire: ignorată
+    rep = build_report(runs, baseline_runs=3, threshold=0.15)
+    assert rep.total_runs == 11 and rep.used_runs == 10
+    assert [(r.host, r.version) for r in rep.regressions] == [("pc1", "1.1.0")]
+    r = rep.regressions[0]
+    assert r.baseline_runs == 3 and r.baseline_versions == ["1.0.0"] and round(r.change, 2) == -0.3
+    g = {(g.version, g.host): g for g in rep.groups}
+    assert g[("1.0.0", "pc1")].runs == 5 and g[("1.1.0", "pc1")].ads_per_min == 7.0
+
+    assert build_report(runs, threshold=0.5).regressions == []
+    assert "v1.1.0 pe pc1" in render_markdown(rep)
+    html = render_html(rep)
+    assert "<svg" in html and 'class="bad"' in html
+
+
+def test_cli_report(tmp_path, capsys):
+    runs = tmp_path / "runs"
+    runs.mkdir()
+    lines = [_run(i, "1.0.0", 100) for i in range(3)] + [_run(3, "1.1.0", 50)]
+    (runs / "index.jsonl").write_text("\n".join(json.dumps(r) for r in lines) + "\nnu e json\n", encoding="utf-8")
+    out = tmp_path / "report.html"
+    assert cli.main(["report", "--log-dir", str(tmp_path), "--out", str(out)]) == 0
+    assert "1 regresii" in capsys.readouterr().out and out.read_text(encoding="utf-8").startswith("<!doctype html>")
+    assert cli.main(["report", "--log-dir", str(tmp_path), "--fail-on-regression"]) == 1
+    assert "# Raport rulări" in capsys.readouterr().out
@@ -0,0 +1,46 @@
+import sys
+import threading
+import time
+
+from sampler import StackSampler, collapse_stack
+
+
+def try_ad_page():
+    return inner()
+
+
+def inner():
+    return collapse_stack(sys._getframe())
+
+
+def outside():
+    return collapse_stack(sys._getframe())
+
+
+def test_collapse_stack_cuts_at_outermost_root():
+    stack = try_ad_page()
+    assert stack.split(";") == ["test_sampler:try_ad_page", "test_sampler:inner"]
+    assert outside() is None
+
+
+def test_sampler_writes_collapsed_file(tmp_path):
+    stop = threading.Event()
+
+    def try_list_page():
+        while not stop.is_set():
+            time.sleep(0.001)
+
+    worker = threading.Thread(target=try_list_page)
+    worker.start()
+    path = tmp_path / "runs" / "run-x.collapsed"
+    sampler = StackSampler(str(path), hz=500).start()
+    try:
+        time.sleep(0.2)
+    finally:
+        summary = sampler.stop()
+        stop.set()
+        worker.join()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines and all(line.startswith("test_sampler:try_list_page") for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == summary["samples"] > 0
+    assert summary["ticks"] >= summary["samples"] and set(summary["root_s"]) == {"try_list_page"}
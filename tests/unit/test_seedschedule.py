@@ -0,0 +1,22 @@
+from seedschedule import SeedSchedule
+
+H = 3600.0
+
+
+def test_busy_seed_polled_more_often_than_quiet(tmp_path):
+    path = str(tmp_path / "s.schedule.json")
+    s = SeedSchedule(path, min_interval_s=600, max_interval_s=6 * H, target_new=5, alpha=1.0)
+    s.sync(["busy", "quiet"], now=0)
+    assert s.next_due(now=0)[1] <= 0
+    # primul crawl = inventar, nu ritm
+    s.record("busy", 200, now=0)
+    s.record("quiet", 200, now=0)
+    assert s.record("busy", 20, now=H) == 0.25 * H  # 20/h => 5 noi la 15 min
+    assert s.record("quiet", 0, now=H) == 1.5 * H  # fără nimic nou: intervalul crește treptat
+    assert s.seeds["quiet"].interval_s > s.seeds["busy"].interval_s
+    assert s.next_due(now=H)[0] == "busy"
+
+    again = SeedSchedule(path, min_interval_s=600, max_interval_s=6 * H)
+    assert again.seeds["busy"].crawls == 2
+    again.sync(["busy"], now=H)
+    assert list(again.seeds) == ["busy"]
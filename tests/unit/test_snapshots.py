@@ -0,0 +1,52 @@
+import json
+import os
+import time
+
+import cli
+from snapshots import HTML_NAME, META_NAME, SnapshotWriter, read_snapshot_html, snapshot_url
+
+
+def test_background_writer_gzips_and_links_run_and_url(tmp_path):
+    w = SnapshotWriter(str(tmp_path), run_id="run42", sample_rate=1.0)
+    assert w.should_capture("no_phone")
+    sid = w.submit("no_phone", "https://www.olx.ro/d/oferta/x-IDabc.html", "<html>" + "x" * 5000 + "</html>", b"PNG")
+    w.close()
+    d = tmp_path / sid
+    assert sid.startswith("no_phone_run42_")
+    assert (d / HTML_NAME).stat().st_size < 1000
+    assert read_snapshot_html(str(d)).startswith("<html>xxx")
+    meta = json.loads((d / META_NAME).read_text(encoding="utf-8"))
+    assert meta["run_id"] == "run42" and snapshot_url(str(d)) == meta["url"]
+    assert cli._snapshot_dirs([str(tmp_path)]) == [str(d)]
+
+
+def test_sampling_and_per_tag_cap(tmp_path):
+    w = SnapshotWriter(str(tmp_path), sample_rate=1.0, max_per_tag=2)
+    assert [w.should_capture("ad_fail") for _ in range(4)] == [True, True, False, False]
+    assert w.should_capture("no_phone")
+    assert w.stats["capped"] == 2
+    w.close()
+    off = SnapshotWriter(str(tmp_path), sample_rate=0.0)
+    assert not any(off.should_capture("ad_fail") for _ in range(10))
+    assert off.stats["sampled_out"] == 10
+    off.close()
+
+
+def test_retention_by_age_then_size(tmp_path):
+    w = SnapshotWriter(str(tmp_path), max_mb=0.01, keep_days=1)
+    w.close()
+    now = time.time()
+    legacy = tmp_path / "ad_fail_20250823-214113"
+    legacy.mkdir()
+    (legacy / "page.html").write_bytes(b"x" * 20000)
+    os.utime(legacy, (now - 90 * 86400, now - 90 * 86400))
+    for i, age_days in enumerate([3, 0.5, 0.2, 0.1]):
+        d = tmp_path / f"s{i}"
+        d.mkdir()
+        (d / HTML_NAME).write_bytes(b"x" * 4000)
+        (d / META_NAME).write_text("{}", encoding="utf-8")
+        os.utime(d, (now - age_days * 86400, now - age_days * 86400))
+    removed = [os.path.basename(p) for p in w.prune(now=now)]
+    # s0 e prea vechi; apoi cele mai vechi până sub bugetul de ~10 KB
+    assert removed == ["s0", "s1"]
+    assert sorted(os.listdir(tmp_path)) == ["ad_fail_20250823-214113", "s2", "s3"]
@@ -0,0 +1,109 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException
+from selenium.webdriver.common.by import By
+
+import scraper_olx
+from scraper_olx import _TAB_OPEN_JS, _TABS_STATUS_JS, TabPool
+
+
+class _Switch:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        if handle not in self._driver.window_handles:
+            raise NoSuchWindowException(handle)
+        self._driver.current_window_handle = handle
+
+
+class _Body:
+    text = ""
+
+
+class StubDriver:
+    """Doar ce folosesc `TabPool` și `reveal_phone`: ferestre cu comutare, tab-uri încărcate imediat, fără telefon."""
+
+    def __init__(self, broken_popup: bool = False):
+        self.window_handles = ["ctrl"]
+        self.current_window_handle = "ctrl"
+        self.current_url = "https://www.olx.ro/d/oferta/x-ID1.html"
+        self.switch_to = _Switch(self)
+        self.broken_popup = broken_popup  # fereastra mobilă nu mai termină de încărcat
+        self.popups = 0
+
+    def get(self, url):
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        if script == _TAB_OPEN_JS:
+            self.window_handles.append(f"tab{len(self.window_handles)}")
+        elif script == _TABS_STATUS_JS:
+            return ["complete"] * sum(h.startswith("tab") for h in self.window_handles)
+        elif script.startswith("window.open(arguments[0]"):
+            self.popups += 1
+            self.window_handles.append(f"popup{self.popups}")
+
+    def find_elements(self, by, value):
+        return []
+
+    def find_element(self, by, value):
+        if by == By.TAG_NAME and not (self.broken_popup and self.current_window_handle.startswith("popup")):
+            return _Body()
+        raise NoSuchElementException(value)
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+class StubSession:
+    proxy = "direct"
+
+    def __init__(self, **kw):
+        self.kw = kw
+        self.driver = StubDriver(**kw)
+        self.rebuilds = 0
+
+    def rebuild(self):
+        self.rebuilds += 1
+        self.driver = StubDriver(**self.kw)
+
+
+def test_ad_in_hand_is_retried_when_the_tab_dies_during_capture(monkeypatch):
+    calls = []
+
+    def capture(driver, href, proxy, t0):
+        calls.append(href)
+        if href == "u2" and calls.count("u2") == 1:
+            raise NoSuchWindowException("tab închis")
+        return {"url": href}, []
+
+    monkeypatch.setattr(scraper_olx, "capture_loaded_ad", capture)
+    monkeypatch.setattr(scraper_olx, "exp_backoff", lambda attempt: None)
+    sess = StubSession()
+    pool = TabPool(sess, 2)
+    got = [(idx, href) for idx, href, _snap, _phones in pool.fetch(enumerate(["u1", "u2", "u3", "u4"]))]
+
+    assert sorted(got) == [(0, "u1"), (1, "u2"), (2, "u3"), (3, "u4")]
+    assert sess.rebuilds == 1 and calls.count("u2") == 2
+
+
+@pytest.mark.parametrize("broken_popup", [False, True])
+def test_reveal_without_phone_returns_to_the_slot_tab(monkeypatch, broken_popup):
+    windows = []
+
+    def capture(driver, href, proxy, t0):
+        tab = driver.current_window_handle
+        phones, strategy = scraper_olx.reveal_phone(driver)
+        windows.append((tab, driver.current_window_handle, strategy))
+        return {"url": href}, phones
+
+    monkeypatch.setattr(scraper_olx, "capture_loaded_ad", capture)
+    monkeypatch.setattr(scraper_olx, "UI_TIME_SCALE", 0.0)
+    monkeypatch.setattr(scraper_olx, "PHONE_NETWORK_CAPTURE", False)
+    sess = StubSession(broken_popup=broken_popup)
+    got = list(TabPool(sess, 2).fetch(enumerate(["u1", "u2", "u3"])))
+
+    assert len(got) == 3 and all(phones == [] for *_rest, phones in got)
+    assert [(tab, now) for tab, now, _s in windows if tab != now] == []
+    assert all(tab.startswith("tab") for tab, _now, _s in windows)
+    assert not any(h.startswith("popup") for h in sess.driver.window_handles)  # fereastra mobilă închisă
@@ -0,0 +1,51 @@
+import time
+
+from taskqueue import TaskQueue
+
+
+def test_lease_complete_exactly_once(tmp_path):
+    path = str(tmp_path / "q.sqlite")
+    q = TaskQueue(path)
+    assert q.add("list", "list:seed", {"url": "seed", "page": 1})
+    assert not q.add("list", "list:seed", {"url": "seed", "page": 1})
+
+    t = q.lease("w1")
+    assert t.kind == "list" and q.lease("w2") is None
+    assert q.complete(t, "w1", new_tasks=[("ad", "https://x/ad1", {"url": "https://x/ad1"})])
+
+    ad = TaskQueue(path).lease("w2")
+    assert ad.kind == "ad"
+    assert q.complete(ad, "w2", rows=[{"telefon": "0711111111", "url": ad.key}])
+    assert [rows for rows in q.pop_unexported()] == [[{"telefon": "0711111111", "url": "https://x/ad1"}]]
+    assert list(q.pop_unexported()) == []
+    assert q.is_drained()
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_rejected(tmp_path):
+    q = TaskQueue(str(tmp_path / "q.sqlite"), lease_s=0.05)
+    q.add("ad", "https://x/ad1", {"url": "https://x/ad1"})
+    dead = q.lease("dead-worker")
+    time.sleep(0.1)
+    alive = q.lease("w2")
+    assert alive is not None and alive.id == dead.id and alive.attempts == 2
+    assert not q.heartbeat(dead.id, "dead-worker")
+    assert not q.complete(dead, "dead-worker", rows=[{"url": "stale"}])
+    assert q.complete(alive, "w2", rows=[{"url": "fresh"}])
+    assert list(q.pop_unexported()) == [[{"url": "fresh"}]]
+
+
+def test_fail_releases_until_max_attempts(tmp_path):
+    q = TaskQueue(str(tmp_path / "q.sqlite"), max_attempts=2)
+    q.add("ad", "u", {"url": "u"})
+    q.fail(q.lease("w"), "w", "chrome mort")
+    q.fail(q.lease("w"), "w", "chrome mort")
+    assert q.lease("w") is None
+    assert q.counts()["failed"] == 1
+
+
+def test_ads_leased_by_priority(tmp_path):
+    q = TaskQueue(str(tmp_path / "q.sqlite"))
+    q.add("list", "list:seed", {"url": "seed"})
+    q.add("ad", "https://x/low", {"url": "https://x/low", "priority": 1.0})
+    q.add("ad", "https://x/high", {"url": "https://x/high", "priority": 5.5})
+    assert [q.lease("w").key for _ in range(3)] == ["https://x/high", "https://x/low", "list:seed"]